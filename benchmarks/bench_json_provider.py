@@ -0,0 +1,91 @@
+"""Compare JSON serialization of a 10k-row item list across providers.
+
+Run from the repository root::
+
+    python benchmarks/bench_json_provider.py [--rows N] [--repeat N]
+
+Rows mirror what the list endpoints return (``to_dict()`` output), once
+with ISO strings as the views produce them today and once with native
+``datetime``/``date``/``Enum``/``Decimal`` values.
+"""
+
+# pylint: disable=wrong-import-position
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from website.constants import UserRole  # noqa: E402
+from website.utils import json_provider  # noqa: E402
+
+
+def make_rows(count, native):
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    rows = []
+    for i in range(count):
+        updated = now - timedelta(minutes=i)
+        expires = date(2026, 1, 1) + timedelta(days=i % 365)
+        rows.append(
+            {
+                "id": i,
+                "name": f"Consumable {i}",
+                "quantity": i % 50,
+                "tags": ["film", "35mm", f"batch-{i % 20}"],
+                "location_id": i % 10,
+                "location": f"Shelf {i % 10}",
+                "expires": expires if native else expires.isoformat(),
+                "last_updated": updated if native else updated.isoformat(),
+                "updated_by": "ta@example.edu",
+                "role": UserRole.TA if native else UserRole.TA.value,
+                "price": Decimal("4.25") if native else "4.25",
+            }
+        )
+    return {"consumables": rows, "next_cursor": None}
+
+
+def bench(label, provider, payload, repeat):
+    seconds = min(timeit.repeat(lambda: provider.dumps(payload), number=1, repeat=repeat))
+    print(f"  {label:<26} {seconds * 1000:8.1f} ms")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    flask_default = DefaultJSONProvider(app)
+    fast = json_provider.FastJSONProvider(app)
+
+    for native in (False, True):
+        payload = make_rows(args.rows, native)
+        kind = "native values" if native else "ISO strings"
+        print(f"{args.rows} rows, {kind}:")
+        try:
+            baseline = bench("flask default (json)", flask_default, payload, args.repeat)
+        except TypeError as exc:
+            # Flask's provider doesn't know Enum
+            print(f"  {'flask default (json)':<26} n/a ({exc})")
+            baseline = None
+        saved, json_provider.orjson = json_provider.orjson, None
+        try:
+            fallback = bench("FastJSONProvider (json)", fast, payload, args.repeat)
+        finally:
+            json_provider.orjson = saved
+        if json_provider.orjson is not None:
+            fastest = bench("FastJSONProvider (orjson)", fast, payload, args.repeat)
+            print(f"  speed-up: {(baseline or fallback) / fastest:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
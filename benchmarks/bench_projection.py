@@ -0,0 +1,91 @@
+"""Compare ORM objects + ``to_dict()`` with the column projection for list pages.
+
+Run from the repository root::
+
+    python benchmarks/bench_projection.py [--rows N] [--repeat N]
+
+Seeds an in-memory SQLite database with N consumables (each with a
+location, an updating user and two tags) and times building the list
+payload both ways, database round trip included.
+"""
+
+# pylint: disable=wrong-import-position
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+
+from website import create_app, db  # noqa: E402
+from website.constants import UserRole  # noqa: E402
+from website.models import (  # noqa: E402
+    Consumable,
+    Location,
+    Tag,
+    User,
+    eager_query,
+)
+from website.utils import projected_query, serialize_row  # noqa: E402
+
+
+def seed(count):
+    users = [
+        User(first_name="U", last_name=str(i), email=f"u{i}@x.com", role=UserRole.TA)
+        for i in range(10)
+    ]
+    locations = [Location(name=f"Shelf {i}") for i in range(10)]
+    tags = [Tag(name=f"tag-{i}") for i in range(20)]
+    db.session.add_all([*users, *locations, *tags])
+    db.session.flush()
+    now = datetime(2025, 1, 1, 12, 0)
+    for i in range(count):
+        db.session.add(
+            Consumable(
+                name=f"Film {i}",
+                quantity=i % 50,
+                location_id=locations[i % 10].id,
+                expires=date(2026, 1, 1),
+                last_updated=now,
+                updated_by=users[i % 10].id,
+                tags=[tags[i % 20], tags[(i + 1) % 20]],
+            )
+        )
+    db.session.commit()
+
+
+def orm_page():
+    db.session.expunge_all()
+    return [obj.to_dict() for obj in eager_query(Consumable).order_by(Consumable.id)]
+
+
+def projected_page(serialize=serialize_row(Consumable)):
+    return [serialize(row) for row in projected_query(Consumable).order_by(Consumable.id)]
+
+
+def bench(label, func, rows, repeat):
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"  {label:<12} {seconds * 1000:8.1f} ms  {rows / seconds:10.0f} rows/s")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        seed(args.rows)
+        print(f"{args.rows} consumables:")
+        orm = bench("ORM", orm_page, args.rows, args.repeat)
+        fast = bench("projection", projected_page, args.rows, args.repeat)
+        print(f"  speed-up: {orm / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,11 @@ _proj_root = os.path.dirname(os.path.dirname(__file__))
 if _proj_root not in sys.path:
     sys.path.insert(0, _proj_root)
 
+# keep mail in memory; nothing in the suite should reach an SMTP server
+os.environ.setdefault("MAIL_BACKEND", "locmem")
+# and events; the default file backend would append to instance/events.jsonl
+os.environ.setdefault("EVENTS_BACKEND", "memory")
+
 from website import create_app
 from website import db
 
@@ -45,6 +50,9 @@ def cleanup_db(app_ctx):
         Location,
         User,
         Tag,
+        ChangeLog,
+        OutboxMessage,
+        JobRun,
         camera_gear_tags,
         lab_equipment_tags,
         consumable_tags,
@@ -64,6 +72,9 @@ def cleanup_db(app_ctx):
         Location.query.delete()
         Tag.query.delete()
         User.query.delete()
+        ChangeLog.query.delete()
+        OutboxMessage.query.delete()
+        JobRun.query.delete()
         db.session.commit()
     except Exception:  # pragma: no cover
         db.session.rollback()
@@ -83,6 +94,9 @@ def cleanup_db(app_ctx):
         Location.query.delete()
         Tag.query.delete()
         User.query.delete()
+        ChangeLog.query.delete()
+        OutboxMessage.query.delete()
+        JobRun.query.delete()
         db.session.commit()
     except Exception:  # pragma: no cover
         db.session.rollback()
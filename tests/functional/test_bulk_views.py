@@ -0,0 +1,179 @@
+# Functional tests for the /bulk endpoints
+# pylint: disable=missing-module-docstring,missing-function-docstring,unused-argument,redefined-outer-name,import-outside-toplevel
+
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from website import db
+from website.constants import (
+    API_PREFIX,
+    CAMERA_GEAR_BULK_ROUTE,
+    CAMERA_GEAR_PREFIX,
+    CONSUMABLES_BULK_ROUTE,
+    CONSUMABLES_PREFIX,
+    LAB_EQUIPMENT_BULK_ROUTE,
+    LAB_EQUIPMENT_PREFIX,
+    LOCATION_BULK_ROUTE,
+    LOCATION_PREFIX,
+    TAG_BULK_ROUTE,
+    TAG_PREFIX,
+    UserRole,
+)
+from website.models import CameraGear, Consumable, LabEquipment, Location, Note, OutboxMessage, Tag, User
+from website.utils.search import search
+
+GEAR_BULK = f"{API_PREFIX}{CAMERA_GEAR_PREFIX}{CAMERA_GEAR_BULK_ROUTE}"
+CONSUMABLES_BULK = f"{API_PREFIX}{CONSUMABLES_PREFIX}{CONSUMABLES_BULK_ROUTE}"
+LAB_BULK = f"{API_PREFIX}{LAB_EQUIPMENT_PREFIX}{LAB_EQUIPMENT_BULK_ROUTE}"
+TAG_BULK = f"{API_PREFIX}{TAG_PREFIX}{TAG_BULK_ROUTE}"
+LOCATION_BULK = f"{API_PREFIX}{LOCATION_PREFIX}{LOCATION_BULK_ROUTE}"
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def client(app, app_ctx):
+    user = User(first_name="TA", last_name="User", email="ta@x.com", role=UserRole.TA)
+    db.session.add(user)
+    db.session.commit()
+    with app.test_client() as test_client:
+        with test_client.session_transaction() as sess:
+            sess["_user_id"] = str(user.id)
+            sess["_fresh"] = True
+        yield test_client
+
+
+def test_bulk_create_camera_gear_with_shared_tags(client):
+    rows = [{"name": f"Body {i}", "tags": ["35mm", "Film" if i % 2 else "film"]} for i in range(50)]
+
+    with count_statements() as statements:
+        rv = client.post(GEAR_BULK, json=rows)
+
+    assert rv.status_code == 200
+    results = rv.get_json()["results"]
+    assert [r["status"] for r in results] == ["created"] * 50
+    assert Tag.query.count() == 2
+    assert CameraGear.query.count() == 50
+    assert sorted(t.name for t in db.session.get(CameraGear, results[7]["id"]).tags) == ["35mm", "film"]
+    # tags are resolved and linked once for the whole batch (SQLite runs the
+    # ordered RETURNING insert per row; Postgres batches it as well)
+    assert len([s for s in statements if s.startswith("SELECT tag.")]) == 1
+    assert len([s for s in statements if s.startswith("INSERT INTO tag ")]) == 1
+    assert len([s for s in statements if s.startswith("INSERT INTO camera_gear_tags")]) == 1
+    assert [r["text"] for r in search("body 7", kinds=["camera_gear"])] == ["Body 7"]
+
+
+def test_bulk_create_reports_invalid_rows_and_keeps_the_rest(client):
+    shelf = Location(name="Shelf")
+    db.session.add(shelf)
+    db.session.commit()
+    rows = [
+        {"name": "Portra", "quantity": 3, "location_id": shelf.id, "expires": "2030-01-01"},
+        {"quantity": 2},
+        {"name": "HP5", "quantity": "lots"},
+        {"name": "Tri-X", "location_id": 999999},
+        {"name": "Delta", "expires": "soon"},
+        "not a row",
+    ]
+
+    rv = client.post(CONSUMABLES_BULK, json={"items": rows})
+
+    statuses = [r["status"] for r in rv.get_json()["results"]]
+    assert statuses == ["created", "error", "error", "error", "error", "error"]
+    portra = Consumable.query.one()
+    assert (portra.name, portra.quantity, portra.location_id) == ("Portra", 3, shelf.id)
+    assert portra.updated_by is not None
+
+
+def test_bulk_consumables_mark_low_stock_crossings(client):
+    rows = [{"name": f"Film {i}", "quantity": i} for i in range(3)] + [{"name": "Paper", "quantity": 50}]
+    client.post(CONSUMABLES_BULK, json=rows)
+
+    # the low rows wait for one digest; nothing is queued per row
+    pending = Consumable.query.filter_by(low_stock_pending=True).order_by(Consumable.name)
+    assert [c.name for c in pending] == ["Film 0", "Film 1", "Film 2"]
+    assert OutboxMessage.query.count() == 0
+
+
+def test_bulk_update_lab_equipment(client):
+    rv = client.post(LAB_BULK, json=[{"name": "Enlarger"}, {"name": "Dryer", "tags": ["wet"]}])
+    enlarger_id, dryer_id = [r["id"] for r in rv.get_json()["results"]]
+
+    rv = client.patch(
+        LAB_BULK,
+        json=[
+            {"id": enlarger_id, "last_serviced_on": "2025-01-02", "tags": ["dry", "Wet"]},
+            {"id": dryer_id, "name": "Film Dryer"},
+            {"id": 987654, "name": "Ghost"},
+            {"name": "No id"},
+        ],
+    )
+
+    statuses = [r["status"] for r in rv.get_json()["results"]]
+    assert statuses == ["updated", "updated", "not_found", "error"]
+    enlarger = db.session.get(LabEquipment, enlarger_id)
+    dryer = db.session.get(LabEquipment, dryer_id)
+    assert str(enlarger.last_serviced_on) == "2025-01-02"
+    assert enlarger.last_serviced_by is not None
+    assert sorted(t.name for t in enlarger.tags) == ["dry", "wet"]
+    assert dryer.name == "Film Dryer"
+    assert [t.name for t in dryer.tags] == ["wet"]
+
+
+def test_bulk_delete_cascades_notes_and_tag_links(client):
+    rv = client.post(GEAR_BULK, json=[{"name": "A", "tags": ["x"]}, {"name": "B", "tags": ["x"]}])
+    a_id, b_id = [r["id"] for r in rv.get_json()["results"]]
+    db.session.add(Note(content="dusty", camera_gear_id=a_id, created_by=1))
+    db.session.commit()
+
+    rv = client.delete(GEAR_BULK, json=[a_id, {"id": b_id}, 424242, "x"])
+
+    statuses = [r["status"] for r in rv.get_json()["results"]]
+    assert statuses == ["deleted", "deleted", "not_found", "error"]
+    assert CameraGear.query.count() == 0
+    assert Note.query.count() == 0
+    assert Tag.query.one().camera_gear == []
+
+
+@pytest.mark.parametrize("url, model", [(TAG_BULK, Tag), (LOCATION_BULK, Location)])
+def test_bulk_named_rows_reject_duplicates(client, url, model):
+    db.session.add(model(name="Existing"))
+    db.session.commit()
+
+    rv = client.post(url, json=[{"name": "New"}, {"name": "existing"}, {"name": "NEW"}])
+    assert [r["status"] for r in rv.get_json()["results"]] == ["created", "error", "error"]
+
+    new_id = rv.get_json()["results"][0]["id"]
+    rv = client.patch(url, json=[{"id": new_id, "name": "EXISTING"}, {"id": new_id, "name": "nEw"}])
+    assert [r["status"] for r in rv.get_json()["results"]] == ["error", "updated"]
+    assert sorted(m.name for m in model.query) == ["Existing", "nEw"]
+
+
+def test_bulk_rejects_malformed_bodies(client):
+    assert client.post(TAG_BULK, json={"rows": []}).status_code == 400
+    assert client.post(TAG_BULK, json=[]).status_code == 400
+    assert client.delete(TAG_BULK, data="nope").status_code == 400
+
+
+def test_bulk_requires_ta(app, app_ctx):
+    user = User(first_name="S", last_name="User", email="s@x.com", role=UserRole.STUDENT)
+    db.session.add(user)
+    db.session.commit()
+    with app.test_client() as test_client:
+        with test_client.session_transaction() as sess:
+            sess["_user_id"] = str(user.id)
+        assert test_client.post(TAG_BULK, json=[{"name": "x"}]).status_code == 403
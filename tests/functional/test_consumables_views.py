@@ -100,6 +100,24 @@ class TestConsumablesEndpoints:
             # delete route requires TA; logged in as TA so expect success
             assert rv2.status_code == 200
 
+    def test_quantity_is_parsed_as_an_integer(self, app, app_ctx, ta_user, consumable_item):
+        url = f"{API_PREFIX}{CONSUMABLES_PREFIX}"
+        with app.test_client() as client:
+            login_user_in_client(client, ta_user)
+            rv = client.post(f"{url}{CONSUMABLES_CREATE_ROUTE}", json={"name": "x", "quantity": "3"})
+            assert rv.status_code == 200
+            assert rv.get_json()["quantity"] == 3
+            rv = client.put(f"{url}/{consumable_item.id}", json={"quantity": "2"})
+            assert rv.status_code == 200
+            assert rv.get_json()["quantity"] == 2
+
+            for bad in ("lots", True, [1]):
+                rv = client.post(f"{url}{CONSUMABLES_CREATE_ROUTE}", json={"name": "x", "quantity": bad})
+                assert rv.status_code == ERROR_BAD_REQUEST
+                rv = client.put(f"{url}/{consumable_item.id}", json={"quantity": bad})
+                assert rv.status_code == ERROR_BAD_REQUEST
+        assert db.session.get(Consumable, consumable_item.id).quantity == 2
+
     def test_update_invalid_expires(self, app, app_ctx, ta_user, consumable_item):
         with app.test_client() as client:
             login_user_in_client(client, ta_user)
@@ -0,0 +1,64 @@
+# Functional tests for the /import endpoint
+# pylint: disable=missing-module-docstring,missing-function-docstring,unused-argument,redefined-outer-name
+
+import io
+
+import pytest
+
+from website import db
+from website.constants import API_PREFIX, IMPORT_PREFIX, IMPORT_ROUTE, UserRole
+from website.models import Consumable, User
+
+IMPORT_URL = f"{API_PREFIX}{IMPORT_PREFIX}{IMPORT_ROUTE}"
+
+
+def _login(app, role):
+    user = User(first_name="Test", last_name="User", email=f"{role.value}@x.com", role=role)
+    db.session.add(user)
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = str(user.id)
+        sess["_fresh"] = True
+    return client, user
+
+
+@pytest.fixture
+def client(app, app_ctx):
+    test_client, _ = _login(app, UserRole.TA)
+    return test_client
+
+
+def test_multipart_csv_upload(client):
+    body = b"type,name,quantity\nconsumable,Stop bath,2\nconsumable,,1\n"
+    rv = client.post(
+        IMPORT_URL,
+        data={"file": (io.BytesIO(body), "items.csv")},
+        content_type="multipart/form-data",
+    )
+    assert rv.status_code == 200
+    data = rv.get_json()
+    assert data["imported"]["consumable"] == 1
+    assert data["errors"] == [{"line": 3, "error": "'name' is required"}]
+    assert Consumable.query.one().name == "Stop bath"
+
+
+def test_raw_jsonl_body(client):
+    rv = client.post(
+        f"{IMPORT_URL}?type=consumable",
+        data=b'{"name": "Developer", "quantity": 4}\n',
+        content_type="application/x-ndjson",
+    )
+    assert rv.status_code == 200
+    assert rv.get_json()["imported"]["consumable"] == 1
+
+
+def test_unknown_format_is_bad_request(client):
+    rv = client.post(IMPORT_URL, data=b"x", content_type="application/octet-stream")
+    assert rv.status_code == 400
+
+
+def test_students_cannot_import(app, app_ctx):
+    student, _ = _login(app, UserRole.STUDENT)
+    rv = student.post(IMPORT_URL, data=b"", content_type="text/csv")
+    assert rv.status_code == 403
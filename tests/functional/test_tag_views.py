@@ -295,6 +295,18 @@ class TestCreateTag:
             response_data = json.loads(rv.data)
             assert MESSAGE_KEY in response_data
 
+    def test_fails_non_string_name(self, app, app_ctx, ta_user):
+        """Test fails (rather than crashing) when name isn't a string, and strips blanks."""
+        with app.test_client() as client:
+            login_user_in_client(client, ta_user)
+            for name in (5, ["a"], {"a": 1}, True):
+                rv = client.post(f"{API_PREFIX}{TAG_PREFIX}{TAG_CREATE_ROUTE}", json={TAG_NAME: name})
+                assert rv.status_code == ERROR_BAD_REQUEST
+            rv = client.post(f"{API_PREFIX}{TAG_PREFIX}{TAG_CREATE_ROUTE}", json={TAG_NAME: "   "})
+            assert rv.status_code == ERROR_BAD_REQUEST
+            rv = client.post(f"{API_PREFIX}{TAG_PREFIX}{TAG_CREATE_ROUTE}", json={TAG_NAME: " padded "})
+            assert json.loads(rv.data)[TAG_NAME] == "padded"
+
     def test_fails_as_student(self, app, app_ctx, student_user):
         """Test student cannot create a tag."""
         with app.test_client() as client:
@@ -378,6 +390,14 @@ class TestUpdateTag:
             assert MESSAGE_KEY in response_data
             assert TAG_NAME_REQUIRED_MESSAGE in response_data[MESSAGE_KEY]
 
+    def test_fails_non_string_name(self, app, app_ctx, ta_user, sample_tag):
+        """Test fails (rather than crashing) when name isn't a string."""
+        with app.test_client() as client:
+            login_user_in_client(client, ta_user)
+            rv = client.put(f"{API_PREFIX}{TAG_PREFIX}/{sample_tag.id}", json={TAG_NAME: 5})
+            assert rv.status_code == ERROR_BAD_REQUEST
+            assert MESSAGE_KEY in json.loads(rv.data)
+
     def test_fails_empty_name(self, app, app_ctx, ta_user, sample_tag):
         """Test fails when name is empty string."""
         with app.test_client() as client:
@@ -8,53 +8,109 @@ fixtures in ways pylint cannot always infer.
 # pylint: disable=missing-module-docstring,import-error,line-too-long,
 # pylint: disable=missing-function-docstring,missing-class-docstring,unused-import
 import os
+import threading
+
+import pytest
 
 import website.views.task_views as view_module
+from website.models import JobRun
+from website.utils import jobs
+
+TOKEN = "test-token-xyz"
+WEEKLY = "/internal/tasks/weekly-expirations"
+
+
+@pytest.fixture
+def token(monkeypatch):
+    monkeypatch.setenv("WEEKLY_TASK_TOKEN", TOKEN)
+    return {"X-Task-Token": TOKEN}
+
+
+@pytest.fixture
+def steps(monkeypatch):
+    """Replace the weekly steps (and the recipient lookup) with the given functions."""
+    lookups = []
+
+    def fake_recipients():
+        lookups.append(1)
+        return ["ta@example.com"]
+
+    monkeypatch.setattr(jobs, "task_recipients", fake_recipients)
+
+    def _use(*functions):
+        monkeypatch.setitem(jobs.JOBS, jobs.WEEKLY_EXPIRATIONS, functions)
+        return lookups
+
+    return _use
+
+
+def _run_to_completion(app, client, token):
+    rv = client.post(WEEKLY, headers=token)
+    assert rv.status_code == 202
+    body = rv.get_json()
+    assert rv.headers["Location"] == body["status_url"]
+    app.extensions["job_runner"].wait(body["id"], timeout=10)
+    status = client.get(body["status_url"], headers=token)
+    assert status.status_code == 200
+    return status.get_json()
 
 
 def test_weekly_endpoint_unauthorized(app):
     client = app.test_client()
     # Ensure token not present in environment for this unauthorized test
     os.environ.pop("WEEKLY_TASK_TOKEN", None)
-    rv = client.post("/internal/tasks/weekly-expirations")
+    rv = client.post(WEEKLY)
     assert rv.status_code == 403
 
 
-def test_weekly_endpoint_success(app, patcher):
-    # patch helpers to no-op and ensure endpoint returns 200
-    def ok1():
-        return True
+def test_weekly_endpoint_enqueues_and_runs_steps_concurrently(app, app_ctx, token, steps):
+    # every step waits at the barrier, so the run only completes if they overlap
+    barrier = threading.Barrier(3, timeout=5)
+    seen = []
 
-    # The view lazily imports helpers from `website.utils.tasks` at runtime;
-    # patch the functions on that module so the endpoint runs the patched
-    # versions when invoked.
-    import website.utils as utils_pkg
-    patcher(utils_pkg, "notify_consumables_expiring_this_week", ok1)
-    patcher(utils_pkg, "notify_camera_gear_due_returns", ok1)
-    patcher(utils_pkg, "notify_lab_equipment_service_reminders", ok1)
+    def make_step(name, sent):
+        def step(session=None, recipients=None):
+            seen.append(recipients)
+            barrier.wait()
+            return sent
+        step.__name__ = name
+        return step
 
-    client = app.test_client()
-    # set a matching token in environment and header
-    token = "test-token-xyz"
-    os.environ["WEEKLY_TASK_TOKEN"] = token
+    lookups = steps(make_step("a", True), make_step("b", False), make_step("c", True))
+    run = _run_to_completion(app, app.test_client(), token)
 
-    rv = client.post("/internal/tasks/weekly-expirations", headers={"X-Task-Token": token})
-    assert rv.status_code == 200
+    assert run["status"] == "succeeded"
+    assert [(r["name"], r["outcome"]) for r in run["results"]] == [
+        ("a", "sent"),
+        ("b", "skipped"),
+        ("c", "sent"),
+    ]
+    assert all(r["duration_ms"] >= 0 for r in run["results"])
+    assert run["duration_ms"] is not None
+    # one recipient lookup shared by all three steps
+    assert lookups == [1]
+    assert seen == [["ta@example.com"]] * 3
 
 
-def test_weekly_endpoint_internal_error(app, patcher):
-    # patch one helper to raise to force 500
-    def bad():
+def test_weekly_endpoint_records_a_failing_step(app, app_ctx, token, steps):
+    def bad(session=None, recipients=None):
         raise RuntimeError("boom")
 
-    import website.utils as utils_pkg
-    patcher(utils_pkg, "notify_consumables_expiring_this_week", bad)
-    patcher(utils_pkg, "notify_camera_gear_due_returns", lambda: True)
-    patcher(utils_pkg, "notify_lab_equipment_service_reminders", lambda: True)
+    def ok(session=None, recipients=None):
+        return True
+
+    steps(bad, ok)
+    run = _run_to_completion(app, app.test_client(), token)
+
+    assert run["status"] == "failed"
+    assert {r["name"]: (r["outcome"], r["error"]) for r in run["results"]} == {
+        "bad": ("error", "boom"),
+        "ok": ("sent", None),
+    }
 
-    token = "test-token-xyz-2"
-    os.environ["WEEKLY_TASK_TOKEN"] = token
 
+def test_run_status_needs_the_token_and_an_existing_run(app, app_ctx, token):
     client = app.test_client()
-    rv = client.post("/internal/tasks/weekly-expirations", headers={"X-Task-Token": token})
-    assert rv.status_code == 500
+    assert client.get("/internal/tasks/runs/1").status_code == 403
+    assert client.get("/internal/tasks/runs/987654", headers=token).status_code == 404
+    assert JobRun.query.count() == 0
@@ -0,0 +1,166 @@
+"""Tests for the change log and the ``/changes`` delta sync endpoints."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from website import db
+from website.constants import API_PREFIX, CAMERA_GEAR_PREFIX, CONSUMABLES_PREFIX
+from website.models import CameraGear, ChangeLog, Consumable, TableVersion, Tag
+from website.utils import encode_cursor, insert_items, prune_change_log
+
+from .test_loaders import mock_current_user
+
+GEAR_CHANGES = f"{API_PREFIX}{CAMERA_GEAR_PREFIX}/changes"
+
+
+def _gear(name, **kwargs):
+    gear = CameraGear(name=name, last_updated=datetime.now(), **kwargs)
+    db.session.add(gear)
+    db.session.commit()
+    return gear
+
+
+def _changes(app, url=GEAR_CHANGES, since=None):
+    query = f"?since={since}" if since else ""
+    with app.test_client() as client, mock_current_user():
+        return client.get(f"{url}{query}")
+
+
+def _sync(app, since):
+    body = _changes(app, since=since).get_json()
+    return sorted(g["name"] for g in body["camera_gear"]), body["deleted"], body["cursor"]
+
+
+def test_full_sync_then_deltas(app, app_ctx):
+    """Only rows written after the cursor come back, plus tombstones."""
+    keep = _gear("Keep")
+    edit = _gear("Edit")
+    drop = _gear("Drop")
+    body = _changes(app).get_json()
+    assert sorted(g["name"] for g in body["camera_gear"]) == ["Drop", "Edit", "Keep"]
+    assert body["deleted"] == []
+
+    edit.name = "Edited"
+    drop_id = drop.id
+    db.session.delete(drop)
+    _gear("New")
+    db.session.commit()
+
+    names, deleted, cursor = _sync(app, body["cursor"])
+    assert names == ["Edited", "New"]
+    assert deleted == [drop_id]
+    assert keep.id not in deleted
+    assert _sync(app, cursor) == ([], [], cursor)
+
+
+def test_unchanged_objects_are_not_logged(app, app_ctx):
+    """Touching an attribute without changing it writes no entry."""
+    gear = _gear("Same")
+    before = ChangeLog.query.count()
+    gear.name = gear.name
+    db.session.commit()
+    assert ChangeLog.query.count() == before
+
+
+def test_bulk_statements_are_logged(app, app_ctx):
+    """``update()``/``delete()`` statements log the rows they match."""
+    first, second, other = _gear("A"), _gear("B"), _gear("C")
+    cursor = _changes(app).get_json()["cursor"]
+    db.session.execute(
+        update(CameraGear).where(CameraGear.id == first.id).values(name="A2")
+    )
+    CameraGear.query.filter(CameraGear.id == second.id).delete()
+    db.session.commit()
+
+    names, deleted, _ = _sync(app, cursor)
+    assert names == ["A2"]
+    assert deleted == [second.id]
+    assert other.id not in deleted
+
+
+def test_insert_returning_rows_are_logged(app, app_ctx):
+    """Rows created by the bulk helpers show up in the delta."""
+    cursor = _changes(app).get_json()["cursor"]
+    insert_items(CameraGear, [{"name": "Bulk", "last_updated": datetime.now()}])
+    db.session.commit()
+    assert _sync(app, cursor)[0] == ["Bulk"]
+
+
+def test_tag_rename_logs_tagged_items(app, app_ctx):
+    """Items whose serialized tags change are part of the delta."""
+    tag = Tag(name="old")
+    _gear("Tagged", tags=[tag])
+    _gear("Plain")
+    cursor = _changes(app).get_json()["cursor"]
+    version = db.session.get(TableVersion, "camera_gear").version
+    tag.name = "new"
+    db.session.commit()
+    # the item table is bumped (and so locked) before its entries are written
+    assert db.session.get(TableVersion, "camera_gear").version > version
+
+    body = _changes(app, since=cursor).get_json()
+    assert [(g["name"], g["tags"]) for g in body["camera_gear"]] == [("Tagged", ["new"])]
+
+    cursor = body["cursor"]
+    db.session.delete(tag)
+    db.session.commit()
+    body = _changes(app, since=cursor).get_json()
+    assert [(g["name"], g["tags"]) for g in body["camera_gear"]] == [("Tagged", [])]
+
+
+def test_changes_are_per_table(app, app_ctx):
+    """A consumable write doesn't appear in the camera gear delta."""
+    cursor = _changes(app).get_json()["cursor"]
+    db.session.add(Consumable(name="Film", quantity=1, last_updated=datetime.now()))
+    db.session.commit()
+    assert _sync(app, cursor)[:2] == ([], [])
+    url = f"{API_PREFIX}{CONSUMABLES_PREFIX}/changes"
+    assert [c["name"] for c in _changes(app, url, cursor).get_json()["consumables"]] == ["Film"]
+
+
+def test_late_commit_to_one_table_is_not_skipped(app, app_ctx):
+    """Another table's newer entry doesn't move this table's cursor past a gap."""
+    _gear("Early")
+    cursor = _changes(app).get_json()["cursor"]
+    head = ChangeLog.query.order_by(ChangeLog.seq.desc()).first().seq
+    # a camera gear transaction took head + 1 but hasn't committed yet,
+    # while a consumables transaction took head + 2 and has
+    db.session.add(
+        ChangeLog(
+            seq=head + 2,
+            table_name=Consumable.__table__.name,
+            row_id=1,
+            deleted=False,
+            changed_at=datetime.now(),
+        )
+    )
+    db.session.commit()
+    assert _sync(app, cursor) == ([], [], cursor)
+
+    # the camera gear transaction commits late, with the lower number
+    _gear("Late")
+    db.session.execute(update(ChangeLog).where(ChangeLog.seq > head + 2).values(seq=head + 1))
+    db.session.commit()
+    assert _sync(app, cursor)[0] == ["Late"]
+
+
+def test_invalid_and_expired_cursors(app, app_ctx):
+    """Garbage is a 400; cursors the log can no longer serve are a 410."""
+    assert _changes(app, since="not-a-cursor").status_code == 400
+    assert _changes(app, since=encode_cursor(["x"])).status_code == 400
+
+    _gear("One")
+    head = ChangeLog.query.order_by(ChangeLog.seq.desc()).first().seq
+    assert _changes(app, since=encode_cursor([head + 5])).status_code == 410
+
+    _gear("Two")
+    _gear("Three")
+    db.session.execute(update(ChangeLog).values(changed_at=datetime.now() - timedelta(days=90)))
+    db.session.commit()
+    assert prune_change_log(30) == 2
+    # the newest entry survives so the sequence keeps growing
+    assert ChangeLog.query.count() == 1
+    assert _changes(app, since=encode_cursor([head - 1])).status_code == 410
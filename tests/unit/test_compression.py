@@ -0,0 +1,91 @@
+"""Tests for negotiated response compression."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import gzip
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+from flask import Response
+
+from website import db
+from website.constants import API_PREFIX, TAG_ALL_ROUTE, TAG_PREFIX, UserRole
+from website.models import Tag
+from website.utils import compression
+
+TAGS_URL = f"{API_PREFIX}{TAG_PREFIX}{TAG_ALL_ROUTE}"
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@contextmanager
+def client_as(app, role=UserRole.STUDENT):
+    user = Mock(role=role, id=1, is_authenticated=True)
+    user.get_id.return_value = "1"
+    with app.test_client() as client, patch("flask_login.utils._get_user", return_value=user):
+        yield client
+
+
+def _add_tags(count):
+    db.session.add_all([Tag(name=f"tag number {i}") for i in range(count)])
+    db.session.commit()
+
+
+def test_large_json_is_gzipped_when_accepted(app, app_ctx):
+    _add_tags(100)
+    with client_as(app) as client:
+        plain = client.get(TAGS_URL)
+        packed = client.get(TAGS_URL, headers=GZIP)
+
+    assert "Content-Encoding" not in plain.headers
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in packed.headers["Vary"]
+    assert gzip.decompress(packed.data) == plain.data
+    assert len(packed.data) * 5 < len(plain.data)
+
+
+def test_small_bodies_are_left_alone(app, app_ctx):
+    _add_tags(1)
+    with client_as(app) as client:
+        rv = client.get(TAGS_URL, headers=GZIP)
+    assert "Content-Encoding" not in rv.headers
+
+
+def test_compressed_etag_still_revalidates(app, app_ctx):
+    _add_tags(100)
+    with client_as(app) as client:
+        first = client.get(TAGS_URL, headers=GZIP)
+        etag = first.headers["ETag"]
+        assert etag.startswith("W/")
+        second = client.get(TAGS_URL, headers={**GZIP, "If-None-Match": etag})
+    assert second.status_code == 304
+
+
+def test_static_files_are_compressed_once(app, app_ctx):
+    compression._static_cache.clear()  # pylint: disable=protected-access
+    with app.test_client() as client, patch.object(
+        compression, "compress", wraps=compression.compress
+    ) as spy:
+        first = client.get("/static/js/home.js", headers=GZIP)
+        second = client.get("/static/js/home.js", headers=GZIP)
+        plain = client.get("/static/js/home.js")
+
+    assert first.headers["Content-Encoding"] == "gzip"
+    assert second.data == first.data
+    assert gzip.decompress(first.data) == plain.data
+    assert spy.call_count == 1
+
+
+def test_streamed_bodies_are_compressed_incrementally(app):
+    chunks = [b"x" * 1000 for _ in range(50)]
+    with app.test_request_context(headers=GZIP):
+        response = compression.compress_response(app, Response(iter(chunks), mimetype="text/plain"))
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        body = b"".join(response.response)
+    assert gzip.decompress(body) == b"".join(chunks)
+
+
+def test_unsupported_encoding_is_not_applied(app):
+    with app.test_request_context(headers={"Accept-Encoding": "zstd"}):
+        response = compression.compress_response(app, Response("y" * 2000, mimetype="text/html"))
+    assert "Content-Encoding" not in response.headers
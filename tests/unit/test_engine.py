@@ -0,0 +1,109 @@
+"""Tests for the engine profiles and the pool stats endpoint."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from website.constants import ADMIN_DB_POOL_ROUTE, ADMIN_PREFIX, UserRole
+from website.utils.engine import engine_options, running_cli_command
+
+from .test_loaders import mock_current_user
+
+PG_URI = "postgresql://user:pw@db.example.com/inventory"
+
+
+def test_cloud_defaults_to_web_profile():
+    """Cloud deployments get pre-ping, recycling and a statement timeout."""
+    options = engine_options(PG_URI, environ={}, cloud=True)
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 300
+    assert options["pool_size"] == 5
+    # 16 request threads + dispatcher + job runner + 3 job steps
+    assert options["pool_size"] + options["max_overflow"] == 21
+    assert options["connect_args"] == {
+        "application_name": "photography-management",
+        "options": "-c statement_timeout=30000",
+    }
+
+
+def test_web_pool_covers_every_thread():
+    """The web pool grows with the request and job threads it serves."""
+    options = engine_options(PG_URI, environ={"WEB_THREADS": "4", "JOB_WORKERS": "1"}, cloud=True)
+    assert options["pool_size"] + options["max_overflow"] == 4 + 2 + 1
+    options = engine_options(PG_URI, environ={"WEB_THREADS": "2", "DB_POOL_SIZE": "10"}, cloud=True)
+    assert options["max_overflow"] == 0
+    # an explicit overflow wins
+    options = engine_options(PG_URI, environ={"DB_MAX_OVERFLOW": "1"}, cloud=True)
+    assert options["max_overflow"] == 1
+    with pytest.raises(ValueError):
+        engine_options(PG_URI, environ={"WEB_THREADS": "lots"}, cloud=True)
+
+
+def test_cli_commands_use_the_worker_profile(monkeypatch):
+    """CLI commands get no statement timeout, whatever DB_PROFILE says."""
+    options = engine_options(PG_URI, environ={"DB_PROFILE": "web"}, cloud=True, cli=True)
+    assert options["pool_size"] == 1
+    assert "options" not in options["connect_args"]
+
+    seen = []
+    monkeypatch.setenv("FLASK_RUN_FROM_CLI", "true")
+
+    @click.group()
+    def cli():
+        pass
+
+    @cli.command("migrate")
+    def migrate():
+        seen.append(running_cli_command())
+
+    @cli.command("run")
+    def run():
+        seen.append(running_cli_command())
+
+    CliRunner().invoke(cli, ["migrate"])
+    CliRunner().invoke(cli, ["run"])
+    assert seen == [True, False]
+    # gunicorn never sets the flag
+    monkeypatch.delenv("FLASK_RUN_FROM_CLI")
+    assert running_cli_command() is False
+
+
+def test_environment_overrides_profile():
+    """``DB_*`` values replace the profile's settings."""
+    environ = {
+        "DB_PROFILE": "worker",
+        "DB_POOL_SIZE": "3",
+        "DB_POOL_PRE_PING": "false",
+        "DB_STATEMENT_TIMEOUT_MS": "500",
+        "DB_APPLICATION_NAME": "nightly",
+    }
+    options = engine_options(PG_URI, environ=environ)
+    assert options["pool_size"] == 3
+    assert options["max_overflow"] == 1
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"] == {
+        "application_name": "nightly",
+        "options": "-c statement_timeout=500",
+    }
+
+
+def test_sqlite_and_bad_values():
+    """SQLite ignores pool settings; bad values fail at startup."""
+    assert engine_options("sqlite:///testing.db", environ={"DB_POOL_SIZE": "3"}) == {}
+    with pytest.raises(ValueError):
+        engine_options(PG_URI, environ={"DB_PROFILE": "huge"})
+    with pytest.raises(ValueError):
+        engine_options(PG_URI, environ={"DB_POOL_SIZE": "many"})
+
+
+def test_pool_stats_endpoint(app, app_ctx):
+    """Admins see the worker's pool counters; others are refused."""
+    url = f"{ADMIN_PREFIX}{ADMIN_DB_POOL_ROUTE}"
+    with app.test_client() as client:
+        with mock_current_user():
+            stats = client.get(url).get_json()
+        with mock_current_user(UserRole.STUDENT):
+            assert client.get(url).status_code == 403
+    assert {"pid", "pool", "checked_out", "capacity", "profile"} <= set(stats)
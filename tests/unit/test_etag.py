@@ -0,0 +1,122 @@
+"""Tests for ETag-based conditional GETs on the API collections."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from sqlalchemy import event, insert
+
+from website import db
+from website.constants import (
+    API_PREFIX,
+    CONSUMABLES_ALL_ROUTE,
+    CONSUMABLES_PREFIX,
+    TAG_ALL_ROUTE,
+    TAG_PREFIX,
+    UserRole,
+)
+from website.models import Consumable, Tag, TableVersion
+
+TAGS_URL = f"{API_PREFIX}{TAG_PREFIX}{TAG_ALL_ROUTE}"
+CONSUMABLES_URL = f"{API_PREFIX}{CONSUMABLES_PREFIX}{CONSUMABLES_ALL_ROUTE}"
+
+
+@contextmanager
+def client_as(app, role=UserRole.STUDENT):
+    user = Mock(role=role, id=1, is_authenticated=True)
+    user.get_id.return_value = "1"
+    with app.test_client() as client, patch("flask_login.utils._get_user", return_value=user):
+        yield client
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+
+def test_matching_etag_returns_304_without_loading_rows(app, app_ctx):
+    db.session.add(Tag(name="film"))
+    db.session.commit()
+
+    with client_as(app) as client:
+        first = client.get(TAGS_URL)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert first.headers["Cache-Control"] == "private, no-cache"
+
+        with count_statements() as statements:
+            second = client.get(TAGS_URL, headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.data == b""
+    assert second.headers["ETag"] == etag
+    assert len(statements) == 1
+    assert "table_version" in statements[0]
+
+
+def test_writes_change_the_etag(app, app_ctx):
+    with client_as(app) as client:
+        before = client.get(TAGS_URL).headers["ETag"]
+
+        db.session.add(Tag(name="lens"))
+        db.session.commit()
+        after_flush = client.get(TAGS_URL, headers={"If-None-Match": before})
+        assert after_flush.status_code == 200
+        assert [t["name"] for t in after_flush.get_json()["tags"]] == ["lens"]
+
+        # statements that skip the unit of work bump the counter too
+        db.session.execute(insert(Tag), [{"name": "paper"}])
+        db.session.commit()
+        after_bulk = client.get(TAGS_URL, headers={"If-None-Match": after_flush.headers["ETag"]})
+        assert after_bulk.status_code == 200
+
+
+def test_related_table_writes_change_item_etags(app, app_ctx):
+    db.session.add(Consumable(name="Film", quantity=1, last_updated=datetime.now()))
+    tag = Tag(name="old")
+    db.session.add(tag)
+    db.session.commit()
+
+    with client_as(app) as client:
+        etag = client.get(CONSUMABLES_URL).headers["ETag"]
+        unrelated = client.get(CONSUMABLES_URL, headers={"If-None-Match": etag})
+        assert unrelated.status_code == 304
+
+        tag.name = "renamed"
+        db.session.commit()
+        assert client.get(CONSUMABLES_URL, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_etag_depends_on_query_string(app, app_ctx):
+    with client_as(app) as client:
+        full = client.get(TAGS_URL).headers["ETag"]
+        paged = client.get(TAGS_URL + "?limit=1").headers["ETag"]
+    assert full != paged
+
+
+def test_errors_are_not_tagged(app, app_ctx):
+    with client_as(app) as client:
+        rv = client.get(CONSUMABLES_URL + "?sort=colour")
+    assert rv.status_code == 400
+    assert "ETag" not in rv.headers
+
+
+def test_table_version_counts_writes(app, app_ctx):
+    before = db.session.get(TableVersion, "tag").version
+    db.session.add(Tag(name="a"))
+    db.session.commit()
+    Tag.query.delete()
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(TableVersion, "tag").version == before + 2
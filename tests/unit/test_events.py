@@ -0,0 +1,173 @@
+"""Tests for change events and the ``/events`` Server-Sent Events stream."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import json
+import queue
+import time
+from datetime import datetime
+
+import pytest
+
+from website import db
+from website.constants import API_PREFIX, EVENTS_PREFIX, EVENTS_ROUTE, UserRole
+from website.models import CameraGear, Consumable, Note, User
+from website.utils import insert_items
+from website.utils.events import (
+    EVENT_BUSY_RETRY_MS,
+    RESYNC,
+    EventHub,
+    FileBackend,
+    MemoryBackend,
+    event_stream,
+    get_hub,
+    init_events,
+)
+
+from .test_loaders import mock_current_user
+
+
+@pytest.fixture
+def hub(app):
+    """Swap the app's hub for an in-process one."""
+    previous = get_hub(app)
+    init_events(app, MemoryBackend())
+    yield get_hub(app)
+    app.extensions["event_hub"] = previous
+
+
+def _drain(subscription):
+    events = []
+    while True:
+        try:
+            events.append(subscription.get(timeout=0))
+        except queue.Empty:
+            return events
+
+
+def _compact(events):
+    return [{k: v for k, v in e.items() if k != "seq"} for e in events]
+
+
+def test_commit_publishes_compact_events(app, hub):
+    """Creates, updates and deletes are published once committed."""
+    user = User(first_name="A", last_name="B", email="a@x.com", role=UserRole.TA)
+    db.session.add(user)
+    db.session.commit()
+    subscription = hub.subscribe()
+    gear = CameraGear(name="R5", last_updated=datetime.now())
+    db.session.add(gear)
+    db.session.commit()
+    note = Note(content="Scratched", camera_gear_id=gear.id, created_by=user.id)
+    db.session.add(note)
+    gear.is_checked_out = True
+    db.session.commit()
+    gear_id, note_id = gear.id, note.id
+    db.session.delete(note)
+    db.session.commit()
+
+    assert _compact(_drain(subscription)) == [
+        {"type": "camera_gear", "id": gear_id, "op": "create"},
+        {
+            "type": "note",
+            "id": note_id,
+            "op": "create",
+            "item_type": "camera_gear",
+            "item_id": gear_id,
+        },
+        {"type": "camera_gear", "id": gear_id, "op": "update", "fields": ["is_checked_out"]},
+        {
+            "type": "note",
+            "id": note_id,
+            "op": "delete",
+            "item_type": "camera_gear",
+            "item_id": gear_id,
+        },
+    ]
+
+
+def test_rollback_publishes_nothing(app, hub):
+    """Events of a rolled back transaction are dropped."""
+    subscription = hub.subscribe()
+    db.session.add(Consumable(name="Film", quantity=1, last_updated=datetime.now()))
+    db.session.flush()
+    db.session.rollback()
+    db.session.commit()
+    assert not _drain(subscription)
+
+
+def test_bulk_inserts_publish(app, hub):
+    """Rows inserted outside the unit of work still produce events."""
+    subscription = hub.subscribe()
+    created = insert_items(
+        Consumable, [{"name": f"Film {i}", "quantity": i, "last_updated": datetime.now()} for i in range(2)]
+    )
+    db.session.commit()
+    assert [(e["id"], e["op"]) for e in _drain(subscription)] == [(c.id, "create") for c in created]
+
+
+def test_last_event_id_replays_or_resyncs(app, hub):
+    """A reconnecting client gets what it missed, or a resync when that's gone."""
+    hub.subscribe()  # a hub records history once it has served a stream
+    first, second = hub.publish([{"type": "note", "id": 1, "op": "create"}] * 2)
+    assert [e["seq"] for e in _drain(hub.subscribe(first["seq"]))] == [second["seq"]]
+    assert hub.subscribe("unknown").get(timeout=0) is RESYNC
+
+
+def test_file_backend_fans_out_between_workers(tmp_path):
+    """Hubs sharing one file (one per worker) all see every event."""
+    path = str(tmp_path / "events.jsonl")
+    workers = [EventHub(FileBackend(path, poll_interval=0.01)) for _ in range(2)]
+    try:
+        subscriptions = [worker.subscribe() for worker in workers]
+        published = workers[0].publish([{"type": "consumable", "id": 3, "op": "update"}])
+        for subscription in subscriptions:
+            assert subscription.get(timeout=2) == published[0]
+    finally:
+        for worker in workers:
+            worker.close()
+
+
+def test_stream_format(app, hub):
+    """Events are framed as SSE messages, with heartbeats while idle."""
+    stream = event_stream(hub, heartbeat=0.01, max_seconds=0.2)
+    assert next(stream) == "retry: 3000\n\n"
+    assert next(stream) == ": keepalive\n\n"
+    (published,) = hub.publish([{"type": "lab_equipment", "id": 2, "op": "delete"}])
+    message = next(stream)
+    while message.startswith(":"):
+        message = next(stream)
+    lines = message.rstrip("\n").split("\n")
+    assert lines[:2] == [f"id: {published['seq']}", "event: change"]
+    assert json.loads(lines[2][len("data: "):]) == {"type": "lab_equipment", "id": 2, "op": "delete"}
+    started = time.monotonic()
+    list(stream)
+    assert time.monotonic() - started < 1
+
+
+def test_streams_per_process_are_capped():
+    """Past the cap a stream only asks the client to retry later."""
+    hub = EventHub(MemoryBackend(), max_streams=1)
+    first = event_stream(hub, heartbeat=0.01, max_seconds=5)
+    assert next(first) == "retry: 3000\n\n"
+    assert list(event_stream(hub)) == [f"retry: {EVENT_BUSY_RETRY_MS}\n\n"]
+    # closing a stream frees its slot
+    first.close()
+    again = event_stream(hub, heartbeat=0.01, max_seconds=5)
+    assert next(again) == "retry: 3000\n\n"
+    again.close()
+
+
+def test_events_endpoint_streams(app, hub):
+    """The endpoint answers with an uncompressed, uncached event stream."""
+    with app.test_client() as client, mock_current_user():
+        response = client.get(f"{API_PREFIX}{EVENTS_PREFIX}{EVENTS_ROUTE}")
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert "Content-Encoding" not in response.headers
+        chunks = iter(response.response)
+        assert next(chunks).startswith(b"retry:")
+        hub.publish([{"type": "camera_gear", "id": 9, "op": "create"}])
+        assert b"event: change" in next(chunks)
+        response.close()
@@ -0,0 +1,132 @@
+"""Tests for sparse fieldsets (``?fields=``) on list and detail endpoints."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from datetime import datetime
+
+import pytest
+
+from website import db
+from website.constants import (
+    API_PREFIX,
+    CAMERA_GEAR_ALL_ROUTE,
+    CAMERA_GEAR_PREFIX,
+    NOTES_ALL_ROUTE,
+    NOTES_PREFIX,
+    UserRole,
+)
+from website.models import CameraGear, Note, User
+from website.utils import FilterError, parse_fields, projected_query, serialize_row
+
+from .test_loaders import count_queries, mock_current_user
+from .test_projection import _seed
+
+GEAR_URL = f"{API_PREFIX}{CAMERA_GEAR_PREFIX}{CAMERA_GEAR_ALL_ROUTE}"
+NOTES_URL = f"{API_PREFIX}{NOTES_PREFIX}{NOTES_ALL_ROUTE}"
+
+
+def _seed_notes():
+    _seed()
+    user = User.query.filter_by(email="a@x.com").one()
+    gear = CameraGear.query.filter_by(name="R5").one()
+    db.session.add_all(
+        [
+            Note(content="long text", camera_gear_id=gear.id, created_by=user.id),
+            # attached item no longer exists
+            Note(content="orphan", consumable_id=99999, created_by=user.id),
+        ]
+    )
+    db.session.commit()
+
+
+def _get(app, url):
+    with app.test_client() as client, mock_current_user():
+        with count_queries() as statements:
+            response = client.get(url)
+    selects = [s for s in statements if "table_version" not in s]
+    return response, selects
+
+
+def test_parse_fields(app, app_ctx):
+    """Absent means everything; ``id`` is always kept; unknown names fail."""
+    assert parse_fields(CameraGear, {}) is None
+    assert parse_fields(CameraGear, {"fields": "name, tags"}) == {"id", "name", "tags"}
+    with pytest.raises(FilterError):
+        parse_fields(CameraGear, {"fields": "name,bogus"})
+
+
+def test_list_selects_only_requested_columns(app, app_ctx):
+    """Unrequested columns, joins and the tag subquery leave the SQL."""
+    _seed()
+    response, selects = _get(app, f"{GEAR_URL}?fields=name")
+    assert response.status_code == 200
+    assert [sorted(item) for item in response.get_json()["camera_gear"]] == [["id", "name"]] * 2
+    (sql,) = selects
+    for absent in ("JOIN", "tag", "email", "return_date"):
+        assert absent not in sql
+
+
+def test_list_rejects_unknown_field(app, app_ctx):
+    """Unknown fields are a 400 like unknown filters."""
+    response, _ = _get(app, f"{GEAR_URL}?fields=nope")
+    assert response.status_code == 400
+    assert "nope" in response.get_json()["error"]
+
+
+def test_notes_cache_fields(app, app_ctx):
+    """The notes cache gets item references without note contents."""
+    _seed_notes()
+    gear = CameraGear.query.filter_by(name="R5").one()
+    response, selects = _get(app, f"{NOTES_URL}?fields=item_type,item_id")
+    assert response.status_code == 200
+    notes = sorted(response.get_json()["notes"], key=lambda n: n["id"])
+    assert [(n["item_type"], n["item_id"]) for n in notes] == [
+        ("camera_gear", gear.id),
+        (None, None),
+    ]
+    assert all(sorted(n) == ["id", "item_id", "item_type"] for n in notes)
+    assert "content" not in selects[0]
+
+
+def test_note_and_user_projection_match_to_dict(app, app_ctx):
+    """Projected notes and users serialize like their ORM objects."""
+    _seed_notes()
+    for model in (Note, User):
+        expected = {obj.id: obj.to_dict() for obj in model.query.all()}
+        serialize = serialize_row(model)
+        assert {row[0]: serialize(row) for row in projected_query(model)} == expected
+
+
+def test_to_dict_skips_unrequested_relationships(app, app_ctx):
+    """Relationships behind unrequested keys aren't loaded."""
+    _seed_notes()
+    db.session.expunge_all()
+    gear = CameraGear.query.filter_by(name="R5").one()
+    note = Note.query.filter_by(content="long text").one()
+    with count_queries() as statements:
+        gear_data = gear.to_dict({"id", "name"})
+        note_data = note.to_dict({"id", "content"})
+    assert statements == []
+    assert gear_data == {"id": gear.id, "name": "R5"}
+    assert note_data == {"id": note.id, "content": "long text"}
+
+
+def test_detail_endpoint_honours_fields(app, app_ctx):
+    """Single-item routes return and load only the requested keys."""
+    _seed()
+    gear = CameraGear.query.filter_by(name="R5").one()
+    db.session.expunge_all()
+    url = f"{API_PREFIX}{CAMERA_GEAR_PREFIX}/one/{gear.id}?fields=name,location"
+    response, selects = _get(app, url)
+    assert response.get_json() == {"id": gear.id, "name": "R5", "location": "Cabinet"}
+    assert len(selects) == 1
+    assert "email" not in selects[0]
+
+
+def test_admin_users_fields(app, app_ctx):
+    """The admin user list honours ``fields`` too."""
+    _seed()
+    with app.test_client() as client, mock_current_user(UserRole.ADMIN):
+        response = client.get("/admin/users/all?fields=email")
+    assert sorted(u["email"] for u in response.get_json()["user"]) == ["a@x.com", "c@x.com"]
+    assert all(sorted(u) == ["email", "id"] for u in response.get_json()["user"])
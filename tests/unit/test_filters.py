@@ -0,0 +1,139 @@
+"""Tests for the server-side filter and sort arguments on item list endpoints."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from website import db
+from website.constants import (
+    API_PREFIX,
+    CAMERA_GEAR_ALL_ROUTE,
+    CAMERA_GEAR_PREFIX,
+    CONSUMABLES_ALL_ROUTE,
+    CONSUMABLES_PREFIX,
+    LAB_EQUIPMENT_ALL_ROUTE,
+    LAB_EQUIPMENT_PREFIX,
+    UserRole,
+)
+from website.models import CameraGear, Consumable, LabEquipment, Location, Tag
+
+GEAR_URL = f"{API_PREFIX}{CAMERA_GEAR_PREFIX}{CAMERA_GEAR_ALL_ROUTE}"
+CONSUMABLES_URL = f"{API_PREFIX}{CONSUMABLES_PREFIX}{CONSUMABLES_ALL_ROUTE}"
+LAB_URL = f"{API_PREFIX}{LAB_EQUIPMENT_PREFIX}{LAB_EQUIPMENT_ALL_ROUTE}"
+
+
+@contextmanager
+def mock_current_user(role=UserRole.TA):
+    """Patch flask-login's current user lookup during a request."""
+    user = Mock()
+    user.role = role
+    user.id = 1
+    user.is_authenticated = True
+    with patch("flask_login.utils._get_user", return_value=user):
+        yield user
+
+
+def _names(app, url, key):
+    with app.test_client() as client, mock_current_user():
+        rv = client.get(url)
+    assert rv.status_code == 200, rv.get_json()
+    return [item["name"] for item in rv.get_json()[key]]
+
+
+@pytest.fixture
+def inventory(app_ctx):
+    """Seed a small mixed inventory used by the filter tests."""
+    now = datetime.utcnow()
+    today = date.today()
+    shelf = Location(name="Top Shelf")
+    closet = Location(name="Closet")
+    film = Tag(name="Film")
+    lens = Tag(name="lens")
+    db.session.add_all([shelf, closet, film, lens])
+    db.session.flush()
+
+    canon = CameraGear(name="Canon AE-1", location_id=shelf.id, last_updated=now, is_checked_out=True)
+    nikon = CameraGear(name="Nikon FM2", location_id=closet.id, last_updated=now)
+    portra = Consumable(name="Portra 400", quantity=1, location_id=shelf.id,
+                        expires=today + timedelta(days=3), last_updated=now)
+    hp5 = Consumable(name="HP5", quantity=10, location_id=closet.id,
+                     expires=today + timedelta(days=30), last_updated=now)
+    paper = Consumable(name="Paper_50%", quantity=0, last_updated=now)
+    enlarger = LabEquipment(name="Enlarger", last_updated=now, service_frequency="Monthly",
+                            last_serviced_on=today - timedelta(days=90))
+    dryer = LabEquipment(name="Dryer", last_updated=now, service_frequency="weekly",
+                         last_serviced_on=today)
+    db.session.add_all([canon, nikon, portra, hp5, paper, enlarger, dryer])
+    db.session.flush()
+    canon.tags = [lens]
+    portra.tags = [film]
+    hp5.tags = [film]
+    dryer.tags = [film]
+    db.session.commit()
+    return {"shelf": shelf, "closet": closet, "today": today}
+
+
+def test_camera_gear_filters(app, inventory):
+    shelf_id = inventory["shelf"].id
+    assert _names(app, f"{GEAR_URL}?checked_out=true", "camera_gear") == ["Canon AE-1"]
+    assert _names(app, f"{GEAR_URL}?checked_out=no", "camera_gear") == ["Nikon FM2"]
+    assert _names(app, f"{GEAR_URL}?location_id={shelf_id}", "camera_gear") == ["Canon AE-1"]
+    assert _names(app, f"{GEAR_URL}?tag=LENS", "camera_gear") == ["Canon AE-1"]
+    assert _names(app, f"{GEAR_URL}?location=clos", "camera_gear") == ["Nikon FM2"]
+    assert _names(app, f"{GEAR_URL}?q=shelf", "camera_gear") == ["Canon AE-1"]
+
+
+def test_consumable_filters_and_sort(app, inventory):
+    soon = (inventory["today"] + timedelta(days=7)).isoformat()
+    assert _names(app, f"{CONSUMABLES_URL}?expires_before={soon}", "consumables") == ["Portra 400"]
+    assert _names(app, f"{CONSUMABLES_URL}?quantity_lte=1&sort=-quantity", "consumables") == [
+        "Portra 400",
+        "Paper_50%",
+    ]
+    assert _names(app, f"{CONSUMABLES_URL}?tag=film,other&sort=expires", "consumables") == [
+        "Portra 400",
+        "HP5",
+    ]
+    # LIKE wildcards in the filter value are matched literally
+    assert _names(app, f"{CONSUMABLES_URL}?name=_50%25", "consumables") == ["Paper_50%"]
+    assert _names(app, f"{CONSUMABLES_URL}?name=", "consumables") == ["HP5", "Paper_50%", "Portra 400"]
+
+
+def test_lab_equipment_filters(app, inventory):
+    cutoff = (inventory["today"] - timedelta(days=30)).isoformat()
+    assert _names(app, f"{LAB_URL}?serviced_before={cutoff}", "lab_equipment") == ["Enlarger"]
+    assert _names(app, f"{LAB_URL}?service_frequency=monthly", "lab_equipment") == ["Enlarger"]
+    assert _names(app, f"{LAB_URL}?tag=film", "lab_equipment") == ["Dryer"]
+    assert _names(app, f"{LAB_URL}?sort=-name", "lab_equipment") == ["Enlarger", "Dryer"]
+
+
+def test_filters_combine_with_pagination(app, inventory):
+    with app.test_client() as client, mock_current_user():
+        first = client.get(f"{CONSUMABLES_URL}?tag=film&sort=-expires&limit=1").get_json()
+        second = client.get(
+            f"{CONSUMABLES_URL}?tag=film&sort=-expires&limit=1&after={first['next_cursor']}"
+        ).get_json()
+    assert [c["name"] for c in first["consumables"]] == ["HP5"]
+    assert [c["name"] for c in second["consumables"]] == ["Portra 400"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"{GEAR_URL}?checked_out=maybe",
+        f"{GEAR_URL}?location_id=abc",
+        f"{CONSUMABLES_URL}?expires_before=tomorrow",
+        f"{CONSUMABLES_URL}?sort=password",
+        f"{LAB_URL}?tag=,",
+    ],
+)
+def test_invalid_filters_return_bad_request(app, app_ctx, url):
+    with app.test_client() as client, mock_current_user():
+        rv = client.get(url)
+    assert rv.status_code == 400
+    assert "error" in rv.get_json()
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta, date
 from unittest.mock import Mock, patch
 
 import pytest
+from sqlalchemy import event
 
 from website import db
 from website.constants import (
@@ -26,6 +27,8 @@ from website.constants import (
     UserRole,
 )
 from website.models import Consumable, CameraGear, LabEquipment
+from website.utils import dashboard
+from website.utils.dashboard import cached_dashboard_stats, dashboard_stats
 
 
 def make_user(role=UserRole.ADMIN, is_authenticated=True):
@@ -137,7 +140,7 @@ def test_home_dashboard_renders_aggregate_stats(app, app_ctx):
     assert context["lab_equipment_total"] == 4
     assert context["inventory_total"] == 13
 
-    assert context["next_expiring"] is fresh_film
+    assert context["next_expiring"] == (fresh_film.id, "Fresh Film", fresh_film.expires)
     assert context["days_until_expiration"] == 5
     assert context["expired_count"] == 1
     assert context["expiring_soon_count"] == 2
@@ -145,10 +148,13 @@ def test_home_dashboard_renders_aggregate_stats(app, app_ctx):
     assert context["checked_out_count"] == 1
 
     next_due_date = today + timedelta(days=4)
-    assert context["next_service_equipment"] is upcoming_equipment
+    assert context["next_service_equipment"].id == upcoming_equipment.id
     assert context["days_until_service"] == 4
     assert context["next_service_date"] == next_due_date
-    assert context["service_overdue"] == [overdue_equipment, unscheduled_equipment]
+    assert [e.name for e in context["service_overdue"]] == [
+        overdue_equipment.name,
+        unscheduled_equipment.name,
+    ]
 
 
 def test_home_dashboard_handles_empty_inventory(app, app_ctx):
@@ -180,45 +186,89 @@ def test_home_dashboard_handles_empty_inventory(app, app_ctx):
     assert context["service_overdue"] == []
 
 
-def test_home_dashboard_handles_non_comparable_service_dates(app, app_ctx):
-    """Guard against odd data causing the service scheduling branch to skip."""
+def test_dashboard_service_schedule_is_computed_in_sql(app, app_ctx):
+    """Frequencies match ignoring case and a service due today isn't overdue."""
+    today = date.today()
     now = datetime.utcnow()
-    equipment = LabEquipment(
-        name="Weird Comparator",
+    due_today = LabEquipment(
+        name="Due Today",
         last_updated=now,
-        updated_by=None,
-        service_frequency="weekly",
-        last_serviced_on=date.today(),
+        service_frequency=" Monthly ",
+        last_serviced_on=today - timedelta(days=30),
+    )
+    later = LabEquipment(
+        name="Later",
+        last_updated=now,
+        service_frequency="YEARLY",
+        last_serviced_on=today - timedelta(days=1),
     )
-    db.session.add(equipment)
+    db.session.add_all([due_today, later])
     db.session.commit()
 
-    class FakeComparable:
-        def __lt__(self, other):
-            return False
+    stats = dashboard_stats(today)
 
-        def __ge__(self, other):
-            return False
+    assert stats["next_service_equipment"].name == "Due Today"
+    assert stats["next_service_date"] == today
+    assert stats["days_until_service"] == 0
+    assert stats["service_overdue"] == []
 
-    class FakeDate:
-        def __add__(self, delta):
-            # returning a comparable object ensures the first branch is skipped
-            return FakeComparable()
 
-    with db.session.no_autoflush:
-        equipment.last_serviced_on = FakeDate()
-        mock_user = make_user(UserRole.ADMIN)
-        with app.test_client() as client:
-            with patch("flask_login.utils._get_user", return_value=mock_user):
-                with patch("website.views.home_views.render_template") as mock_render:
-                    mock_render.return_value = "rendered"
-                    response = client.get(f"{HOME_PREFIX}{HOME_ROUTE}")
+def test_dashboard_stats_run_a_fixed_number_of_queries(app, app_ctx):
+    """Query count doesn't depend on how many items exist."""
+    now = datetime.utcnow()
+    db.session.add_all(
+        [Consumable(name=f"c{i}", quantity=i, last_updated=now) for i in range(50)]
+        + [CameraGear(name=f"g{i}", last_updated=now) for i in range(50)]
+    )
+    db.session.commit()
 
-    assert response.status_code == 200
-    mock_render.assert_called_once()
-    context = mock_render.call_args.kwargs
-    assert context["service_overdue"] == []
-    assert context["next_service_equipment"] is None
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        stats = dashboard_stats()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+    assert stats["consumables_total"] == sum(range(50))
+    assert stats["camera_gear_total"] == 50
+    assert len(statements) <= 6
+
+
+def test_dashboard_cache_serves_hits_and_drops_on_writes(app, app_ctx):
+    """Writes through a flush or a bulk statement invalidate the cached figures."""
+    now = datetime.utcnow()
+    db.session.add(Consumable(name="Film", quantity=3, last_updated=now))
+    db.session.commit()
+
+    first = cached_dashboard_stats()
+    with patch("website.utils.dashboard.dashboard_stats") as recompute:
+        assert cached_dashboard_stats() is first
+    recompute.assert_not_called()
+
+    db.session.add(CameraGear(name="Camera", last_updated=now))
+    db.session.commit()
+    assert cached_dashboard_stats()["camera_gear_total"] == 1
+
+    Consumable.query.delete()
+    db.session.commit()
+    assert cached_dashboard_stats()["consumables_total"] == 0
+
+
+def test_dashboard_cache_expires_at_date_rollover(app, app_ctx):
+    """Day-relative figures are recomputed once the date changes."""
+    first = cached_dashboard_stats()
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    with patch.object(dashboard, "date", Tomorrow):
+        assert cached_dashboard_stats() is not first
 
 
 def test_home_requires_approved_role(app, app_ctx):
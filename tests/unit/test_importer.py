@@ -0,0 +1,131 @@
+"""Tests for the streaming CSV/JSONL inventory importer."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import io
+import json
+from datetime import date
+
+import pytest
+
+from website import db
+from website.models import CameraGear, Consumable, LabEquipment, Location, Tag
+from website.utils.importer import InventoryImporter, InventoryImportError, detect_format
+
+CSV_TEXT = (
+    "type,name,tags,location,quantity,expires,service_frequency,last_serviced_on\n"
+    'consumable,Portra 400,"film, 35mm",Fridge,12,2026-01-31,,\n'
+    "consumable,HP5,Film,fridge,,,,\n"
+    "lab_equipment,Enlarger,darkroom,,,,monthly,2025-05-01\n"
+    "camera_gear,Nikon F3,35mm,Cabinet,,,,\n"
+    "widget,Mystery,,,,,,\n"
+    "consumable,Bad quantity,,,lots,,,\n"
+)
+
+
+def test_detect_format():
+    assert detect_format("items.CSV") == "csv"
+    assert detect_format("items.ndjson") == "jsonl"
+    assert detect_format("items.txt", "jsonl") == "jsonl"
+    with pytest.raises(InventoryImportError):
+        detect_format("items.xlsx")
+
+
+def test_csv_import_creates_items_tags_and_locations(app, app_ctx):
+    reports = []
+    importer = InventoryImporter(chunk_size=2, user_id=7, progress=reports.append)
+    report = importer.run(io.BytesIO(CSV_TEXT.encode()), "csv")
+
+    assert report["processed"] == 6
+    assert report["imported"] == {"camera_gear": 1, "consumable": 2, "lab_equipment": 1}
+    assert [e["line"] for e in report["errors"]] == [6, 7]
+    assert len(reports) == 3  # two written chunks, then the rejected tail
+    assert reports[-1] == report
+
+    portra = Consumable.query.filter_by(name="Portra 400").one()
+    assert portra.quantity == 12
+    assert portra.expires == date(2026, 1, 31)
+    assert portra.updated_by == 7
+    assert sorted(t.name for t in portra.tags) == ["35mm", "film"]
+    hp5 = Consumable.query.filter_by(name="HP5").one()
+    assert hp5.quantity == 1
+    assert hp5.location_id == portra.location_id  # names match ignoring case
+    assert [t.name for t in hp5.tags] == ["film"]
+    assert Location.query.count() == 2
+    assert Tag.query.count() == 3
+
+    enlarger = LabEquipment.query.one()
+    assert enlarger.last_serviced_on == date(2025, 5, 1)
+    assert enlarger.last_serviced_by == 7
+    assert CameraGear.query.one().tags[0].name == "35mm"
+
+
+def test_jsonl_import_with_default_type_and_bad_lines(app, app_ctx):
+    location = Location(name="Shelf")
+    db.session.add(location)
+    db.session.commit()
+    lines = [
+        json.dumps({"name": "Canon AE-1", "tags": ["slr", "SLR"], "location_id": location.id}),
+        "not json",
+        json.dumps(["a", "list"]),
+        "",
+        json.dumps({"name": "Ghost", "location_id": 999999}),
+    ]
+    importer = InventoryImporter(default_type="camera", chunk_size=10)
+    report = importer.run(io.StringIO("\n".join(lines)), "jsonl")
+
+    assert report["imported"]["camera_gear"] == 1
+    assert {e["line"]: e["error"] for e in report["errors"]} == {
+        2: "Invalid JSON",
+        3: "Row must be a JSON object",
+        5: "Location not found",
+    }
+    gear = CameraGear.query.one()
+    assert gear.location_id == location.id
+    assert [t.name for t in gear.tags] == ["slr"]
+
+
+def test_reported_errors_are_capped(app, app_ctx):
+    text = "type,name\n" + "widget,x\n" * 5
+    report = InventoryImporter(max_errors=2).run(io.StringIO(text), "csv")
+    assert report["rejected"] == 5
+    assert len(report["errors"]) == 2
+    assert report["errors_truncated"] is True
+
+
+def test_undecodable_bytes_keep_the_committed_rows(app, app_ctx):
+    text = "type,name\n" + "".join(f"consumable,Film {i}\n" for i in range(1000))
+    importer = InventoryImporter(chunk_size=100)
+    report = importer.run(io.BytesIO(text.encode() + b"consumable,\xff\n"), "csv")
+
+    assert report["imported"]["consumable"] == Consumable.query.count() > 0
+    assert report["rejected"] == 1
+    assert report["errors"][0]["error"].startswith("File is not valid UTF-8")
+    assert report["errors"][0]["line"] <= 1002
+
+
+def test_unknown_default_type_is_rejected():
+    with pytest.raises(InventoryImportError):
+        InventoryImporter(default_type="spaceship")
+
+
+def test_cli_import(app, app_ctx, tmp_path):
+    path = tmp_path / "items.jsonl"
+    path.write_text(json.dumps({"type": "consumable", "name": "Fixer", "quantity": 3}) + "\n")
+
+    result = app.test_cli_runner().invoke(args=["import-inventory", str(path)])
+
+    assert result.exit_code == 0, result.output
+    assert "consumable: 1" in result.output
+    assert Consumable.query.one().quantity == 3
+
+
+def test_cli_import_reports_rows_before_undecodable_bytes(app, app_ctx, tmp_path):
+    path = tmp_path / "items.jsonl"
+    path.write_bytes(b'{"type": "consumable", "name": "Fixer"}\n\xff\n')
+
+    result = app.test_cli_runner().invoke(args=["import-inventory", str(path)])
+
+    assert result.exit_code == 0, result.output
+    assert "not valid UTF-8" in result.output
+    assert "consumable: 0" in result.output
@@ -0,0 +1,105 @@
+"""Tests for the secondary index plan and duplicate-name handling."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from website import db
+from website.constants import API_PREFIX, LOCATION_PREFIX, TAG_PREFIX, UserRole
+from website.models import INDEXES, Location, Tag, ensure_indexes
+
+
+@contextmanager
+def mock_current_user(role=UserRole.TA):
+    """Patch flask-login's current user lookup during a request."""
+    user = Mock()
+    user.role = role
+    user.id = 1
+    user.is_authenticated = True
+    with patch("flask_login.utils._get_user", return_value=user):
+        yield user
+
+
+def _index_names():
+    rows = db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))
+    return {row[0] for row in rows}
+
+
+def test_every_planned_index_exists(app_ctx):
+    assert {index.name for index in INDEXES} <= _index_names()
+
+
+def test_ensure_indexes_recreates_missing_index(app_ctx):
+    db.session.execute(text("DROP INDEX ix_consumable_expires"))
+    db.session.commit()
+    assert "ix_consumable_expires" not in _index_names()
+
+    assert ensure_indexes(db.engine) == []
+    assert "ix_consumable_expires" in _index_names()
+
+
+def test_tag_lookup_uses_case_insensitive_index(app_ctx):
+    plan = db.session.execute(
+        text("EXPLAIN QUERY PLAN SELECT id FROM tag WHERE lower(name) = :name"), {"name": "film"}
+    ).all()
+    assert any("uq_tag_name_lower" in row[-1] for row in plan)
+
+
+def test_tag_names_are_unique_ignoring_case(app_ctx):
+    db.session.add(Tag(name="Film"))
+    db.session.commit()
+    db.session.add(Tag(name="film"))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+
+@pytest.mark.parametrize(
+    "prefix, model",
+    [(TAG_PREFIX, Tag), (LOCATION_PREFIX, Location)],
+)
+def test_create_duplicate_name_returns_conflict(app, app_ctx, prefix, model):
+    db.session.add(model(name="Shelf"))
+    db.session.commit()
+
+    with app.test_client() as client, mock_current_user():
+        rv = client.post(f"{API_PREFIX}{prefix}/", json={"name": "SHELF"})
+
+    assert rv.status_code == 409
+    assert "message" in rv.get_json()
+    assert model.query.count() == 1
+
+
+def test_update_tag_to_existing_name_returns_conflict(app, app_ctx):
+    film = Tag(name="Film")
+    lens = Tag(name="Lens")
+    db.session.add_all([film, lens])
+    db.session.commit()
+
+    with app.test_client() as client, mock_current_user():
+        conflict = client.put(f"{API_PREFIX}{TAG_PREFIX}/{lens.id}", json={"name": "film"})
+        recase = client.put(f"{API_PREFIX}{TAG_PREFIX}/{film.id}", json={"name": "FILM"})
+
+    assert conflict.status_code == 409
+    assert recase.status_code == 200
+    assert recase.get_json()["name"] == "FILM"
+
+
+def test_item_tags_resolve_case_insensitively(app, app_ctx):
+    db.session.add(Tag(name="Film"))
+    db.session.commit()
+
+    with app.test_client() as client, mock_current_user():
+        rv = client.post(
+            f"{API_PREFIX}/consumables/",
+            json={"name": "Portra", "quantity": 2, "tags": ["film"]},
+        )
+
+    assert rv.status_code == 200, rv.get_json()
+    assert rv.get_json()["tags"] == ["Film"]
+    assert Tag.query.count() == 1
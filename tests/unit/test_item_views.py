@@ -0,0 +1,131 @@
+"""Tests for the unified /api/v1/items/all endpoint."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import event
+
+from website import db
+from website.constants import API_PREFIX, ITEM_ALL_ROUTE, ITEM_PREFIX, UserRole
+from website.models import CameraGear, Consumable, LabEquipment, Location, Tag
+
+ITEMS_URL = f"{API_PREFIX}{ITEM_PREFIX}{ITEM_ALL_ROUTE}"
+
+
+@contextmanager
+def mock_current_user(role=UserRole.STUDENT):
+    """Patch flask-login's current user lookup during a request."""
+    user = Mock()
+    user.role = role
+    user.id = 1
+    user.is_authenticated = True
+    with patch("flask_login.utils._get_user", return_value=user):
+        yield user
+
+
+@pytest.fixture
+def inventory(app_ctx):
+    now = datetime.utcnow()
+    shelf = Location(name="Shelf")
+    film = Tag(name="film")
+    darkroom = Tag(name="darkroom")
+    db.session.add_all([shelf, film, darkroom])
+    db.session.flush()
+    db.session.add_all(
+        [
+            CameraGear(name="Bravo camera", location_id=shelf.id, last_updated=now, is_checked_out=True),
+            Consumable(
+                name="Alpha film",
+                quantity=0,
+                expires=date(2030, 1, 1),
+                location_id=shelf.id,
+                last_updated=now,
+                tags=[film, darkroom],
+            ),
+            LabEquipment(name="Charlie enlarger", last_updated=now, tags=[darkroom]),
+        ]
+    )
+    db.session.commit()
+
+
+def _get(app, query=""):
+    with app.test_client() as client, mock_current_user():
+        return client.get(ITEMS_URL + query)
+
+
+def test_items_are_merged_into_one_shape(app, inventory):
+    rv = _get(app)
+    assert rv.status_code == 200
+    items = rv.get_json()["items"]
+
+    assert [(i["type"], i["name"]) for i in items] == [
+        ("consumable", "Alpha film"),
+        ("camera_gear", "Bravo camera"),
+        ("lab_equipment", "Charlie enlarger"),
+    ]
+    film, camera, enlarger = items
+    assert film["quantity"] == 0
+    assert film["expires"] == "2030-01-01"
+    assert film["location"] == "Shelf"
+    assert film["tags"] == ["darkroom", "film"]
+    assert camera["quantity"] == 1
+    assert camera["checked_out"] is True
+    assert enlarger["location"] is None
+    assert enlarger["tags"] == ["darkroom"]
+
+
+def test_items_come_from_one_statement(app, inventory):
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        # the ETag's table_version lookup is a separate, constant-cost read
+        if statement.lstrip().upper().startswith("SELECT") and "table_version" not in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        rv = _get(app, "?tag=darkroom")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+    assert len(rv.get_json()["items"]) == 2
+    assert len([s for s in statements if "UNION ALL" in s]) == 1
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("?type=lab_equipment,camera_gear", ["Bravo camera", "Charlie enlarger"]),
+        ("?checked_out=true", ["Bravo camera"]),
+        ("?location=shelf", ["Alpha film", "Bravo camera"]),
+        ("?quantity_lte=0&type=camera_gear", []),
+        ("?sort=-name", ["Charlie enlarger", "Bravo camera", "Alpha film"]),
+    ],
+)
+def test_items_filters_and_sort(app, inventory, query, expected):
+    rv = _get(app, query)
+    assert rv.status_code == 200
+    assert [i["name"] for i in rv.get_json()["items"]] == expected
+
+
+def test_items_pagination_spans_types(app, inventory):
+    seen, after = [], None
+    while True:
+        rv = _get(app, "?limit=2" + (f"&after={after}" if after else ""))
+        data = rv.get_json()
+        seen.extend((i["type"], i["id"]) for i in data["items"])
+        after = data["next_cursor"]
+        if not after:
+            break
+    assert len(seen) == 3
+    assert len(set(seen)) == 3
+
+
+@pytest.mark.parametrize("query", ["?type=spaceship", "?sort=colour", "?location_id=abc"])
+def test_items_rejects_bad_arguments(app, inventory, query):
+    assert _get(app, query).status_code == 400
@@ -0,0 +1,76 @@
+"""Tests for the orjson-backed JSON provider."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import NamedTuple
+
+import pytest
+
+from website.constants import UserRole
+from website.utils import json_provider
+from website.utils.json_provider import FastJSONProvider
+
+
+class Pair(NamedTuple):
+    left: int
+    right: int
+
+
+PAYLOAD = {
+    "when": datetime(2025, 1, 2, 3, 4, 5, 600),
+    "day": date(2025, 1, 2),
+    "role": UserRole.TA,
+    "price": Decimal("1.50"),
+    "pair": Pair(1, 2),
+    "name": "Ilford — HP5",
+}
+EXPECTED = {
+    "when": "2025-01-02T03:04:05.000600",
+    "day": "2025-01-02",
+    "role": "ta",
+    "price": "1.50",
+    "pair": [1, 2],
+    "name": "Ilford — HP5",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def provider(request, app, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson not installed")
+    return FastJSONProvider(app)
+
+
+def test_app_uses_fast_provider(app):
+    assert isinstance(app.json, FastJSONProvider)
+
+
+def test_both_backends_encode_the_same_types(provider):
+    assert json.loads(provider.dumps(PAYLOAD)) == EXPECTED
+
+
+def test_response_is_json_bytes(provider, app):
+    with app.app_context():
+        response = provider.response(PAYLOAD)
+    assert response.mimetype == "application/json"
+    assert json.loads(response.data) == EXPECTED
+
+
+def test_loads_round_trip_and_errors(provider):
+    assert provider.loads(b'{"a": [1, 2]}') == {"a": [1, 2]}
+    with pytest.raises(ValueError):
+        provider.loads("{not json")
+
+
+def test_unserializable_values_raise(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({"x": object()})
+
+
+def test_stdlib_keyword_arguments_are_honoured(provider):
+    assert provider.dumps({"b": 1, "a": 2}, sort_keys=True, indent=None) == '{"a": 2, "b": 1}'
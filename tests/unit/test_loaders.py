@@ -0,0 +1,151 @@
+"""Tests for the shared eager-loading options used by list endpoints.
+
+The list endpoints should issue a fixed number of queries regardless of
+how many rows (and related tags/locations/users) they serialize.
+"""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+from sqlalchemy import event
+
+from website import db
+from website.constants import (
+    API_PREFIX,
+    CAMERA_GEAR_ALL_ROUTE,
+    CAMERA_GEAR_PREFIX,
+    CONSUMABLES_ALL_ROUTE,
+    CONSUMABLES_PREFIX,
+    LAB_EQUIPMENT_ALL_ROUTE,
+    LAB_EQUIPMENT_PREFIX,
+    NOTES_ALL_ROUTE,
+    NOTES_PREFIX,
+    UserRole,
+)
+from website.models import (
+    CameraGear,
+    Consumable,
+    LabEquipment,
+    Location,
+    Note,
+    Tag,
+    User,
+    eager_query,
+)
+
+
+@contextmanager
+def count_queries():
+    """Count the SQL statements executed on the engine inside the block."""
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+@contextmanager
+def mock_current_user(role=UserRole.ADMIN):
+    """Patch flask-login's current user so no user query is issued."""
+    user = Mock()
+    user.role = role
+    user.id = 1
+    user.is_authenticated = True
+    with patch("flask_login.utils._get_user", return_value=user):
+        yield user
+
+
+def _seed(count, start=0):
+    """Create ``count`` rows of each item type, each with its own tag, location, user and note."""
+    now = datetime.utcnow()
+    for i in range(start, start + count):
+        user = User(first_name="U", last_name=str(i), email=f"u{i}@x.com", role=UserRole.TA)
+        location = Location(name=f"Shelf {i}")
+        tag = Tag(name=f"tag-{i}")
+        db.session.add_all([user, location, tag])
+        db.session.flush()
+
+        gear = CameraGear(
+            name=f"Gear {i}",
+            location_id=location.id,
+            last_updated=now,
+            updated_by=user.id,
+            checked_out_by=user.id,
+            is_checked_out=True,
+        )
+        consumable = Consumable(
+            name=f"Film {i}",
+            quantity=i,
+            location_id=location.id,
+            last_updated=now,
+            updated_by=user.id,
+        )
+        equipment = LabEquipment(
+            name=f"Printer {i}",
+            last_updated=now,
+            updated_by=user.id,
+            last_serviced_by=user.id,
+        )
+        db.session.add_all([gear, consumable, equipment])
+        db.session.flush()
+        gear.tags = [tag]
+        consumable.tags = [tag]
+        equipment.tags = [tag]
+        db.session.add(Note(content=f"note {i}", camera_gear_id=gear.id, created_by=user.id))
+    db.session.commit()
+
+
+def _count_for(app, url):
+    db.session.expunge_all()
+    with app.test_client() as client:
+        with mock_current_user():
+            with count_queries() as statements:
+                response = client.get(url)
+    assert response.status_code == 200
+    return len(statements)
+
+
+def test_list_query_count_is_independent_of_row_count(app, app_ctx):
+    """Serializing 10x more rows must not add queries."""
+    urls = [
+        f"{API_PREFIX}{CAMERA_GEAR_PREFIX}{CAMERA_GEAR_ALL_ROUTE}",
+        f"{API_PREFIX}{CONSUMABLES_PREFIX}{CONSUMABLES_ALL_ROUTE}",
+        f"{API_PREFIX}{LAB_EQUIPMENT_PREFIX}{LAB_EQUIPMENT_ALL_ROUTE}",
+        f"{API_PREFIX}{NOTES_PREFIX}{NOTES_ALL_ROUTE}",
+    ]
+    _seed(2)
+    small = [_count_for(app, url) for url in urls]
+    _seed(18, start=2)
+    large = [_count_for(app, url) for url in urls]
+
+    assert small == large
+    assert max(large) <= 3
+
+
+def test_eager_query_preloads_relationships(app, app_ctx):
+    """Relationships used by to_dict are populated without lazy loads."""
+    _seed(1)
+    db.session.expunge_all()
+    gear = eager_query(CameraGear).first()
+    with count_queries() as statements:
+        data = gear.to_dict()
+    assert statements == []
+    assert data["tags"] == ["tag-0"]
+    assert data["location"] == "Shelf 0"
+    assert data["checked_out_by"] == "u0@x.com"
+
+
+def test_eager_query_without_options_returns_plain_query(app, app_ctx):
+    """Models without declared loader options still get a usable query."""
+    db.session.add(Tag(name="plain"))
+    db.session.commit()
+    assert [t.name for t in eager_query(Tag).all()] == ["plain"]
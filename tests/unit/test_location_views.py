@@ -130,6 +130,19 @@ def test_create_location_requires_name(app, app_ctx):
     assert response.get_json()[MESSAGE_KEY] == LOCATION_NAME_NEEDED_MESSAGE
 
 
+def test_create_location_rejects_non_string_name(app, app_ctx):
+    """A non-string `name` is a 400, not a crash; blank names count as missing."""
+    with app.test_client() as client:
+        with mock_current_user(UserRole.TA):
+            for name in (5, ["Studio"], True):
+                response = client.post(build_url(LOCATION_CREATE_ROUTE), json={LOCATION_NAME: name})
+                assert response.status_code == ERROR_BAD_REQUEST
+            response = client.post(build_url(LOCATION_CREATE_ROUTE), json={LOCATION_NAME: "  "})
+            assert response.get_json()[MESSAGE_KEY] == LOCATION_NAME_NEEDED_MESSAGE
+
+    assert Location.query.count() == 0
+
+
 def test_update_location_changes_name(app, app_ctx):
     """PUT should rename an existing location when provided a new name."""
     location = Location(name="Old Name")
@@ -167,6 +180,23 @@ def test_update_location_requires_name(app, app_ctx):
     assert response[0][MESSAGE_KEY] == LOCATION_NAME_NEEDED_MESSAGE
 
 
+def test_update_location_rejects_non_string_name(app, app_ctx):
+    location = Location(name="Shelf")
+    db.session.add(location)
+    db.session.commit()
+
+    with app.test_request_context(
+        build_url(LOCATION_UPDATE_ROUTE, location.id),
+        method="PUT",
+        json={LOCATION_NAME: 5},
+    ):
+        with mock_current_user(UserRole.TA):
+            response = view_module.update_location(location_id=location.id)
+
+    assert response[1] == ERROR_BAD_REQUEST
+    assert db.session.get(Location, location.id).name == "Shelf"
+
+
 def test_delete_location_removes_record(app, app_ctx):
     """Deleting returns the success message and removes the row."""
     location = Location(name="To Delete")
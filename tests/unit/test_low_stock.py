@@ -0,0 +1,141 @@
+"""Tests for debounced, coalesced low-stock alerting."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import importlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from website import db
+from website.constants import API_PREFIX, CONSUMABLES_PREFIX, UserRole
+from website.models import Consumable, OutboxMessage, User
+from website.utils.low_stock import (
+    DEFAULT_COOLDOWN_SECONDS,
+    DEFAULT_DIGEST_WINDOW_SECONDS,
+    queue_low_stock_digest,
+    track_low_stock,
+)
+
+from .test_loaders import mock_current_user
+
+WINDOW = timedelta(seconds=DEFAULT_DIGEST_WINDOW_SECONDS)
+
+
+@pytest.fixture(autouse=True)
+def mail_ready(monkeypatch):
+    """Default threshold, and a mail extension so digests are queued."""
+    monkeypatch.delenv("LOW_STOCK_THRESHOLD", raising=False)
+    monkeypatch.delenv("LOW_STOCK_COOLDOWN", raising=False)
+    monkeypatch.delenv("LOW_STOCK_DIGEST_WINDOW", raising=False)
+    monkeypatch.setattr(importlib.import_module("website.utils.mail"), "mail", object())
+
+
+def _item(name="Film", quantity=10):
+    item = Consumable(name=name, quantity=quantity, last_updated=datetime.now())
+    db.session.add(item)
+    db.session.commit()
+    return item
+
+
+def _recipient():
+    db.session.add(User(first_name="T", last_name="A", email="ta@x.com", role=UserRole.TA))
+    db.session.commit()
+
+
+def test_decrementing_stock_alerts_once(app, app_ctx):
+    _recipient()
+    item = _item(quantity=10)
+    url = f"{API_PREFIX}{CONSUMABLES_PREFIX}/{item.id}"
+    with app.test_client() as client, mock_current_user():
+        for quantity in (5, 4, 3, 2, 1):
+            assert client.put(url, json={"quantity": quantity}).status_code == 200
+    # the request path queued nothing
+    assert OutboxMessage.query.count() == 0
+    item = db.session.get(Consumable, item.id)
+    assert item.low_stock_pending
+
+    assert queue_low_stock_digest(item.low_stock_since + WINDOW) == 1
+    (message,) = OutboxMessage.query.all()
+    assert f"Film (id: {item.id}): 1 left" in message.body
+    # nothing left to report
+    assert queue_low_stock_digest(datetime.now() + 2 * WINDOW) == 0
+
+
+def test_crossings_within_the_window_share_one_digest(app_ctx):
+    _recipient()
+    now = datetime.now()
+    items = [_item(f"Film {i}") for i in range(3)]
+    for offset, item in enumerate(items):
+        item.quantity = 1
+        assert track_low_stock(item, now + timedelta(seconds=offset))
+    db.session.commit()
+
+    # the window is counted from the oldest crossing
+    assert queue_low_stock_digest(now + WINDOW - timedelta(seconds=1)) == 0
+    assert queue_low_stock_digest(now + WINDOW) == 3
+    (message,) = OutboxMessage.query.all()
+    assert message.subject == "Low stock alert: 3 item(s)"
+
+
+def test_restock_before_the_digest_cancels_the_alert(app_ctx):
+    now = datetime.now()
+    item = _item()
+    item.quantity = 2
+    assert track_low_stock(item, now)
+    item.quantity = 20
+    assert not track_low_stock(item, now)
+    assert not item.low_stock_pending and item.low_stock_since is None
+    db.session.commit()
+    assert queue_low_stock_digest(now + WINDOW) == 0
+
+
+def test_cool_down_suppresses_repeat_crossings(app_ctx):
+    start = datetime.now()
+    item = _item()
+    item.quantity = 1
+    track_low_stock(item, start)
+    item.low_stock_pending, item.low_stock_alerted_at = False, start  # digested
+
+    later = start + timedelta(hours=1)
+    item.quantity = 30
+    track_low_stock(item, later)
+    item.quantity = 1
+    assert not track_low_stock(item, later)
+    assert item.low_stock_since == later
+
+    after = start + timedelta(seconds=DEFAULT_COOLDOWN_SECONDS + 1)
+    item.quantity = 30
+    track_low_stock(item, after)
+    item.quantity = 1
+    assert track_low_stock(item, after)
+
+
+def test_unreadable_quantity_is_skipped(app_ctx):
+    item = Consumable(name="Film", quantity="lots", last_updated=datetime.now())
+    assert not track_low_stock(item)
+    assert not item.low_stock_pending and item.low_stock_since is None
+    item.quantity = "2"
+    assert track_low_stock(item)
+
+
+def test_failed_digest_leaves_crossings_pending(app_ctx, monkeypatch):
+    _recipient()
+    now = datetime.now()
+    item = _item(quantity=1)
+    assert track_low_stock(item, now)
+    db.session.commit()
+
+    def broken_queue(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(importlib.import_module("website.utils.mail"), "queue_email", broken_queue)
+    with pytest.raises(RuntimeError):
+        queue_low_stock_digest(now + WINDOW)
+    # the dispatcher rolls the batch back, so the claim is undone and retried
+    db.session.rollback()
+    assert db.session.get(Consumable, item.id).low_stock_pending
+    monkeypatch.undo()
+    monkeypatch.setattr(importlib.import_module("website.utils.mail"), "mail", object())
+    assert queue_low_stock_digest(now + WINDOW) == 1
+    assert OutboxMessage.query.count() == 1
@@ -0,0 +1,148 @@
+"""Tests for MailSession connection reuse against a local SMTP stand-in."""
+
+# pylint: disable=import-error,redefined-outer-name,unused-argument,too-few-public-methods
+
+import importlib
+import os
+import socketserver
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from flask_mailman import EmailMessage
+
+from website import db
+from website.constants import UserRole
+from website.models import Consumable, LabEquipment, User
+
+# ``website.utils.mail`` is shadowed by the re-exported ``mail`` instance
+mailmod = importlib.import_module("website.utils.mail")
+
+# time the stand-in spends before greeting, standing in for connect + TLS
+HANDSHAKE_SECONDS = 0.05
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts everything, records each DATA."""
+
+    def _reply(self, line):
+        self.wfile.write(line + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(HANDSHAKE_SECONDS)
+        self._reply(b"220 stand-in ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line[:4].upper()
+            if command == b"DATA":
+                self._reply(b"354 end with .")
+                data = []
+                for body_line in iter(self.rfile.readline, b""):
+                    if body_line == b".\r\n":
+                        break
+                    data.append(body_line)
+                with server.lock:
+                    server.messages.append(b"".join(data))
+                self._reply(b"250 queued")
+            elif command == b"QUIT":
+                self._reply(b"221 bye")
+                return
+            else:
+                self._reply(b"250 ok")
+
+
+class StandInSMTP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = []
+
+
+@pytest.fixture
+def smtp_server(app, monkeypatch):
+    """Point the app's mail settings at a stand-in SMTP server."""
+    server = StandInSMTP()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    state = app.extensions["mailman"]
+    monkeypatch.setattr(mailmod.mail, "app", app)
+    for name, value in {
+        "backend": "smtp",
+        "server": "127.0.0.1",
+        "port": server.server_address[1],
+        "use_tls": False,
+        "use_ssl": False,
+        "username": None,
+        "default_sender": "lab@example.com",
+    }.items():
+        monkeypatch.setattr(state, name, value)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _messages(count):
+    return [EmailMessage(subject=f"m{i}", body="body", to=["ta@x.com"]) for i in range(count)]
+
+
+def test_session_sends_every_message_over_one_connection(app_ctx, smtp_server):
+    started = time.perf_counter()
+    with mailmod.MailSession() as session:
+        for message in _messages(10):
+            session.send(message)
+        assert session.send_messages(_messages(5)) == 5
+    elapsed = time.perf_counter() - started
+    assert session.sent == 15
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 15
+    # one handshake for the job, not one per message
+    assert elapsed < 5 * HANDSHAKE_SECONDS
+
+
+def test_messages_sent_alone_connect_each_time(app_ctx, smtp_server):
+    started = time.perf_counter()
+    for message in _messages(5):
+        message.send()
+    assert time.perf_counter() - started >= 5 * HANDSHAKE_SECONDS
+    assert smtp_server.connections == 5
+
+
+def test_session_with_nothing_to_send_never_connects(app_ctx, smtp_server):
+    with mailmod.MailSession() as session:
+        assert session.send_messages([]) == 0
+    assert smtp_server.connections == 0
+
+
+def test_weekly_task_shares_one_connection(app, app_ctx, smtp_server, monkeypatch):
+    db.session.add_all(
+        [
+            User(first_name="T", last_name="A", email="ta@x.com", role=UserRole.TA),
+            Consumable(name="Film", quantity=2, expires=date.today(), last_updated=datetime.now()),
+            LabEquipment(
+                name="Scope",
+                last_updated=datetime.now(),
+                last_serviced_on=date.today() - timedelta(days=60),
+                service_frequency="monthly",
+            ),
+        ]
+    )
+    db.session.commit()
+    monkeypatch.setitem(os.environ, "WEEKLY_TASK_TOKEN", "token")
+    response = app.test_client().post(
+        "/internal/tasks/weekly-expirations", headers={"X-Task-Token": "token"}
+    )
+    assert response.status_code == 202
+    app.extensions["job_runner"].wait(response.get_json()["id"], timeout=10)
+    # the steps run concurrently but share the run's connection
+    assert smtp_server.connections == 1
+    assert len(smtp_server.messages) == 2
@@ -0,0 +1,88 @@
+"""Tests for the schema migrations and the startup version check."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import importlib
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateIndex
+
+from website import create_app, db
+from website.migrations import current_version, head_version, load_migrations, upgrade
+from website.models import INDEXES
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_migrations_build_the_model_schema(engine):
+    """A database built by migrations matches the models."""
+    assert current_version(engine) == 0
+    applied = upgrade(engine)
+    assert [m.version for m in applied] == list(range(1, head_version() + 1))
+    assert current_version(engine) == head_version()
+
+    inspector = inspect(engine)
+    for table in db.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert columns == set(table.columns.keys()), table.name
+    with engine.connect() as connection:
+        index_names = set(
+            connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars()
+        )
+    planned = {index.name for table in db.metadata.tables.values() for index in table.indexes}
+    assert planned | {index.name for index in INDEXES} <= index_names
+    assert "search_index" in inspector.get_table_names()
+
+    assert upgrade(engine) == []
+
+
+def test_upgrade_adopts_a_create_all_database(engine):
+    """Databases created before migrations existed are brought up to date."""
+    db.metadata.create_all(engine)
+    upgrade(engine, target=1)
+    assert current_version(engine) == 1
+    upgrade(engine)
+    assert current_version(engine) == head_version()
+
+
+def test_index_migration_copies_the_index_plan(engine):
+    """0002 creates its own copies of the indexes; they match the plan."""
+    migration = importlib.import_module("website.migrations.versions.0002_secondary_indexes")
+
+    def ddl(indexes):
+        return {str(CreateIndex(index).compile(dialect=engine.dialect)) for index in indexes}
+
+    assert ddl(migration.INDEXES) == ddl(INDEXES)
+
+
+def test_migrations_are_numbered_and_described():
+    migrations = load_migrations()
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+    assert all(m.description for m in migrations)
+
+
+def test_startup_only_reads_the_version(engine, monkeypatch):
+    """An up to date database costs one query at startup, whatever its size."""
+    upgrade(engine)
+    monkeypatch.setenv("SQLALCHEMY_DATABASE_URI", str(engine.url))
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", _before)
+    try:
+        app = create_app()
+    finally:
+        event.remove(Engine, "before_cursor_execute", _before)
+    assert len(statements) == 1
+    assert "schema_version" in statements[0]
+    with app.app_context():
+        db.engine.dispose()
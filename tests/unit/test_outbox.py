@@ -0,0 +1,185 @@
+"""Tests for the transactional mail outbox and its dispatcher."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument,too-few-public-methods
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from website import db
+from website.models import OUTBOX_FAILED, OUTBOX_PENDING, OUTBOX_SENT, OutboxMessage
+from website.utils import outbox
+from website.utils.outbox import CircuitBreaker, backoff_seconds, dispatch_batch, init_mail_dispatcher
+
+
+class FakeConnection:
+    """Records what a dispatcher does with its one SMTP connection."""
+
+    def __init__(self, fail_on=(), fail_open=False):
+        self.fail_on = set(fail_on)
+        self.fail_open = fail_open
+        self.opened = 0
+        self.closed = 0
+        self.sent = []
+
+    def open(self):
+        if self.fail_open:
+            raise ConnectionRefusedError("no server")
+        self.opened += 1
+
+    def close(self):
+        self.closed += 1
+
+
+class FakeMail:
+    def __init__(self, connection):
+        self.connection = connection
+        self.connections = 0
+
+    def get_connection(self, fail_silently=False):
+        self.connections += 1
+        return self.connection
+
+
+class FakeEmail:
+    def __init__(self, subject=None, body=None, to=None, connection=None):
+        self.subject, self.to, self.connection = subject, to, connection
+
+    def send(self):
+        if self.subject in self.connection.fail_on:
+            raise OSError("rejected")
+        self.connection.sent.append(self.subject)
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    connection = FakeConnection()
+    fake = FakeMail(connection)
+    monkeypatch.setattr(outbox.mail_module, "mail", fake)
+    monkeypatch.setattr(outbox.mail_module, "EmailMessage", FakeEmail)
+    return fake
+
+
+def _queue(*subjects):
+    for subject in subjects:
+        outbox.mail_module.queue_email(subject, ["ta@x.com"], "body")
+    db.session.commit()
+
+
+def _statuses():
+    return {m.subject: m.status for m in OutboxMessage.query.order_by(OutboxMessage.id)}
+
+
+def test_batch_is_sent_over_one_connection(app_ctx, smtp):
+    _queue("a", "b", "c")
+    assert dispatch_batch() == {"sent": 3, "retried": 0, "failed": 0}
+    assert smtp.connections == 1 and smtp.connection.closed == 1
+    assert smtp.connection.sent == ["a", "b", "c"]
+    assert set(_statuses().values()) == {OUTBOX_SENT}
+    # nothing is due any more
+    assert dispatch_batch() == {"sent": 0, "retried": 0, "failed": 0}
+
+
+def test_failure_backs_off_then_gives_up(app_ctx, smtp):
+    smtp.connection.fail_on = {"bad"}
+    _queue("bad", "good")
+    assert dispatch_batch() == {"sent": 1, "retried": 1, "failed": 0}
+    bad = OutboxMessage.query.filter_by(subject="bad").one()
+    assert bad.status == OUTBOX_PENDING and bad.attempts == 1
+    assert bad.next_attempt_at > datetime.now() + timedelta(seconds=backoff_seconds(1) - 5)
+    assert "rejected" in bad.last_error
+
+    # not due until the backoff passes
+    assert dispatch_batch()["retried"] == 0
+    bad.attempts = outbox.OUTBOX_MAX_ATTEMPTS - 1
+    bad.next_attempt_at = datetime.now()
+    db.session.commit()
+    assert dispatch_batch() == {"sent": 0, "retried": 0, "failed": 1}
+    assert _statuses() == {"bad": OUTBOX_FAILED, "good": OUTBOX_SENT}
+
+
+def test_breaker_stops_sending_and_releases_the_rest(app_ctx, smtp):
+    smtp.connection.fail_on = {"a", "b"}
+    _queue("a", "b", "c")
+    breaker = CircuitBreaker(failures=2, reset_after=60)
+    assert dispatch_batch(breaker) == {"sent": 0, "retried": 2, "failed": 0}
+    assert breaker.is_open
+    c = OutboxMessage.query.filter_by(subject="c").one()
+    # released untried: no attempt counted, due immediately
+    assert c.attempts == 0 and c.next_attempt_at <= datetime.now()
+    # an open breaker doesn't even connect
+    assert dispatch_batch(breaker) == {"sent": 0, "retried": 0, "failed": 0}
+    assert smtp.connections == 1
+
+
+def test_unreachable_server_retries_the_whole_batch(app_ctx, smtp):
+    smtp.connection.fail_open = True
+    _queue("a", "b")
+    breaker = CircuitBreaker(failures=1)
+    assert dispatch_batch(breaker) == {"sent": 0, "retried": 2, "failed": 0}
+    assert breaker.is_open
+    assert {m.attempts for m in OutboxMessage.query} == {1}
+
+
+def test_claimed_messages_are_not_sent_twice(app_ctx, smtp):
+    _queue("a")
+    now = datetime.now()
+    assert len(outbox._claim(now, 10)) == 1  # pylint: disable=protected-access
+    # a second dispatcher sees the lease and claims nothing
+    assert outbox._claim(now, 10) == []  # pylint: disable=protected-access
+
+
+def test_rollback_discards_queued_mail(app_ctx, smtp):
+    outbox.mail_module.queue_email("lost", ["ta@x.com"], "body")
+    assert db.session.info.get(outbox.mail_module.MAIL_QUEUED_KEY)
+    db.session.rollback()
+    assert OutboxMessage.query.count() == 0
+    assert outbox.mail_module.MAIL_QUEUED_KEY not in db.session.info
+
+
+def test_commit_wakes_the_dispatcher(app, app_ctx, smtp):
+    woken = []
+    app.extensions["mail_dispatcher"] = type("Waker", (), {"wake": lambda self: woken.append(1)})()
+    try:
+        outbox.mail_module.queue_email("hello", ["ta@x.com"], "body")
+        assert woken == []
+        db.session.commit()
+    finally:
+        del app.extensions["mail_dispatcher"]
+    # nothing was sent inline; the commit only woke the dispatcher
+    assert woken == [1] and smtp.connections == 0
+
+
+def test_dispatcher_starts_with_the_first_request(monkeypatch):
+    running = threading.Event()
+
+    def fake_run(app, stop, wake, breaker, poll):
+        running.set()
+        stop.wait()
+
+    monkeypatch.setattr(outbox, "run_dispatcher", fake_run)
+    web = Flask(__name__)
+    web.config["MAIL_SERVER"] = "smtp.example.com"
+    web.add_url_rule("/", "index", lambda: "ok")
+    dispatcher = init_mail_dispatcher(web)
+    try:
+        # creating the app (as every CLI command does) starts nothing
+        assert not dispatcher.started and not running.is_set()
+        assert web.test_client().get("/").status_code == 200
+        assert running.wait(5)
+    finally:
+        dispatcher.stop()
+
+
+def test_mail_worker_refuses_next_to_an_in_process_dispatcher(app, app_ctx, smtp):
+    app.extensions["mail_dispatcher"] = object()
+    try:
+        result = app.test_cli_runner().invoke(args=["mail-worker", "--once"])
+    finally:
+        del app.extensions["mail_dispatcher"]
+    assert result.exit_code != 0
+    assert "MAIL_DISPATCHER=off" in result.output
+    assert smtp.connections == 0
+    assert app.test_cli_runner().invoke(args=["mail-worker", "--once"]).exit_code == 0
@@ -0,0 +1,157 @@
+"""Tests for keyset pagination on the list endpoints."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from website import db
+from website.constants import (
+    API_PREFIX,
+    CONSUMABLES_ALL_ROUTE,
+    CONSUMABLES_PREFIX,
+    TAG_ALL_ROUTE,
+    TAG_PREFIX,
+    UserRole,
+)
+from website.models import Consumable, Tag
+from website.utils.pagination import (
+    PaginationError,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+    parse_page_args,
+    sort_keys,
+)
+
+
+@contextmanager
+def mock_current_user(role=UserRole.TA):
+    """Patch flask-login's current user lookup during a request."""
+    user = Mock()
+    user.role = role
+    user.id = 1
+    user.is_authenticated = True
+    with patch("flask_login.utils._get_user", return_value=user):
+        yield user
+
+
+def _walk(client, url, limit):
+    """Follow next_cursor links and return the pages' contents."""
+    pages = []
+    after = None
+    while True:
+        query = f"?limit={limit}" + (f"&after={after}" if after else "")
+        rv = client.get(url + query)
+        assert rv.status_code == 200
+        data = rv.get_json()
+        pages.append(data)
+        after = data["next_cursor"]
+        if not after:
+            return pages
+
+
+def test_cursor_round_trip():
+    values = ["Film", 12, date(2025, 1, 2), None]
+    assert decode_cursor(encode_cursor(values)) == ["Film", 12, "2025-01-02", None]
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(PaginationError):
+        decode_cursor("not a cursor!")
+
+
+@pytest.mark.parametrize(
+    "args",
+    [{"limit": "abc"}, {"limit": "0"}, {"limit": "100000"}, {"after": "abc"}],
+)
+def test_parse_page_args_rejects_invalid(args):
+    with pytest.raises(PaginationError):
+        parse_page_args(args)
+
+
+def test_parse_page_args_defaults_to_unpaginated():
+    assert parse_page_args({}) == (None, None)
+
+
+def test_items_are_paged_in_name_then_id_order(app, app_ctx):
+    # duplicate names exercise the id tie-breaker
+    now = datetime.utcnow()
+    for name in ["c", "a", "b", "a", "d", "b", "e"]:
+        db.session.add(Consumable(name=name, quantity=1, last_updated=now))
+    db.session.commit()
+    expected = [(c.name, c.id) for c in Consumable.query.order_by(Consumable.name, Consumable.id)]
+
+    with app.test_client() as client, mock_current_user():
+        pages = _walk(client, f"{API_PREFIX}{CONSUMABLES_PREFIX}{CONSUMABLES_ALL_ROUTE}", limit=3)
+
+    assert [len(p["consumables"]) for p in pages] == [3, 3, 1]
+    seen = [(c["name"], c["id"]) for p in pages for c in p["consumables"]]
+    assert seen == expected
+
+
+def test_tags_are_paged_in_name_order(app, app_ctx):
+    for name in ["c", "a", "b", "d", "e"]:
+        db.session.add(Tag(name=name))
+    db.session.commit()
+
+    with app.test_client() as client, mock_current_user():
+        pages = _walk(client, f"{API_PREFIX}{TAG_PREFIX}{TAG_ALL_ROUTE}", limit=3)
+
+    assert [[t["name"] for t in p["tags"]] for p in pages] == [["a", "b", "c"], ["d", "e"]]
+
+
+def test_unpaginated_request_returns_everything(app, app_ctx):
+    for name in ["x", "y"]:
+        db.session.add(Tag(name=name))
+    db.session.commit()
+
+    with app.test_client() as client, mock_current_user():
+        rv = client.get(f"{API_PREFIX}{TAG_PREFIX}{TAG_ALL_ROUTE}")
+
+    data = rv.get_json()
+    assert len(data["tags"]) == 2
+    assert data["next_cursor"] is None
+
+
+def test_invalid_cursor_returns_bad_request(app, app_ctx):
+    with app.test_client() as client, mock_current_user():
+        rv = client.get(f"{API_PREFIX}{CONSUMABLES_PREFIX}{CONSUMABLES_ALL_ROUTE}?limit=2&after=zzz")
+    assert rv.status_code == 400
+
+
+def test_nullable_sort_key_pages_nulls_last(app, app_ctx):
+    today = date.today()
+    now = datetime.utcnow()
+    for i, expires in enumerate([None, today + timedelta(days=2), None, today, today]):
+        db.session.add(Consumable(name=f"c{i}", quantity=1, expires=expires, last_updated=now))
+    db.session.commit()
+
+    keys = sort_keys(Consumable.expires) + [(Consumable.id, False)]
+    seen = []
+    after = None
+    while True:
+        rows, after = keyset_paginate(Consumable.query, keys, 2, after)
+        seen.extend(rows)
+        if not after:
+            break
+
+    assert [c.expires for c in seen] == [today, today, today + timedelta(days=2), None, None]
+    assert len({c.id for c in seen}) == 5
+
+
+def test_descending_sort_key(app, app_ctx):
+    now = datetime.utcnow()
+    for i in range(5):
+        db.session.add(Consumable(name=f"n{i}", quantity=i, last_updated=now))
+    db.session.commit()
+
+    keys = sort_keys(Consumable.quantity, descending=True) + [(Consumable.id, False)]
+    first, cursor = keyset_paginate(Consumable.query, keys, 3)
+    second, cursor2 = keyset_paginate(Consumable.query, keys, 3, cursor)
+
+    assert [c.quantity for c in first + second] == [4, 3, 2, 1, 0]
+    assert cursor2 is None
@@ -0,0 +1,142 @@
+"""Tests for the column projections behind the item list endpoints."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from datetime import date, datetime
+
+from website import db
+from website.constants import (
+    API_PREFIX,
+    CAMERA_GEAR_ALL_ROUTE,
+    CAMERA_GEAR_PREFIX,
+    CONSUMABLES_ALL_ROUTE,
+    CONSUMABLES_PREFIX,
+    UserRole,
+)
+from website.models import CameraGear, Consumable, LabEquipment, Location, Tag, User
+from website.utils import apply_filters, projected_query, serialize_row
+
+from .test_loaders import count_queries, mock_current_user
+
+MODELS = (CameraGear, Consumable, LabEquipment)
+
+
+def _seed():
+    """Create one fully populated and one sparse row of each item type."""
+    now = datetime(2024, 5, 1, 12, 30)
+    user = User(first_name="A", last_name="B", email="a@x.com", role=UserRole.TA)
+    other = User(first_name="C", last_name="D", email="c@x.com", role=UserRole.TA)
+    location = Location(name="Cabinet")
+    tags = [Tag(name="lens"), Tag(name="Canon")]
+    db.session.add_all([user, other, location, *tags])
+    db.session.flush()
+    db.session.add_all(
+        [
+            CameraGear(
+                name="R5",
+                location_id=location.id,
+                last_updated=now,
+                updated_by=user.id,
+                is_checked_out=True,
+                checked_out_by=other.id,
+                checked_out_date=now,
+                return_date=now,
+                tags=tags,
+            ),
+            CameraGear(name="Bare", last_updated=now),
+            Consumable(
+                name="Film",
+                quantity=4,
+                location_id=location.id,
+                expires=date(2025, 1, 1),
+                last_updated=now,
+                updated_by=user.id,
+                tags=tags[:1],
+            ),
+            Consumable(name="Tape", quantity=0, last_updated=now),
+            LabEquipment(
+                name="Printer",
+                last_updated=now,
+                updated_by=user.id,
+                last_serviced_on=date(2024, 4, 1),
+                last_serviced_by=other.id,
+                service_frequency="Monthly",
+                tags=tags,
+            ),
+            LabEquipment(name="Scope", last_updated=now),
+        ]
+    )
+    db.session.commit()
+
+
+def _normalized(item):
+    return {**item, "tags": sorted(item["tags"])}
+
+
+def test_projection_matches_to_dict(app, app_ctx):
+    """Every projected row serializes exactly like the ORM object."""
+    _seed()
+    for model in MODELS:
+        expected = {obj.id: _normalized(obj.to_dict()) for obj in model.query.all()}
+        serialize = serialize_row(model)
+        rows = projected_query(model).all()
+        actual = {item["id"]: _normalized(item) for item in map(serialize, rows)}
+        assert actual == expected
+        # key order is part of the response shape
+        for item in map(serialize, rows):
+            assert list(item) == list(db.session.get(model, item["id"]).to_dict())
+
+
+def test_missing_updater_matches_to_dict(app, app_ctx):
+    """An ``updated_by`` pointing at no user serializes like ``to_dict()``."""
+    _seed()
+    missing = db.session.query(db.func.max(User.id)).scalar() + 100
+    for model in MODELS:
+        model.query.update({model.updated_by: missing})
+    db.session.commit()
+    for model in MODELS:
+        serialize = serialize_row(model)
+        for row in projected_query(model).all():
+            item = serialize(row)
+            expected = db.session.get(model, item["id"]).to_dict()
+            assert item["updated_by"] == expected["updated_by"]
+    assert Consumable.query.first().to_dict()["updated_by"] == missing
+
+
+def test_projection_accepts_filters(app, app_ctx):
+    """Relationship filters still apply alongside the projection's joins."""
+    _seed()
+    query = apply_filters(
+        projected_query(CameraGear), CameraGear, {"location": "cab", "tag": "lens"}
+    )
+    assert [serialize_row(CameraGear)(row)["name"] for row in query.all()] == ["R5"]
+
+
+def test_list_endpoint_is_a_single_statement(app, app_ctx):
+    """A list page is one SELECT besides the ETag version lookup."""
+    _seed()
+    db.session.expunge_all()
+    url = f"{API_PREFIX}{CAMERA_GEAR_PREFIX}{CAMERA_GEAR_ALL_ROUTE}?limit=1"
+    with app.test_client() as client, mock_current_user():
+        with count_queries() as statements:
+            response = client.get(url)
+        assert response.status_code == 200
+        rows = [s for s in statements if "table_version" not in s]
+        assert len(rows) == 1
+
+        body = response.get_json()
+        assert [item["name"] for item in body["camera_gear"]] == ["Bare"]
+        response = client.get(f"{url}&after={body['next_cursor']}")
+        assert [item["name"] for item in response.get_json()["camera_gear"]] == ["R5"]
+
+
+def test_list_endpoint_reports_location_and_tags(app, app_ctx):
+    """Joined and aggregated columns come through the endpoint."""
+    _seed()
+    url = f"{API_PREFIX}{CONSUMABLES_PREFIX}{CONSUMABLES_ALL_ROUTE}?sort=-quantity"
+    with app.test_client() as client, mock_current_user():
+        items = client.get(url).get_json()["consumables"]
+    assert [(i["name"], i["location"], i["tags"]) for i in items] == [
+        ("Film", "Cabinet", ["lens"]),
+        ("Tape", None, []),
+    ]
@@ -0,0 +1,115 @@
+"""Tests for the full-text search index and the search endpoint."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from website import db
+from website.constants import API_PREFIX, SEARCH_PREFIX, SEARCH_ROUTE, UserRole
+from website.models import CameraGear, Consumable, Location, Note, Tag
+from website.utils.search import SearchError, search
+
+SEARCH_URL = f"{API_PREFIX}{SEARCH_PREFIX}{SEARCH_ROUTE}"
+
+
+@contextmanager
+def mock_current_user(role=UserRole.STUDENT):
+    """Patch flask-login's current user lookup during a request."""
+    user = Mock()
+    user.role = role
+    user.id = 1
+    user.is_authenticated = True
+    with patch("flask_login.utils._get_user", return_value=user):
+        yield user
+
+
+def _hits(query, **kwargs):
+    return [(r["type"], r["text"]) for r in search(query, **kwargs)]
+
+
+@pytest.fixture
+def catalog(app_ctx):
+    """Seed one record of each searchable kind."""
+    now = datetime.utcnow()
+    shelf = Location(name="Darkroom Shelf")
+    film = Tag(name="Film")
+    canon = CameraGear(name="Canon AE-1", last_updated=now)
+    portra = Consumable(name="Portra 400 film", quantity=5, last_updated=now)
+    db.session.add_all([shelf, film, canon, portra])
+    db.session.flush()
+    note = Note(content="Shutter sticks on the Canon", camera_gear_id=canon.id, created_by=1,
+                created_at=now, updated_at=now)
+    db.session.add(note)
+    db.session.commit()
+    return {"canon": canon, "portra": portra, "note": note, "film": film}
+
+
+def test_search_covers_every_kind(catalog):
+    assert set(_hits("canon")) == {
+        ("camera_gear", "Canon AE-1"),
+        ("note", "Shutter sticks on the Canon"),
+    }
+    assert ("location", "Darkroom Shelf") in _hits("darkroom")
+    assert set(_hits("film")) == {("tag", "Film"), ("consumable", "Portra 400 film")}
+
+
+def test_search_ranks_and_matches_prefixes(catalog):
+    # the shorter document containing the term ranks higher
+    assert _hits("film")[0] == ("tag", "Film")
+    assert _hits("port") == [("consumable", "Portra 400 film")]
+    assert _hits("canon shut") == [("note", "Shutter sticks on the Canon")]
+    assert _hits("canon", kinds=["note"]) == [("note", "Shutter sticks on the Canon")]
+
+
+def test_search_index_follows_updates_and_deletes(catalog):
+    catalog["canon"].name = "Nikon FM2"
+    db.session.commit()
+    assert _hits("canon") == [("note", "Shutter sticks on the Canon")]
+    assert _hits("nikon") == [("camera_gear", "Nikon FM2")]
+
+    db.session.delete(catalog["note"])
+    db.session.commit()
+    assert _hits("canon") == []
+
+
+def test_search_index_rolls_back_with_the_session(catalog):
+    db.session.add(Tag(name="Medium format"))
+    db.session.flush()
+    assert _hits("medium") == [("tag", "Medium format")]
+    db.session.rollback()
+    assert _hits("medium") == []
+
+
+def test_search_index_survives_bulk_delete(catalog):
+    Tag.query.filter_by(name="Film").delete()
+    db.session.commit()
+    assert _hits("film") == [("consumable", "Portra 400 film")]
+
+
+def test_search_rejects_bad_queries(app_ctx):
+    with pytest.raises(SearchError):
+        search('"*')
+    with pytest.raises(SearchError):
+        search("canon", kinds=["users"])
+
+
+def test_search_endpoint(app, catalog):
+    with app.test_client() as client, mock_current_user():
+        rv = client.get(f"{SEARCH_URL}?q=canon&type=camera_gear")
+        bad = client.get(f"{SEARCH_URL}?q=")
+        bad_limit = client.get(f"{SEARCH_URL}?q=canon&limit=0")
+    assert rv.status_code == 200
+    results = rv.get_json()["results"]
+    assert [(r["type"], r["id"]) for r in results] == [("camera_gear", catalog["canon"].id)]
+    assert bad.status_code == 400
+    assert bad_limit.status_code == 400
+
+
+def test_search_endpoint_requires_approved_user(app, app_ctx):
+    with app.test_client() as client, mock_current_user(role=UserRole.INVALID):
+        rv = client.get(f"{SEARCH_URL}?q=canon")
+    assert rv.status_code == 403
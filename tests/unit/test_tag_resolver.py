@@ -0,0 +1,99 @@
+"""Tests for the shared set-based tag resolver."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+from sqlalchemy import event
+
+from website import db
+from website.constants import API_PREFIX, CAMERA_GEAR_PREFIX, UserRole
+from website.models import CameraGear, Tag
+from website.utils import tags as tag_utils
+from website.utils.search import search
+from website.utils.tags import resolve_tags
+
+
+@contextmanager
+def count_statements():
+    """Collect the SQL statements executed inside the block."""
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+
+
+@contextmanager
+def mock_current_user(role=UserRole.TA):
+    """Patch flask-login's current user lookup during a request."""
+    user = Mock()
+    user.role = role
+    user.id = 1
+    user.is_authenticated = True
+    with patch("flask_login.utils._get_user", return_value=user):
+        yield user
+
+
+def test_resolve_tags_dedupes_and_keeps_existing_casing(app_ctx):
+    db.session.add(Tag(name="Film"))
+    db.session.commit()
+
+    tags = resolve_tags(["film", " Lens ", "FILM", "", None, "lens"])
+
+    assert [t.name for t in tags] == ["Film", "Lens"]
+    assert all(t.id is not None for t in tags)
+    assert resolve_tags([]) == []
+
+
+def test_resolve_tags_uses_constant_number_of_statements(app_ctx):
+    db.session.add_all([Tag(name=f"tag{i}") for i in range(10)])
+    db.session.commit()
+    names = [f"TAG{i}" for i in range(20)]
+
+    with count_statements() as statements:
+        tags = resolve_tags(names)
+
+    assert len(tags) == 20
+    # one SELECT for existing tags, one multi-row upsert for the rest, one
+    # batched write of the new names to the search index and one bump of
+    # the tag table's change counter
+    assert len(statements) == 4
+    assert Tag.query.count() == 20
+
+
+def test_resolve_tags_reads_rows_created_concurrently(app_ctx, patcher):
+    db.session.add(Tag(name="Film"))
+    db.session.commit()
+    real_fetch = tag_utils._fetch  # pylint: disable=protected-access
+    calls = []
+
+    def stale_first_fetch(keys, model=Tag):
+        calls.append(keys)
+        # the first lookup misses "film", as if another request created it meanwhile
+        return {} if len(calls) == 1 else real_fetch(keys, model=model)
+
+    patcher(tag_utils, "_fetch", stale_first_fetch)
+    tags = resolve_tags(["film", "lens"])
+
+    assert sorted(t.name for t in tags) == ["Film", "lens"]
+    assert Tag.query.count() == 2
+
+
+def test_new_tags_are_searchable_and_committed_with_the_item(app, app_ctx):
+    with app.test_client() as client, mock_current_user():
+        rv = client.post(
+            f"{API_PREFIX}{CAMERA_GEAR_PREFIX}/",
+            json={"name": "Leica M6", "tags": ["Rangefinder", "rangefinder", "35mm"]},
+        )
+
+    assert rv.status_code == 200, rv.get_json()
+    assert rv.get_json()["tags"] == ["Rangefinder", "35mm"]
+    assert [t.name for t in CameraGear.query.one().tags] == ["Rangefinder", "35mm"]
+    assert [r["text"] for r in search("rangefinder", kinds=["tag"])] == ["Rangefinder"]
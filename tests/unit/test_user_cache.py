@@ -0,0 +1,83 @@
+"""Tests for the per-process cache behind flask-login's user loader."""
+
+# pylint: disable=import-error,wrong-import-position,redefined-outer-name,unused-argument
+
+import time
+
+from website import db
+from website.constants import HOME_PREFIX, LAB_EQUIPMENT_ROUTE, UserRole
+from website.models import User
+from website.utils.user_cache import CachedUser, UserCache, load_cached_user
+
+from .test_loaders import count_queries
+
+
+def _user(role=UserRole.STUDENT, email="s@x.com"):
+    user = User(first_name="S", last_name="T", email=email, role=role)
+    user.save()
+    return user
+
+
+def test_template_route_needs_no_queries_once_cached(app, app_ctx):
+    """After the first request the user comes from the cache."""
+    user_id = _user().id
+    url = f"{HOME_PREFIX}{LAB_EQUIPMENT_ROUTE}"
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(user_id)
+        assert client.get(url).status_code == 200
+        with count_queries() as statements:
+            response = client.get(url)
+    assert response.status_code == 200
+    assert statements == []
+
+
+def test_saving_a_user_invalidates_it(app, app_ctx):
+    """A committed role change is seen by the next load."""
+    user = _user()
+    assert load_cached_user(user.id).role == UserRole.STUDENT
+    user.role = UserRole.ADMIN
+    user.save()
+    assert load_cached_user(user.id).role == UserRole.ADMIN
+
+
+def test_role_endpoint_invalidates_target(app, app_ctx):
+    """``make_ta`` drops the promoted user's cached role."""
+    admin = _user(UserRole.ADMIN, "a@x.com")
+    student = _user()
+    assert load_cached_user(student.id).role == UserRole.STUDENT
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(admin.id)
+        assert client.post(f"/admin/users/to-ta/{student.id}").status_code == 200
+    assert load_cached_user(student.id).role == UserRole.TA
+
+
+def test_rollback_keeps_and_bulk_delete_drops_entries(app, app_ctx):
+    """A rolled back change keeps the entry; a bulk delete drops every entry."""
+    user = _user()
+    load_cached_user(user.id)
+    user.role = UserRole.ADMIN
+    db.session.flush()
+    db.session.rollback()
+    assert load_cached_user(user.id).role == UserRole.STUDENT
+
+    User.query.delete()
+    db.session.commit()
+    assert load_cached_user(user.id) is None
+
+
+def test_cache_is_bounded_and_expires():
+    """Entries expire after the TTL and the oldest are evicted past the size."""
+    def snapshot(user_id):
+        return CachedUser(
+            id=user_id, first_name="A", last_name="B", email="e", profile_picture=None, role=None
+        )
+
+    cache = UserCache(ttl=0.05, size=2)
+    for user_id in (1, 2, 3):
+        cache.put(snapshot(user_id))
+    assert cache.get(1) is None
+    assert cache.get(3).id == 3
+    time.sleep(0.06)
+    assert cache.get(3) is None
@@ -27,6 +27,10 @@ from .views import (
     consumables_blueprint,
     tasks_blueprint,
     notes_blueprint,
+    search_blueprint,
+    import_blueprint,
+    items_blueprint,
+    events_blueprint,
 )
 from .constants import (
     ADMIN_PREFIX,
@@ -46,6 +50,10 @@ from .constants import (
     UNAUTHORIZED_TEMPLATE,
     CONSUMABLES_PREFIX,
     NOTES_PREFIX,
+    SEARCH_PREFIX,
+    IMPORT_PREFIX,
+    ITEM_PREFIX,
+    EVENTS_PREFIX,
 )
 
 load_dotenv()
@@ -53,6 +61,10 @@ load_dotenv()
 def create_app():
     app = Flask(__name__)
 
+    from .utils.json_provider import FastJSONProvider
+
+    app.json = FastJSONProvider(app)
+
     app.secret_key = os.getenv(SECRET_KEY)
 
     if not app.secret_key:
@@ -72,19 +84,27 @@ def create_app():
     # Keep the SQLAlchemy option as a boolean-like environment value if present.
     app.config[SQLALCHEMY_TRACK_MODIFICATIONS] = os.getenv(SQLALCHEMY_TRACK_MODIFICATIONS)
 
+    # Pool sizing, pre-ping and timeouts come from DB_* environment values.
+    from .utils.engine import configure_engine
+
+    configure_engine(app, cloud=bool(os.environ.get("CLOUD")))
+
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = AUTH_PREFIX
     login_manager.login_message = None
 
+    from .utils.user_cache import load_cached_user
+
 
     @login_manager.user_loader
     def load_user(user_id):
         """Load a user by ID for flask-login.
 
-        Returns ``None`` when the user isn't found.
+        Returns ``None`` when the user isn't found. Users are served from
+        a short-lived per-process cache, so most requests skip the query.
         """
-        return User.query.get(int(user_id))
+        return load_cached_user(int(user_id))
 
 
     db.init_app(app)
@@ -92,6 +112,8 @@ def create_app():
     # Mail configuration - read common mail-related env vars. If not present, Mail initialization will still
     # occur but sending will be a no-op until valid settings are provided in env.
     app.config["MAIL_SERVER"] = os.getenv("MAIL_SERVER")
+    # "smtp" unless set; "locmem" keeps messages in memory (tests)
+    app.config["MAIL_BACKEND"] = os.getenv("MAIL_BACKEND")
     _mail_port = os.getenv("MAIL_PORT")
     app.config["MAIL_PORT"] = int(_mail_port) if _mail_port else None
     app.config["MAIL_USERNAME"] = os.getenv("MAIL_USERNAME")
@@ -105,6 +127,9 @@ def create_app():
     app.config["MAIL_USE_TLS"] = _mail_tls in ("1", "true", "yes")
     _mail_ssl = os.getenv("MAIL_USE_SSL", "False").lower()
     app.config["MAIL_USE_SSL"] = _mail_ssl in ("1", "true", "yes")
+    # "thread" sends queued mail from each web process, "off" leaves it
+    # to "flask mail-worker".
+    app.config["MAIL_DISPATCHER"] = os.getenv("MAIL_DISPATCHER", "thread")
 
     init_oauth(app)
 
@@ -136,6 +161,10 @@ def create_app():
     app.register_blueprint(location_blueprint, url_prefix=API_PREFIX + LOCATION_PREFIX)
     app.register_blueprint(tasks_blueprint)
     app.register_blueprint(notes_blueprint, url_prefix=API_PREFIX + NOTES_PREFIX)
+    app.register_blueprint(search_blueprint, url_prefix=API_PREFIX + SEARCH_PREFIX)
+    app.register_blueprint(import_blueprint, url_prefix=API_PREFIX + IMPORT_PREFIX)
+    app.register_blueprint(items_blueprint, url_prefix=API_PREFIX + ITEM_PREFIX)
+    app.register_blueprint(events_blueprint, url_prefix=API_PREFIX + EVENTS_PREFIX)
 
     @app.errorhandler(ERROR_NOT_FOUND)
     def page_not_found(e):
@@ -165,7 +194,39 @@ def create_app():
         return render_template(UNAUTHORIZED_TEMPLATE), ERROR_NOT_AUTHORIZED
 
 
-    with app.app_context():
-        db.create_all()  # Create database tables
+    # Startup only reads the schema version; "flask db upgrade" migrates.
+    # Local databases are upgraded automatically unless DB_AUTO_UPGRADE=false.
+    from .migrations import DB_AUTO_UPGRADE, init_schema
+
+    _auto_upgrade = os.getenv(DB_AUTO_UPGRADE, "" if os.environ.get("CLOUD") else "True")
+    init_schema(app, auto_upgrade=_auto_upgrade.lower() in ("1", "true", "yes"))
+
+    from .utils.search import init_search
+
+    init_search(app)
+
+    from .utils.compression import init_compression
+
+    init_compression(app)
+
+    from .utils.events import init_events
+
+    init_events(app)
+
+    from .utils.user_cache import init_user_cache
+
+    init_user_cache(app)
+
+    from .cli import register_cli
+
+    register_cli(app)
+
+    from .utils.outbox import init_mail_dispatcher
+
+    init_mail_dispatcher(app)
+
+    from .utils.jobs import init_job_runner
+
+    init_job_runner(app)
 
     return app
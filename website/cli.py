@@ -0,0 +1,168 @@
+"""Flask CLI commands.
+
+Registered on the app by :func:`register_cli`; run them with ``flask
+--app app <command>``.
+"""
+
+import threading
+
+import click
+from flask import current_app
+
+from website import db
+from .migrations import MigrationError, current_version, head_version, load_migrations, upgrade
+from .models import User
+from .utils.changes import DEFAULT_CHANGE_RETENTION_DAYS, prune_change_log
+from .utils.outbox import (
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_POLL_SECONDS,
+    dispatch_batch,
+    get_dispatcher,
+    run_dispatcher,
+)
+from .utils.importer import (
+    DEFAULT_CHUNK_SIZE,
+    IMPORT_FORMATS,
+    IMPORT_TYPES,
+    InventoryImporter,
+    InventoryImportError,
+    detect_format,
+)
+
+
+@click.command("import-inventory")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format", "fmt", type=click.Choice(IMPORT_FORMATS), help="Defaults to the file extension."
+)
+@click.option(
+    "--type",
+    "default_type",
+    type=click.Choice(sorted(IMPORT_TYPES)),
+    help="Type for rows without one.",
+)
+@click.option(
+    "--chunk-size", default=DEFAULT_CHUNK_SIZE, show_default=True, help="Rows per transaction."
+)
+@click.option("--user-email", help="Record this user as the last updater of the imported items.")
+def import_inventory(path, fmt, default_type, chunk_size, user_email):
+    """Import items from a CSV or JSONL file at PATH."""
+    user_id = None
+    if user_email:
+        user = User.query.filter_by(email=user_email).first()
+        if user is None:
+            raise click.ClickException(f"No user with email {user_email}")
+        user_id = user.id
+
+    def progress(report):
+        click.echo(
+            f"{report['processed']} rows read, "
+            f"{sum(report['imported'].values())} imported, {report['rejected']} rejected",
+            err=True,
+        )
+
+    try:
+        fmt = detect_format(path, fmt)
+        importer = InventoryImporter(chunk_size, default_type, user_id, progress)
+        with open(path, "rb") as stream:
+            report = importer.run(stream, fmt)
+    except InventoryImportError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    for error in report["errors"]:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    if report["errors_truncated"]:
+        click.echo("(further rejected rows not listed)", err=True)
+    for kind, count in report["imported"].items():
+        click.echo(f"{kind}: {count}")
+
+
+@click.command("prune-changes")
+@click.option(
+    "--days",
+    default=DEFAULT_CHANGE_RETENTION_DAYS,
+    show_default=True,
+    help="Keep change log entries this many days old.",
+)
+def prune_changes(days):
+    """Delete old change log entries behind the /changes endpoints.
+
+    Clients holding a cursor older than the cutoff get 410 Gone and
+    resync from scratch.
+    """
+    click.echo(f"{prune_change_log(days)} entries removed")
+
+
+@click.command("mail-worker")
+@click.option("--once", is_flag=True, help="Send one batch and exit (for cron).")
+@click.option(
+    "--batch-size", default=OUTBOX_BATCH_SIZE, show_default=True, help="Messages per batch."
+)
+@click.option(
+    "--poll",
+    default=OUTBOX_POLL_SECONDS,
+    show_default=True,
+    help="Seconds between polls when idle.",
+)
+def mail_worker(once, batch_size, poll):
+    """Send queued mail from the outbox.
+
+    Needs MAIL_DISPATCHER=off, so web processes don't send themselves.
+    """
+    if get_dispatcher() is not None:
+        raise click.ClickException(
+            "The in-process mail dispatcher is enabled; set MAIL_DISPATCHER=off to use mail-worker"
+        )
+    if once:
+        counts = dispatch_batch(batch_size=batch_size)
+        click.echo(", ".join(f"{count} {state}" for state, count in counts.items()))
+        return
+    stop = threading.Event()
+    try:
+        run_dispatcher(current_app._get_current_object(), stop, poll=poll, batch_size=batch_size)
+    except KeyboardInterrupt:
+        stop.set()
+
+
+@click.group("db")
+def db_cli():
+    """Inspect and upgrade the database schema."""
+
+
+@db_cli.command("upgrade")
+@click.option("--to", "target", type=int, help="Stop after this migration (default: the latest).")
+def db_upgrade(target):
+    """Apply the pending schema migrations."""
+    try:
+        applied = upgrade(
+            db.engine,
+            target,
+            on_applied=lambda m: click.echo(f"applied {m.version}: {m.description}"),
+        )
+    except MigrationError as exc:
+        raise click.ClickException(str(exc)) from exc
+    if not applied:
+        click.echo(f"already at version {current_version(db.engine)}")
+
+
+@db_cli.command("current")
+def db_current():
+    """Show the database's schema version and the latest migration."""
+    click.echo(f"{current_version(db.engine)} (latest {head_version()})")
+
+
+@db_cli.command("history")
+def db_history():
+    """List the migrations, marking those applied to the database."""
+    version = current_version(db.engine)
+    for migration in load_migrations():
+        mark = "x" if migration.version <= version else " "
+        click.echo(f"[{mark}] {migration.version}: {migration.description}")
+
+
+def register_cli(app):
+    """Add the project's commands to ``app.cli``."""
+    app.cli.add_command(import_inventory)
+    app.cli.add_command(prune_changes)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(mail_worker)
@@ -32,6 +32,7 @@ API_PREFIX = API_BASE + API_VERSION
 GET = "GET"
 POST = "POST"
 PUT = "PUT"
+PATCH = "PATCH"
 DELETE = "DELETE"
 
 # -----------------------------------------
@@ -79,12 +80,15 @@ ITEM_PREFIX = "/items"
 #  Item Routes (prefixed with "/item")
 # =========================================
 #
-# GET     /api/v1/items/all                   → Retrieve all items
+# GET     /api/v1/items/all                   → Retrieve all items of every type in one shape
+#                                               (optional: type=camera_gear,consumable, the
+#                                               item filters, sort=<field>, limit/after)
 # GET     /api/v1/items/one/<int:item_id>     → Retrieve a specific item by ID
 # POST    /api/v1/items/                      → Create a new item
 # PUT     /api/v1/items/<int:item_id>         → Update an existing item
 # DELETE  /api/v1/items/<int:item_id>         → Delete an item by ID
 
+ITEM_DEFAULT_NAME = "items"
 ITEM_ALL_ROUTE = "/all"
 ITEM_GET_ONE_ROUTE = "/one/<int:item_id>"
 ITEM_CREATE_ROUTE = "/"
@@ -110,20 +114,26 @@ ITEM_FIELD_UPDATED_BY = "updated_by"
 #
 # GET     /api/v1/camera_gear/all                → Retrieve all camera gear
 # GET     /api/v1/camera_gear/one/<int:gear_id>   → Retrieve a specific camera gear item by ID
+# GET     /api/v1/camera_gear/changes?since=<cursor> → Camera gear written/deleted since a cursor
 # POST    /api/v1/camera_gear/                   → Create a new camera gear item
 # PUT     /api/v1/camera_gear/<int:gear_id>       → Update an existing camera gear item
 # PUT     /api/v1/camera_gear/checkout/<int:gear_id> → Check out a camera gear item
 # PUT     /api/v1/camera_gear/checkin/<int:gear_id>  → Check in a camera gear item
 # DELETE  /api/v1/camera_gear/<int:gear_id>       → Delete a camera gear item by ID
+# POST    /api/v1/camera_gear/bulk               → Create many camera gear items
+# PATCH   /api/v1/camera_gear/bulk               → Update many camera gear items
+# DELETE  /api/v1/camera_gear/bulk               → Delete many camera gear items
 
 CAMERA_GEAR_PREFIX = "/camera_gear"
 CAMERA_GEAR_ALL_ROUTE = "/all"
 CAMERA_GEAR_GET_ONE_ROUTE = "/one/<int:gear_id>"
+CAMERA_GEAR_CHANGES_ROUTE = "/changes"
 CAMERA_GEAR_CREATE_ROUTE = "/"
 CAMERA_GEAR_UPDATE_ROUTE = "/<int:gear_id>"
 CAMERA_GEAR_CHECK_OUT_ROUTE = "/checkout/<int:gear_id>"
 CAMERA_GEAR_CHECK_IN_ROUTE = "/checkin/<int:gear_id>"
 CAMERA_GEAR_DELETE_ROUTE = "/<int:gear_id>"
+CAMERA_GEAR_BULK_ROUTE = "/bulk"
 
 # =====================================================
 #     Camera Gear Fields
@@ -160,16 +170,22 @@ LAB_EQUIPMENT_LAST_SERVICED_BY_USER_FIELD = "last_serviced_by_user"
 #
 # GET     /api/v1/lab_equipment/all                → Retrieve all lab equipment
 # GET     /api/v1/lab_equipment/one/<int:equipment_id>   → Retrieve a specific lab equipment item by ID
+# GET     /api/v1/lab_equipment/changes?since=<cursor> → Items written/deleted since a cursor
 # POST    /api/v1/lab_equipment/                   → Create a new lab equipment item
 # PUT     /api/v1/lab_equipment/<int:equipment_id>       → Update an existing lab equipment item
 # DELETE  /api/v1/lab_equipment/<int:equipment_id>       → Delete a lab equipment item by ID
+# POST    /api/v1/lab_equipment/bulk               → Create many lab equipment items
+# PATCH   /api/v1/lab_equipment/bulk               → Update many lab equipment items
+# DELETE  /api/v1/lab_equipment/bulk               → Delete many lab equipment items
 
 LAB_EQUIPMENT_PREFIX = "/lab_equipment"
 LAB_EQUIPMENT_ALL_ROUTE = "/all"
 LAB_EQUIPMENT_GET_ONE_ROUTE = "/one/<int:equipment_id>"
+LAB_EQUIPMENT_CHANGES_ROUTE = "/changes"
 LAB_EQUIPMENT_CREATE_ROUTE = "/"
 LAB_EQUIPMENT_UPDATE_ROUTE = "/<int:equipment_id>"
 LAB_EQUIPMENT_DELETE_ROUTE = "/<int:equipment_id>"
+LAB_EQUIPMENT_BULK_ROUTE = "/bulk"
 
 
 # =====================================================
@@ -178,16 +194,22 @@ LAB_EQUIPMENT_DELETE_ROUTE = "/<int:equipment_id>"
 #
 # GET     /api/v1/consumables/all                → Retrieve all consumables
 # GET     /api/v1/consumables/one/<int:consumable_id>   → Retrieve a specific consumable by ID
+# GET     /api/v1/consumables/changes?since=<cursor> → Consumables written/deleted since a cursor
 # POST    /api/v1/consumables/                   → Create a new consumable
 # PUT     /api/v1/consumables/<int:consumable_id>       → Update an existing consumable
 # DELETE  /api/v1/consumables/<int:consumable_id>       → Delete a consumable by ID
+# POST    /api/v1/consumables/bulk               → Create many consumables
+# PATCH   /api/v1/consumables/bulk               → Update many consumables
+# DELETE  /api/v1/consumables/bulk               → Delete many consumables
 
 CONSUMABLES_PREFIX = "/consumables"
 CONSUMABLES_ALL_ROUTE = "/all"
 CONSUMABLES_GET_ONE_ROUTE = "/one/<int:consumable_id>"
+CONSUMABLES_CHANGES_ROUTE = "/changes"
 CONSUMABLES_CREATE_ROUTE = "/"
 CONSUMABLES_UPDATE_ROUTE = "/<int:consumable_id>"
 CONSUMABLES_DELETE_ROUTE = "/<int:consumable_id>"
+CONSUMABLES_BULK_ROUTE = "/bulk"
 
 CONSUMABLES_DEFAULT_NAME = "consumables"
 
@@ -198,6 +220,7 @@ TAG_NAME = "name"
 TAG_DEFAULT_NAME = "tags"
 TAG_DELETE_SUCCESS_MESSAGE = "Tag deleted successfully"
 TAG_NAME_REQUIRED_MESSAGE = "Tag name is required."
+TAG_ALREADY_EXISTS_MESSAGE = "A tag with that name already exists."
 
 # ====================================
 #  Tag Routes (prefixed with "/tag")
@@ -208,12 +231,16 @@ TAG_NAME_REQUIRED_MESSAGE = "Tag name is required."
 # POST    /api/v1/tag/                   → Create a new tag
 # PUT     /api/v1/tag/<int:tag_id>       → Update an existing tag
 # DELETE  /api/v1/tag/<int:tag_id>       → Delete a tag by ID
+# POST    /api/v1/tag/bulk               → Create many tags
+# PATCH   /api/v1/tag/bulk               → Rename many tags
+# DELETE  /api/v1/tag/bulk               → Delete many tags
 
 TAG_ALL_ROUTE = "/all"
 TAG_GET_ONE_ROUTE = "/one/<int:tag_id>"
 TAG_CREATE_ROUTE = "/"
 TAG_UPDATE_ROUTE = "/<int:tag_id>"
 TAG_DELETE_ROUTE = "/<int:tag_id>"
+TAG_BULK_ROUTE = "/bulk"
 
 # location fields
 LOCATION_PREFIX = "/location"
@@ -230,6 +257,9 @@ LOCATION_DEFAULT_NAME = "locations"
 # POST    /api/v1/location/                      → Create a new location
 # PUT     /api/v1/location/<int:location_id>     → Update an existing location
 # DELETE  /api/v1/location/<int:location_id>     → Delete a location by ID
+# POST    /api/v1/location/bulk                  → Create many locations
+# PATCH   /api/v1/location/bulk                  → Rename many locations
+# DELETE  /api/v1/location/bulk                  → Delete many locations
 
 
 LOCATION_ALL_ROUTE = "/all"
@@ -237,9 +267,11 @@ LOCATION_GET_ONE_ROUTE = "/one/<int:location_id>"
 LOCATION_CREATE_ROUTE = "/"
 LOCATION_UPDATE_ROUTE = "/<int:location_id>"
 LOCATION_DELETE_ROUTE = "/<int:location_id>"
+LOCATION_BULK_ROUTE = "/bulk"
 
 LOCATION_DELETE_SUCCESS_MESSAGE = "location deleted successfully"
 LOCATION_NAME_NEEDED_MESSAGE = "location name is required."
+LOCATION_ALREADY_EXISTS_MESSAGE = "A location with that name already exists."
 
 # =====================================================
 #  Notes Routes (prefixed with "/notes")
@@ -273,8 +305,56 @@ NOTE_ITEM_TYPE_REQUIRED_MESSAGE = "Item type is required."
 NOTE_ITEM_ID_REQUIRED_MESSAGE = "Item ID is required."
 NOTE_DELETE_SUCCESS_MESSAGE = "Note deleted successfully."
 
+# =====================================================
+#  Search Routes (prefixed with "/search")
+# =====================================================
+# GET     /api/v1/search/?q=<text>&type=<kind,...>&limit=<n> → Ranked full-text matches
+
+SEARCH_PREFIX = "/search"
+SEARCH_ROUTE = "/"
+SEARCH_DEFAULT_NAME = "search"
+SEARCH_QUERY_ARG = "q"
+SEARCH_TYPE_ARG = "type"
+SEARCH_LIMIT_ARG = "limit"
+SEARCH_RESULTS_KEY = "results"
+
+# =====================================================
+#  Import Routes (prefixed with "/import")
+# =====================================================
+# POST    /api/v1/import/?format=<csv|jsonl>&type=<kind>&chunk_size=<n>
+#                                          → Stream a CSV/JSONL file of items into the inventory
+
+IMPORT_PREFIX = "/import"
+IMPORT_ROUTE = "/"
+IMPORT_DEFAULT_NAME = "import"
+IMPORT_FILE_FIELD = "file"
+IMPORT_FORMAT_ARG = "format"
+IMPORT_TYPE_ARG = "type"
+IMPORT_CHUNK_SIZE_ARG = "chunk_size"
+
+# =====================================================
+#  Event Routes (prefixed with "/events")
+# =====================================================
+# GET     /api/v1/events/                  → Server-Sent Events stream of item and note changes
+
+EVENTS_PREFIX = "/events"
+EVENTS_ROUTE = "/"
+EVENTS_DEFAULT_NAME = "events"
+
 # Admin routes
 ADMIN_PREFIX = "/admin"
+ADMIN_DB_POOL_ROUTE = "/db-pool"
+
+# =====================================================
+#  Internal Task Routes (prefixed with "/internal/tasks")
+# =====================================================
+# POST    /internal/tasks/weekly-expirations  → Enqueue the weekly notifications job (202)
+# GET     /internal/tasks/runs/<id>           → Status, timings and step outcomes of a job run
+
+TASKS_PREFIX = "/internal/tasks"
+TASKS_WEEKLY_EXPIRATIONS_ROUTE = "/weekly-expirations"
+TASKS_RUN_ROUTE = "/runs/<int:run_id>"
+TASK_TOKEN_HEADER = "X-Task-Token"
 
 
 # =========================================
@@ -297,6 +377,7 @@ GOOGLE_CLIENT_SECRET = "GOOGLE_CLIENT_SECRET"
 SECRET_KEY = "SECRET_KEY"
 SQLALCHEMY_DATABASE_URI = "SQLALCHEMY_DATABASE_URI"
 SQLALCHEMY_TRACK_MODIFICATIONS = "SQLALCHEMY_TRACK_MODIFICATIONS"
+SQLALCHEMY_ENGINE_OPTIONS = "SQLALCHEMY_ENGINE_OPTIONS"
 DEFAULT_ADMIN_EMAIL = "DEFAULT_ADMIN_EMAIL"
 
 # =========================================
@@ -346,3 +427,7 @@ MESSAGE_KEY = "message"
 ERROR_NOT_FOUND = 404
 ERROR_NOT_AUTHORIZED = 403
 ERROR_BAD_REQUEST = 400
+ERROR_CONFLICT = 409
+ERROR_GONE = 410
+ERROR_UNAVAILABLE = 503
+STATUS_ACCEPTED = 202
@@ -0,0 +1,182 @@
+"""Versioned schema migrations.
+
+The database records the number of the last migration applied in the
+single-row ``schema_version`` table. Migrations are the modules in
+``migrations/versions`` named ``<number>_<description>.py``, numbered
+1, 2, 3, ... with no gaps, each defining ``upgrade(connection)``. A
+migration describes the schema as it was when it was written, so never
+edit one that has shipped; add a new one instead.
+
+* ``flask db upgrade`` applies the pending migrations, each in its own
+  transaction together with the version bump.
+* App startup (:func:`init_schema`) only reads the version number. It
+  upgrades automatically when ``DB_AUTO_UPGRADE`` is on, which is the
+  default outside cloud deployments. Cloud deployments run
+  ``flask db upgrade`` in the release phase.
+
+Migrations create objects with ``checkfirst``/``IF NOT EXISTS`` so they
+also bring a database built by the old ``db.create_all()`` startup up
+to date. SQLite runs DDL outside the transaction, so a migration that
+fails there can leave part of its work behind; rerunning it is safe.
+"""
+
+import importlib
+import pkgutil
+import re
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select, update
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from website import db
+from . import versions
+
+DB_AUTO_UPGRADE = "DB_AUTO_UPGRADE"
+
+_VERSION_ROW = 1
+_MODULE_RE = re.compile(r"^(\d+)_(\w+)$")
+_SCHEMA_EXTENSION = "schema_version"
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+_table_version = Table(
+    "table_version",
+    MetaData(),
+    Column("table_name", String(100), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+Migration = namedtuple("Migration", "version name description upgrade")
+
+
+class MigrationError(RuntimeError):
+    """Raised when the migration scripts or the database are inconsistent."""
+
+
+@lru_cache(maxsize=None)
+def load_migrations():
+    """Return every :class:`Migration` in version order."""
+    found = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        match = _MODULE_RE.match(info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        description = (module.__doc__ or match.group(2)).strip().splitlines()[0]
+        found.append(Migration(int(match.group(1)), info.name, description, module.upgrade))
+    found.sort(key=lambda migration: migration.version)
+    numbers = [migration.version for migration in found]
+    if numbers != list(range(1, len(found) + 1)):
+        raise MigrationError(f"Migrations must be numbered 1..n without gaps, found {numbers}")
+    return tuple(found)
+
+
+def head_version():
+    """Return the version a fully upgraded database is at."""
+    return len(load_migrations())
+
+
+def current_version(bind):
+    """Return the database's schema version; 0 when it has never been migrated."""
+    try:
+        with bind.connect() as connection:
+            version = connection.scalar(
+                select(schema_version.c.version).where(schema_version.c.id == _VERSION_ROW)
+            )
+    except (OperationalError, ProgrammingError):
+        # no schema_version table yet
+        return 0
+    return version or 0
+
+
+def _set_version(connection, version):
+    values = {"version": version, "applied_at": datetime.now()}
+    updated = connection.execute(
+        update(schema_version).where(schema_version.c.id == _VERSION_ROW).values(**values)
+    )
+    if not updated.rowcount:
+        connection.execute(insert(schema_version).values(id=_VERSION_ROW, **values))
+
+
+def upgrade(bind, target=None, on_applied=None):
+    """Apply the migrations after the database's version, up to ``target``.
+
+    ``on_applied`` is called with each :class:`Migration` once it has
+    been committed. Returns the migrations that were applied.
+    """
+    migrations = load_migrations()
+    target = len(migrations) if target is None else target
+    if not 0 <= target <= len(migrations):
+        raise MigrationError(f"No migration {target}; the latest is {len(migrations)}")
+    with bind.begin() as connection:
+        schema_version.create(connection, checkfirst=True)
+    applied = []
+    for migration in migrations[:target]:
+        with bind.begin() as connection:
+            # locks the version row on databases that support it, so two
+            # processes upgrading at once apply each migration once
+            current = connection.scalar(
+                select(schema_version.c.version)
+                .where(schema_version.c.id == _VERSION_ROW)
+                .with_for_update()
+            ) or 0
+            if current >= migration.version:
+                continue
+            migration.upgrade(connection)
+            _set_version(connection, migration.version)
+        applied.append(migration)
+        if on_applied is not None:
+            on_applied(migration)
+    return applied
+
+
+def seed_table_versions(connection, names):
+    """Add a ``table_version`` counter row for each table in ``names`` lacking one.
+
+    Migrations that create a table call this so ETags and the change
+    counters cover it.
+    """
+    existing = set(connection.scalars(select(_table_version.c.table_name)))
+    missing = [
+        {"table_name": name, "version": 0, "updated_at": datetime.now()}
+        for name in names
+        if name not in existing
+    ]
+    if missing:
+        connection.execute(insert(_table_version), missing)
+
+
+def init_schema(app, auto_upgrade=False):
+    """Check the database's schema version at startup.
+
+    Only the version number is read. A database behind the latest
+    migration is upgraded when ``auto_upgrade`` is set and otherwise
+    logged, so ``flask db upgrade`` can still start the app to fix it.
+    """
+    head = head_version()
+    with app.app_context():
+        version = current_version(db.engine)
+        if version < head and auto_upgrade:
+            upgrade(db.engine)
+            version = head
+    if version < head:
+        app.logger.warning(
+            "Database schema is at version %d of %d; run 'flask db upgrade'", version, head
+        )
+    elif version > head:
+        app.logger.warning(
+            "Database schema version %d is newer than this code's latest migration (%d)",
+            version,
+            head,
+        )
+    app.extensions[_SCHEMA_EXTENSION] = version
+    return version
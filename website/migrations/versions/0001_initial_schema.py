@@ -0,0 +1,110 @@
+"""Create the inventory, user and note tables.
+
+This is the schema the app created with ``db.create_all()`` before
+migrations existed, frozen here so later model changes don't alter it.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+)
+
+metadata = MetaData()
+
+Table(
+    "user",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("first_name", String(80), nullable=False),
+    Column("last_name", String(80), nullable=False),
+    Column("email", String(120), unique=True, nullable=False),
+    Column("profile_picture", String(200)),
+    Column("role", Enum("ADMIN", "TA", "STUDENT", "INVALID", name="userrole"), nullable=False),
+)
+
+Table(
+    "location",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+)
+
+Table(
+    "tag",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+)
+
+Table(
+    "camera_gear",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("location_id", Integer, ForeignKey("location.id")),
+    Column("last_updated", DateTime, nullable=False),
+    Column("updated_by", Integer, ForeignKey("user.id")),
+    Column("is_checked_out", Boolean, nullable=False),
+    Column("checked_out_by", Integer, ForeignKey("user.id"), nullable=True),
+    Column("checked_out_date", DateTime, nullable=True),
+    Column("return_date", DateTime, nullable=True),
+)
+
+Table(
+    "lab_equipment",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("last_updated", DateTime, nullable=False),
+    Column("updated_by", Integer, ForeignKey("user.id")),
+    Column("last_serviced_on", Date, nullable=True),
+    Column("last_serviced_by", Integer, ForeignKey("user.id"), nullable=True),
+    Column("service_frequency", String(100), nullable=True),
+)
+
+Table(
+    "consumable",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("quantity", Integer, nullable=False),
+    Column("location_id", Integer, ForeignKey("location.id")),
+    Column("expires", Date, nullable=True),
+    Column("last_updated", DateTime, nullable=False),
+    Column("updated_by", Integer, ForeignKey("user.id")),
+)
+
+Table(
+    "note",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("content", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=True),
+    Column("created_by", Integer, ForeignKey("user.id"), nullable=False),
+    Column("updated_by", Integer, ForeignKey("user.id"), nullable=True),
+    Column("camera_gear_id", Integer, ForeignKey("camera_gear.id"), unique=True, nullable=True),
+    Column("lab_equipment_id", Integer, ForeignKey("lab_equipment.id"), unique=True, nullable=True),
+    Column("consumable_id", Integer, ForeignKey("consumable.id"), unique=True, nullable=True),
+)
+
+for item in ("camera_gear", "lab_equipment", "consumable"):
+    Table(
+        f"{item}_tags",
+        metadata,
+        Column(f"{item}_id", Integer, ForeignKey(f"{item}.id"), primary_key=True),
+        Column("tag_id", Integer, ForeignKey("tag.id"), primary_key=True),
+    )
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,73 @@
+"""Add the secondary indexes for name lookups, foreign keys and date windows.
+
+The index definitions are copied from ``models.indexes`` as they were
+when this migration was written; the tables only list the columns the
+indexes need. A unique index fails while duplicate tag or location
+names (ignoring case) exist; merge them and rerun the upgrade.
+"""
+
+from sqlalchemy import Column, Index, MetaData, Table, func
+from sqlalchemy.schema import CreateIndex
+
+metadata = MetaData()
+
+
+def _table(name, *columns):
+    return Table(name, metadata, *(Column(column) for column in columns))
+
+
+tag = _table("tag", "name")
+location = _table("location", "name")
+camera_gear = _table(
+    "camera_gear", "name", "location_id", "checked_out_by", "return_date", "updated_by"
+)
+consumable = _table("consumable", "name", "location_id", "expires", "updated_by")
+lab_equipment = _table(
+    "lab_equipment", "name", "last_serviced_on", "last_serviced_by", "updated_by"
+)
+note = _table("note", "created_by", "updated_by")
+camera_gear_tags = _table("camera_gear_tags", "camera_gear_id", "tag_id")
+lab_equipment_tags = _table("lab_equipment_tags", "lab_equipment_id", "tag_id")
+consumable_tags = _table("consumable_tags", "consumable_id", "tag_id")
+
+INDEXES = (
+    Index("uq_tag_name_lower", func.lower(tag.c.name), unique=True),
+    Index("uq_location_name_lower", func.lower(location.c.name), unique=True),
+    Index("ix_camera_gear_name", camera_gear.c.name),
+    Index("ix_consumable_name", consumable.c.name),
+    Index("ix_lab_equipment_name", lab_equipment.c.name),
+    Index("ix_camera_gear_location_id", camera_gear.c.location_id),
+    Index("ix_camera_gear_checked_out_by", camera_gear.c.checked_out_by),
+    Index("ix_camera_gear_return_date", camera_gear.c.return_date),
+    Index("ix_camera_gear_updated_by", camera_gear.c.updated_by),
+    Index("ix_consumable_location_id", consumable.c.location_id),
+    Index("ix_consumable_expires", consumable.c.expires),
+    Index("ix_consumable_updated_by", consumable.c.updated_by),
+    Index("ix_lab_equipment_last_serviced_on", lab_equipment.c.last_serviced_on),
+    Index("ix_lab_equipment_last_serviced_by", lab_equipment.c.last_serviced_by),
+    Index("ix_lab_equipment_updated_by", lab_equipment.c.updated_by),
+    Index("ix_note_created_by", note.c.created_by),
+    Index("ix_note_updated_by", note.c.updated_by),
+    Index(
+        "ix_camera_gear_tags_tag_id",
+        camera_gear_tags.c.tag_id,
+        camera_gear_tags.c.camera_gear_id,
+    ),
+    Index(
+        "ix_lab_equipment_tags_tag_id",
+        lab_equipment_tags.c.tag_id,
+        lab_equipment_tags.c.lab_equipment_id,
+    ),
+    Index(
+        "ix_consumable_tags_tag_id",
+        consumable_tags.c.tag_id,
+        consumable_tags.c.consumable_id,
+    ),
+)
+
+
+def upgrade(connection):
+    for index in INDEXES:
+        # IF NOT EXISTS rather than checkfirst: reflection can't see
+        # expression indexes such as lower(name) on every backend
+        connection.execute(CreateIndex(index, if_not_exists=True))
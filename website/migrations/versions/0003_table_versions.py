@@ -0,0 +1,33 @@
+"""Add the per-table change counters behind ETags."""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+
+from website.migrations import seed_table_versions
+
+metadata = MetaData()
+
+Table(
+    "table_version",
+    metadata,
+    Column("table_name", String(100), primary_key=True),
+    Column("version", Integer, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+TABLES = (
+    "user",
+    "location",
+    "tag",
+    "camera_gear",
+    "lab_equipment",
+    "consumable",
+    "note",
+    "camera_gear_tags",
+    "lab_equipment_tags",
+    "consumable_tags",
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+    seed_table_versions(connection, TABLES)
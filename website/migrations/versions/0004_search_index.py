@@ -0,0 +1,79 @@
+"""Create and populate the full-text search index.
+
+The table layout and the SQLite rowid scheme (``id * 8 + code``) are
+copied from ``utils.search`` as they were when this migration was
+written; the sync code there must keep reading them the same way.
+"""
+
+from sqlalchemy import inspect, text
+
+SEARCH_TABLE = "search_index"
+ROWID_STRIDE = 8
+
+# kind -> (table, indexed column, rowid code)
+KINDS = {
+    "camera_gear": ("camera_gear", "name", 1),
+    "consumable": ("consumable", "name", 2),
+    "lab_equipment": ("lab_equipment", "name", 3),
+    "tag": ("tag", "name", 4),
+    "location": ("location", "name", 5),
+    "note": ("note", "content", 6),
+}
+
+
+def _create(connection):
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+                "kind UNINDEXED, ref_id UNINDEXED, body, "
+                "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+        )
+    elif dialect == "postgresql":
+        connection.execute(
+            text(
+                f"CREATE TABLE {SEARCH_TABLE} ("
+                "kind VARCHAR(32) NOT NULL, ref_id INTEGER NOT NULL, body TEXT NOT NULL, "
+                "document tsvector GENERATED ALWAYS AS (to_tsvector('simple', body)) STORED, "
+                "PRIMARY KEY (kind, ref_id))"
+            )
+        )
+        connection.execute(
+            text(
+                f"CREATE INDEX ix_{SEARCH_TABLE}_document ON {SEARCH_TABLE} USING GIN (document)"
+            )
+        )
+    else:
+        connection.execute(
+            text(
+                f"CREATE TABLE {SEARCH_TABLE} ("
+                "kind VARCHAR(32) NOT NULL, ref_id INTEGER NOT NULL, body TEXT NOT NULL, "
+                "PRIMARY KEY (kind, ref_id))"
+            )
+        )
+
+
+def _populate(connection):
+    sqlite = connection.dialect.name == "sqlite"
+    for kind, (table, column, code) in KINDS.items():
+        if sqlite:
+            sql = (
+                f"INSERT INTO {SEARCH_TABLE} (rowid, kind, ref_id, body) "
+                f"SELECT id * {ROWID_STRIDE} + {code}, :kind, id, {column} "
+                f'FROM "{table}" WHERE {column} IS NOT NULL'
+            )
+        else:
+            sql = (
+                f"INSERT INTO {SEARCH_TABLE} (kind, ref_id, body) "
+                f'SELECT :kind, id, {column} FROM "{table}" WHERE {column} IS NOT NULL'
+            )
+        connection.execute(text(sql), {"kind": kind})
+
+
+def upgrade(connection):
+    if inspect(connection).has_table(SEARCH_TABLE):
+        return
+    _create(connection)
+    _populate(connection)
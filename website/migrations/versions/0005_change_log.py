@@ -0,0 +1,24 @@
+"""Add the change log behind the ``/changes`` delta sync endpoints."""
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, MetaData, String, Table
+
+from website.migrations import seed_table_versions
+
+metadata = MetaData()
+
+Table(
+    "change_log",
+    metadata,
+    Column("seq", Integer, primary_key=True, autoincrement=True),
+    Column("table_name", String(100), nullable=False),
+    Column("row_id", Integer, nullable=False),
+    Column("deleted", Boolean, nullable=False),
+    Column("changed_at", DateTime, nullable=False),
+    Index("ix_change_log_table_seq", "table_name", "seq"),
+    sqlite_autoincrement=True,
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+    seed_table_versions(connection, ("change_log",))
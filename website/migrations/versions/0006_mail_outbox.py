@@ -0,0 +1,28 @@
+"""Add the outbox that queued mail waits in until it is sent."""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, MetaData, String, Table, Text
+
+from website.migrations import seed_table_versions
+
+metadata = MetaData()
+
+Table(
+    "mail_outbox",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("subject", String(255), nullable=False),
+    Column("recipients", JSON, nullable=False),
+    Column("body", Text, nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("next_attempt_at", DateTime, nullable=False),
+    Column("last_error", Text),
+    Column("created_at", DateTime, nullable=False),
+    Column("sent_at", DateTime),
+    Index("ix_mail_outbox_due", "status", "next_attempt_at"),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+    seed_table_versions(connection, ("mail_outbox",))
@@ -0,0 +1,19 @@
+"""Add the per-item low-stock alert state to consumables."""
+
+from sqlalchemy import Boolean, Column, DateTime, inspect, false
+from sqlalchemy.schema import CreateColumn
+
+COLUMNS = (
+    Column("low_stock_since", DateTime),
+    Column("low_stock_pending", Boolean, nullable=False, server_default=false()),
+    Column("low_stock_alerted_at", DateTime),
+)
+
+
+def upgrade(connection):
+    existing = {column["name"] for column in inspect(connection).get_columns("consumable")}
+    for column in COLUMNS:
+        if column.name in existing:
+            continue
+        ddl = CreateColumn(column).compile(dialect=connection.dialect)
+        connection.exec_driver_sql(f"ALTER TABLE consumable ADD COLUMN {ddl}")
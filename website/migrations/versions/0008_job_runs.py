@@ -0,0 +1,26 @@
+"""Add the job run history polled by the internal task status endpoint."""
+
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, MetaData, String, Table, Text
+
+from website.migrations import seed_table_versions
+
+metadata = MetaData()
+
+Table(
+    "job_run",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("started_at", DateTime),
+    Column("finished_at", DateTime),
+    Column("results", JSON),
+    Column("error", Text),
+    Index("ix_job_run_name_created", "name", "created_at"),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
+    seed_table_versions(connection, ("job_run",))
@@ -16,6 +16,12 @@ from .associations import (
     lab_equipment_tags,
     consumable_tags,
 )
+from .loaders import FIELD_LOADER_OPTIONS, LOADER_OPTIONS, eager_query
+from .indexes import INDEXES, ensure_indexes
+from .table_version import TableVersion
+from .change_log import ChangeLog
+from .mail_outbox import OUTBOX_FAILED, OUTBOX_PENDING, OUTBOX_SENT, OutboxMessage
+from .job_run import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JobRun
 
 __all__ = [
     'User',
@@ -28,4 +34,20 @@ __all__ = [
     'camera_gear_tags',
     'lab_equipment_tags',
     'consumable_tags',
+    'FIELD_LOADER_OPTIONS',
+    'LOADER_OPTIONS',
+    'eager_query',
+    'INDEXES',
+    'ensure_indexes',
+    'TableVersion',
+    'ChangeLog',
+    'OutboxMessage',
+    'OUTBOX_PENDING',
+    'OUTBOX_SENT',
+    'OUTBOX_FAILED',
+    'JobRun',
+    'JOB_QUEUED',
+    'JOB_RUNNING',
+    'JOB_SUCCEEDED',
+    'JOB_FAILED',
 ]
@@ -1,8 +1,21 @@
 """Base model utilities and SQLAlchemy DB instance.
 
-This module exposes the SQLAlchemy ``db`` object used by models.
+This module exposes the SQLAlchemy ``db`` object used by models, and
+the helpers ``to_dict`` methods use to honour a sparse field selection.
 """
 
 # from flask_sqlalchemy import SQLAlchemy
 
 # db = SQLAlchemy()
+
+
+def wants(fields, key):
+    """Return True when ``key`` is part of ``fields`` (None selects every field)."""
+    return fields is None or key in fields
+
+
+def pick_fields(data, fields):
+    """Return ``data`` restricted to ``fields``, keeping its key order."""
+    if fields is None:
+        return data
+    return {key: value for key, value in data.items() if key in fields}
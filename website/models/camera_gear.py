@@ -12,6 +12,7 @@ from ..constants import (
 )
 
 from website import db
+from .base import pick_fields, wants
 
 class CameraGear(db.Model):
     """Represents a camera gear item stored in inventory."""
@@ -46,14 +47,20 @@ class CameraGear(db.Model):
         uselist=False,
     )
 
-    def to_dict(self):
-        """Return a serializable dict for this CameraGear instance."""
-        tags = [t.name for t in getattr(self, "tags", [])]
+    def to_dict(self, fields=None):
+        """Return a serializable dict for this CameraGear instance.
+
+        ``fields`` limits the keys returned; relationships behind keys
+        that aren't requested are not touched (and so not loaded).
+        """
+        tags = []
+        if wants(fields, ITEM_FIELD_TAGS):
+            tags = [t.name for t in getattr(self, "tags", [])]
 
         # Get location name
         location_name = None
         try:
-            if getattr(self, "location", None):
+            if wants(fields, "location") and getattr(self, "location", None):
                 location_name = self.location.name
         except Exception:
             location_name = None
@@ -61,14 +68,22 @@ class CameraGear(db.Model):
         updater = None
         checked_out_user = None
         try:
-            if self.updated_by and getattr(self, "updated_by_user", None):
+            if (
+                wants(fields, ITEM_FIELD_UPDATED_BY)
+                and self.updated_by
+                and getattr(self, "updated_by_user", None)
+            ):
                 updater = self.updated_by_user.email
-            if self.checked_out_by and getattr(self, "checked_out_by_user", None):
+            if (
+                wants(fields, "checked_out_by")
+                and self.checked_out_by
+                and getattr(self, "checked_out_by_user", None)
+            ):
                 checked_out_user = self.checked_out_by_user.email
         except Exception:
             pass
 
-        return {
+        return pick_fields({
             "id": self.id,
             ITEM_FIELD_NAME: self.name,
             ITEM_FIELD_TAGS: tags,
@@ -84,4 +99,4 @@ class CameraGear(db.Model):
                 self.checked_out_date.isoformat() if self.checked_out_date else None
             ),
             "return_date": self.return_date.isoformat() if self.return_date else None,
-        }
+        }, fields)
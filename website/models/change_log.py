@@ -0,0 +1,30 @@
+"""Append-only log of writes to the synced item tables.
+
+Every insert, update and delete of a camera gear, consumable or lab
+equipment row appends an entry (see ``utils.changes``). ``seq`` is the
+change sequence: it only ever grows, so "everything after ``seq`` N" is
+a well-defined delta, and entries with ``deleted`` set are the
+tombstones for removed rows.
+"""
+
+from website import db
+
+
+class ChangeLog(db.Model):
+    """One write to a synced row."""
+    __tablename__ = "change_log"
+    __table_args__ = (
+        db.Index("ix_change_log_table_seq", "table_name", "seq"),
+        # never hand out a sequence number twice, even after pruning
+        {"sqlite_autoincrement": True},
+    )
+
+    seq = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    table_name = db.Column(db.String(100), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    deleted = db.Column(db.Boolean, nullable=False, default=False)
+    changed_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        state = "deleted" if self.deleted else "written"
+        return f"<ChangeLog {self.seq} {self.table_name}#{self.row_id} {state}>"
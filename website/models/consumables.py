@@ -14,6 +14,7 @@ from ..constants import (
 )
 
 from website import db
+from .base import pick_fields, wants
 
 class Consumable(db.Model):
     """Represents a consumable inventory item (e.g., film, paper)."""
@@ -25,6 +26,12 @@ class Consumable(db.Model):
     expires = db.Column(db.Date, nullable=True)
     last_updated = db.Column(db.DateTime, nullable=False)
     updated_by = db.Column(db.Integer, db.ForeignKey("user.id"))
+    # low-stock alert state, maintained by utils.low_stock
+    low_stock_since = db.Column(db.DateTime, nullable=True)
+    low_stock_pending = db.Column(
+        db.Boolean, nullable=False, default=False, server_default=db.false()
+    )
+    low_stock_alerted_at = db.Column(db.DateTime, nullable=True)
 
     def __repr__(self):
         return f"<Consumable {self.name}>"
@@ -39,22 +46,25 @@ class Consumable(db.Model):
         "User", foreign_keys=[updated_by], backref="updated_consumables", uselist=False
     )
 
-    def to_dict(self):
+    def to_dict(self, fields=None):
         """Return a serializable dict for this Consumable using the shared item field constants.
         Tags are returned as a list of names. `location_id` uses the constant key:
         the human-readable `location` name is provided under the key 'location'.
+        ``fields`` limits the keys returned and the relationships touched.
         """
-        tags = [t.name for t in getattr(self, "tags", [])]
+        tags = []
+        if wants(fields, ITEM_FIELD_TAGS):
+            tags = [t.name for t in getattr(self, "tags", [])]
         location_name = None
         try:
-            if getattr(self, "location", None):
+            if wants(fields, "location") and getattr(self, "location", None):
                 location_name = self.location.name
         except Exception:
             location_name = None
 
         updater = None
         try:
-            if self.updated_by:
+            if wants(fields, ITEM_FIELD_UPDATED_BY) and self.updated_by:
                 # prefer the relationship when available
                 if getattr(self, "updated_by_user", None):
                     updater = self.updated_by_user.email
@@ -63,7 +73,7 @@ class Consumable(db.Model):
         except Exception:
             updater = None
 
-        return {
+        return pick_fields({
             "id": self.id,
             ITEM_FIELD_NAME: self.name,
             ITEM_FIELD_QUANTITY: self.quantity,
@@ -75,4 +85,4 @@ class Consumable(db.Model):
                 self.last_updated.isoformat() if self.last_updated else None
             ),
             ITEM_FIELD_UPDATED_BY: updater,
-        }
+        }, fields)
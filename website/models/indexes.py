@@ -0,0 +1,88 @@
+"""Secondary index plan for the inventory tables.
+
+Every secondary index lives here so the full plan can be read in one
+place. Schema migrations carry their own copies of the definitions,
+so a new index needs both an entry here and a migration that creates
+it. :func:`ensure_indexes` recreates any that are missing, e.g. after a
+manual repair.
+
+Note that ``Note.camera_gear_id``/``lab_equipment_id``/``consumable_id``
+and ``User.email`` are declared ``unique`` and are already backed by the
+unique constraint's index.
+"""
+
+import logging
+
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.schema import CreateIndex
+
+from website import db
+from .associations import camera_gear_tags, consumable_tags, lab_equipment_tags
+from .camera_gear import CameraGear
+from .consumables import Consumable
+from .lab_equipment import LabEquipment
+from .location import Location
+from .notes import Note
+from .tag import Tag
+
+logger = logging.getLogger(__name__)
+
+INDEXES = (
+    # Name lookups: one tag/location per case-insensitive name.
+    db.Index("uq_tag_name_lower", func.lower(Tag.name), unique=True),
+    db.Index("uq_location_name_lower", func.lower(Location.name), unique=True),
+    # Default list ordering.
+    db.Index("ix_camera_gear_name", CameraGear.name),
+    db.Index("ix_consumable_name", Consumable.name),
+    db.Index("ix_lab_equipment_name", LabEquipment.name),
+    # Foreign keys and date windows.
+    db.Index("ix_camera_gear_location_id", CameraGear.location_id),
+    db.Index("ix_camera_gear_checked_out_by", CameraGear.checked_out_by),
+    db.Index("ix_camera_gear_return_date", CameraGear.return_date),
+    db.Index("ix_camera_gear_updated_by", CameraGear.updated_by),
+    db.Index("ix_consumable_location_id", Consumable.location_id),
+    db.Index("ix_consumable_expires", Consumable.expires),
+    db.Index("ix_consumable_updated_by", Consumable.updated_by),
+    db.Index("ix_lab_equipment_last_serviced_on", LabEquipment.last_serviced_on),
+    db.Index("ix_lab_equipment_last_serviced_by", LabEquipment.last_serviced_by),
+    db.Index("ix_lab_equipment_updated_by", LabEquipment.updated_by),
+    db.Index("ix_note_created_by", Note.created_by),
+    db.Index("ix_note_updated_by", Note.updated_by),
+    # Tag -> items; the primary keys only cover item -> tags.
+    db.Index(
+        "ix_camera_gear_tags_tag_id",
+        camera_gear_tags.c.tag_id,
+        camera_gear_tags.c.camera_gear_id,
+    ),
+    db.Index(
+        "ix_lab_equipment_tags_tag_id",
+        lab_equipment_tags.c.tag_id,
+        lab_equipment_tags.c.lab_equipment_id,
+    ),
+    db.Index(
+        "ix_consumable_tags_tag_id",
+        consumable_tags.c.tag_id,
+        consumable_tags.c.consumable_id,
+    ),
+)
+
+
+def ensure_indexes(bind) -> list[str]:
+    """Create any index from :data:`INDEXES` missing on ``bind``.
+
+    Each index is created in its own transaction so one failure (for
+    example a unique index over existing duplicate names) doesn't block
+    the rest. Returns the names of indexes that could not be created.
+    """
+    failed = []
+    for index in INDEXES:
+        try:
+            with bind.begin() as connection:
+                # IF NOT EXISTS rather than checkfirst: reflection can't see
+                # expression indexes such as lower(name) on every backend
+                connection.execute(CreateIndex(index, if_not_exists=True))
+        except SQLAlchemyError:
+            logger.exception("Could not create index %s", index.name)
+            failed.append(index.name)
+    return failed
@@ -0,0 +1,50 @@
+"""Runs of background jobs started by the internal task endpoints.
+
+A :class:`JobRun` is written when a job is enqueued and updated by the
+runner in ``utils.jobs`` as it starts and finishes, so its status,
+timings and per-step outcomes can be polled after the triggering
+request has returned.
+"""
+
+from website import db
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class JobRun(db.Model):
+    """One run of a named job and its outcome."""
+    __tablename__ = "job_run"
+    __table_args__ = (db.Index("ix_job_run_name_created", "name", "created_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default=JOB_QUEUED)
+    created_at = db.Column(db.DateTime, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # one {"name", "outcome", "duration_ms", "error"} entry per step
+    results = db.Column(db.JSON)
+    error = db.Column(db.Text)
+
+    def __repr__(self):
+        return f"<JobRun {self.id} {self.name} {self.status}>"
+
+    def to_dict(self):
+        """Return the run as served by the job status endpoint."""
+        duration_ms = None
+        if self.started_at and self.finished_at:
+            duration_ms = round((self.finished_at - self.started_at).total_seconds() * 1000)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": duration_ms,
+            "results": self.results or [],
+            "error": self.error,
+        }
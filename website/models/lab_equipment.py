@@ -10,6 +10,7 @@ from ..constants import (
 )
 
 from website import db
+from .base import pick_fields, wants
 
 class LabEquipment(db.Model):
     """Represents lab equipment that can be tracked and serviced."""
@@ -45,21 +46,35 @@ class LabEquipment(db.Model):
         uselist=False,
     )
 
-    def to_dict(self):
-        """Return a serializable dict for this LabEquipment instance."""
-        tags = [t.name for t in getattr(self, "tags", [])]
+    def to_dict(self, fields=None):
+        """Return a serializable dict for this LabEquipment instance.
+
+        ``fields`` limits the keys returned; relationships behind keys
+        that aren't requested are not touched (and so not loaded).
+        """
+        tags = []
+        if wants(fields, ITEM_FIELD_TAGS):
+            tags = [t.name for t in getattr(self, "tags", [])]
 
         updater = None
         serviced_by_user = None
         try:
-            if self.updated_by and getattr(self, "updated_by_user", None):
+            if (
+                wants(fields, ITEM_FIELD_UPDATED_BY)
+                and self.updated_by
+                and getattr(self, "updated_by_user", None)
+            ):
                 updater = self.updated_by_user.email
-            if self.last_serviced_by and getattr(self, "last_serviced_by_user", None):
+            if (
+                wants(fields, "last_serviced_by")
+                and self.last_serviced_by
+                and getattr(self, "last_serviced_by_user", None)
+            ):
                 serviced_by_user = self.last_serviced_by_user.email
         except Exception:
             pass
 
-        return {
+        return pick_fields({
             "id": self.id,
             ITEM_FIELD_NAME: self.name,
             ITEM_FIELD_TAGS: tags,
@@ -72,4 +87,4 @@ class LabEquipment(db.Model):
             ),
             "last_serviced_by": serviced_by_user,
             "service_frequency": self.service_frequency,
-        }
+        }, fields)
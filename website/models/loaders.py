@@ -0,0 +1,78 @@
+"""Shared relationship loader options for API queries.
+
+Every model's ``to_dict`` touches a handful of relationships (tags,
+location, the users behind the ``*_by`` columns and, for notes, the
+attached item). Left to the default lazy loading that is one SELECT per
+relationship per row. The options declared here load those relationships
+up-front so a list request costs a fixed number of queries no matter how
+many rows it returns.
+
+Collections use ``selectinload`` (one extra ``IN`` query per collection)
+and many-to-one references use ``joinedload`` (a LEFT OUTER JOIN on the
+main query).
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from ..constants import ITEM_FIELD_TAGS, ITEM_FIELD_UPDATED_BY
+from .camera_gear import CameraGear
+from .consumables import Consumable
+from .lab_equipment import LabEquipment
+from .notes import Note
+
+
+_NOTE_ITEM_OPTIONS = (
+    joinedload(Note.camera_gear),
+    joinedload(Note.lab_equipment),
+    joinedload(Note.consumable),
+)
+
+# loader options keyed by the ``to_dict`` field that needs them
+FIELD_LOADER_OPTIONS = {
+    CameraGear: {
+        ITEM_FIELD_TAGS: (selectinload(CameraGear.tags),),
+        "location": (joinedload(CameraGear.location),),
+        ITEM_FIELD_UPDATED_BY: (joinedload(CameraGear.updated_by_user),),
+        "checked_out_by": (joinedload(CameraGear.checked_out_by_user),),
+    },
+    Consumable: {
+        ITEM_FIELD_TAGS: (selectinload(Consumable.tags),),
+        "location": (joinedload(Consumable.location),),
+        ITEM_FIELD_UPDATED_BY: (joinedload(Consumable.updated_by_user),),
+    },
+    LabEquipment: {
+        ITEM_FIELD_TAGS: (selectinload(LabEquipment.tags),),
+        ITEM_FIELD_UPDATED_BY: (joinedload(LabEquipment.updated_by_user),),
+        "last_serviced_by": (joinedload(LabEquipment.last_serviced_by_user),),
+    },
+    Note: {
+        # the attached item is only reported when its row exists
+        "item_type": _NOTE_ITEM_OPTIONS,
+        "item_id": _NOTE_ITEM_OPTIONS,
+        "item_name": _NOTE_ITEM_OPTIONS,
+        "created_by": (joinedload(Note.created_by_user),),
+        "updated_by": (joinedload(Note.updated_by_user),),
+    },
+}
+
+
+
+def _options_for(model, fields):
+    """Return the distinct loader options behind ``fields`` (all when None)."""
+    by_field = FIELD_LOADER_OPTIONS.get(model, {})
+    keys = by_field if fields is None else [key for key in by_field if key in fields]
+    # several fields can share the same options
+    unique = {id(option): option for key in keys for option in by_field[key]}
+    return tuple(unique.values())
+
+
+LOADER_OPTIONS = {model: _options_for(model, None) for model in FIELD_LOADER_OPTIONS}
+
+
+def eager_query(model, fields=None):
+    """Return ``model.query`` with the relationships used by ``to_dict`` preloaded.
+
+    With ``fields``, only the relationships behind those keys are
+    loaded. Models without declared options get a plain query back.
+    """
+    return model.query.options(*_options_for(model, fields))
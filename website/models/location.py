@@ -6,6 +6,7 @@ Provides the Location SQLAlchemy model used by items and gear.
 from ..constants import LOCATION_ID, LOCATION_NAME
 
 from website import db
+from .base import pick_fields
 
 class Location(db.Model):
     """Simple location record used by items and gear."""
@@ -16,9 +17,12 @@ class Location(db.Model):
         """Return a readable representation for debugging."""
         return f"<Location {self.name}>"
 
-    def to_dict(self):
-        """Return a simple dict representation of the location."""
-        return {
+    def to_dict(self, fields=None):
+        """Return a simple dict representation of the location.
+
+        ``fields`` limits the keys returned.
+        """
+        return pick_fields({
             LOCATION_ID: self.id,
             LOCATION_NAME: self.name,
-        }
+        }, fields)
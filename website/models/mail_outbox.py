@@ -0,0 +1,35 @@
+"""Outgoing mail waiting to be sent.
+
+Code that needs to send mail adds an :class:`OutboxMessage` in the same
+transaction as the change it is about (see ``utils.mail.queue_email``),
+so a rolled back request sends nothing and a committed one can't lose
+its message. The dispatcher in ``utils.outbox`` delivers pending
+messages, retrying failures with backoff.
+"""
+
+from website import db
+
+OUTBOX_PENDING = "pending"
+OUTBOX_SENT = "sent"
+OUTBOX_FAILED = "failed"
+
+
+class OutboxMessage(db.Model):
+    """One email and its delivery state."""
+    __tablename__ = "mail_outbox"
+    __table_args__ = (db.Index("ix_mail_outbox_due", "status", "next_attempt_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    recipients = db.Column(db.JSON, nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(16), nullable=False, default=OUTBOX_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # due time while pending; also pushed forward while a dispatcher holds it
+    next_attempt_at = db.Column(db.DateTime, nullable=False)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False)
+    sent_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"<OutboxMessage {self.id} {self.status} {self.subject!r}>"
@@ -7,6 +7,7 @@ such as camera gear, lab equipment, and consumables.
 from datetime import datetime
 
 from website import db
+from .base import pick_fields, wants
 
 class Note(db.Model):
     """Represents a note that can be attached to inventory items."""
@@ -46,14 +47,27 @@ class Note(db.Model):
         """Return a readable representation for debugging."""
         return f"<Note {self.id}>"
 
-    def to_dict(self):
-        """Return a serializable dict for this Note instance."""
+    def to_dict(self, fields=None):
+        """Return a serializable dict for this Note instance.
+
+        ``fields`` limits the keys returned; the users and item behind
+        keys that aren't requested are not loaded. The attached item is
+        only reported when its row exists.
+        """
         creator = None
         updater = None
         try:
-            if self.created_by and getattr(self, "created_by_user", None):
+            if (
+                wants(fields, "created_by")
+                and self.created_by
+                and getattr(self, "created_by_user", None)
+            ):
                 creator = self.created_by_user.email
-            if self.updated_by and getattr(self, "updated_by_user", None):
+            if (
+                wants(fields, "updated_by")
+                and self.updated_by
+                and getattr(self, "updated_by_user", None)
+            ):
                 updater = self.updated_by_user.email
         except Exception:
             pass
@@ -63,21 +77,22 @@ class Note(db.Model):
         item_id = None
         item_name = None
 
-        try:
-            if self.camera_gear_id and getattr(self, "camera_gear", None):
-                item_type = "camera_gear"
-                item_id = self.camera_gear_id
-                item_name = self.camera_gear.name if self.camera_gear else None
-            elif self.lab_equipment_id and getattr(self, "lab_equipment", None):
-                item_type = "lab_equipment"
-                item_id = self.lab_equipment_id
-                item_name = self.lab_equipment.name if self.lab_equipment else None
-            elif self.consumable_id and getattr(self, "consumable", None):
-                item_type = "consumable"
-                item_id = self.consumable_id
-                item_name = self.consumable.name if self.consumable else None
-        except Exception:
-            pass
+        if any(wants(fields, key) for key in ("item_type", "item_id", "item_name")):
+            try:
+                if self.camera_gear_id and getattr(self, "camera_gear", None):
+                    item_type = "camera_gear"
+                    item_id = self.camera_gear_id
+                    item_name = self.camera_gear.name if self.camera_gear else None
+                elif self.lab_equipment_id and getattr(self, "lab_equipment", None):
+                    item_type = "lab_equipment"
+                    item_id = self.lab_equipment_id
+                    item_name = self.lab_equipment.name if self.lab_equipment else None
+                elif self.consumable_id and getattr(self, "consumable", None):
+                    item_type = "consumable"
+                    item_id = self.consumable_id
+                    item_name = self.consumable.name if self.consumable else None
+            except Exception:
+                pass
 
         # Format timestamps as UTC ISO strings with 'Z' suffix
         created_at_str = None
@@ -87,7 +102,7 @@ class Note(db.Model):
         if self.updated_at:
             updated_at_str = self.updated_at.isoformat() + 'Z' if self.updated_at.tzinfo is None else self.updated_at.isoformat()
 
-        return {
+        return pick_fields({
             "id": self.id,
             "content": self.content,
             "created_at": created_at_str,
@@ -97,4 +112,4 @@ class Note(db.Model):
             "item_type": item_type,
             "item_id": item_id,
             "item_name": item_name,
-        }
+        }, fields)
@@ -0,0 +1,23 @@
+"""Per-table change counters.
+
+Each row counts the committed writes to one table. The counters are
+bumped inside the writing transaction (see ``utils.etag``), so reading
+a handful of them is a cheap way to tell whether anything a response
+depends on has changed. Migrations add a row for each table they
+create (``migrations.seed_table_versions``).
+"""
+
+from website import db
+
+
+class TableVersion(db.Model):
+    """Change counter and last-write time for one table."""
+    __tablename__ = "table_version"
+
+    table_name = db.Column(db.String(100), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<TableVersion {self.table_name} {self.version}>"
+
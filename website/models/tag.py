@@ -6,6 +6,7 @@ Defines Tag model used by items and gear.
 from ..constants import TAG_ID, TAG_NAME
 
 from website import db
+from .base import pick_fields
 
 class Tag(db.Model):
     """Tag used to categorize items and equipment."""
@@ -16,9 +17,12 @@ class Tag(db.Model):
         """Readable representation for the Tag object."""
         return f"<Tag {self.name}>"
 
-    def to_dict(self):
-        """Return a serializable dict for this Tag instance."""
-        return {
+    def to_dict(self, fields=None):
+        """Return a serializable dict for this Tag instance.
+
+        ``fields`` limits the keys returned.
+        """
+        return pick_fields({
             TAG_ID: self.id,
             TAG_NAME: self.name,
-        }
+        }, fields)
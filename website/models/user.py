@@ -8,6 +8,7 @@ from sqlalchemy import Enum
 from ..constants import UserRole
 
 from website import db
+from .base import pick_fields
 
 class User(db.Model, UserMixin):
     """Application user with authentication and role information."""
@@ -22,16 +23,19 @@ class User(db.Model, UserMixin):
         """Return a concise representation for debugging."""
         return f"<User {self.email} Role {self.role}>"
 
-    def to_dict(self):
-        """Return a JSON-serializable representation of the user."""
-        return {
+    def to_dict(self, fields=None):
+        """Return a JSON-serializable representation of the user.
+
+        ``fields`` limits the keys returned.
+        """
+        return pick_fields({
             "id": self.id,
             "first_name": self.first_name,
             "last_name": self.last_name,
             "email": self.email,
             "profile_picture": self.profile_picture,
             "role": self.role.value if self.role else None,
-        }
+        }, fields)
 
     def save(self):
         """Save the user to the database"""
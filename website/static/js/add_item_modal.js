@@ -145,7 +145,9 @@ document.addEventListener("DOMContentLoaded", function () {
   // Fetch all tags from the database
   async function fetchTags() {
     try {
-      const response = await fetch((window.API_PREFIX || "/api/v1") + "/tags/all");
+      const response = await fetch((window.API_PREFIX || "/api/v1") + "/tags/all", {
+        cache: "no-cache",
+      });
       if (!response.ok) {
         throw new Error("Failed to fetch tags");
       }
@@ -161,7 +163,9 @@ document.addEventListener("DOMContentLoaded", function () {
   // Fetch all locations from the database
   async function fetchLocations() {
     try {
-      const response = await fetch((window.API_PREFIX || "/api/v1") + "/location/all");
+      const response = await fetch((window.API_PREFIX || "/api/v1") + "/location/all", {
+        cache: "no-cache",
+      });
       if (!response.ok) {
         throw new Error("Failed to fetch locations");
       }
@@ -40,7 +40,7 @@ document.addEventListener("DOMContentLoaded", function () {
 
 async function fetchUsers() {
     try {
-        const response = await fetch("/admin/users/all");
+        const response = await fetch("/admin/users/all", { cache: "no-cache" });
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
@@ -90,17 +90,27 @@ document.addEventListener("DOMContentLoaded", function () {
   if (typeof loadNotesCache === "function") {
     loadNotesCache();
   }
+
+  // Refresh the current page when someone else changes an item
+  if (typeof LiveEvents !== "undefined") {
+    LiveEvents.watch("camera_gear", async () => {
+      await Pagination.reload();
+      renderPaginatedTable();
+      Pagination.render();
+    });
+  }
 });
 
 // Load all camera gear
 async function loadCameraGear() {
   try {
-    const response = await fetch(`${API_BASE}/all`);
-    const data = await response.json();
-    const gear = data.camera_gear || [];
-
-    // Initialize pagination
-    Pagination.init(gear);
+    // Fetch the first page; further pages are loaded on demand
+    await Pagination.initRemote({
+      url: `${API_BASE}/all`,
+      key: "camera_gear",
+      // only the columns the table shows
+      fields: ["name", "tags", "location", "checked_out_by", "last_updated"],
+    });
     Pagination.setOnPageChange(() => {
       renderPaginatedTable();
     });
@@ -224,7 +234,9 @@ function showEmptyState(message) {
 // Open edit modal
 async function openEditModal(itemId) {
   try {
-    const response = await fetch(`${API_BASE}/one/${itemId}`);
+    const response = await fetch(`${API_BASE}/one/${itemId}`, {
+      cache: "no-cache",
+    });
     if (!response.ok) {
       throw new Error(`Failed to fetch camera gear: ${response.status}`);
     }
@@ -345,13 +357,9 @@ function setupDeleteHandler() {
           );
           if (modal) modal.hide();
 
-          // Remove from pagination data and refresh
-          const allItems = Pagination.getAllItems();
-          const filteredItems = allItems.filter((item) => item.id != itemId);
-          Pagination.init(filteredItems);
-          Pagination.setOnPageChange(() => {
-            renderPaginatedTable();
-          });
+          // Re-fetch the current page so it is topped up from the server
+          Pagination.removeItem(itemId);
+          await Pagination.reload();
           renderPaginatedTable();
           Pagination.render();
         } else {
@@ -368,15 +376,8 @@ function setupDeleteHandler() {
 
 // Add item to table (called from modal)
 window.addCameraGearToTable = function (item) {
-  // Get current items and add new one
-  const allItems = Pagination.getAllItems();
-  allItems.unshift(item);
-
-  // Reinitialize pagination with updated items
-  Pagination.init(allItems);
-  Pagination.setOnPageChange(() => {
-    renderPaginatedTable();
-  });
+  // Show the new item at the top of the current page
+  Pagination.addItem(item);
 
   // Render table and pagination
   renderPaginatedTable();
@@ -390,60 +391,16 @@ window.updateCameraGearInTable = function (data) {
 
 // Filter table
 function filterTable() {
-  const searchValue =
-    document.getElementById("search-input")?.value.toLowerCase() || "";
-  const nameFilter =
-    document.getElementById("filter-name")?.value.toLowerCase() || "";
-  const tagsFilter =
-    document.getElementById("filter-tags")?.value.toLowerCase() || "";
-  const locationFilter =
-    document.getElementById("filter-location")?.value.toLowerCase() || "";
-  const statusFilter = document.getElementById("filter-status")?.value || "";
-
-  // Get all items from pagination
-  const allItems = Pagination.getAllItems();
-
-  // Filter items
-  const filteredItems = allItems.filter((item) => {
-    const itemName = (item.name || "").toLowerCase();
-    const itemTags = Array.isArray(item.tags)
-      ? item.tags.join(", ").toLowerCase()
-      : (item.tags || "").toLowerCase();
-    const itemLocation = (item.location || "").toLowerCase();
-    const isCheckedOut = !!item.checked_out_by;
-    const itemStatus = isCheckedOut ? "checked out" : "available";
-
-    const searchMatch =
-      !searchValue ||
-      itemName.includes(searchValue) ||
-      itemTags.includes(searchValue) ||
-      itemLocation.includes(searchValue);
-
-    const nameMatch = !nameFilter || itemName.includes(nameFilter);
-    const tagsMatch =
-      !tagsFilter || itemTags.includes(tagsFilter.toLowerCase());
-    const locationMatch =
-      !locationFilter || itemLocation.includes(locationFilter);
-    const statusMatch =
-      !statusFilter ||
-      (statusFilter === "available" && !isCheckedOut) ||
-      (statusFilter === "checked-out" && isCheckedOut);
-
-    const hasSpecificFilters =
-      nameFilter || tagsFilter || locationFilter || statusFilter;
-    return (
-      searchMatch &&
-      (!hasSpecificFilters ||
-        (nameMatch && tagsMatch && locationMatch && statusMatch))
-    );
+  const value = (id) => document.getElementById(id)?.value.trim() || "";
+  const status = value("filter-status");
+
+  applyServerFilters({
+    q: value("search-input"),
+    name: value("filter-name"),
+    tag: value("filter-tags"),
+    location: value("filter-location"),
+    checked_out: status ? String(status === "checked-out") : "",
   });
-
-  // Update pagination with filtered items
-  Pagination.setFilteredItems(filteredItems);
-
-  // Re-render table and pagination
-  renderPaginatedTable();
-  Pagination.render();
 }
 
 function clearFilters() {
@@ -454,10 +411,29 @@ function clearFilters() {
   document.getElementById("filter-status").value = "";
 
   // Reset to show all items
-  const allItems = Pagination.getAllItems();
-  Pagination.setFilteredItems(allItems);
-  renderPaginatedTable();
-  Pagination.render();
+  applyServerFilters({});
+}
+
+// Apply filters server-side and reload from the first page. Inputs fire
+// on every keystroke, so requests are debounced.
+let filterTimer = null;
+function applyServerFilters(params) {
+  // Drop empty values so cleared inputs don't filter
+  const query = {};
+  Object.entries(params).forEach(([key, value]) => {
+    if (value) query[key] = value;
+  });
+
+  clearTimeout(filterTimer);
+  filterTimer = setTimeout(async () => {
+    try {
+      await Pagination.setParams(query);
+    } catch (error) {
+      console.error("Failed to filter items:", error);
+    }
+    renderPaginatedTable();
+    Pagination.render();
+  }, 250);
 }
 
 // Make functions global
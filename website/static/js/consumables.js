@@ -3,16 +3,22 @@ const CONSUMABLES_API_BASE = "/api/v1/consumables";
 async function fetchItems() {
   try {
     console.log("Fetching consumables from /consumables/all");
-    const response = await fetch(CONSUMABLES_API_BASE + "/all");
-    if (!response.ok) {
-      throw new Error(`HTTP error! status: ${response.status}`);
-    }
-    const data = await response.json();
-    console.log("Fetched consumables:", data);
-    const items = data.consumables || [];
-
-    // Initialize pagination
-    Pagination.init(items);
+    // Fetch the first page; further pages are loaded on demand
+    await Pagination.initRemote({
+      url: CONSUMABLES_API_BASE + "/all",
+      key: "consumables",
+      // only the columns the table shows
+      fields: [
+        "name",
+        "quantity",
+        "tags",
+        "location",
+        "location_id",
+        "expires",
+        "last_updated",
+        "updated_by",
+      ],
+    });
     Pagination.setOnPageChange(() => {
       renderPaginatedTable();
     });
@@ -181,7 +187,9 @@ function populateTable(items) {
 
 async function openEditModal(itemId) {
   try {
-    const resp = await fetch(`${CONSUMABLES_API_BASE}/one/${itemId}`);
+    const resp = await fetch(`${CONSUMABLES_API_BASE}/one/${itemId}`, {
+      cache: "no-cache",
+    });
     if (!resp.ok)
       throw new Error(`Failed to fetch consumable ${itemId}: ${resp.status}`);
     const data = await resp.json();
@@ -234,15 +242,8 @@ function showEmptyState(message) {
 window.addItemToTable = function (item) {
   console.log("Adding consumable to table:", item);
 
-  // Get current items and add new one
-  const allItems = Pagination.getAllItems();
-  allItems.unshift(item);
-
-  // Reinitialize pagination with updated items
-  Pagination.init(allItems);
-  Pagination.setOnPageChange(() => {
-    renderPaginatedTable();
-  });
+  // Show the new item at the top of the current page
+  Pagination.addItem(item);
 
   // Render table and pagination
   renderPaginatedTable();
@@ -252,64 +253,14 @@ window.addItemToTable = function (item) {
 };
 
 function filterTable() {
-  // Get search input value
-  const searchValue =
-    document.getElementById("search-input")?.value.toLowerCase() || "";
-
-  // Get specific filter values
-  const nameFilter =
-    document.getElementById("filter-name")?.value.toLowerCase() || "";
-  const tagsFilter =
-    document.getElementById("filter-tags")?.value.toLowerCase() || "";
-  const locationFilter =
-    document.getElementById("filter-location")?.value.toLowerCase() || "";
-
-  // Get all items from pagination
-  const allItems = Pagination.getAllItems();
-
-  // Filter items
-  const filteredItems = allItems.filter((item) => {
-    const itemName = (item.name || "").toLowerCase();
-    const itemTags = formatTagsDisplay(item.tags).toLowerCase();
-    const itemLocation = getLocationDisplay(item).toLowerCase();
-
-    // Search input searches across all fields
-    const searchMatch =
-      !searchValue ||
-      itemName.includes(searchValue) ||
-      itemTags.includes(searchValue) ||
-      itemLocation.includes(searchValue);
-
-    // Specific filters take precedence if they have values
-    const nameMatch = !nameFilter || itemName.includes(nameFilter);
-
-    // Handle comma-separated tags: split by comma, trim, and check if any match
-    let tagsMatch = true;
-    if (tagsFilter) {
-      const filterTags = tagsFilter
-        .split(",")
-        .map((tag) => tag.trim())
-        .filter((tag) => tag.length > 0);
-      tagsMatch = filterTags.some((tag) => itemTags.includes(tag));
-    }
+  const value = (id) => document.getElementById(id)?.value.trim() || "";
 
-    const locationMatch =
-      !locationFilter || itemLocation.includes(locationFilter);
-
-    // Show if search matches or all specific filters match (if any have values)
-    const hasSpecificFilters = nameFilter || tagsFilter || locationFilter;
-    return (
-      searchMatch &&
-      (!hasSpecificFilters || (nameMatch && tagsMatch && locationMatch))
-    );
+  applyServerFilters({
+    q: value("search-input"),
+    name: value("filter-name"),
+    tag: value("filter-tags"),
+    location: value("filter-location"),
   });
-
-  // Update pagination with filtered items
-  Pagination.setFilteredItems(filteredItems);
-
-  // Re-render table and pagination
-  renderPaginatedTable();
-  Pagination.render();
 }
 
 function clearFilters() {
@@ -319,10 +270,29 @@ function clearFilters() {
   document.getElementById("filter-location").value = "";
 
   // Reset to show all items
-  const allItems = Pagination.getAllItems();
-  Pagination.setFilteredItems(allItems);
-  renderPaginatedTable();
-  Pagination.render();
+  applyServerFilters({});
+}
+
+// Apply filters server-side and reload from the first page. Inputs fire
+// on every keystroke, so requests are debounced.
+let filterTimer = null;
+function applyServerFilters(params) {
+  // Drop empty values so cleared inputs don't filter
+  const query = {};
+  Object.entries(params).forEach(([key, value]) => {
+    if (value) query[key] = value;
+  });
+
+  clearTimeout(filterTimer);
+  filterTimer = setTimeout(async () => {
+    try {
+      await Pagination.setParams(query);
+    } catch (error) {
+      console.error("Failed to filter items:", error);
+    }
+    renderPaginatedTable();
+    Pagination.render();
+  }, 250);
 }
 
 // Make functions global for HTML onclick handlers
@@ -388,6 +358,15 @@ document.addEventListener("DOMContentLoaded", () => {
     loadNotesCache();
   }
 
+  // Refresh the current page when someone else changes an item
+  if (typeof LiveEvents !== "undefined") {
+    LiveEvents.watch("consumable", async () => {
+      await Pagination.reload();
+      renderPaginatedTable();
+      Pagination.render();
+    });
+  }
+
   // Set up delete confirmation button handler
   const confirmDeleteBtn = document.getElementById("confirmDeleteBtn");
   if (confirmDeleteBtn) {
@@ -428,16 +407,10 @@ document.addEventListener("DOMContentLoaded", () => {
           );
           if (deleteBtn) {
             row.classList.add("table-danger");
-            setTimeout(() => {
-              // Remove from pagination data and refresh
-              const allItems = Pagination.getAllItems();
-              const filteredItems = allItems.filter(
-                (item) => item.id != itemId
-              );
-              Pagination.init(filteredItems);
-              Pagination.setOnPageChange(() => {
-                renderPaginatedTable();
-              });
+            setTimeout(async () => {
+              // Re-fetch the current page so it is topped up from the server
+              Pagination.removeItem(itemId);
+              await Pagination.reload();
               renderPaginatedTable();
               Pagination.render();
             }, 500);
@@ -0,0 +1,57 @@
+/**
+ * Live table updates from the `/api/v1/events` Server-Sent Events stream.
+ *
+ * `LiveEvents.watch(type, onChange)` calls `onChange` (debounced) when an
+ * item of `type` is created, updated or deleted by anyone, and refreshes
+ * the notes cache when a note changes. A `resync` event means some events
+ * were missed, so both are refreshed. The browser reconnects on its own
+ * (sending Last-Event-ID) whenever the stream ends.
+ */
+const LiveEvents = (function () {
+  const EVENTS_URL = "/api/v1/events/";
+  const DEBOUNCE_MS = 300;
+
+  let source = null;
+  const watchers = [];
+
+  function debounce(fn) {
+    let timer = null;
+    return () => {
+      clearTimeout(timer);
+      timer = setTimeout(fn, DEBOUNCE_MS);
+    };
+  }
+
+  const refreshNotes = debounce(() => {
+    if (typeof refreshNotesCache === "function") refreshNotesCache();
+  });
+
+  function connect() {
+    if (source || typeof EventSource === "undefined") return;
+    source = new EventSource(EVENTS_URL);
+
+    source.addEventListener("change", (message) => {
+      const event = JSON.parse(message.data);
+      if (event.type === "note") {
+        refreshNotes();
+        return;
+      }
+      watchers
+        .filter((watcher) => watcher.type === event.type)
+        .forEach((watcher) => watcher.refresh());
+    });
+
+    source.addEventListener("resync", () => {
+      refreshNotes();
+      watchers.forEach((watcher) => watcher.refresh());
+    });
+  }
+
+  // Call `onChange` when items of `type` change.
+  function watch(type, onChange) {
+    watchers.push({ type, refresh: debounce(onChange) });
+    connect();
+  }
+
+  return { watch };
+})();
@@ -5,7 +5,10 @@ window.API_PREFIX = API_PREFIX; // Make it available globally
 async function fetchItems() {
   try {
     console.log("Fetching items from /items/all");
-    const response = await fetch(API_PREFIX + "/items/all");
+    const response = await fetch(API_PREFIX + "/items/all", {
+      // revalidate with If-None-Match; the server answers 304 when nothing changed
+      cache: "no-cache",
+    });
     if (!response.ok) {
       throw new Error(`HTTP error! status: ${response.status}`);
     }
@@ -43,17 +43,34 @@ document.addEventListener("DOMContentLoaded", function () {
   if (typeof loadNotesCache === "function") {
     loadNotesCache();
   }
+
+  // Refresh the current page when someone else changes an item
+  if (typeof LiveEvents !== "undefined") {
+    LiveEvents.watch("lab_equipment", async () => {
+      await Pagination.reload();
+      renderPaginatedTable();
+      Pagination.render();
+    });
+  }
 });
 
 // Load all equipment
 async function loadEquipment() {
   try {
-    const response = await fetch(`${API_BASE}/all`);
-    const data = await response.json();
-    const equipment = data.lab_equipment || [];
-
-    // Initialize pagination
-    Pagination.init(equipment);
+    // Fetch the first page; further pages are loaded on demand
+    await Pagination.initRemote({
+      url: `${API_BASE}/all`,
+      key: "lab_equipment",
+      // only the columns the table shows
+      fields: [
+        "name",
+        "tags",
+        "last_updated",
+        "last_serviced_on",
+        "last_serviced_by",
+        "service_frequency",
+      ],
+    });
     Pagination.setOnPageChange(() => {
       renderPaginatedTable();
     });
@@ -148,7 +165,9 @@ function showEmptyState(message) {
 // Open edit modal
 async function openEditModal(itemId) {
   try {
-    const response = await fetch(`${API_BASE}/one/${itemId}`);
+    const response = await fetch(`${API_BASE}/one/${itemId}`, {
+      cache: "no-cache",
+    });
     if (!response.ok) {
       throw new Error(`Failed to fetch equipment: ${response.status}`);
     }
@@ -217,13 +236,9 @@ function setupDeleteHandler() {
           );
           if (modal) modal.hide();
 
-          // Remove from pagination data and refresh
-          const allItems = Pagination.getAllItems();
-          const filteredItems = allItems.filter((item) => item.id != itemId);
-          Pagination.init(filteredItems);
-          Pagination.setOnPageChange(() => {
-            renderPaginatedTable();
-          });
+          // Re-fetch the current page so it is topped up from the server
+          Pagination.removeItem(itemId);
+          await Pagination.reload();
           renderPaginatedTable();
           Pagination.render();
         } else {
@@ -241,15 +256,8 @@ function setupDeleteHandler() {
 
 // Add item to table (called from modal)
 window.addLabEquipmentToTable = function (item) {
-  // Get current items and add new one
-  const allItems = Pagination.getAllItems();
-  allItems.unshift(item);
-
-  // Reinitialize pagination with updated items
-  Pagination.init(allItems);
-  Pagination.setOnPageChange(() => {
-    renderPaginatedTable();
-  });
+  // Show the new item at the top of the current page
+  Pagination.addItem(item);
 
   // Render table and pagination
   renderPaginatedTable();
@@ -263,52 +271,14 @@ window.updateLabEquipmentInTable = function (data) {
 
 // Filter table
 function filterTable() {
-  const searchValue =
-    document.getElementById("search-input")?.value.toLowerCase() || "";
-  const nameFilter =
-    document.getElementById("filter-name")?.value.toLowerCase() || "";
-  const tagsFilter =
-    document.getElementById("filter-tags")?.value.toLowerCase() || "";
-  const serviceFrequencyFilter =
-    document.getElementById("filter-service-frequency")?.value || "";
-
-  // Get all items from pagination
-  const allItems = Pagination.getAllItems();
-
-  // Filter items
-  const filteredItems = allItems.filter((item) => {
-    const itemName = (item.name || "").toLowerCase();
-    const itemTags = Array.isArray(item.tags)
-      ? item.tags.join(", ").toLowerCase()
-      : (item.tags || "").toLowerCase();
-    const itemServiceFreq = (item.service_frequency || "").toLowerCase();
-
-    const searchMatch =
-      !searchValue ||
-      itemName.includes(searchValue) ||
-      itemTags.includes(searchValue);
-
-    const nameMatch = !nameFilter || itemName.includes(nameFilter);
-    const tagsMatch =
-      !tagsFilter || itemTags.includes(tagsFilter.toLowerCase());
-    const serviceFreqMatch =
-      !serviceFrequencyFilter ||
-      itemServiceFreq.includes(serviceFrequencyFilter.toLowerCase());
-
-    const hasSpecificFilters =
-      nameFilter || tagsFilter || serviceFrequencyFilter;
-    return (
-      searchMatch &&
-      (!hasSpecificFilters || (nameMatch && tagsMatch && serviceFreqMatch))
-    );
-  });
+  const value = (id) => document.getElementById(id)?.value.trim() || "";
 
-  // Update pagination with filtered items
-  Pagination.setFilteredItems(filteredItems);
-
-  // Re-render table and pagination
-  renderPaginatedTable();
-  Pagination.render();
+  applyServerFilters({
+    q: value("search-input"),
+    name: value("filter-name"),
+    tag: value("filter-tags"),
+    service_frequency: value("filter-service-frequency"),
+  });
 }
 
 function clearFilters() {
@@ -318,10 +288,29 @@ function clearFilters() {
   document.getElementById("filter-service-frequency").value = "";
 
   // Reset to show all items
-  const allItems = Pagination.getAllItems();
-  Pagination.setFilteredItems(allItems);
-  renderPaginatedTable();
-  Pagination.render();
+  applyServerFilters({});
+}
+
+// Apply filters server-side and reload from the first page. Inputs fire
+// on every keystroke, so requests are debounced.
+let filterTimer = null;
+function applyServerFilters(params) {
+  // Drop empty values so cleared inputs don't filter
+  const query = {};
+  Object.entries(params).forEach(([key, value]) => {
+    if (value) query[key] = value;
+  });
+
+  clearTimeout(filterTimer);
+  filterTimer = setTimeout(async () => {
+    try {
+      await Pagination.setParams(query);
+    } catch (error) {
+      console.error("Failed to filter items:", error);
+    }
+    renderPaginatedTable();
+    Pagination.render();
+  }, 250);
 }
 
 // Make functions global
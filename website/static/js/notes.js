@@ -48,7 +48,8 @@ async function loadNoteForItem(itemType, itemId) {
     showNotesLoading(true);
 
     const response = await fetch(
-      `${NOTES_API_BASE}/by-item/${itemType}/${itemId}`
+      `${NOTES_API_BASE}/by-item/${itemType}/${itemId}`,
+      { cache: "no-cache" }
     );
 
     if (response.status === 404 || response.status === 200) {
@@ -447,7 +448,10 @@ function hideNotesAlert() {
  */
 async function loadNotesCache() {
   try {
-    const response = await fetch(`${NOTES_API_BASE}/all`);
+    // only which items have a note is needed, not the note contents
+    const response = await fetch(`${NOTES_API_BASE}/all?fields=item_type,item_id`, {
+      cache: "no-cache",
+    });
     if (response.ok) {
       const data = await response.json();
       const notes = data.notes || [];
@@ -1,5 +1,11 @@
 /**
- * Manages pagination state and rendering for the items table
+ * Manages pagination state and rendering for the items table.
+ *
+ * Two modes are supported:
+ *  - local:  `init(items)` pages through an array already in memory.
+ *  - remote: `initRemote({ url, key })` fetches one page at a time from a
+ *            list endpoint using `?limit=&after=` keyset cursors. `fields`
+ *            (optional) limits the keys the server returns per row.
  */
 const Pagination = (function () {
   // Private state
@@ -9,12 +15,63 @@ const Pagination = (function () {
   const itemsPerPage = 10;
   let onPageChangeCallback = null;
 
+  // Remote mode state. `cursors[n]` is the `after` cursor for page n + 1.
+  let remote = null;
+
   function init(items) {
+    remote = null;
     allItems = items || [];
     filteredItems = [...allItems];
     currentPage = 1;
   }
 
+  function isRemote() {
+    return remote !== null;
+  }
+
+  async function fetchPage(page) {
+    const query = new URLSearchParams(remote.params);
+    query.set("limit", itemsPerPage);
+    if (remote.fields) query.set("fields", remote.fields.join(","));
+    const cursor = remote.cursors[page - 1];
+    if (cursor) query.set("after", cursor);
+
+    const response = await fetch(`${remote.url}?${query.toString()}`, {
+      // revalidate with If-None-Match; unchanged pages come back as 304
+      cache: "no-cache",
+    });
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const data = await response.json();
+
+    allItems = data[remote.key] || [];
+    filteredItems = [...allItems];
+    currentPage = page;
+    remote.cursors[page] = data.next_cursor || null;
+    remote.cursors.length = page + 1;
+  }
+
+  // Switch to remote mode and load the first page.
+  async function initRemote({ url, key, params = {}, fields = null }) {
+    remote = { url, key, params, fields, cursors: [null] };
+    await fetchPage(1);
+  }
+
+  // Replace the query parameters (filters, sort) and reload from page 1.
+  async function setParams(params) {
+    if (!remote) return;
+    remote.params = params || {};
+    remote.cursors = [null];
+    await fetchPage(1);
+  }
+
+  // Re-fetch the current page, e.g. after an edit or delete.
+  async function reload() {
+    if (!remote) return;
+    await fetchPage(Math.min(currentPage, remote.cursors.length));
+  }
+
   function setFilteredItems(items) {
     filteredItems = items || [];
     currentPage = 1; // Reset to first page when filtering
@@ -29,6 +86,7 @@ const Pagination = (function () {
   }
 
   function getCurrentPageItems() {
+    if (remote) return filteredItems;
     const startIndex = (currentPage - 1) * itemsPerPage;
     const endIndex = startIndex + itemsPerPage;
     return filteredItems.slice(startIndex, endIndex);
@@ -39,6 +97,10 @@ const Pagination = (function () {
   }
 
   function getTotalPages() {
+    if (remote) {
+      // Only pages we hold a cursor for are reachable.
+      return remote.cursors[currentPage] ? currentPage + 1 : currentPage;
+    }
     return Math.ceil(filteredItems.length / itemsPerPage);
   }
 
@@ -49,7 +111,12 @@ const Pagination = (function () {
   function addItem(item) {
     allItems.unshift(item);
     filteredItems = [...allItems];
-    currentPage = 1; // Reset to first page to show new item
+    if (!remote) currentPage = 1; // Reset to first page to show new item
+  }
+
+  function removeItem(itemId) {
+    allItems = allItems.filter((item) => item.id != itemId);
+    filteredItems = filteredItems.filter((item) => item.id != itemId);
   }
 
   function updateItem(updatedItem) {
@@ -81,11 +148,20 @@ const Pagination = (function () {
     onPageChangeCallback = callback;
   }
 
-  function goToPage(page) {
+  async function goToPage(page) {
     const totalPages = getTotalPages();
     if (page < 1 || page > totalPages) return;
 
-    currentPage = page;
+    if (remote) {
+      try {
+        await fetchPage(page);
+      } catch (error) {
+        console.error("Failed to load page:", error);
+        return;
+      }
+    } else {
+      currentPage = page;
+    }
 
     // Call callback if set
     if (onPageChangeCallback && typeof onPageChangeCallback === "function") {
@@ -105,6 +181,22 @@ const Pagination = (function () {
     currentPage = 1;
   }
 
+  function summaryText() {
+    if (remote) {
+      const first = (currentPage - 1) * itemsPerPage + 1;
+      return `Showing ${first} - ${first + filteredItems.length - 1}${
+        remote.cursors[currentPage] ? " (more available)" : ""
+      }`;
+    }
+    return `Showing ${Math.min(
+      (currentPage - 1) * itemsPerPage + 1,
+      filteredItems.length
+    )} - ${Math.min(
+      currentPage * itemsPerPage,
+      filteredItems.length
+    )} of ${filteredItems.length} items`;
+  }
+
   function render(containerId = "pagination-container") {
     const paginationContainer = document.getElementById(containerId);
     if (!paginationContainer) return;
@@ -188,13 +280,7 @@ const Pagination = (function () {
           </ul>
         </nav>
         <div class="text-center mt-2 text-muted small">
-          Showing ${Math.min(
-            (currentPage - 1) * itemsPerPage + 1,
-            filteredItems.length
-          )} - ${Math.min(
-      currentPage * itemsPerPage,
-      filteredItems.length
-    )} of ${filteredItems.length} items
+          ${summaryText()}
         </div>
       `;
 
@@ -203,6 +289,10 @@ const Pagination = (function () {
 
   return {
     init,
+    initRemote,
+    isRemote,
+    setParams,
+    reload,
     setFilteredItems,
     getAllItems,
     getFilteredItems,
@@ -211,6 +301,7 @@ const Pagination = (function () {
     getTotalPages,
     getItemsPerPage,
     addItem,
+    removeItem,
     updateItem,
     setOnPageChange,
     goToPage,
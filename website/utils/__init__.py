@@ -7,3 +7,10 @@ import them from ``utils`` directly.
 from .role_decorators import *
 from .mail import *
 from .tasks import *
+from .pagination import *
+from .filters import *
+from .tags import *
+from .bulk import *
+from .etag import *
+from .projection import *
+from .changes import *
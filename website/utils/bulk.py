@@ -0,0 +1,356 @@
+"""Batch create/update/delete helpers behind the ``/bulk`` endpoints.
+
+Each blueprint supplies a row parser that turns one JSON object into
+column values (the same validation its single-row endpoint does) and
+these helpers do the batch work in a single transaction:
+
+* create: one ``INSERT ... RETURNING`` executed as a multi-row insert,
+  tags resolved once for the whole batch and the association rows
+  inserted with one executemany.
+* update: targets loaded with one ``IN`` query, changes flushed together
+  so the ORM groups them into executemany ``UPDATE`` statements.
+* delete: targets and the relationships the delete cascades through
+  loaded up-front, then removed in one flush.
+
+Rows that fail validation are reported and skipped; the rest are
+written. Every helper returns ``(results, objects)`` where ``results``
+has one entry per input row, in input order.
+"""
+
+from datetime import datetime
+
+from flask import request
+from flask_login import current_user
+from sqlalchemy import func, insert
+from sqlalchemy.orm import selectinload
+
+from website import db
+from ..constants import DELETE, ERROR_BAD_REQUEST, ITEM_FIELD_TAGS, PATCH, POST
+from ..models import Location
+from .changes import log_inserted
+from .events import queue_inserted
+from .search import index_objects
+from .tags import resolve_tags
+
+BULK_ITEMS_KEY = "items"
+BULK_RESULTS_KEY = "results"
+MAX_BULK_ROWS = 5000
+
+STATUS_CREATED = "created"
+STATUS_UPDATED = "updated"
+STATUS_DELETED = "deleted"
+STATUS_ERROR = "error"
+STATUS_NOT_FOUND = "not_found"
+
+
+class BulkError(ValueError):
+    """Raised when a bulk request body can't be processed at all."""
+
+
+class RowError(ValueError):
+    """Raised by row parsers when a single row is invalid."""
+
+
+def parse_bulk_body(data):
+    """Return the list of rows from a bulk request body.
+
+    Accepts either a bare JSON array or ``{"items": [...]}``.
+    """
+    rows = data.get(BULK_ITEMS_KEY) if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        raise BulkError("Request body must be a JSON array of rows")
+    if not rows:
+        raise BulkError("No rows given")
+    if len(rows) > MAX_BULK_ROWS:
+        raise BulkError(f"At most {MAX_BULK_ROWS} rows per request")
+    return rows
+
+
+def parse_bulk_ids(rows):
+    """Return integer ids from a list of ids or ``{"id": ...}`` objects.
+
+    Invalid entries map to None so callers can report them per row.
+    """
+    ids = []
+    for row in rows:
+        raw = row.get("id") if isinstance(row, dict) else row
+        ids.append(raw if isinstance(raw, int) and not isinstance(raw, bool) else None)
+    return ids
+
+
+def row_text(row, field, required=True):
+    """Return a stripped string field, raising RowError when required and blank."""
+    value = row.get(field)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise RowError(f"'{field}' is required")
+        return None
+    if not isinstance(value, str):
+        raise RowError(f"'{field}' must be a string")
+    return value.strip()
+
+
+def row_int(row, field, default=None):
+    """Return an integer field (None/"" give ``default``)."""
+    value = row.get(field)
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        raise RowError(f"'{field}' must be an integer")
+    try:
+        return int(value)
+    except (TypeError, ValueError) as exc:
+        raise RowError(f"'{field}' must be an integer") from exc
+
+
+def row_date(row, field):
+    """Return an ISO date field as a ``date`` (None/"" give None)."""
+    value = row.get(field)
+    if value is None or value == "":
+        return None
+    try:
+        return datetime.fromisoformat(value).date()
+    except (TypeError, ValueError) as exc:
+        raise RowError(f"'{field}' must be an ISO date (YYYY-MM-DD)") from exc
+
+
+def _error(index, message, status=STATUS_ERROR):
+    return {"index": index, "status": status, "error": message}
+
+
+def _stamp(model, values):
+    """Fill in the audit columns the single-row endpoints set."""
+    if hasattr(model, "last_updated"):
+        values["last_updated"] = datetime.now()
+    if hasattr(model, "updated_by"):
+        values["updated_by"] = current_user.id
+    return values
+
+
+def _parse_rows(model, rows, parse_row, partial):
+    """Run ``parse_row`` over ``rows``; return ``(parsed, errors)``.
+
+    ``parsed`` holds ``(index, values, tag_names)`` tuples.
+    """
+    parsed, errors = [], {}
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors[index] = _error(index, "Row must be an object")
+            continue
+        try:
+            values = parse_row(row, partial)
+        except RowError as exc:
+            errors[index] = _error(index, str(exc))
+            continue
+        tag_names = values.pop(ITEM_FIELD_TAGS, None)
+        if tag_names is not None and not isinstance(tag_names, list):
+            errors[index] = _error(index, "'tags' must be a list of names")
+            continue
+        parsed.append((index, _stamp(model, values), tag_names))
+    _check_locations(parsed, errors)
+    return [p for p in parsed if p[0] not in errors], errors
+
+
+def _check_locations(parsed, errors):
+    """Reject rows that reference a location that doesn't exist (one query)."""
+    wanted = {values["location_id"] for _, values, _ in parsed if values.get("location_id")}
+    if not wanted:
+        return
+    known = {row[0] for row in db.session.query(Location.id).filter(Location.id.in_(wanted))}
+    for index, values, _ in parsed:
+        if values.get("location_id") and values["location_id"] not in known:
+            errors[index] = _error(index, "Location not found")
+
+
+def _check_unique_names(model, parsed, errors, ids=None):
+    """Reject names that repeat (ignoring case) in the batch or in the table.
+
+    For updates ``ids`` maps row index to target id so a row may keep or
+    re-case its own name.
+    """
+    named = [(i, values["name"]) for i, values, _ in parsed if values.get("name")]
+    if not named:
+        return
+    existing = dict(
+        db.session.query(func.lower(model.name), model.id).filter(
+            func.lower(model.name).in_({name.lower() for _, name in named})
+        )
+    )
+    seen = set()
+    for index, name in named:
+        key = name.lower()
+        owner = existing.get(key)
+        if key in seen or (owner is not None and (ids is None or owner != ids[index])):
+            errors[index] = _error(index, f"'{name}' already exists")
+        seen.add(key)
+
+
+def _resolve_batch_tags(parsed):
+    """Resolve every tag name used in the batch at once; key by lower name."""
+    names = [name for _, _, tag_names in parsed for name in (tag_names or [])]
+    return {tag.name.lower(): tag for tag in resolve_tags(names)}
+
+
+def _row_tags(tag_names, by_name):
+    tags, seen = [], set()
+    for name in tag_names or []:
+        tag = by_name.get(name.strip().lower()) if isinstance(name, str) else None
+        if tag is not None and tag.id not in seen:
+            seen.add(tag.id)
+            tags.append(tag)
+    return tags
+
+
+def _ordered(results, errors, count):
+    merged = {**results, **errors}
+    return [merged[i] for i in range(count)]
+
+
+def insert_items(model, values, tag_ids=None):
+    """Insert one ``model`` row per dict in ``values`` and return the new objects.
+
+    ``tag_ids`` optionally lists the tag ids to link to each new row
+    (same order as ``values``). Rows are inserted with one ordered
+    ``INSERT ... RETURNING`` and the links with one executemany. Nothing
+    is committed.
+    """
+    created = db.session.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True), values
+    ).all()
+    if tag_ids and hasattr(model, "tags"):
+        relationship = model.tags.property
+        (_, item_column), = relationship.synchronize_pairs
+        (_, tag_column), = relationship.secondary_synchronize_pairs
+        links = [
+            {item_column.name: obj.id, tag_column.name: tag_id}
+            for obj, row_tag_ids in zip(created, tag_ids)
+            for tag_id in row_tag_ids
+        ]
+        if links:
+            db.session.execute(relationship.secondary.insert(), links)
+    index_objects(db.session, created)
+    log_inserted(db.session, created)
+    queue_inserted(db.session, created)
+    return created
+
+
+def bulk_create(model, rows, parse_row, unique_name=False, on_written=None):
+    """Insert every valid row of ``rows`` as ``model`` in one transaction.
+
+    ``unique_name`` reports case-insensitive name clashes per row instead
+    of letting the unique index fail the whole batch. ``on_written`` is
+    called with the new objects before the commit.
+    """
+    parsed, errors = _parse_rows(model, rows, parse_row, partial=False)
+    if unique_name:
+        _check_unique_names(model, parsed, errors)
+        parsed = [p for p in parsed if p[0] not in errors]
+    created = []
+    results = {}
+    if parsed:
+        by_name = _resolve_batch_tags(parsed)
+        created = insert_items(
+            model,
+            [values for _, values, _ in parsed],
+            [[t.id for t in _row_tags(tag_names, by_name)] for _, _, tag_names in parsed],
+        )
+        for obj, (index, _, _) in zip(created, parsed):
+            results[index] = {"index": index, "status": STATUS_CREATED, "id": obj.id}
+        if on_written is not None:
+            on_written(created)
+    db.session.commit()
+    return _ordered(results, errors, len(rows)), created
+
+
+def bulk_update(model, rows, parse_row, unique_name=False, on_written=None):
+    """Apply every valid partial update in ``rows`` in one transaction.
+
+    ``on_written`` is called with the updated objects before the commit.
+    """
+    ids = parse_bulk_ids(rows)
+    errors = {i: _error(i, "Row needs an integer 'id'") for i, v in enumerate(ids) if v is None}
+    parsed, row_errors = _parse_rows(model, rows, parse_row, partial=True)
+    errors.update(row_errors)
+    parsed = [p for p in parsed if p[0] not in errors]
+    if unique_name:
+        _check_unique_names(model, parsed, errors, ids)
+        parsed = [p for p in parsed if p[0] not in errors]
+
+    query = model.query
+    if hasattr(model, "tags"):
+        query = query.options(selectinload(model.tags))
+    targets = {obj.id: obj for obj in query.filter(model.id.in_([ids[i] for i, _, _ in parsed]))}
+    by_name = _resolve_batch_tags(parsed)
+
+    results, updated = {}, []
+    for index, values, tag_names in parsed:
+        obj = targets.get(ids[index])
+        if obj is None:
+            errors[index] = _error(index, "Not found", STATUS_NOT_FOUND)
+            continue
+        for key, value in values.items():
+            setattr(obj, key, value)
+        if tag_names is not None:
+            obj.tags = _row_tags(tag_names, by_name)
+        updated.append(obj)
+        results[index] = {"index": index, "status": STATUS_UPDATED, "id": obj.id}
+    if on_written is not None and updated:
+        on_written(updated)
+    db.session.commit()
+    return _ordered(results, errors, len(rows)), updated
+
+
+def _delete_options(model):
+    """Load the relationships a delete cascades through or must unlink."""
+    return [
+        selectinload(getattr(model, rel.key))
+        for rel in db.inspect(model).relationships
+        if rel.direction.name != "MANYTOONE"
+    ]
+
+
+def bulk_delete(model, rows):
+    """Delete every listed row of ``model`` in one transaction."""
+    ids = parse_bulk_ids(rows)
+    errors = {i: _error(i, "Row needs an integer 'id'") for i, v in enumerate(ids) if v is None}
+    wanted = [v for v in ids if v is not None]
+    targets = {
+        obj.id: obj
+        for obj in model.query.options(*_delete_options(model)).filter(model.id.in_(wanted))
+    }
+    results, deleted = {}, set()
+    for index, ident in enumerate(ids):
+        if ident is None:
+            continue
+        obj = targets.get(ident)
+        if obj is None:
+            errors[index] = _error(index, "Not found", STATUS_NOT_FOUND)
+            continue
+        if ident not in deleted:
+            db.session.delete(obj)
+            deleted.add(ident)
+        results[index] = {"index": index, "status": STATUS_DELETED, "id": ident}
+    db.session.commit()
+    return _ordered(results, errors, len(rows)), [targets[i] for i in deleted]
+
+
+def bulk_response(model, parse_row, unique_name=False, on_written=None):
+    """Run the bulk operation matching the request method and build the response.
+
+    POST creates, PATCH updates and DELETE deletes. ``on_written`` is
+    called with the created or updated objects before the commit, so
+    whatever it writes (such as queued mail) commits with them.
+    """
+    try:
+        rows = parse_bulk_body(request.get_json(silent=True))
+    except BulkError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    if request.method == POST:
+        results = bulk_create(model, rows, parse_row, unique_name, on_written)[0]
+    elif request.method == PATCH:
+        results = bulk_update(model, rows, parse_row, unique_name, on_written)[0]
+    elif request.method == DELETE:
+        results = bulk_delete(model, rows)[0]
+    else:  # pragma: no cover - routes only register the three methods
+        return {"error": "Unsupported method"}, ERROR_BAD_REQUEST
+    return {BULK_RESULTS_KEY: results}
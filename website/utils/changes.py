@@ -0,0 +1,294 @@
+"""Change log and delta sync for the item tables.
+
+Writes to camera gear, consumables and lab equipment append entries to
+:class:`~website.models.ChangeLog` on the writing connection, so they
+commit or roll back with the change itself:
+
+* ``after_flush`` logs inserted, updated and deleted rows of the unit
+  of work. Renaming or deleting a tag or location also logs the items
+  that show it, since their serialized form changes.
+* ``do_orm_execute`` logs the rows matched by ``update()``/``delete()``
+  statements (looked up just before they run).
+* Rows created with ``INSERT ... RETURNING`` outside the unit of work
+  are passed to :func:`log_inserted` by the caller.
+
+:func:`changes_response` serves ``GET <prefix>/changes?since=<cursor>``:
+the current form of every row written after the cursor, the ids of rows
+deleted since, and the cursor to send next time. Without ``since`` it
+returns a full snapshot to start from.
+
+Every entry for a table is written after bumping that table's
+``table_version`` row in the same transaction (``utils.etag`` does it
+earlier in the flush; :func:`_log_related` does it itself for the item
+tables a tag or location change touches), so writers to one table are
+serialized and its sequence numbers are handed out in commit order.
+Writers to different tables are not, so a cursor only ever covers one
+table: its ``head`` is the newest entry *for that table*, and a
+late-committing write to another table can't be skipped past.
+"""
+
+from datetime import datetime, timedelta
+
+from flask import request
+from sqlalchemy import and_, delete, event, func, insert, literal, select
+
+from website import db
+from ..constants import ERROR_BAD_REQUEST, ERROR_GONE
+from ..models import (
+    CameraGear,
+    ChangeLog,
+    Consumable,
+    LabEquipment,
+    Location,
+    Tag,
+    camera_gear_tags,
+    consumable_tags,
+    lab_equipment_tags,
+)
+# imported (with its session hooks, which must run before the ones below)
+# to take each table's ``table_version`` row before logging to it
+from .etag import bump_table_versions
+from .filters import FilterError
+from .pagination import PaginationError, decode_cursor, encode_cursor
+from .projection import parse_fields, projected_query, serialize_row
+
+CHANGES_SINCE_ARG = "since"
+CHANGES_DELETED_KEY = "deleted"
+CHANGES_CURSOR_KEY = "cursor"
+DEFAULT_CHANGE_RETENTION_DAYS = 30
+
+TRACKED_MODELS = (CameraGear, Consumable, LabEquipment)
+
+_LOG = ChangeLog.__table__
+_TRACKED_TABLES = {model.__table__.name: model for model in TRACKED_MODELS}
+_TAG_LINKS = {
+    CameraGear: camera_gear_tags.c.camera_gear_id,
+    Consumable: consumable_tags.c.consumable_id,
+    LabEquipment: lab_equipment_tags.c.lab_equipment_id,
+}
+
+
+class ChangesError(ValueError):
+    """Raised when a ``since`` cursor can't be used."""
+
+
+class ChangesExpired(ChangesError):
+    """Raised when the entries after a cursor have been pruned."""
+
+
+def log_changes(connection, table_name, row_ids, deleted=False):
+    """Append one entry per id in ``row_ids`` for ``table_name``."""
+    if not row_ids:
+        return
+    now = datetime.now()
+    connection.execute(
+        insert(_LOG),
+        [
+            {"table_name": table_name, "row_id": row_id, "deleted": deleted, "changed_at": now}
+            for row_id in row_ids
+        ],
+    )
+
+
+def log_inserted(session, objects):
+    """Log rows inserted outside the unit of work (ORM bulk/upsert statements).
+
+    Those statements don't fire flush events, so callers that create
+    tracked rows that way pass the returned objects here instead.
+    """
+    by_table = {}
+    for obj in objects:
+        if type(obj) in TRACKED_MODELS:
+            by_table.setdefault(obj.__table__.name, []).append(obj.id)
+    for table_name, row_ids in by_table.items():
+        log_changes(session.connection(), table_name, row_ids)
+
+
+def _log_related(connection, tag_ids, location_ids):
+    """Log the items showing any of the given tags or locations.
+
+    The item tables' ``table_version`` rows are bumped first, both
+    because their serialized rows change and so these entries are
+    serialized with the tables' other writers.
+    """
+    now = datetime.now()
+    sources = []
+    for model, item_column in _TAG_LINKS.items():
+        if tag_ids:
+            tagged = select(item_column).where(item_column.table.c.tag_id.in_(tag_ids))
+            sources.append((model, tagged))
+        if location_ids and hasattr(model, "location_id"):
+            sources.append((model, select(model.id).where(model.location_id.in_(location_ids))))
+    bump_table_versions(connection, [model.__table__.name for model, _ in sources])
+    for model, ids in sources:
+        rows = ids.add_columns(
+            literal(model.__table__.name), literal(False), literal(now)
+        ).distinct()
+        connection.execute(
+            insert(_LOG).from_select(["row_id", "table_name", "deleted", "changed_at"], rows)
+        )
+
+
+def _renamed(obj):
+    return db.inspect(obj).attrs["name"].history.has_changes()
+
+
+@event.listens_for(db.session, "before_flush")
+def _collect_related(session, flush_context, instances):  # pylint: disable=unused-argument
+    # link rows of deleted tags are gone after the flush; record them first
+    tag_ids = [obj.id for obj in session.deleted if isinstance(obj, Tag)]
+    location_ids = [obj.id for obj in session.deleted if isinstance(obj, Location)]
+    tag_ids += [obj.id for obj in session.dirty if isinstance(obj, Tag) and _renamed(obj)]
+    location_ids += [
+        obj.id for obj in session.dirty if isinstance(obj, Location) and _renamed(obj)
+    ]
+    if tag_ids or location_ids:
+        _log_related(session.connection(), tag_ids, location_ids)
+
+
+@event.listens_for(db.session, "after_flush")
+def _log_flush(session, flush_context):  # pylint: disable=unused-argument
+    written, deleted = {}, {}
+    for obj in session.new:
+        if type(obj) in TRACKED_MODELS:
+            written.setdefault(obj.__table__.name, []).append(obj.id)
+    for obj in session.dirty:
+        if type(obj) in TRACKED_MODELS and session.is_modified(obj):
+            written.setdefault(obj.__table__.name, []).append(obj.id)
+    for obj in session.deleted:
+        if type(obj) in TRACKED_MODELS:
+            deleted.setdefault(obj.__table__.name, []).append(obj.id)
+    if not (written or deleted):
+        return
+    connection = session.connection()
+    for table_name, row_ids in written.items():
+        log_changes(connection, table_name, row_ids)
+    for table_name, row_ids in deleted.items():
+        log_changes(connection, table_name, row_ids, deleted=True)
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _log_statement(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) not in _TRACKED_TABLES:
+        return
+    statement = orm_execute_state.statement
+    connection = orm_execute_state.session.connection()
+    if orm_execute_state.is_executemany and statement.whereclause is None:
+        # ORM bulk update/delete by primary key: the ids are the parameters
+        row_ids = [params["id"] for params in orm_execute_state.parameters]
+    else:
+        matched = select(table.c.id)
+        if statement.whereclause is not None:
+            matched = matched.where(statement.whereclause)
+        row_ids = list(connection.scalars(matched))
+    log_changes(connection, table.name, row_ids, deleted=orm_execute_state.is_delete)
+
+
+# -----------------------------------------------------------------------
+# Reading
+# -----------------------------------------------------------------------
+
+
+def parse_since(args):
+    """Return the sequence number from the ``since`` argument, or None."""
+    raw = args.get(CHANGES_SINCE_ARG)
+    if raw in (None, ""):
+        return None
+    try:
+        values = decode_cursor(raw)
+    except PaginationError as exc:
+        raise ChangesError("Invalid 'since' cursor") from exc
+    if len(values) != 1 or not isinstance(values[0], int) or isinstance(values[0], bool):
+        raise ChangesError("Invalid 'since' cursor")
+    return values[0]
+
+
+def _bounds(table_name):
+    return db.session.execute(
+        select(func.min(_LOG.c.seq), func.max(_LOG.c.seq)).where(_LOG.c.table_name == table_name)
+    ).one()
+
+
+def changes_since(model, since, fields=None):
+    """Return ``(rows, deleted_ids, head)`` for ``model`` after sequence ``since``.
+
+    ``rows`` are the current :func:`projected_query` rows of everything
+    written after ``since`` (every row when ``since`` is None) and
+    ``head`` is the sequence number to resume from. Raises
+    :class:`ChangesExpired` when entries after ``since`` were pruned.
+    """
+    table_name = model.__table__.name
+    # only writers to this table are serialized with each other, so a
+    # newer entry for another table may commit before an older one here
+    oldest, head = _bounds(table_name)
+    head = head or 0
+    query = projected_query(model, fields)
+    if since is None:
+        return query.order_by(model.id).all(), [], head
+    # cursor 0 comes from an empty log, which pruning never leaves behind
+    if since > head or (since and oldest is not None and since < oldest - 1):
+        raise ChangesExpired("Changes since this cursor are no longer available")
+
+    latest = (
+        select(_LOG.c.row_id, func.max(_LOG.c.seq).label("seq"))
+        .where(
+            _LOG.c.table_name == table_name,
+            _LOG.c.seq > since,
+            _LOG.c.seq <= head,
+        )
+        .group_by(_LOG.c.row_id)
+        .subquery()
+    )
+    entries = db.session.execute(
+        select(_LOG.c.row_id, _LOG.c.deleted).join(
+            latest, and_(_LOG.c.seq == latest.c.seq, _LOG.c.row_id == latest.c.row_id)
+        )
+    ).all()
+    written = sorted(row_id for row_id, was_deleted in entries if not was_deleted)
+    deleted = {row_id for row_id, was_deleted in entries if was_deleted}
+    rows = query.filter(model.id.in_(written)).order_by(model.id).all() if written else []
+    # deleted after ``head`` was read; report it now rather than next time.
+    # ``id`` is always the first projected column.
+    deleted.update(set(written) - {row[0] for row in rows})
+    return rows, sorted(deleted), head
+
+
+def changes_response(model, collection_name):
+    """Serialize the changes to ``model`` since the request's ``since`` cursor.
+
+    Returns ``{collection_name: [...], "deleted": [...], "cursor": ...}``;
+    ``fields`` works as on the list endpoints.
+    """
+    try:
+        since = parse_since(request.args)
+        fields = parse_fields(model, request.args)
+        rows, deleted, head = changes_since(model, since, fields)
+    except ChangesExpired as exc:
+        return {"error": str(exc)}, ERROR_GONE
+    except (ChangesError, FilterError) as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    serialize = serialize_row(model, fields)
+    return {
+        collection_name: [serialize(row) for row in rows],
+        CHANGES_DELETED_KEY: deleted,
+        CHANGES_CURSOR_KEY: encode_cursor([head]),
+    }
+
+
+def prune_change_log(days=DEFAULT_CHANGE_RETENTION_DAYS):
+    """Delete entries older than ``days`` and return how many went.
+
+    The newest entry of each table is always kept so sequence numbers
+    stay monotonic, every table's cursors keep a head, and expired
+    cursors can be recognised.
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+    newest = select(func.max(_LOG.c.seq)).group_by(_LOG.c.table_name)
+    result = db.session.execute(
+        delete(_LOG).where(_LOG.c.changed_at < cutoff, _LOG.c.seq.not_in(newest))
+    )
+    db.session.commit()
+    return result.rowcount
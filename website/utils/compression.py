@@ -0,0 +1,180 @@
+"""Negotiated gzip/brotli compression for text responses.
+
+:func:`init_compression` registers an ``after_request`` hook that
+compresses HTML, JSON, CSS, JS and other text responses when the client
+sends a matching ``Accept-Encoding``:
+
+* Bodies smaller than ``COMPRESS_MIN_SIZE`` are sent as-is; the framing
+  overhead would outweigh the saving.
+* Buffered bodies up to ``COMPRESS_STREAM_THRESHOLD`` are compressed in
+  one go. Larger and streamed bodies are compressed chunk by chunk as
+  they are sent, so memory use doesn't depend on the response size.
+* Static files are compressed once per file version and kept in an
+  in-process cache keyed by path, mtime and size, so repeated requests
+  for the same asset only pay for a dictionary lookup.
+
+Brotli is used when the ``brotli`` package is installed and the client
+prefers it; gzip (stdlib) otherwise. Compressed responses carry a weak
+ETag, since the bytes differ from the identity representation.
+"""
+
+import gzip
+import os
+import threading
+import zlib
+
+from flask import request
+from werkzeug.security import safe_join
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESS_MIN_SIZE = 500
+COMPRESS_STREAM_THRESHOLD = 1 << 20
+COMPRESS_LEVEL = 6
+BROTLI_QUALITY = 5
+STATIC_BROTLI_QUALITY = 11
+
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "application/xml",
+        "image/svg+xml",
+        "text/css",
+        "text/csv",
+        "text/html",
+        "text/javascript",
+        "text/plain",
+        "text/xml",
+    }
+)
+
+_static_cache = {}
+_static_cache_lock = threading.Lock()
+
+
+def available_encodings():
+    """Return the content codings this process can produce, preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encodings):
+    """Return the best supported coding the client accepts, or None."""
+    return accept_encodings.best_match(available_encodings())
+
+
+def compress(data, encoding, static=False):
+    """Return ``data`` compressed with ``encoding``."""
+    if encoding == "br":
+        return brotli.compress(data, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if static else COMPRESS_LEVEL, mtime=0)
+
+
+def _stream(chunks, encoding):
+    """Yield the compressed form of ``chunks`` as they are produced."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        feed, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        feed, finish = compressor.compress, compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            out = feed(chunk)
+            if out:
+                yield out
+        yield finish()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def _static_body(app, encoding):
+    """Return the cached compressed bytes of the requested static file."""
+    filename = (request.view_args or {}).get("filename")
+    if not filename or not app.static_folder:
+        return None
+    path = safe_join(app.static_folder, filename)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size, encoding)
+    with _static_cache_lock:
+        body = _static_cache.get(key)
+    if body is None:
+        with open(path, "rb") as handle:
+            body = compress(handle.read(), encoding, static=True)
+        with _static_cache_lock:
+            # drop older versions of the same file
+            for stale in [k for k in _static_cache if k[0] == path and k[3] == encoding]:
+                del _static_cache[stale]
+            _static_cache[key] = body
+    return body
+
+
+def _compressible(response):
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    if not 200 <= response.status_code < 300 or response.status_code in (204, 206):
+        return False
+    if "Content-Encoding" in response.headers or "Content-Range" in response.headers:
+        return False
+    return "no-transform" not in response.headers.get("Cache-Control", "")
+
+
+def _weaken_etag(response):
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_response(app, response):
+    """Compress ``response`` in place when the client and content allow it."""
+    if request.method == "HEAD" or not _compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.direct_passthrough:
+        # files from send_file; only the static folder is cached
+        if request.endpoint != "static":
+            return response
+        if response.content_length is not None and response.content_length < COMPRESS_MIN_SIZE:
+            return response
+        body = _static_body(app, encoding)
+        if body is None:
+            return response
+        response.close()
+        response.direct_passthrough = False
+        response.set_data(body)
+    elif response.is_streamed or (response.content_length or 0) > COMPRESS_STREAM_THRESHOLD:
+        response.response = _stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_data(compress(data, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+    _weaken_etag(response)
+    return response
+
+
+def init_compression(app):
+    """Register response compression on ``app``."""
+
+    @app.after_request
+    def _compress(response):
+        return compress_response(app, response)
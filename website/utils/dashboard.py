@@ -0,0 +1,227 @@
+"""Aggregate statistics for the home dashboard.
+
+Every figure is computed in the database: one aggregate query per item
+table using ``SUM``/``COUNT(*) FILTER (...)``, an ``ORDER BY ... LIMIT 1``
+on the indexed ``expires`` column for the next expiring consumable, and
+the next service date (``last_serviced_on`` plus the frequency interval)
+computed in SQL. Only the handful of rows the dashboard names are loaded,
+so the cost doesn't grow with the size of the inventory.
+
+The figures are also cached per process (:func:`cached_dashboard_stats`).
+The cache is dropped whenever a session flushes or bulk-writes one of the
+item tables, when the date changes (the "days until" values are relative
+to today), and after ``DASHBOARD_CACHE_TTL`` seconds as a backstop for
+writes made by other worker processes. Cached entries hold plain
+summaries rather than ORM objects, so they outlive the request session.
+"""
+
+import threading
+import time
+from datetime import date
+from typing import NamedTuple
+
+from sqlalchemy import Date, case, event, func, or_, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import GenericFunction
+
+from website import db
+from ..models import CameraGear, Consumable, LabEquipment
+
+EXPIRING_SOON_DAYS = 14
+DASHBOARD_CACHE_TTL = 300
+
+# service_frequency values the dashboard schedules; anything else is unscheduled
+SERVICE_INTERVAL_DAYS = {
+    "weekly": 7,
+    "monthly": 30,
+    "quarterly": 90,
+    "yearly": 365,
+}
+
+
+class ExpiringItem(NamedTuple):
+    """The next consumable to expire, as shown on the dashboard."""
+
+    id: int
+    name: str
+    expires: date
+
+
+class ItemSummary(NamedTuple):
+    """An item the dashboard names."""
+
+    id: int
+    name: str
+
+
+class add_days(GenericFunction):  # pylint: disable=invalid-name,too-many-ancestors
+    """``add_days(date, n)``: the date ``n`` days after ``date``."""
+
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(add_days)
+def _add_days_default(element, compiler, **kw):
+    start, days = list(element.clauses)
+    return f"({compiler.process(start, **kw)} + {compiler.process(days, **kw)})"
+
+
+@compiles(add_days, "sqlite")
+def _add_days_sqlite(element, compiler, **kw):
+    start, days = list(element.clauses)
+    return f"date({compiler.process(start, **kw)}, ({compiler.process(days, **kw)}) || ' days')"
+
+
+def _service_interval():
+    """SQL expression for the frequency interval in days (NULL when unscheduled)."""
+    frequency = func.lower(func.trim(LabEquipment.service_frequency))
+    return case(
+        *((frequency == name, days) for name, days in SERVICE_INTERVAL_DAYS.items()),
+        else_=None,
+    )
+
+
+def _consumable_stats(today):
+    soon = date.fromordinal(today.toordinal() + EXPIRING_SOON_DAYS)
+    row = db.session.execute(
+        select(
+            func.coalesce(func.sum(Consumable.quantity), 0),
+            func.count().filter(Consumable.expires < today),
+            func.count().filter(Consumable.expires.between(today, soon)),
+            func.count().filter(func.coalesce(Consumable.quantity, 0) <= 0),
+        )
+    ).one()
+    next_expiring = (
+        Consumable.query.filter(Consumable.expires >= today)
+        .order_by(Consumable.expires, Consumable.id)
+        .first()
+    )
+    return {
+        "consumables_total": int(row[0]),
+        "expired_count": row[1],
+        "expiring_soon_count": row[2],
+        "out_of_stock_count": row[3],
+        "next_expiring": (
+            ExpiringItem(next_expiring.id, next_expiring.name, next_expiring.expires)
+            if next_expiring
+            else None
+        ),
+        "days_until_expiration": (next_expiring.expires - today).days if next_expiring else None,
+    }
+
+
+def _camera_gear_stats():
+    total, checked_out = db.session.execute(
+        select(func.count(), func.count().filter(CameraGear.is_checked_out.is_(True)))
+    ).one()
+    return {"camera_gear_total": total, "checked_out_count": checked_out}
+
+
+def _lab_equipment_stats(today):
+    interval = _service_interval()
+    next_due = add_days(LabEquipment.last_serviced_on, interval)
+    scheduled = interval.is_not(None)
+
+    upcoming = db.session.execute(
+        select(LabEquipment.id, LabEquipment.name, next_due)
+        .where(scheduled, LabEquipment.last_serviced_on.is_not(None), next_due >= today)
+        .order_by(next_due, LabEquipment.id)
+        .limit(1)
+    ).first()
+    overdue = db.session.execute(
+        select(LabEquipment.id, LabEquipment.name)
+        .where(scheduled, or_(LabEquipment.last_serviced_on.is_(None), next_due < today))
+        .order_by(LabEquipment.id)
+    )
+    next_service_date = upcoming[2] if upcoming else None
+    return {
+        "lab_equipment_total": db.session.scalar(select(func.count()).select_from(LabEquipment)),
+        "next_service_equipment": ItemSummary(upcoming[0], upcoming[1]) if upcoming else None,
+        "next_service_date": next_service_date,
+        "days_until_service": (next_service_date - today).days if next_service_date else None,
+        "service_overdue": [ItemSummary(*row) for row in overdue],
+    }
+
+
+def dashboard_stats(today=None):
+    """Return the home dashboard's template context."""
+    today = today or date.today()
+    stats = {
+        **_consumable_stats(today),
+        **_camera_gear_stats(),
+        **_lab_equipment_stats(today),
+    }
+    stats["inventory_total"] = (
+        stats["consumables_total"] + stats["camera_gear_total"] + stats["lab_equipment_total"]
+    )
+    return stats
+
+
+# -----------------------------------------------------------------------
+# Cache
+# -----------------------------------------------------------------------
+
+_CACHED_MODELS = (Consumable, CameraGear, LabEquipment)
+
+_cache_lock = threading.Lock()
+_cache = {"stats": None, "day": None, "expires_at": 0.0, "generation": 0}
+
+
+def invalidate_dashboard_cache():
+    """Drop the cached dashboard figures."""
+    with _cache_lock:
+        _cache["stats"] = None
+        _cache["generation"] += 1
+
+
+def cached_dashboard_stats():
+    """Return :func:`dashboard_stats`, recomputing only after an invalidation."""
+    today = date.today()
+    with _cache_lock:
+        stats = _cache["stats"]
+        if stats is not None and _cache["day"] == today and time.monotonic() < _cache["expires_at"]:
+            return stats
+        generation = _cache["generation"]
+    stats = dashboard_stats(today)
+    with _cache_lock:
+        # a write that landed while we were computing makes this result stale
+        if _cache["generation"] == generation:
+            _cache.update(
+                stats=stats, day=today, expires_at=time.monotonic() + DASHBOARD_CACHE_TTL
+            )
+    return stats
+
+
+def _touches_dashboard(objects):
+    return any(isinstance(obj, _CACHED_MODELS) for obj in objects)
+
+
+@event.listens_for(db.session, "after_flush")
+def _invalidate_after_flush(session, flush_context):  # pylint: disable=unused-argument
+    if any(_touches_dashboard(objs) for objs in (session.new, session.dirty, session.deleted)):
+        session.info["dashboard_dirty"] = True
+        invalidate_dashboard_cache()
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _invalidate_after_bulk(orm_execute_state):
+    """Catch ``insert()``/``update()``/``delete()`` statements, which skip the flush."""
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _CACHED_MODELS):
+        orm_execute_state.session.info["dashboard_dirty"] = True
+        invalidate_dashboard_cache()
+
+
+@event.listens_for(db.session, "after_commit")
+def _invalidate_after_commit(session):
+    # a request may have refilled the cache from pre-commit data in between
+    if session.info.pop("dashboard_dirty", False):
+        invalidate_dashboard_cache()
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _forget_after_rollback(session, previous_transaction):  # pylint: disable=unused-argument
+    session.info.pop("dashboard_dirty", None)
@@ -0,0 +1,200 @@
+"""SQLAlchemy engine and connection pool settings from the environment.
+
+``create_app`` passes :func:`engine_options` to Flask-SQLAlchemy as
+``SQLALCHEMY_ENGINE_OPTIONS``. A profile picks the pool defaults for
+the kind of process (``DB_PROFILE``; ``web`` on cloud deployments,
+otherwise SQLAlchemy's own defaults) and individual ``DB_*`` variables
+override them. ``flask`` CLI commands (the release-phase ``db
+upgrade``, imports, ``mail-worker``, ...) always use the ``worker``
+profile, so a deployment-wide ``DB_PROFILE`` or the cloud default
+doesn't give them the web statement timeout:
+
+=========================== ===================================================
+``DB_POOL_SIZE``            connections kept open per process
+``DB_MAX_OVERFLOW``         extra connections allowed under load
+``DB_POOL_TIMEOUT``         seconds to wait for a free connection
+``DB_POOL_RECYCLE``         seconds before a connection is replaced
+``DB_POOL_PRE_PING``        test connections on checkout (``true``/``false``)
+``DB_STATEMENT_TIMEOUT_MS`` PostgreSQL ``statement_timeout``
+``DB_APPLICATION_NAME``     PostgreSQL ``application_name``
+=========================== ===================================================
+
+Each process can hold up to ``pool_size + max_overflow`` connections.
+A web process needs one for each gunicorn request thread
+(``WEB_THREADS``, which the Procfile passes to ``--threads``) plus its
+background threads: the mail dispatcher, the job runner and its
+``JOB_WORKERS`` step threads. The ``web`` profile keeps ``pool_size``
+connections open and sets ``max_overflow`` so the total covers all of
+them (16 + 1 + 1 + 3 = 21 by default); requests then never wait on
+the pool. Lower ``WEB_THREADS`` (or set ``DB_MAX_OVERFLOW``) if
+workers × that total exceeds the database's connection limit.
+:func:`pool_stats` reports a pool's live usage.
+
+SQLite databases (development and tests) ignore the pool settings.
+"""
+
+import os
+
+import click
+from sqlalchemy.engine import make_url
+
+from ..constants import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_ENGINE_OPTIONS
+
+DB_PROFILE = "DB_PROFILE"
+DB_POOL_SIZE = "DB_POOL_SIZE"
+DB_MAX_OVERFLOW = "DB_MAX_OVERFLOW"
+DB_POOL_TIMEOUT = "DB_POOL_TIMEOUT"
+DB_POOL_RECYCLE = "DB_POOL_RECYCLE"
+DB_POOL_PRE_PING = "DB_POOL_PRE_PING"
+DB_STATEMENT_TIMEOUT_MS = "DB_STATEMENT_TIMEOUT_MS"
+DB_APPLICATION_NAME = "DB_APPLICATION_NAME"
+WEB_THREADS = "WEB_THREADS"
+DEFAULT_WEB_THREADS = 16
+# the mail dispatcher and the job runner's own thread; its step
+# threads (JOB_WORKERS) are counted separately
+BACKGROUND_THREADS = 2
+
+DEFAULT_APPLICATION_NAME = "photography-management"
+
+ENGINE_PROFILES = {
+    # SQLAlchemy's defaults
+    "default": {},
+    # gunicorn web workers behind a router that drops idle connections
+    # (max_overflow is sized from the thread count, see web_connections)
+    "web": {
+        "pool_size": 5,
+        "pool_timeout": 10,
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30_000,
+    },
+    # CLI commands and scheduled jobs: one connection, long statements allowed
+    "worker": {
+        "pool_size": 1,
+        "max_overflow": 1,
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+    },
+}
+
+_INT_SETTINGS = {
+    DB_POOL_SIZE: "pool_size",
+    DB_MAX_OVERFLOW: "max_overflow",
+    DB_POOL_TIMEOUT: "pool_timeout",
+    DB_POOL_RECYCLE: "pool_recycle",
+    DB_STATEMENT_TIMEOUT_MS: "statement_timeout_ms",
+}
+_TRUE = ("1", "true", "yes")
+
+
+def _env_int(environ, name, default):
+    if not environ.get(name):
+        return default
+    try:
+        return int(environ[name])
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+
+
+def web_connections(environ=None):
+    """Return how many connections a web process can use at once."""
+    from .jobs import DEFAULT_JOB_WORKERS, JOB_WORKERS  # local import to avoid cycles
+
+    environ = os.environ if environ is None else environ
+    threads = _env_int(environ, WEB_THREADS, DEFAULT_WEB_THREADS)
+    job_workers = _env_int(environ, JOB_WORKERS, DEFAULT_JOB_WORKERS)
+    return threads + BACKGROUND_THREADS + job_workers
+
+
+def running_cli_command():
+    """Return True when a ``flask`` CLI command (other than ``run``) is loading the app."""
+    if not os.environ.get("FLASK_RUN_FROM_CLI"):
+        return False
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and ctx.info_name != "run"
+
+
+def engine_settings(environ=None, cloud=False, cli=False):
+    """Return the profile's settings with the ``DB_*`` overrides applied.
+
+    ``cli`` selects the ``worker`` profile whatever ``DB_PROFILE`` says.
+    Raises ``ValueError`` for an unknown profile or a malformed number.
+    """
+    environ = os.environ if environ is None else environ
+    if cli:
+        profile = "worker"
+    else:
+        profile = environ.get(DB_PROFILE) or ("web" if cloud else "default")
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(
+            f"Unknown {DB_PROFILE} '{profile}'; expected one of: {', '.join(ENGINE_PROFILES)}"
+        )
+    settings = dict(ENGINE_PROFILES[profile], profile=profile)
+    for name, key in _INT_SETTINGS.items():
+        if environ.get(name):
+            settings[key] = _env_int(environ, name, None)
+    if profile == "web" and not environ.get(DB_MAX_OVERFLOW):
+        settings["max_overflow"] = max(web_connections(environ) - settings["pool_size"], 0)
+    if environ.get(DB_POOL_PRE_PING):
+        settings["pool_pre_ping"] = environ[DB_POOL_PRE_PING].lower() in _TRUE
+    settings["application_name"] = environ.get(DB_APPLICATION_NAME) or DEFAULT_APPLICATION_NAME
+    return settings
+
+
+def engine_options(database_uri, environ=None, cloud=False, cli=False):
+    """Return ``SQLALCHEMY_ENGINE_OPTIONS`` for ``database_uri``."""
+    settings = engine_settings(environ, cloud, cli)
+    backend = make_url(database_uri).get_backend_name()
+    if backend == "sqlite":
+        return {}
+    options = {
+        key: settings[key]
+        for key in ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping")
+        if key in settings
+    }
+    if backend == "postgresql":
+        connect_args = {"application_name": settings["application_name"]}
+        if settings.get("statement_timeout_ms"):
+            connect_args["options"] = f"-c statement_timeout={settings['statement_timeout_ms']}"
+        options["connect_args"] = connect_args
+    return options
+
+
+def configure_engine(app, cloud=False):
+    """Set ``SQLALCHEMY_ENGINE_OPTIONS`` (and ``DB_PROFILE``) on ``app``."""
+    uri = app.config[SQLALCHEMY_DATABASE_URI]
+    cli = running_cli_command()
+    app.config[DB_PROFILE] = engine_settings(cloud=cloud, cli=cli)["profile"]
+    app.config.setdefault(SQLALCHEMY_ENGINE_OPTIONS, engine_options(uri, cloud=cloud, cli=cli))
+
+
+def pool_stats(engine):
+    """Return the current checkout counts and limits of ``engine``'s pool.
+
+    Counters a pool class doesn't keep (e.g. SQLite's) are reported as None.
+    """
+    pool = engine.pool
+
+    def counter(name):
+        method = getattr(pool, name, None)
+        return method() if callable(method) else None
+
+    size = counter("size")
+    max_overflow = getattr(pool, "_max_overflow", None)
+    stats = {
+        "pid": os.getpid(),
+        "pool": type(pool).__name__,
+        "size": size,
+        "max_overflow": max_overflow,
+        "checked_out": counter("checkedout"),
+        "checked_in": counter("checkedin"),
+        "overflow": counter("overflow"),
+        "timeout": counter("timeout"),
+        "recycle": getattr(pool, "_recycle", None),
+        "pre_ping": getattr(pool, "_pre_ping", None),
+    }
+    if size is not None and max_overflow is not None and max_overflow >= 0:
+        stats["capacity"] = size + max_overflow
+    else:
+        stats["capacity"] = None  # unbounded or not a queue pool
+    return stats
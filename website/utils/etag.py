@@ -0,0 +1,122 @@
+"""Conditional GET support for the JSON endpoints.
+
+A response's ETag is derived from the change counters
+(:class:`~website.models.TableVersion`) of the tables it is built from,
+the request URL and the user, so it can be computed with one small
+primary-key lookup before the view runs. When the client's
+``If-None-Match`` matches, a ``304`` is returned without loading or
+serializing any rows.
+
+The counters are bumped in the writing transaction by session hooks:
+``after_flush`` for unit-of-work changes and ``do_orm_execute`` for
+``insert()``/``update()``/``delete()`` statements, which skip the flush.
+Writes made outside the session (raw connections) aren't seen.
+"""
+
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from flask import make_response, request
+from flask_login import current_user
+from sqlalchemy import event, select, update
+from sqlalchemy.sql.dml import UpdateBase
+
+from website import db
+from ..models import TableVersion
+
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+_VERSIONS = TableVersion.__table__
+
+
+def _table_name(source):
+    """Return the table name of a model, ``Table`` or name."""
+    if isinstance(source, str):
+        return source
+    return getattr(source, "__tablename__", None) or source.name
+
+
+def table_versions(names):
+    """Return ``{table_name: (version, updated_at)}`` for ``names``."""
+    rows = db.session.execute(
+        select(_VERSIONS.c.table_name, _VERSIONS.c.version, _VERSIONS.c.updated_at).where(
+            _VERSIONS.c.table_name.in_(names)
+        )
+    )
+    return {name: (version, updated_at) for name, version, updated_at in rows}
+
+
+def compute_etag(names):
+    """Return ``(etag, last_modified)`` for the current request over ``names``."""
+    versions = table_versions(names)
+    user = current_user.get_id() if current_user.is_authenticated else ""
+    parts = [request.full_path, str(user)]
+    parts += [f"{name}={versions.get(name, (0, None))[0]}" for name in names]
+    etag = hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+    stamps = [updated_at for _, updated_at in versions.values() if updated_at]
+    return etag, max(stamps, default=None)
+
+
+def conditional_get(*sources):
+    """Decorate a GET view whose response depends only on ``sources``.
+
+    ``sources`` are the models or tables the response is built from
+    (including related tables whose columns it embeds).
+    """
+    names = sorted({_table_name(source) for source in sources})
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = compute_etag(names)
+            # weak comparison: compression serves the same ETag weakened
+            if request.if_none_match.contains_weak(etag):
+                response = make_response("", 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+# -----------------------------------------------------------------------
+# Version bumps
+# -----------------------------------------------------------------------
+
+
+def bump_table_versions(connection, names):
+    """Increment the counters for ``names`` on ``connection``."""
+    names = sorted(set(names) - {_VERSIONS.name})
+    if names:
+        connection.execute(
+            update(_VERSIONS)
+            .where(_VERSIONS.c.table_name.in_(names))
+            .values(version=_VERSIONS.c.version + 1, updated_at=datetime.now())
+        )
+
+
+@event.listens_for(db.session, "after_flush")
+def _bump_after_flush(session, flush_context):  # pylint: disable=unused-argument
+    names = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        mapper = db.inspect(obj).mapper
+        names.update(table.name for table in mapper.tables)
+    bump_table_versions(session.connection(), names)
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _bump_for_statement(orm_execute_state):
+    statement = orm_execute_state.statement
+    if isinstance(statement, UpdateBase):
+        table = getattr(statement, "table", None)
+        if table is not None and getattr(table, "name", None):
+            bump_table_versions(orm_execute_state.session.connection(), [table.name])
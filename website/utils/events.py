@@ -0,0 +1,462 @@
+"""Live change events for the item and note tables, streamed over SSE.
+
+Session hooks collect a compact event for every row of a tracked model
+that a flush inserts, updates or deletes::
+
+    {"type": "camera_gear", "id": 7, "op": "update",
+     "fields": ["is_checked_out", "checked_out_by", "checked_out_date"]}
+
+and publish them through the app's :class:`EventHub` once the
+transaction commits (a rollback drops them). Note events also carry the
+``item_type``/``item_id`` they are attached to.
+
+The hub fans events out to every open ``/api/v1/events`` stream. So a
+write handled by one gunicorn worker reaches streams held by the
+others, publishing goes through a backend shared by all workers:
+
+* :class:`FileBackend` (the default): events are appended as JSON lines
+  to a file in the instance folder and every worker tails it. Works for
+  any number of workers on one host.
+* :class:`MemoryBackend`: in-process only, for single-process servers
+  and tests.
+
+Every open stream holds a server thread, so each process serves at
+most ``EVENTS_MAX_STREAMS`` (default 4) at once and ends each after
+``EVENT_STREAM_MAX_SECONDS``; pages over the limit are asked to retry
+later rather than waiting for a thread.
+
+Once it has served a stream, each hub remembers the last
+``EVENT_HISTORY`` events so a reconnecting ``EventSource`` (which sends
+``Last-Event-ID``) gets what it missed, or a ``resync`` event when
+that's no longer possible.
+"""
+
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from flask import current_app, has_app_context
+from sqlalchemy import event
+
+from website import db
+from ..models import CameraGear, Consumable, LabEquipment, Note
+
+try:  # optional: serializes rotation between workers
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the platform
+    fcntl = None
+
+EVENTS_BACKEND = "EVENTS_BACKEND"
+EVENTS_FILE_NAME = "events.jsonl"
+EVENT_HISTORY = 500
+EVENT_QUEUE_SIZE = 1000
+EVENT_HEARTBEAT_SECONDS = 15
+# streams end after this long; EventSource reconnects (with Last-Event-ID)
+EVENT_STREAM_MAX_SECONDS = 60
+EVENT_RETRY_MS = 3000
+# each open stream holds a server thread; past this many per process,
+# new streams are told to come back after EVENT_BUSY_RETRY_MS
+EVENTS_MAX_STREAMS = "EVENTS_MAX_STREAMS"
+DEFAULT_MAX_STREAMS = 4
+EVENT_BUSY_RETRY_MS = 30000
+FILE_POLL_SECONDS = 0.2
+FILE_MAX_BYTES = 1 << 20
+
+EVENT_TYPES = {
+    CameraGear: "camera_gear",
+    Consumable: "consumable",
+    LabEquipment: "lab_equipment",
+    Note: "note",
+}
+
+_TYPES_BY_TABLE = {model.__table__.name: model for model in EVENT_TYPES}
+
+OP_CREATE = "create"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+# ``Subscription.get`` returns this when events were lost
+RESYNC = object()
+
+_PENDING_KEY = "pending_events"
+_EXTENSION = "event_hub"
+_ids = itertools.count(1)
+
+
+def _new_event_id():
+    # unique across workers and restarts; ordering comes from the backend
+    return f"{time.time_ns():x}-{os.getpid():x}-{next(_ids):x}"
+
+
+class Subscription:
+    """One stream's queue of events."""
+
+    def __init__(self, size=EVENT_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=size)
+        self.overflowed = False
+
+    def put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # a stalled client; make it start over instead of growing
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Return the next event, :data:`RESYNC`, or raise ``queue.Empty``."""
+        if self.overflowed:
+            self.overflowed = False
+            with self._queue.mutex:
+                self._queue.queue.clear()
+            return RESYNC
+        return self._queue.get(timeout=timeout)
+
+
+class EventHub:
+    """Fans published events out to this process's subscriptions."""
+
+    def __init__(self, backend, history=EVENT_HISTORY, max_streams=DEFAULT_MAX_STREAMS):
+        self.backend = backend
+        self._subscribers = set()
+        self._recent = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._started = False
+        self._streams = threading.BoundedSemaphore(max_streams)
+
+    def acquire_stream(self):
+        """Reserve one of this process's stream slots; False when all are taken."""
+        return self._streams.acquire(blocking=False)
+
+    def release_stream(self):
+        self._streams.release()
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.backend.start(self._deliver)
+
+    def publish(self, events):
+        """Send ``events`` to every worker's subscribers."""
+        events = [dict(e, seq=_new_event_id()) for e in events]
+        if events:
+            self.backend.write(events)
+        return events
+
+    def subscribe(self, last_event_id=None):
+        """Return a new :class:`Subscription`.
+
+        With ``last_event_id``, the events after it are queued first; if it
+        is no longer in the history the subscription starts with a resync.
+        """
+        self._start()
+        subscription = Subscription()
+        with self._lock:
+            if last_event_id:
+                ids = [e["seq"] for e in self._recent]
+                if last_event_id in ids:
+                    for missed in list(self._recent)[ids.index(last_event_id) + 1:]:
+                        subscription.put(missed)
+                else:
+                    subscription.overflowed = True
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _deliver(self, evt):
+        with self._lock:
+            self._recent.append(evt)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(evt)
+
+    def close(self):
+        self.backend.stop()
+
+
+class MemoryBackend:
+    """Delivers events within the current process only."""
+
+    def __init__(self):
+        self._deliver = None
+        self._lock = threading.Lock()
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def write(self, events):
+        with self._lock:
+            if self._deliver is not None:
+                for evt in events:
+                    self._deliver(evt)
+
+    def stop(self):
+        self._deliver = None
+
+
+class FileBackend:
+    """Shares events between processes through an append-only JSON-lines file.
+
+    Writers append whole lines with ``O_APPEND``; each process tails the
+    file from the end in a daemon thread. When the file outgrows
+    ``max_bytes`` it is renamed to ``<path>.1`` and a new one started;
+    readers finish the old file before following the rename.
+    """
+
+    def __init__(self, path, poll_interval=FILE_POLL_SECONDS, max_bytes=FILE_MAX_BYTES):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.max_bytes = max_bytes
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, deliver):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        handle = open(self.path, "a+b")  # pylint: disable=consider-using-with
+        handle.seek(0, os.SEEK_END)
+        self._thread = threading.Thread(
+            target=self._tail, args=(handle, deliver), name="event-file-tail", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, events):
+        data = "".join(json.dumps(e, separators=(",", ":")) + "\n" for e in events)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            os.write(fd, data.encode("utf-8"))
+            if os.fstat(fd).st_size > self.max_bytes and os.path.exists(self.path):
+                # only rotate the file we just wrote to, not a newer one
+                if os.stat(self.path).st_ino == os.fstat(fd).st_ino:
+                    os.replace(self.path, self.path + ".1")
+        finally:
+            os.close(fd)
+
+    def _tail(self, handle, deliver):
+        partial = b""
+        while not self._stop.is_set():
+            chunk = handle.read()
+            if chunk:
+                lines = (partial + chunk).split(b"\n")
+                partial = lines.pop()
+                for line in lines:
+                    if line.strip():
+                        try:
+                            deliver(json.loads(line))
+                        except ValueError:
+                            continue
+                continue
+            if self._rotated(handle):
+                handle.close()
+                handle = open(self.path, "a+b")  # pylint: disable=consider-using-with
+                handle.seek(0)
+                partial = b""
+                continue
+            self._stop.wait(self.poll_interval)
+        handle.close()
+
+    def _rotated(self, handle):
+        try:
+            return os.stat(self.path).st_ino != os.fstat(handle.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+
+def make_backend(app):
+    """Return the backend named by the ``EVENTS_BACKEND`` setting.
+
+    ``memory`` keeps events in-process; ``file`` (default) or
+    ``file:<path>`` shares them through a file.
+    """
+    setting = app.config.get(EVENTS_BACKEND) or os.getenv(EVENTS_BACKEND) or "file"
+    if setting == "memory":
+        return MemoryBackend()
+    if setting == "file":
+        return FileBackend(os.path.join(app.instance_path, EVENTS_FILE_NAME))
+    if setting.startswith("file:"):
+        return FileBackend(setting[len("file:"):])
+    raise ValueError(f"Unknown {EVENTS_BACKEND} setting: {setting!r}")
+
+
+def init_events(app, backend=None):
+    """Create the app's :class:`EventHub`.
+
+    ``EVENTS_MAX_STREAMS`` caps the streams it serves at once.
+    """
+    setting = app.config.get(EVENTS_MAX_STREAMS) or os.getenv(EVENTS_MAX_STREAMS)
+    try:
+        max_streams = int(setting) if setting else DEFAULT_MAX_STREAMS
+    except ValueError:
+        max_streams = DEFAULT_MAX_STREAMS
+    app.extensions[_EXTENSION] = EventHub(
+        backend or make_backend(app), max_streams=max(max_streams, 1)
+    )
+
+
+def get_hub(app=None):
+    """Return the app's hub, or None when events aren't set up."""
+    app = app or (current_app if has_app_context() else None)
+    return app.extensions.get(_EXTENSION) if app is not None else None
+
+
+# -----------------------------------------------------------------------
+# Collecting events from the session
+# -----------------------------------------------------------------------
+
+
+def _changed_fields(obj):
+    state = db.inspect(obj)
+    fields = []
+    for attr in state.mapper.column_attrs:
+        if state.attrs[attr.key].history.has_changes():
+            fields.append(attr.key)
+    if "tags" in state.mapper.relationships and state.attrs["tags"].history.has_changes():
+        fields.append("tags")
+    return fields
+
+
+def _event(obj, op, fields=None):
+    evt = {"type": EVENT_TYPES[type(obj)], "id": obj.id, "op": op}
+    if fields is not None:
+        evt["fields"] = fields
+    if isinstance(obj, Note):
+        for kind in ("camera_gear", "lab_equipment", "consumable"):
+            item_id = getattr(obj, f"{kind}_id")
+            if item_id:
+                evt.update(item_type=kind, item_id=item_id)
+                break
+    return evt
+
+
+def queue_events(session, events):
+    """Hold ``events`` until ``session`` commits."""
+    if events:
+        session.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+def queue_inserted(session, objects):
+    """Queue create events for rows inserted outside the unit of work.
+
+    Bulk ``INSERT ... RETURNING`` statements don't fire flush events, so
+    callers that create tracked rows that way pass the objects here.
+    """
+    queue_events(session, [_event(o, OP_CREATE) for o in objects if type(o) in EVENT_TYPES])
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_flush(session, flush_context):  # pylint: disable=unused-argument
+    events = [_event(obj, OP_CREATE) for obj in session.new if type(obj) in EVENT_TYPES]
+    for obj in session.dirty:
+        if type(obj) in EVENT_TYPES:
+            fields = _changed_fields(obj)
+            if fields:
+                events.append(_event(obj, OP_UPDATE, fields))
+    events += [_event(obj, OP_DELETE) for obj in session.deleted if type(obj) in EVENT_TYPES]
+    queue_events(session, events)
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _collect_statement(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    model = _TYPES_BY_TABLE.get(getattr(table, "name", None))
+    if model is None:
+        return
+    # the matched rows aren't known without another query; ``"id": null``
+    # tells clients that any row of the type may have changed
+    op = OP_DELETE if orm_execute_state.is_delete else OP_UPDATE
+    queue_events(orm_execute_state.session, [{"type": EVENT_TYPES[model], "id": None, "op": op}])
+
+
+@event.listens_for(db.session, "after_commit")
+def _publish_after_commit(session):
+    events = session.info.pop(_PENDING_KEY, None)
+    hub = get_hub()
+    if events and hub is not None:
+        try:
+            hub.publish(events)
+        except OSError:
+            # the write is committed; a lost notification only delays clients
+            current_app.logger.exception("Failed to publish %d change events", len(events))
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _drop_after_rollback(session, previous_transaction):  # pylint: disable=unused-argument
+    session.info.pop(_PENDING_KEY, None)
+
+
+# -----------------------------------------------------------------------
+# Streaming
+# -----------------------------------------------------------------------
+
+
+def format_sse(data, event_name=None, event_id=None):
+    """Return one Server-Sent Events message."""
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    if event_name:
+        lines.append(f"event: {event_name}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def event_stream(
+    hub,
+    last_event_id=None,
+    heartbeat=EVENT_HEARTBEAT_SECONDS,
+    max_seconds=EVENT_STREAM_MAX_SECONDS,
+):
+    """Yield SSE messages for ``hub``'s events until ``max_seconds`` pass.
+
+    Change events are sent as ``change`` messages, lost events as a
+    ``resync`` message (clients should reload), and idle periods as
+    comment heartbeats that keep proxies from closing the connection.
+    When the hub already serves its maximum number of streams, only a
+    longer ``retry`` is sent and the stream ends at once.
+    """
+    if not hub.acquire_stream():
+        yield f"retry: {EVENT_BUSY_RETRY_MS}\n\n"
+        return
+    try:
+        yield from _stream(hub, last_event_id, heartbeat, max_seconds)
+    finally:
+        hub.release_stream()
+
+
+def _stream(hub, last_event_id, heartbeat, max_seconds):
+    subscription = hub.subscribe(last_event_id)
+    deadline = time.monotonic() + max_seconds
+    try:
+        yield f"retry: {EVENT_RETRY_MS}\n\n"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                evt = subscription.get(timeout=min(heartbeat, remaining))
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            if evt is RESYNC:
+                yield format_sse({}, "resync")
+                continue
+            data = {key: value for key, value in evt.items() if key != "seq"}
+            yield format_sse(data, "change", evt["seq"])
+    finally:
+        hub.unsubscribe(subscription)
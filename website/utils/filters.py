@@ -0,0 +1,181 @@
+"""Query-string filters and sorting for the item list endpoints.
+
+The list endpoints accept a small query language that is compiled into
+SQL ``WHERE``/``ORDER BY`` clauses so a filtered view only reads and
+returns the rows it needs:
+
+    ?tag=film,35mm          item has any of the named tags (case-insensitive)
+    ?location_id=3          item is stored at location 3
+    ?location=shelf         location name contains "shelf"
+    ?name=canon             item name contains "canon"
+    ?q=canon                name, tag or location name contains "canon"
+    ?checked_out=true       camera gear checkout state
+    ?expires_before=DATE    consumables expiring before DATE (ISO)
+    ?quantity_lte=N         consumables with at most N left
+    ?serviced_before=DATE   lab equipment last serviced before DATE (ISO)
+    ?service_frequency=X    lab equipment with that service frequency
+    ?sort=name | -name      sort by a whitelisted column, "-" for descending
+
+Unknown filter values raise :class:`FilterError` which the views turn
+into a 400 response.
+"""
+
+from datetime import date
+
+from sqlalchemy import func, or_
+
+from ..models import CameraGear, Consumable, LabEquipment, Location, Tag
+
+SORT_ARG = "sort"
+_TRUE_VALUES = ("1", "true", "yes")
+_FALSE_VALUES = ("0", "false", "no")
+
+
+class FilterError(ValueError):
+    """Raised when a filter or sort argument can't be interpreted."""
+
+
+def _parse_int(name, raw):
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise FilterError(f"'{name}' must be an integer") from exc
+
+
+def _parse_date(name, raw):
+    try:
+        return date.fromisoformat(raw)
+    except ValueError as exc:
+        raise FilterError(f"'{name}' must be an ISO date (YYYY-MM-DD)") from exc
+
+
+def _parse_bool(name, raw):
+    value = raw.lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    raise FilterError(f"'{name}' must be true or false")
+
+
+def _contains(column, raw):
+    """Case-insensitive substring match with LIKE wildcards escaped."""
+    escaped = raw.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return func.lower(column).like(f"%{escaped.lower()}%", escape="\\")
+
+
+def _tag_names(raw):
+    return [n.strip().lower() for n in raw.split(",") if n.strip()]
+
+
+def _has_tag(model):
+    def build(name, raw):
+        names = _tag_names(raw)
+        if not names:
+            raise FilterError(f"'{name}' must name at least one tag")
+        return model.tags.any(func.lower(Tag.name).in_(names))
+
+    return build
+
+
+def _location_name(model):
+    return lambda name, raw: model.location.has(_contains(Location.name, raw))
+
+
+def _search(model, with_location):
+    def build(name, raw):
+        clauses = [
+            _contains(model.name, raw),
+            model.tags.any(_contains(Tag.name, raw)),
+        ]
+        if with_location:
+            clauses.append(model.location.has(_contains(Location.name, raw)))
+        return or_(*clauses)
+
+    return build
+
+
+def _equals(column, parse):
+    return lambda name, raw: column == parse(name, raw)
+
+
+def _before(column):
+    return lambda name, raw: column < _parse_date(name, raw)
+
+
+FILTERS = {
+    CameraGear: {
+        "q": _search(CameraGear, with_location=True),
+        "name": lambda name, raw: _contains(CameraGear.name, raw),
+        "tag": _has_tag(CameraGear),
+        "location_id": _equals(CameraGear.location_id, _parse_int),
+        "location": _location_name(CameraGear),
+        "checked_out": _equals(CameraGear.is_checked_out, _parse_bool),
+    },
+    Consumable: {
+        "q": _search(Consumable, with_location=True),
+        "name": lambda name, raw: _contains(Consumable.name, raw),
+        "tag": _has_tag(Consumable),
+        "location_id": _equals(Consumable.location_id, _parse_int),
+        "location": _location_name(Consumable),
+        "expires_before": _before(Consumable.expires),
+        "quantity_lte": lambda name, raw: Consumable.quantity <= _parse_int(name, raw),
+    },
+    LabEquipment: {
+        "q": _search(LabEquipment, with_location=False),
+        "name": lambda name, raw: _contains(LabEquipment.name, raw),
+        "tag": _has_tag(LabEquipment),
+        "serviced_before": _before(LabEquipment.last_serviced_on),
+        "service_frequency": lambda name, raw: (
+            func.lower(LabEquipment.service_frequency) == raw.strip().lower()
+        ),
+    },
+}
+
+SORTS = {
+    CameraGear: {
+        "id": CameraGear.id,
+        "name": CameraGear.name,
+        "last_updated": CameraGear.last_updated,
+        "checked_out_date": CameraGear.checked_out_date,
+        "return_date": CameraGear.return_date,
+    },
+    Consumable: {
+        "id": Consumable.id,
+        "name": Consumable.name,
+        "quantity": Consumable.quantity,
+        "expires": Consumable.expires,
+        "last_updated": Consumable.last_updated,
+    },
+    LabEquipment: {
+        "id": LabEquipment.id,
+        "name": LabEquipment.name,
+        "last_serviced_on": LabEquipment.last_serviced_on,
+        "last_updated": LabEquipment.last_updated,
+    },
+}
+
+
+def apply_filters(query, model, args):
+    """Return ``query`` narrowed by every recognised filter in ``args``.
+
+    Empty values are ignored so a cleared form field doesn't filter.
+    """
+    for name, build in FILTERS.get(model, {}).items():
+        raw = args.get(name)
+        if raw is None or raw.strip() == "":
+            continue
+        query = query.filter(build(name, raw.strip()))
+    return query
+
+
+def parse_sort(model, args, default="name"):
+    """Return ``(column, descending)`` for the ``sort`` argument."""
+    raw = (args.get(SORT_ARG) or default).strip()
+    descending = raw.startswith("-")
+    key = raw.lstrip("-")
+    columns = SORTS.get(model, {})
+    if key not in columns:
+        allowed = ", ".join(sorted(columns))
+        raise FilterError(f"Cannot sort by '{key}'; expected one of: {allowed}")
+    return columns[key], descending
@@ -0,0 +1,297 @@
+"""Streaming CSV/JSONL inventory import.
+
+Rows are read one at a time from a file-like object, validated, and
+written in chunked transactions, so memory use depends on the chunk size
+and the number of distinct tag/location names, not on the file size.
+
+Each row describes one camera gear, consumable or lab equipment item::
+
+    type,name,tags,location,quantity,expires,service_frequency,last_serviced_on
+    consumable,Portra 400,"film, 35mm",Fridge,12,2026-01-31,,
+    lab_equipment,Enlarger,darkroom,,,,monthly,2025-05-01
+
+JSONL rows use the same keys; ``tags`` may be a list. ``type`` can be
+omitted when a default type is given. Tags and locations are referenced
+by name and created when missing; their ids are cached for the whole
+import so each distinct name costs at most one lookup. ``location_id``
+is accepted instead of ``location``.
+"""
+
+import csv
+import io
+import json
+import re
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from website import db
+from ..models import CameraGear, Consumable, LabEquipment, Location, Tag
+from .bulk import RowError, insert_items, row_date, row_int, row_text
+from .tags import resolve_names
+
+IMPORT_FORMATS = ("csv", "jsonl")
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_TYPES = {
+    "camera_gear": CameraGear,
+    "consumable": Consumable,
+    "lab_equipment": LabEquipment,
+}
+_TYPE_ALIASES = {
+    "camera": "camera_gear",
+    "gear": "camera_gear",
+    "consumables": "consumable",
+    "lab": "lab_equipment",
+}
+_TAG_SPLIT_RE = re.compile(r"[,;|]")
+
+
+class InventoryImportError(ValueError):
+    """Raised when an import can't start (unknown format or type)."""
+
+
+def detect_format(filename=None, declared=None):
+    """Return the import format from an explicit value or the file extension."""
+    fmt = (declared or "").strip().lower()
+    if not fmt and filename:
+        ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+        fmt = {"ndjson": "jsonl", "json": "jsonl"}.get(ext, ext)
+    if fmt not in IMPORT_FORMATS:
+        raise InventoryImportError(
+            f"Unsupported import format; expected one of: {', '.join(IMPORT_FORMATS)}"
+        )
+    return fmt
+
+
+def normalize_type(raw):
+    """Return the canonical item type for ``raw`` or None if unknown."""
+    if not raw:
+        return None
+    key = str(raw).strip().lower().replace("-", "_").replace(" ", "_")
+    key = _TYPE_ALIASES.get(key, key)
+    return key if key in IMPORT_TYPES else None
+
+
+def _text_stream(stream):
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+
+
+def iter_rows(stream, fmt):
+    """Yield ``(line_number, row)`` pairs; ``row`` is a dict or a RowError."""
+    text = _text_stream(stream)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            if None in row:
+                yield reader.line_num, RowError("Row has more cells than the header")
+            else:
+                yield reader.line_num, row
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, RowError("Invalid JSON")
+            continue
+        yield line_number, row if isinstance(row, dict) else RowError("Row must be a JSON object")
+
+
+def _tag_names(raw):
+    if raw is None:
+        return []
+    if isinstance(raw, list):
+        return [n.strip() for n in raw if isinstance(n, str) and n.strip()]
+    if isinstance(raw, str):
+        return [n.strip() for n in _TAG_SPLIT_RE.split(raw) if n.strip()]
+    raise RowError("'tags' must be a list or a comma-separated string")
+
+
+def parse_import_row(row, default_type=None):
+    """Validate one row; return ``(kind, values, tag_names, location_name)``."""
+    kind = normalize_type(row.get("type")) if row.get("type") else default_type
+    if kind is None:
+        raise RowError(f"Unknown item type '{row.get('type')}'")
+    values = {"name": row_text(row, "name")}
+    location_name = None
+    if kind in ("camera_gear", "consumable"):
+        location_name = row_text(row, "location", required=False)
+        values["location_id"] = None if location_name else row_int(row, "location_id")
+    if kind == "consumable":
+        quantity = row_int(row, "quantity", default=1)
+        if quantity < 0:
+            raise RowError("'quantity' can't be negative")
+        values["quantity"] = quantity
+        values["expires"] = row_date(row, "expires")
+    if kind == "lab_equipment":
+        values["service_frequency"] = row_text(row, "service_frequency", required=False)
+        values["last_serviced_on"] = row_date(row, "last_serviced_on")
+    return kind, values, _tag_names(row.get("tags")), location_name
+
+
+class _NameCache:
+    """Lower-cased name -> id for a table with unique names, filled on demand."""
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = {}
+
+    def load(self, names):
+        missing = [n for n in names if n.lower() not in self.ids]
+        if missing:
+            for row in resolve_names(self.model, missing):
+                self.ids[row.name.lower()] = row.id
+
+    def get(self, name):
+        return self.ids.get(name.lower())
+
+    def clear(self):
+        self.ids.clear()
+
+
+class InventoryImporter:
+    """Import rows from a stream in chunked transactions.
+
+    ``progress`` is called with the running report after every chunk.
+    """
+
+    def __init__(
+        self,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        default_type=None,
+        user_id=None,
+        progress=None,
+        max_errors=MAX_REPORTED_ERRORS,
+    ):
+        if default_type is not None and normalize_type(default_type) is None:
+            raise InventoryImportError(f"Unknown item type '{default_type}'")
+        self.chunk_size = max(1, min(int(chunk_size), MAX_CHUNK_SIZE))
+        self.default_type = normalize_type(default_type)
+        self.user_id = user_id
+        self.progress = progress
+        self.max_errors = max_errors
+        self.processed = 0
+        self.rejected = 0
+        self.imported = {kind: 0 for kind in IMPORT_TYPES}
+        self.errors = []
+        self._tags = _NameCache(Tag)
+        self._locations = _NameCache(Location)
+        self._known_location_ids = set()
+
+    def report(self):
+        """Return the running totals and the first ``max_errors`` rejected rows."""
+        return {
+            "processed": self.processed,
+            "imported": dict(self.imported),
+            "rejected": self.rejected,
+            "errors": list(self.errors),
+            "errors_truncated": self.rejected > len(self.errors),
+        }
+
+    def run(self, stream, fmt):
+        """Import every row of ``stream`` and return the final report.
+
+        Undecodable bytes stop the import; the rows read before them are
+        still written and the stop is reported as a rejected line, since
+        earlier chunks may already be committed.
+        """
+        chunk = []
+        line_number = 0
+        rows = iter_rows(stream, fmt)
+        while True:
+            try:
+                line_number, row = next(rows)
+            except StopIteration:
+                break
+            except UnicodeDecodeError:
+                # the text is decoded in blocks, so this is only near the bad bytes
+                self.processed += 1
+                self._reject(line_number + 1, "File is not valid UTF-8; the rest was not read")
+                break
+            self.processed += 1
+            try:
+                if isinstance(row, RowError):
+                    raise row
+                chunk.append((line_number, parse_import_row(row, self.default_type)))
+            except RowError as exc:
+                self._reject(line_number, str(exc))
+            if len(chunk) >= self.chunk_size:
+                self._write(chunk)
+                chunk = []
+        if chunk:
+            self._write(chunk)
+        elif self.progress:
+            self.progress(self.report())
+        return self.report()
+
+    def _reject(self, line_number, message):
+        self.rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_number, "error": message})
+
+    def _check_location_ids(self, chunk):
+        wanted = {
+            values["location_id"]
+            for _, (_, values, _, _) in chunk
+            if values.get("location_id") and values["location_id"] not in self._known_location_ids
+        }
+        if wanted:
+            found = db.session.query(Location.id).filter(Location.id.in_(wanted))
+            self._known_location_ids.update(row[0] for row in found)
+        valid = []
+        for line_number, parsed in chunk:
+            location_id = parsed[1].get("location_id")
+            if location_id and location_id not in self._known_location_ids:
+                self._reject(line_number, "Location not found")
+            else:
+                valid.append((line_number, parsed))
+        return valid
+
+    def _write(self, chunk):
+        """Write one chunk in its own transaction."""
+        chunk = self._check_location_ids(chunk)
+        now = datetime.now()
+        try:
+            # ordered so the first spelling of a new name is the one stored
+            self._tags.load(dict.fromkeys(n for _, (_, _, tags, _) in chunk for n in tags))
+            self._locations.load(dict.fromkeys(loc for _, (_, _, _, loc) in chunk if loc))
+            grouped = {}
+            for _, (kind, values, tag_names, location_name) in chunk:
+                if location_name:
+                    values["location_id"] = self._locations.get(location_name)
+                values["last_updated"] = now
+                values["updated_by"] = self.user_id
+                if kind == "lab_equipment":
+                    serviced = values["last_serviced_on"]
+                    values["last_serviced_by"] = self.user_id if serviced else None
+                tag_ids = list(dict.fromkeys(self._tags.get(n) for n in tag_names))
+                tag_ids = [tag_id for tag_id in tag_ids if tag_id is not None]
+                rows, links = grouped.setdefault(kind, ([], []))
+                rows.append(values)
+                links.append(tag_ids)
+            for kind, (rows, links) in grouped.items():
+                insert_items(IMPORT_TYPES[kind], rows, links)
+            db.session.commit()
+        except SQLAlchemyError as exc:
+            db.session.rollback()
+            # ids cached during the failed transaction may not exist
+            self._tags.clear()
+            self._locations.clear()
+            self._known_location_ids.clear()
+            current_app.logger.exception("Import chunk failed")
+            for line_number, _ in chunk:
+                self._reject(line_number, f"Database error: {exc.__class__.__name__}")
+        else:
+            for _, (kind, _, _, _) in chunk:
+                self.imported[kind] += 1
+        # the inserted objects aren't referenced past this point, and the
+        # session's identity map holds them weakly, so memory stays bounded
+        if self.progress:
+            self.progress(self.report())
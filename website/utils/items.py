@@ -0,0 +1,132 @@
+"""Cross-type item listing backed by a single ``UNION ALL`` query.
+
+Camera gear, consumables and lab equipment are projected onto one row
+shape (:data:`ITEM_COLUMNS`) and combined with ``UNION ALL``. Filtering
+happens inside each branch (reusing the per-model filters from
+``utils.filters``) and sorting/pagination on the combined result, so a
+page costs one statement however many items exist. Tag names come from
+a correlated ``aggregate_strings`` subquery per branch and the location
+name from a join, so no per-row lookups follow.
+
+A filter that only one type understands (``?checked_out=true``,
+``?expires_before=...``) drops the types that don't support it rather
+than being ignored for them.
+"""
+
+from sqlalchemy import Boolean, Date, Integer, cast, literal, null, select, union_all
+
+from website import db
+from ..models import CameraGear, Consumable, LabEquipment, Location
+from .filters import FILTERS, FilterError, SORT_ARG, apply_filters
+from .projection import split_tags, tag_names_subquery
+
+ITEM_TYPE_ARG = "type"
+
+ITEM_TYPES = {
+    "camera_gear": CameraGear,
+    "consumable": Consumable,
+    "lab_equipment": LabEquipment,
+}
+
+ITEM_COLUMNS = (
+    "type",
+    "id",
+    "name",
+    "quantity",
+    "location_id",
+    "location",
+    "expires",
+    "checked_out",
+    "last_serviced_on",
+    "last_updated",
+    "tags",
+)
+
+ITEM_SORTS = ("id", "name", "quantity", "expires", "last_updated", "type")
+
+
+def _branch(kind, model):
+    """Project ``model`` onto the shared item row shape."""
+    has_location = hasattr(model, "location_id")
+    columns = {
+        "type": literal(kind),
+        "id": model.id,
+        "name": model.name,
+        # gear and equipment are single units
+        "quantity": model.quantity if model is Consumable else literal(1, Integer),
+        "location_id": model.location_id if has_location else cast(null(), Integer),
+        "location": Location.name if has_location else cast(null(), Location.name.type),
+        "expires": model.expires if model is Consumable else cast(null(), Date),
+        "checked_out": model.is_checked_out if model is CameraGear else cast(null(), Boolean),
+        "last_serviced_on": (
+            model.last_serviced_on if model is LabEquipment else cast(null(), Date)
+        ),
+        "last_updated": model.last_updated,
+        "tags": tag_names_subquery(model),
+    }
+    stmt = select(*(expr.label(name) for name, expr in columns.items()))
+    if has_location:
+        stmt = stmt.select_from(model).outerjoin(Location, Location.id == model.location_id)
+    return stmt
+
+
+def _requested_types(args):
+    raw = (args.get(ITEM_TYPE_ARG) or "").strip()
+    if not raw:
+        return list(ITEM_TYPES)
+    kinds = [k.strip() for k in raw.split(",") if k.strip()]
+    unknown = [k for k in kinds if k not in ITEM_TYPES]
+    if unknown:
+        allowed = ", ".join(ITEM_TYPES)
+        raise FilterError(f"Unknown item type '{unknown[0]}'; expected one of: {allowed}")
+    return kinds
+
+
+def items_union(args):
+    """Return the ``UNION ALL`` of every requested item type as a subquery.
+
+    Raises :class:`FilterError` for unknown types or filter values.
+    """
+    given = {
+        name
+        for name, raw in args.items()
+        if name not in (ITEM_TYPE_ARG, SORT_ARG) and raw.strip()
+    }
+    known = set().union(*(FILTERS[model] for model in ITEM_TYPES.values()))
+    branches = []
+    for kind in _requested_types(args):
+        model = ITEM_TYPES[kind]
+        if given & (known - set(FILTERS[model])):
+            continue
+        branches.append(apply_filters(_branch(kind, model), model, args))
+    if not branches:
+        # no type supports every filter given; keep the shape, return nothing
+        branches.append(_branch("camera_gear", CameraGear).where(literal(False)))
+    return union_all(*branches).subquery("items")
+
+
+def parse_item_sort(items, args, default="name"):
+    """Return ``(column, descending)`` on the union for the ``sort`` argument."""
+    raw = (args.get(SORT_ARG) or default).strip()
+    descending = raw.startswith("-")
+    key = raw.lstrip("-")
+    if key not in ITEM_SORTS:
+        raise FilterError(
+            f"Cannot sort by '{key}'; expected one of: {', '.join(sorted(ITEM_SORTS))}"
+        )
+    return items.c[key], descending
+
+
+def serialize_item(row):
+    """Return the JSON shape of one union row."""
+    item = dict(zip(ITEM_COLUMNS, row))
+    for field in ("expires", "last_serviced_on", "last_updated"):
+        if item[field] is not None:
+            item[field] = item[field].isoformat()
+    item["tags"] = sorted(split_tags(item["tags"]))
+    return item
+
+
+def items_query(items):
+    """Return a session query selecting every column of the union in order."""
+    return db.session.query(*(items.c[name] for name in ITEM_COLUMNS))
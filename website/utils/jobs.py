@@ -0,0 +1,185 @@
+"""Background runs of the scheduled jobs behind the internal task endpoints.
+
+The task endpoints don't do their work inside the request any more:
+:func:`enqueue_job` records a queued :class:`~website.models.JobRun`
+and hands it to the app's :class:`JobRunner`, and the endpoint answers
+``202`` with the run's status URL straight away.
+
+A run looks up the admin/TA recipients once and opens one
+:class:`~website.utils.mail.MailSession`, then executes its steps
+concurrently on a thread pool (``JOB_WORKERS`` threads, default 3),
+each in its own app context and database session, sharing the
+recipient snapshot and the mail connection. Every step's outcome and
+duration are recorded on the run as it finishes.
+
+Runs execute in the web process that enqueued them, so one in flight
+when that process exits never finishes. The next :func:`enqueue_job`
+marks runs still queued or running after ``JOB_STALE_SECONDS`` as
+failed rather than leaving them pending forever.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import update
+
+from website import db
+from ..models import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JobRun
+from .mail import MailSession
+from .tasks import (
+    notify_camera_gear_due_returns,
+    notify_consumables_expiring_this_week,
+    notify_lab_equipment_service_reminders,
+    task_recipients,
+)
+
+JOB_WORKERS = "JOB_WORKERS"
+DEFAULT_JOB_WORKERS = 3
+JOB_STALE_SECONDS = 3600
+
+WEEKLY_EXPIRATIONS = "weekly-expirations"
+
+STEP_SENT = "sent"
+STEP_SKIPPED = "skipped"
+STEP_ERROR = "error"
+
+# job name -> steps; each step takes ``session`` and ``recipients``
+# keywords and returns True when it sent mail
+JOBS = {
+    WEEKLY_EXPIRATIONS: (
+        notify_consumables_expiring_this_week,
+        notify_camera_gear_due_returns,
+        notify_lab_equipment_service_reminders,
+    ),
+}
+
+_EXTENSION = "job_runner"
+_TABLE = JobRun.__table__
+
+
+def _run_step(app, step, session, recipients):
+    """Run one step in its own app context and return its result entry."""
+    name = step.__name__
+    started = time.perf_counter()
+    outcome, error = STEP_SKIPPED, None
+    with app.app_context():
+        try:
+            if step(session=session, recipients=list(recipients)):
+                outcome = STEP_SENT
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            app.logger.exception("Job step %s failed", name)
+            outcome, error = STEP_ERROR, str(exc)
+    duration_ms = round((time.perf_counter() - started) * 1000)
+    return {"name": name, "outcome": outcome, "duration_ms": duration_ms, "error": error}
+
+
+def run_job(run_id, pool):
+    """Execute the queued run ``run_id``, its steps on ``pool``.
+
+    Does nothing if another runner already started it.
+    """
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    claimed = db.session.execute(
+        update(_TABLE)
+        .where(_TABLE.c.id == run_id, _TABLE.c.status == JOB_QUEUED)
+        .values(status=JOB_RUNNING, started_at=datetime.now())
+    ).rowcount
+    db.session.commit()
+    if not claimed:
+        return
+    run = db.session.get(JobRun, run_id)
+    results = {}
+    try:
+        steps = JOBS[run.name]
+        names = [step.__name__ for step in steps]
+        # one recipient lookup and one mail connection shared by every step
+        recipients = task_recipients()
+        with MailSession() as session:
+            futures = [pool.submit(_run_step, app, step, session, recipients) for step in steps]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["name"]] = result
+                run.results = [results[name] for name in names if name in results]
+                db.session.commit()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        app.logger.exception("Job run %s failed", run_id)
+        run.error = str(exc)
+    failed = run.error or any(r["outcome"] == STEP_ERROR for r in results.values())
+    run.status = JOB_FAILED if failed else JOB_SUCCEEDED
+    run.finished_at = datetime.now()
+    db.session.commit()
+
+
+class JobRunner:
+    """Runs jobs one at a time on a background thread, their steps on a pool."""
+
+    def __init__(self, app, workers=DEFAULT_JOB_WORKERS):
+        self.app = app
+        self._runs = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-run")
+        self._steps = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-step")
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _execute(self, run_id):
+        with self.app.app_context():
+            try:
+                run_job(run_id, self._steps)
+            except Exception:  # pylint: disable=broad-exception-caught
+                self.app.logger.exception("Job run %s failed", run_id)
+                db.session.rollback()
+
+    def submit(self, run_id):
+        future = self._runs.submit(self._execute, run_id)
+        with self._lock:
+            self._futures = {k: f for k, f in self._futures.items() if not f.done()}
+            self._futures[run_id] = future
+        return future
+
+    def wait(self, run_id, timeout=None):
+        """Block until run ``run_id`` (submitted here) finishes."""
+        with self._lock:
+            future = self._futures.get(run_id)
+        if future is not None:
+            future.result(timeout)
+
+    def shutdown(self, wait=True):
+        self._runs.shutdown(wait=wait)
+        self._steps.shutdown(wait=wait)
+
+
+def init_job_runner(app):
+    """Create the app's :class:`JobRunner`; threads start with the first run."""
+    try:
+        workers = int(os.getenv(JOB_WORKERS, str(DEFAULT_JOB_WORKERS)))
+    except ValueError:
+        workers = DEFAULT_JOB_WORKERS
+    runner = JobRunner(app, max(workers, 1))
+    app.extensions[_EXTENSION] = runner
+    return runner
+
+
+def get_runner():
+    """Return the current app's :class:`JobRunner`."""
+    return current_app.extensions[_EXTENSION]
+
+
+def enqueue_job(name):
+    """Record a queued run of job ``name``, start it in the background and return it."""
+    now = datetime.now()
+    db.session.execute(
+        update(_TABLE)
+        .where(
+            _TABLE.c.status.in_([JOB_QUEUED, JOB_RUNNING]),
+            _TABLE.c.created_at < now - timedelta(seconds=JOB_STALE_SECONDS),
+        )
+        .values(status=JOB_FAILED, finished_at=now, error="Abandoned: its process stopped")
+    )
+    run = JobRun(name=name, status=JOB_QUEUED, created_at=now)
+    db.session.add(run)
+    db.session.commit()
+    get_runner().submit(run.id)
+    return run
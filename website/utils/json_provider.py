@@ -0,0 +1,113 @@
+"""JSON provider backed by orjson, with a stdlib fallback.
+
+:class:`FastJSONProvider` replaces Flask's default provider so every
+dict a view returns (and ``jsonify``) is serialized by orjson when it is
+installed. orjson handles ``datetime``/``date`` (ISO 8601), ``Enum``
+(by value), dataclasses and UUIDs natively; ``Decimal`` and a few other
+types go through :func:`_default`. Without orjson the same conversions
+are applied through the stdlib ``json`` module, so the output doesn't
+depend on which backend is active.
+
+Unlike Flask's provider, keys aren't sorted by default; sorting is a
+large share of the encoding cost and clients don't depend on key order.
+"""
+
+import dataclasses
+import decimal
+import enum
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:  # optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(o):
+    """Convert values neither backend serializes natively."""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, enum.Enum):
+        return o.value
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if isinstance(o, tuple):
+        return list(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that prefers orjson."""
+
+    default = staticmethod(_default)
+    sort_keys = False
+    # orjson always emits UTF-8; match it in the fallback
+    ensure_ascii = False
+
+    @property
+    def backend(self):
+        """Name of the library doing the encoding."""
+        return "orjson" if orjson is not None else "json"
+
+    def _orjson_option(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _dump_bytes(self, obj, indent=False):
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=_default, option=self._orjson_option(indent))
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits; let the stdlib decide
+                pass
+        return json.dumps(
+            obj,
+            default=_default,
+            ensure_ascii=self.ensure_ascii,
+            sort_keys=self.sort_keys,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+        ).encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        """Serialize ``obj`` to a JSON string.
+
+        Extra stdlib keyword arguments (``cls``, ``indent``...) fall back
+        to the stdlib encoder so callers relying on them keep working.
+        """
+        if kwargs:
+            kwargs.setdefault("default", _default)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self._dump_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or bytes."""
+        if orjson is not None and not kwargs:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response without a bytes -> str -> bytes round trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(
+            self._dump_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
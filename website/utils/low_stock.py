@@ -0,0 +1,124 @@
+"""Debounced low-stock alerting.
+
+A consumable alerts when its quantity *crosses* ``LOW_STOCK_THRESHOLD``
+on the way down, not on every write while it stays low. The state lives
+on the row:
+
+* ``low_stock_since`` - when the item last went from above the
+  threshold to at or below it; cleared when it is restocked.
+* ``low_stock_pending`` - the crossing is waiting for the next digest.
+* ``low_stock_alerted_at`` - when the item was last part of a digest.
+
+:func:`track_low_stock` runs in the request path. It only sets those
+columns on the row being written, so it costs no queries and no mail.
+A crossing within ``LOW_STOCK_COOLDOWN`` seconds of the item's last
+alert is ignored, and an item restocked before the digest goes out is
+dropped from it.
+
+:func:`queue_low_stock_digest` runs in the mail dispatcher. Once the
+oldest pending crossing is ``LOW_STOCK_DIGEST_WINDOW`` seconds old it
+claims every pending item and queues one digest for all of them.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, select, update
+
+from website import db
+from ..models import Consumable
+from .mail import send_low_stock_digest
+
+LOW_STOCK_THRESHOLD = "LOW_STOCK_THRESHOLD"
+LOW_STOCK_COOLDOWN = "LOW_STOCK_COOLDOWN"
+LOW_STOCK_DIGEST_WINDOW = "LOW_STOCK_DIGEST_WINDOW"
+
+DEFAULT_THRESHOLD = 5
+DEFAULT_COOLDOWN_SECONDS = 24 * 3600
+DEFAULT_DIGEST_WINDOW_SECONDS = 300
+
+_TABLE = Consumable.__table__
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def low_stock_threshold():
+    """Return the quantity at or below which an item counts as low."""
+    return _env_int(LOW_STOCK_THRESHOLD, DEFAULT_THRESHOLD)
+
+
+def track_low_stock(item, now=None, threshold=None):
+    """Update ``item``'s alert state after a write; call before committing.
+
+    Returns True when the write is a downward crossing that will be part
+    of the next digest. A quantity that isn't a number is left alone.
+    """
+    now = now or datetime.now()
+    threshold = low_stock_threshold() if threshold is None else threshold
+    if item.quantity is None:
+        quantity = None
+    else:
+        try:
+            quantity = int(item.quantity)
+        except (TypeError, ValueError):
+            current_app.logger.info(
+                "Could not interpret quantity for item %s; skipping low-stock check.",
+                getattr(item, "id", "?"),
+            )
+            return False
+    if quantity is None or quantity > threshold:
+        # restocked: re-arm, and drop a crossing the digest hasn't sent yet
+        if item.low_stock_since is not None:
+            item.low_stock_since = None
+        if item.low_stock_pending:
+            item.low_stock_pending = False
+        return False
+    if item.low_stock_since is not None:
+        return False  # still low from an earlier crossing
+    item.low_stock_since = now
+    cooldown = timedelta(seconds=_env_int(LOW_STOCK_COOLDOWN, DEFAULT_COOLDOWN_SECONDS))
+    if item.low_stock_alerted_at is not None and now - item.low_stock_alerted_at < cooldown:
+        return False
+    item.low_stock_pending = True
+    return True
+
+
+def track_low_stock_all(items):
+    """:func:`track_low_stock` for every item of a bulk write."""
+    now = datetime.now()
+    threshold = low_stock_threshold()
+    for item in items:
+        track_low_stock(item, now, threshold)
+
+
+def queue_low_stock_digest(now=None):
+    """Queue one digest for the pending crossings once the window has passed.
+
+    Items are claimed with a conditional ``UPDATE``, so concurrent
+    dispatchers never report the same crossing twice. Commits; returns
+    the number of items reported.
+    """
+    now = now or datetime.now()
+    window = timedelta(seconds=_env_int(LOW_STOCK_DIGEST_WINDOW, DEFAULT_DIGEST_WINDOW_SECONDS))
+    oldest = db.session.scalar(
+        select(func.min(_TABLE.c.low_stock_since)).where(_TABLE.c.low_stock_pending)
+    )
+    if oldest is None or now - oldest < window:
+        return 0
+    claimed = db.session.scalars(
+        update(_TABLE)
+        .where(_TABLE.c.low_stock_pending)
+        .values(low_stock_pending=False, low_stock_alerted_at=now)
+        .returning(_TABLE.c.id)
+    ).all()
+    if claimed:
+        items = Consumable.query.filter(Consumable.id.in_(claimed)).order_by(Consumable.name).all()
+        send_low_stock_digest(items, threshold=low_stock_threshold())
+    db.session.commit()
+    return len(claimed)
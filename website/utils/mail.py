@@ -3,17 +3,34 @@
 Provides a thin wrapper around the Flask-Mailman extension. Functions
 are resilient when mail isn't configured so they won't break request
 flows if sending fails.
+
+Alerts raised while handling a request aren't sent inline:
+:func:`queue_email` adds them to the outbox in the caller's
+transaction and the dispatcher in ``utils.outbox`` delivers them, so a
+slow or unreachable mail server never holds up the request.
+
+Jobs that send several messages (the weekly notifications, a dispatcher
+batch) send them through a :class:`MailSession`, which reuses one SMTP
+connection instead of connecting and negotiating TLS per message.
 """
 
 import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
 from typing import Optional
 
 from flask import Flask, current_app
 from flask_mailman import Mail, EmailMessage
 
+from website import db
+
 # lazy-initialized Mail instance
 mail: Optional[Mail] = None
 
+# session.info flag: the transaction queued mail (see utils.outbox)
+MAIL_QUEUED_KEY = "mail_queued"
+
 
 def init_mail(app: Flask) -> None:
     """Initialize the Mail extension with the given Flask app.
@@ -24,98 +41,152 @@ def init_mail(app: Flask) -> None:
     mail = Mail(app)
 
 
-def send_low_stock_alert(item, threshold: int | None = None) -> bool:
-    """Send a low-stock alert for `item` to all admin and TA users.
+class MailSession:
+    """Sends every message of one job over a single mail connection.
+
+    ``EmailMessage.send()`` on its own opens (and closes) a connection
+    per message. Inside ``with MailSession() as session`` the messages
+    passed to :meth:`send` or :meth:`send_messages` share one
+    connection, opened with the first message so a job with nothing to
+    send never connects, and closed when the block exits.
 
-    Returns True if an email was sent (or attempted), False if no email
-    was necessary (quantity above threshold) or there were no recipients.
+    A session can be shared by threads; their messages go out one at
+    a time over the shared connection. Keyword arguments are passed to
+    ``Mail.get_connection`` (``host``, ``port``, ``timeout``...).
+    """
 
-    Behavior is resilient and mirrors the notification helpers in
-    `website.utils.tasks`: try DB operations first, fall back to in-Python
-    logic, log failures, and do not raise from this helper.
+    def __init__(self, fail_silently: bool = False, **options):
+        self.fail_silently = fail_silently
+        self.options = options
+        self.connection = None
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def open(self):
+        """Return the session's connection, connecting on first use."""
+        with self._lock:
+            if self.connection is None:
+                if mail is None:
+                    raise RuntimeError("Mail extension not initialized")
+                connection = mail.get_connection(fail_silently=self.fail_silently, **self.options)
+                connection.open()
+                self.connection = connection
+            return self.connection
+
+    def send(self, message) -> None:
+        """Send one ``EmailMessage`` over the session's connection."""
+        # the connection already carries fail_silently
+        message.connection = self.open()
+        message.send()
+        with self._lock:
+            self.sent += 1
+
+    def send_messages(self, messages) -> int:
+        """Send ``messages`` over the session's connection; return how many were sent."""
+        messages = list(messages)
+        if not messages:
+            return 0
+        sent = self.open().send_messages(messages) or 0
+        with self._lock:
+            self.sent += sent
+        return sent
+
+    def close(self) -> None:
+        with self._lock:
+            connection, self.connection = self.connection, None
+        if connection is None:
+            return
+        try:
+            connection.close()
+        except Exception:  # pylint: disable=broad-exception-caught
+            # the messages went out; a failed QUIT doesn't matter
+            pass
+
+
+@contextmanager
+def mail_session(session: Optional[MailSession] = None):
+    """Yield ``session``, or a new :class:`MailSession` closed on exit when None."""
+    if session is not None:
+        yield session
+        return
+    with MailSession() as new_session:
+        yield new_session
+
+
+def queue_email(subject: str, to, body: str):
+    """Add an email to the outbox as part of the current transaction.
+
+    Nothing is committed; the message is sent once the caller commits
+    and is dropped if it rolls back. Returns the
+    :class:`~website.models.OutboxMessage`.
+    """
+    from ..models import OutboxMessage  # local import to avoid cycles
+
+    now = datetime.now()
+    message = OutboxMessage(
+        subject=subject,
+        recipients=list(to),
+        body=body,
+        created_at=now,
+        next_attempt_at=now,
+    )
+    db.session.add(message)
+    db.session.info[MAIL_QUEUED_KEY] = True
+    return message
+
+
+def send_low_stock_digest(items, threshold: int | None = None) -> bool:
+    """Queue one low-stock email covering every item in ``items`` at or below threshold.
+
+    Called by :func:`~website.utils.low_stock.queue_low_stock_digest`
+    in the mail dispatcher, once the oldest pending crossing is a digest
+    window old, with every item it just claimed; the message is queued in
+    the same transaction as the claim. Returns True if an email was
+    queued.
     """
-    # Determine threshold (env override)
     try:
         if threshold is None:
             threshold = int(os.getenv("LOW_STOCK_THRESHOLD", "5"))
-    except Exception:  # pragma: no cover - defensive
+    except ValueError:
         threshold = 5
 
-    # Only proceed if item quantity is at-or-below threshold
-    try:
-        if item.quantity is None or int(item.quantity) > int(threshold):
-            if current_app and current_app.logger:
-                current_app.logger.info(
-                    "Item %s (id:%s) above low-stock threshold; skipping.",
-                    getattr(item, "name", "?"),
-                    getattr(item, "id", "?"),
-                )
-            return False
-    except (TypeError, ValueError):  # pragma: no cover - defensive
-        # if quantity can't be interpreted, do not send
-        if current_app and current_app.logger:
-            current_app.logger.info(
-                "Could not interpret quantity for item %s; skipping low-stock alert.",
-                getattr(item, "id", "?"),
-            )
-        return False
-
-    # If Mail isn't initialized, nothing to do.
-    if mail is None:
-        if current_app and current_app.logger:
-            current_app.logger.info("Mail extension not initialized; skipping low-stock alert for item id %s", getattr(item, "id", "?"))
+    low = []
+    for item in items:
+        try:
+            quantity = int(item.quantity)
+        except (TypeError, ValueError):
+            continue  # can't tell whether it's low
+        if quantity <= threshold:
+            low.append(item)
+    if not low or mail is None:
         return False
 
-    # Import here to avoid circular imports at app import time
-    try:
-        from ..models import User  # local import to avoid cycles
-        from ..constants import UserRole
-    except (ImportError, ModuleNotFoundError):  # pragma: no cover - defensive
-        if current_app and current_app.logger:
-            current_app.logger.exception(
-                "Failed to import User/roles for low-stock alert",
-            )
-        return False
-
-    # collect admin and TA recipients
-    try:
-        recipients_q = (
-            User.query.filter(
-                User.role.in_([UserRole.ADMIN, UserRole.TA])
-            ).all()
-        )
-    except Exception:  # pragma: no cover - fallback exercised in tests
-        recipients_q = [
-            u for u in User.query.all() if u.role in (UserRole.ADMIN, UserRole.TA)
-        ]
+    from ..models import User  # local import to avoid cycles
+    from ..constants import UserRole
 
-    recipients = [u.email for u in recipients_q if getattr(u, "email", None)]
+    recipients = [
+        u.email
+        for u in User.query.filter(User.role.in_([UserRole.ADMIN, UserRole.TA])).all()
+        if u.email
+    ]
     if not recipients:
-        if current_app and current_app.logger:
-            current_app.logger.info("No admin/TA recipients for low-stock alert for item id %s", getattr(item, "id", "?"))
+        current_app.logger.info("No admin/TA recipients for low-stock digest")
         return False
 
-    subject = f"Low stock alert: {item.name}"
-    location = getattr(item, "location", None)
-    location_name = location.name if location else "Unknown"
-    body_lines = [
-        f"Item '{item.name}' (id: {item.id}) has low stock.",
-        f"Quantity remaining: {item.quantity}",
-        f"Location: {location_name}",
-        "\nPlease restock or re-order as needed.",
-    ]
-    body = "\n".join(body_lines)
-
-    try:
-        msg = EmailMessage(subject=subject, to=recipients, body=body)
-        msg.send()
-    except Exception:  # pragma: no cover - error path exercised in tests
-        if current_app and current_app.logger:
-            current_app.logger.exception(
-                "Failed to send low-stock email for item id %s",
-                getattr(item, "id", "?"),
-            )
-        # we attempted to send but it failed; return True to indicate an attempt
-        return True
+    lines = [f"{len(low)} item(s) have low stock:", ""]
+    for item in low:
+        location = getattr(item, "location", None)
+        lines.append(
+            f"- {item.name} (id: {item.id}): {item.quantity} left, "
+            f"location: {location.name if location else 'Unknown'}"
+        )
+    lines.append("\nPlease restock or re-order as needed.")
 
+    queue_email(f"Low stock alert: {len(low)} item(s)", recipients, "\n".join(lines))
     return True
@@ -0,0 +1,303 @@
+"""Delivery of the mail outbox.
+
+:func:`dispatch_batch` claims up to ``batch_size`` due messages, sends
+them through one :class:`~website.utils.mail.MailSession` (a single
+SMTP connection) and records the outcome:
+
+* sent messages are marked ``sent``;
+* failures are retried with exponential backoff
+  (``OUTBOX_BACKOFF_BASE`` seconds, doubling, capped at
+  ``OUTBOX_BACKOFF_MAX``) and marked ``failed`` after
+  ``OUTBOX_MAX_ATTEMPTS``;
+* a :class:`CircuitBreaker` stops all sending for a while after
+  repeated failures, so an unreachable server costs one failed attempt
+  per cool-down instead of one per message.
+
+Before claiming, each batch turns the pending low-stock crossings into
+one digest message (see ``utils.low_stock``).
+
+A message is claimed by moving its ``next_attempt_at`` past a lease with
+a conditional ``UPDATE``, so several dispatchers (one per gunicorn
+worker, or a separate ``flask mail-worker``) never send it twice, and a
+dispatcher that dies mid-batch only delays it until the lease expires.
+
+:func:`init_mail_dispatcher` sets up a :class:`MailDispatcher` thread
+for the web process (``MAIL_DISPATCHER=thread``, the default when a mail
+server is configured), started by its first request. It polls every ``OUTBOX_POLL_SECONDS`` and is
+woken as soon as a transaction that queued mail commits. Set
+``MAIL_DISPATCHER=off`` and run ``flask mail-worker`` to send from a
+separate process instead; ``mail-worker`` refuses to run while the
+in-process dispatcher is enabled.
+"""
+
+import importlib
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, select, update
+
+from website import db
+from ..models import OUTBOX_FAILED, OUTBOX_PENDING, OUTBOX_SENT, OutboxMessage
+from . import low_stock
+
+# ``utils`` re-exports the ``mail`` extension instance under the
+# submodule's name, so ``from . import mail`` would get the instance
+mail_module = importlib.import_module(f"{__package__}.mail")
+
+MAIL_DISPATCHER = "MAIL_DISPATCHER"
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_BACKOFF_BASE = 30
+OUTBOX_BACKOFF_MAX = 3600
+OUTBOX_LEASE_SECONDS = 300
+OUTBOX_POLL_SECONDS = 30
+BREAKER_FAILURES = 3
+BREAKER_RESET_SECONDS = 120
+
+_EXTENSION = "mail_dispatcher"
+_TABLE = OutboxMessage.__table__
+
+
+class CircuitBreaker:
+    """Stops sending after ``failures`` consecutive errors for ``reset_after`` seconds.
+
+    Once the cool-down passes one trial batch is let through ("half
+    open"); success closes the breaker, another failure reopens it.
+    """
+
+    def __init__(
+        self, failures=BREAKER_FAILURES, reset_after=BREAKER_RESET_SECONDS, clock=time.monotonic
+    ):
+        self.failures = failures
+        self.reset_after = reset_after
+        self._clock = clock
+        self._count = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            return self._clock() - self._opened_at < self.reset_after
+
+    def allow(self):
+        """Return True when sending may be attempted."""
+        return not self.is_open
+
+    def success(self):
+        with self._lock:
+            self._count = 0
+            self._opened_at = None
+
+    def failure(self):
+        with self._lock:
+            self._count += 1
+            if self._count >= self.failures:
+                self._opened_at = self._clock()
+
+
+def backoff_seconds(attempts):
+    """Return the delay before retrying a message that failed ``attempts`` times."""
+    return min(OUTBOX_BACKOFF_BASE * 2 ** max(attempts - 1, 0), OUTBOX_BACKOFF_MAX)
+
+
+def _claim(now, limit):
+    """Lease up to ``limit`` due messages to this dispatcher and return them."""
+    due = db.session.scalars(
+        select(_TABLE.c.id)
+        .where(_TABLE.c.status == OUTBOX_PENDING, _TABLE.c.next_attempt_at <= now)
+        .order_by(_TABLE.c.next_attempt_at, _TABLE.c.id)
+        .limit(limit)
+    ).all()
+    lease = now + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+    claimed = []
+    for message_id in due:
+        result = db.session.execute(
+            update(_TABLE)
+            .where(
+                _TABLE.c.id == message_id,
+                _TABLE.c.status == OUTBOX_PENDING,
+                _TABLE.c.next_attempt_at <= now,
+            )
+            .values(next_attempt_at=lease, attempts=_TABLE.c.attempts + 1)
+        )
+        if result.rowcount:
+            claimed.append(message_id)
+    db.session.commit()
+    if not claimed:
+        return []
+    return db.session.scalars(
+        select(OutboxMessage).where(OutboxMessage.id.in_(claimed)).order_by(OutboxMessage.id)
+    ).all()
+
+
+def _failed(message, error, now):
+    message.last_error = str(error)[:2000]
+    if message.attempts >= OUTBOX_MAX_ATTEMPTS:
+        message.status = OUTBOX_FAILED
+    else:
+        message.next_attempt_at = now + timedelta(seconds=backoff_seconds(message.attempts))
+
+
+def _release(messages, now):
+    """Return claimed but unattempted messages to the queue."""
+    for message in messages:
+        message.attempts -= 1
+        message.next_attempt_at = now
+
+
+def dispatch_batch(breaker=None, batch_size=OUTBOX_BATCH_SIZE):
+    """Send one batch of due messages.
+
+    Returns ``{"sent": n, "retried": n, "failed": n}``; all zero when
+    mail isn't set up, nothing is due or the breaker is open.
+    """
+    counts = {"sent": 0, "retried": 0, "failed": 0}
+    if mail_module.mail is None or (breaker is not None and not breaker.allow()):
+        return counts
+    # low-stock crossings are coalesced here, off the request path
+    low_stock.queue_low_stock_digest()
+    now = datetime.now()
+    messages = _claim(now, batch_size)
+    if not messages:
+        return counts
+
+    session = mail_module.MailSession()
+    try:
+        session.open()
+    except Exception as exc:  # pylint: disable=broad-exception-caught
+        current_app.logger.warning("Could not connect to the mail server: %s", exc)
+        if breaker is not None:
+            breaker.failure()
+        for message in messages:
+            _failed(message, exc, now)
+            counts["failed" if message.status == OUTBOX_FAILED else "retried"] += 1
+        db.session.commit()
+        return counts
+
+    try:
+        for position, message in enumerate(messages):
+            if breaker is not None and not breaker.allow():
+                _release(messages[position:], now)
+                break
+            email = mail_module.EmailMessage(
+                subject=message.subject, body=message.body, to=message.recipients
+            )
+            try:
+                session.send(email)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                current_app.logger.warning("Sending outbox message %s failed: %s", message.id, exc)
+                if breaker is not None:
+                    breaker.failure()
+                _failed(message, exc, now)
+                counts["failed" if message.status == OUTBOX_FAILED else "retried"] += 1
+                continue
+            if breaker is not None:
+                breaker.success()
+            message.status = OUTBOX_SENT
+            message.sent_at = datetime.now()
+            message.last_error = None
+            counts["sent"] += 1
+    finally:
+        session.close()
+        db.session.commit()
+    return counts
+
+
+def run_dispatcher(
+    app, stop, wake=None, breaker=None, poll=OUTBOX_POLL_SECONDS, batch_size=OUTBOX_BATCH_SIZE
+):
+    """Dispatch batches until ``stop`` is set, waiting ``poll`` seconds when idle."""
+    breaker = breaker or CircuitBreaker()
+    wake = wake or threading.Event()
+    while not stop.is_set():
+        counts = {}
+        with app.app_context():
+            try:
+                counts = dispatch_batch(breaker, batch_size)
+            except Exception:  # pylint: disable=broad-exception-caught
+                app.logger.exception("Mail dispatcher batch failed")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+        if sum(counts.values()) >= batch_size:
+            continue  # more may be due right away
+        wake.wait(poll)
+        wake.clear()
+
+
+class MailDispatcher:
+    """Background thread running :func:`run_dispatcher` for one app."""
+
+    def __init__(self, app, poll=OUTBOX_POLL_SECONDS):
+        self.breaker = CircuitBreaker()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(
+            target=run_dispatcher,
+            args=(app, self._stop, self._wake, self.breaker, poll),
+            name="mail-dispatcher",
+            daemon=True,
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def started(self):
+        return self._thread.ident is not None
+
+    def start(self):
+        """Start the thread; later calls do nothing."""
+        with self._lock:
+            if not self.started:
+                self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        self._wake.set()
+        if self.started:
+            self._thread.join(timeout)
+
+
+def init_mail_dispatcher(app):
+    """Set up the in-process dispatcher unless ``MAIL_DISPATCHER=off`` or mail isn't configured.
+
+    The thread starts with the app's first request, so CLI processes
+    (migrations, imports, ``mail-worker``) never run one.
+    """
+    mode = (app.config.get(MAIL_DISPATCHER) or "thread").lower()
+    if mode == "off" or not app.config.get("MAIL_SERVER"):
+        return None
+    dispatcher = MailDispatcher(app)
+    app.extensions[_EXTENSION] = dispatcher
+
+    @app.before_request
+    def _start_mail_dispatcher():
+        if not dispatcher.started:
+            dispatcher.start()
+
+    return dispatcher
+
+
+def get_dispatcher(app=None):
+    """Return the app's in-process dispatcher, or None when it has none."""
+    return (app or current_app).extensions.get(_EXTENSION)
+
+
+@event.listens_for(db.session, "after_commit")
+def _wake_after_commit(session):
+    if session.info.pop(mail_module.MAIL_QUEUED_KEY, None) and has_app_context():
+        dispatcher = current_app.extensions.get(_EXTENSION)
+        if dispatcher is not None:
+            dispatcher.wake()
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _forget_after_rollback(session, previous_transaction):  # pylint: disable=unused-argument
+    session.info.pop(mail_module.MAIL_QUEUED_KEY, None)
@@ -0,0 +1,173 @@
+"""Keyset (cursor) pagination helpers for the list endpoints.
+
+List endpoints accept ``?limit=<n>&after=<cursor>``. Pages are ordered
+by a sort key followed by the primary key, and the next page is selected
+with a ``WHERE (sort_key, id) > (last_sort_key, last_id)`` comparison
+instead of ``OFFSET`` so the database can seek straight to the page
+through an index no matter how deep the client has scrolled.
+
+Cursors are opaque URL-safe strings encoding the key values of the last
+row on the page. Requests without ``limit`` keep returning the whole
+collection so existing callers are unaffected.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+
+from flask import request
+from sqlalchemy import Date, DateTime, and_, case, false, or_
+
+from ..constants import ERROR_BAD_REQUEST
+
+PAGE_LIMIT_ARG = "limit"
+PAGE_AFTER_ARG = "after"
+NEXT_CURSOR_KEY = "next_cursor"
+MAX_PAGE_LIMIT = 500
+
+
+class PaginationError(ValueError):
+    """Raised when the ``limit``/``after`` request arguments are invalid."""
+
+
+def sort_keys(column, descending=False):
+    """Return the ``(expression, descending)`` pairs that order by ``column``.
+
+    Nullable columns get a leading "is null" flag so NULLs always sort
+    last and still take part in the keyset comparison.
+    """
+    keys = []
+    if getattr(column, "nullable", False):
+        keys.append((case((column.is_(None), 1), else_=0), False))
+    keys.append((column, descending))
+    return keys
+
+
+def encode_cursor(values) -> str:
+    """Encode a list of key values into an opaque cursor string."""
+    payload = [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Decode a cursor produced by :func:`encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, ValueError, UnicodeError) as exc:
+        raise PaginationError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise PaginationError("Invalid cursor")
+    return values
+
+
+def _coerce(expression, value):
+    """Convert a JSON cursor value back to the Python type of ``expression``."""
+    if value is None:
+        return None
+    try:
+        if isinstance(expression.type, DateTime):
+            return datetime.fromisoformat(value)
+        if isinstance(expression.type, Date):
+            return date.fromisoformat(value)
+    except (TypeError, ValueError) as exc:
+        raise PaginationError("Invalid cursor") from exc
+    return value
+
+
+def _after_clause(keys, values):
+    """Build the row-value comparison ``keys > values`` as an OR chain.
+
+    Written out explicitly so mixed sort directions work and so a NULL
+    cursor value turns the equality terms into ``IS NULL``.
+    """
+    clauses = []
+    for i, (expression, descending) in enumerate(keys):
+        value = values[i]
+        ties = [keys[j][0] == values[j] for j in range(i)]
+        if value is None:
+            # NULLs share one slot at the end; only the tie-breaker can advance
+            step = false()
+        else:
+            step = expression < value if descending else expression > value
+        clauses.append(and_(*ties, step))
+    return or_(*clauses)
+
+
+def parse_page_args(args):
+    """Return ``(limit, after)`` from request args; ``limit`` is None when absent."""
+    raw_limit = args.get(PAGE_LIMIT_ARG)
+    after = args.get(PAGE_AFTER_ARG) or None
+    if raw_limit in (None, ""):
+        if after:
+            raise PaginationError("'after' requires 'limit'")
+        return None, None
+    try:
+        limit = int(raw_limit)
+    except ValueError as exc:
+        raise PaginationError("'limit' must be an integer") from exc
+    if limit < 1 or limit > MAX_PAGE_LIMIT:
+        raise PaginationError(f"'limit' must be between 1 and {MAX_PAGE_LIMIT}")
+    return limit, after
+
+
+def keyset_paginate(query, keys, limit, after=None):
+    """Return ``(rows, next_cursor)`` for one page of ``query``.
+
+    ``keys`` is a list of ``(expression, descending)`` pairs and must end
+    with a unique column (normally the primary key). The key expressions
+    are added to ``query`` as extra columns so the cursor can be built
+    from the last row without re-evaluating anything in Python.
+
+    Queries for a single entity yield that entity per row; queries for
+    several columns yield a tuple of those columns.
+    """
+    width = len(query.column_descriptions)
+    if after is not None:
+        values = decode_cursor(after)
+        if len(values) != len(keys):
+            raise PaginationError("Invalid cursor")
+        values = [_coerce(expression, v) for (expression, _), v in zip(keys, values)]
+        query = query.filter(_after_clause(keys, values))
+
+    ordering = [e.desc() if descending else e.asc() for e, descending in keys]
+    labelled = [e.label(f"_page_key_{i}") for i, (e, _) in enumerate(keys)]
+    rows = query.add_columns(*labelled).order_by(*ordering).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(list(rows[-1][-len(keys):]))
+    if width == 1:
+        return [row[0] for row in rows], next_cursor
+    return [tuple(row[:width]) for row in rows], next_cursor
+
+
+def paginated_response(
+    query, collection_name, sort_column, id_column, descending=False, serialize=None
+):
+    """Serialize ``query`` as ``{collection_name: [...], "next_cursor": ...}``.
+
+    Rows are ordered by ``sort_column`` then ``id_column`` (a column or a
+    sequence of columns that together identify a row). Reads
+    ``limit``/``after`` from the current request; without ``limit`` the
+    full collection is returned and ``next_cursor`` is None.
+    """
+    serialize = serialize or (lambda obj: obj.to_dict())
+    id_columns = id_column if isinstance(id_column, (list, tuple)) else [id_column]
+    keys = sort_keys(sort_column, descending) + [(column, False) for column in id_columns]
+    try:
+        limit, after = parse_page_args(request.args)
+        if limit is None:
+            ordering = [e.desc() if desc else e.asc() for e, desc in keys]
+            items, next_cursor = query.order_by(*ordering).all(), None
+        else:
+            items, next_cursor = keyset_paginate(query, keys, limit, after)
+    except PaginationError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    return {
+        collection_name: [serialize(item) for item in items],
+        NEXT_CURSOR_KEY: next_cursor,
+    }
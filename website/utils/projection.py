@@ -0,0 +1,247 @@
+"""Read-only column projections for the list endpoints.
+
+Building ORM instances (identity map, attribute state, relationship
+collections) only to call ``to_dict()`` on them and throw them away is
+the bulk of a list request's cost. :func:`projected_query` instead
+selects exactly the columns ``to_dict()`` reads, in one statement:
+
+* location, item names and user emails through outer joins,
+* tag names through a correlated ``aggregate_strings`` subquery
+  (``group_concat`` on SQLite, ``string_agg`` on PostgreSQL),
+
+and :func:`serialize_row` turns each row into the same dict shape as
+the model's ``to_dict()``. The query accepts the same filters and sort
+columns as ``model.query``, so it plugs into ``apply_filters`` and
+``paginated_response`` unchanged.
+
+Both take an optional field selection (see :func:`parse_fields`); only
+the columns, joins and subqueries behind the selected keys are part of
+the statement.
+"""
+
+from collections import namedtuple
+
+from sqlalchemy import String, case, cast, func, select
+from sqlalchemy.orm import aliased
+
+from website import db
+from ..constants import (
+    ITEM_FIELD_EXPIRES,
+    ITEM_FIELD_LOCATION_ID,
+    ITEM_FIELD_NAME,
+    ITEM_FIELD_QUANTITY,
+    ITEM_FIELD_TAGS,
+    ITEM_FIELD_UPDATED_BY,
+)
+from ..models import (
+    CameraGear,
+    Consumable,
+    LabEquipment,
+    Location,
+    Note,
+    Tag,
+    User,
+    camera_gear_tags,
+    consumable_tags,
+    lab_equipment_tags,
+)
+from .filters import FilterError
+
+FIELDS_ARG = "fields"
+
+TAG_SEPARATOR = "\x1f"
+
+_TAG_TABLES = {
+    CameraGear: (camera_gear_tags, camera_gear_tags.c.camera_gear_id),
+    Consumable: (consumable_tags, consumable_tags.c.consumable_id),
+    LabEquipment: (lab_equipment_tags, lab_equipment_tags.c.lab_equipment_id),
+}
+
+# ``joins`` are the ``(target, onclause)`` outer joins ``expression`` needs
+_Field = namedtuple("_Field", "key expression convert joins")
+
+
+def tag_names_subquery(model):
+    """Correlated subquery yielding ``model``'s tag names joined by TAG_SEPARATOR."""
+    table, item_column = _TAG_TABLES[model]
+    return (
+        select(func.aggregate_strings(Tag.name, TAG_SEPARATOR))
+        .select_from(table.join(Tag, Tag.id == table.c.tag_id))
+        .where(item_column == model.id)
+        .scalar_subquery()
+    )
+
+
+def split_tags(value):
+    """Return the tag name list from an aggregated tag string."""
+    return value.split(TAG_SEPARATOR) if value else []
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _utc_iso(value):
+    # note timestamps are naive UTC; suffixed like Note.to_dict() does
+    if value is None:
+        return None
+    return value.isoformat() + "Z" if value.tzinfo is None else value.isoformat()
+
+
+def _same(value):
+    return value
+
+
+def _enum_value(value):
+    return value.value if value is not None else None
+
+
+def _user_email(key, column):
+    """Return a field for the email of the user ``column`` points at."""
+    user = aliased(User)
+    return _Field(key, user.email, _same, ((user, user.id == column),))
+
+
+def _id_or_email(value):
+    # the fallback is the cast user id; an email always has an "@"
+    return int(value) if value is not None and value.isdigit() else value
+
+
+def _user_email_or_id(key, column):
+    """Like :func:`_user_email`, but the raw id when the user row is gone.
+
+    ``Consumable.to_dict()`` falls back to the stored id rather than None.
+    """
+    user = aliased(User)
+    expression = func.coalesce(user.email, cast(column, String))
+    return _Field(key, expression, _id_or_email, ((user, user.id == column),))
+
+
+def _item_fields(model):
+    fields = [
+        _Field("id", model.id, _same, ()),
+        _Field(ITEM_FIELD_NAME, model.name, _same, ()),
+    ]
+    if model is Consumable:
+        fields.append(_Field(ITEM_FIELD_QUANTITY, model.quantity, _same, ()))
+    fields.append(_Field(ITEM_FIELD_TAGS, tag_names_subquery(model), split_tags, ()))
+    if model in (CameraGear, Consumable):
+        # aliased so filters' ``location.has()`` subqueries don't correlate to it
+        place = aliased(Location)
+        fields += [
+            _Field(ITEM_FIELD_LOCATION_ID, model.location_id, _same, ()),
+            _Field("location", place.name, _same, ((place, place.id == model.location_id),)),
+        ]
+    if model is Consumable:
+        fields.append(_Field(ITEM_FIELD_EXPIRES, model.expires, _iso, ()))
+    updater = _user_email_or_id if model is Consumable else _user_email
+    fields += [
+        _Field("last_updated", model.last_updated, _iso, ()),
+        updater(ITEM_FIELD_UPDATED_BY, model.updated_by),
+    ]
+    if model is CameraGear:
+        fields += [
+            _Field("is_checked_out", model.is_checked_out, _same, ()),
+            _user_email("checked_out_by", model.checked_out_by),
+            _Field("checked_out_date", model.checked_out_date, _iso, ()),
+            _Field("return_date", model.return_date, _iso, ()),
+        ]
+    if model is LabEquipment:
+        fields += [
+            _Field("last_serviced_on", model.last_serviced_on, _iso, ()),
+            _user_email("last_serviced_by", model.last_serviced_by),
+            _Field("service_frequency", model.service_frequency, _same, ()),
+        ]
+    return fields
+
+
+def _note_fields():
+    attached = [
+        ("camera_gear", Note.camera_gear_id, aliased(CameraGear)),
+        ("lab_equipment", Note.lab_equipment_id, aliased(LabEquipment)),
+        ("consumable", Note.consumable_id, aliased(Consumable)),
+    ]
+    # like Note.to_dict(), only report an item whose row exists
+    item_type = case(*((item.id.isnot(None), kind) for kind, _, item in attached))
+    item_id = case(*((item.id.isnot(None), column) for _, column, item in attached))
+    item_name = case(*((item.id.isnot(None), item.name) for _, _, item in attached))
+    item_joins = tuple((item, item.id == column) for _, column, item in attached)
+    return [
+        _Field("id", Note.id, _same, ()),
+        _Field("content", Note.content, _same, ()),
+        _Field("created_at", Note.created_at, _utc_iso, ()),
+        _Field("updated_at", Note.updated_at, _utc_iso, ()),
+        _user_email("created_by", Note.created_by),
+        _user_email("updated_by", Note.updated_by),
+        _Field("item_type", item_type, _same, item_joins),
+        _Field("item_id", item_id, _same, item_joins),
+        _Field("item_name", item_name, _same, item_joins),
+    ]
+
+
+def _user_fields():
+    return [
+        _Field("id", User.id, _same, ()),
+        _Field("first_name", User.first_name, _same, ()),
+        _Field("last_name", User.last_name, _same, ()),
+        _Field("email", User.email, _same, ()),
+        _Field("profile_picture", User.profile_picture, _same, ()),
+        _Field("role", User.role, _enum_value, ()),
+    ]
+
+
+_PROJECTIONS = {model: _item_fields(model) for model in _TAG_TABLES}
+_PROJECTIONS[Note] = _note_fields()
+_PROJECTIONS[User] = _user_fields()
+
+
+def serialized_fields(model):
+    """Return the keys ``model.to_dict()`` produces, in order."""
+    return [field.key for field in _PROJECTIONS[model]]
+
+
+def parse_fields(model, args):
+    """Return the ``fields`` selection from request args, or None for every field.
+
+    ``id`` is always included. Raises :class:`FilterError` for unknown
+    names.
+    """
+    raw = (args.get(FIELDS_ARG) or "").strip()
+    if not raw:
+        return None
+    names = [name.strip() for name in raw.split(",") if name.strip()]
+    allowed = serialized_fields(model)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise FilterError(f"Unknown field '{unknown[0]}'; expected one of: {', '.join(allowed)}")
+    return frozenset(names) | {"id"}
+
+
+def _selected(model, fields):
+    return [field for field in _PROJECTIONS[model] if fields is None or field.key in fields]
+
+
+def projected_query(model, fields=None):
+    """Return a query selecting the ``to_dict()`` columns of ``model``.
+
+    With ``fields``, only the columns and joins behind those keys are
+    selected.
+    """
+    selected = _selected(model, fields)
+    labelled = (field.expression.label(f"_{field.key}") for field in selected)
+    query = db.session.query(*labelled).select_from(model)
+    # fields can share joins; each alias is joined once
+    joins = {id(target): (target, onclause) for f in selected for target, onclause in f.joins}
+    for target, onclause in joins.values():
+        query = query.outerjoin(target, onclause)
+    return query
+
+
+def serialize_row(model, fields=None):
+    """Return a function turning a :func:`projected_query` row into ``to_dict()`` output."""
+    converters = [(field.key, field.convert) for field in _selected(model, fields)]
+
+    def serialize(row):
+        return {key: convert(value) for (key, convert), value in zip(converters, row)}
+
+    return serialize
@@ -0,0 +1,303 @@
+"""Full-text search index over item, tag, location and note text.
+
+A single ``search_index`` table holds one row per searchable record:
+
+* SQLite: an FTS5 virtual table. The rowid is derived from the record's
+  kind and id so updates and deletes touch exactly one row.
+* Postgres: a plain table with a generated ``tsvector`` column and a GIN
+  index on it.
+* Anything else: a plain table searched with ``LIKE`` (slow, but keeps
+  the endpoint working in unusual test setups).
+
+The index is kept in sync from SQLAlchemy session events: every flush
+that inserts, updates or deletes a tracked model writes the matching
+index row on the same connection, so it commits or rolls back with the
+business change. Bulk ``Query.delete()``/``update()`` calls can't report
+which rows changed, so they rebuild the affected kind instead.
+"""
+
+import re
+
+from flask import Flask, current_app
+from sqlalchemy import event, text
+
+from website import db
+from ..models import CameraGear, Consumable, LabEquipment, Location, Note, Tag
+
+SEARCH_TABLE = "search_index"
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# kind name -> (model, indexed attribute, rowid code). Codes are part of the
+# SQLite rowid scheme, so never renumber an existing entry.
+SEARCH_KINDS = {
+    "camera_gear": (CameraGear, "name", 1),
+    "consumable": (Consumable, "name", 2),
+    "lab_equipment": (LabEquipment, "name", 3),
+    "tag": (Tag, "name", 4),
+    "location": (Location, "name", 5),
+    "note": (Note, "content", 6),
+}
+_KIND_BY_MODEL = {model: kind for kind, (model, _, _) in SEARCH_KINDS.items()}
+_ROWID_STRIDE = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+# engines whose index table is known to exist; checked on every flush so
+# apps that never called init_search() skip the sync work entirely
+_INDEXED_ENGINES = set()
+
+
+class SearchError(ValueError):
+    """Raised when a search request can't be run."""
+
+
+def _rowid(kind: str, ref_id: int) -> int:
+    return ref_id * _ROWID_STRIDE + SEARCH_KINDS[kind][2]
+
+
+def _dialect(connection) -> str:
+    return connection.dialect.name
+
+
+def _engine_key(engine) -> str:
+    return engine.url.render_as_string(hide_password=True)
+
+
+def _is_indexed(connection) -> bool:
+    return _engine_key(connection.engine) in _INDEXED_ENGINES
+
+
+# -----------------------------------------------------------------------
+# Rebuilding
+# -----------------------------------------------------------------------
+
+
+def reindex_kind(connection, kind: str) -> None:
+    """Replace every index row of ``kind`` with the current table contents."""
+    model, attr, code = SEARCH_KINDS[kind]
+    table = model.__table__.name
+    connection.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE kind = :kind"), {"kind": kind})
+    if _dialect(connection) == "sqlite":
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, kind, ref_id, body) "
+                f"SELECT id * {_ROWID_STRIDE} + {code}, :kind, id, {attr} "
+                f'FROM "{table}" WHERE {attr} IS NOT NULL'
+            ),
+            {"kind": kind},
+        )
+    else:
+        connection.execute(
+            text(
+                f"INSERT INTO {SEARCH_TABLE} (kind, ref_id, body) "
+                f'SELECT :kind, id, {attr} FROM "{table}" WHERE {attr} IS NOT NULL'
+            ),
+            {"kind": kind},
+        )
+
+
+def rebuild_search_index(connection) -> None:
+    """Repopulate the whole index from the source tables."""
+    for kind in SEARCH_KINDS:
+        reindex_kind(connection, kind)
+
+
+def init_search(app: Flask) -> None:
+    """Keep the search index in sync with writes made through ``app``'s engine.
+
+    The index table itself is created by a schema migration. Call from
+    the application factory after the schema check.
+    """
+    with app.app_context():
+        _INDEXED_ENGINES.add(_engine_key(db.engine))
+
+
+# -----------------------------------------------------------------------
+# Synchronization
+# -----------------------------------------------------------------------
+
+
+def _delete_rows(connection, kind: str, ref_ids) -> None:
+    if not ref_ids:
+        return
+    if _dialect(connection) == "sqlite":
+        connection.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"),
+            [{"rowid": _rowid(kind, ref_id)} for ref_id in ref_ids],
+        )
+    else:
+        connection.execute(
+            text(f"DELETE FROM {SEARCH_TABLE} WHERE kind = :kind AND ref_id = :ref_id"),
+            [{"kind": kind, "ref_id": ref_id} for ref_id in ref_ids],
+        )
+
+
+def _write_rows(connection, kind: str, rows, replace: bool = True) -> None:
+    """Write ``(ref_id, body)`` pairs for ``kind``, one statement per step.
+
+    ``replace`` clears any existing row first; pass False for records
+    that were just inserted and can't be indexed yet. A None body removes
+    the record from the index.
+    """
+    if not rows:
+        return
+    dialect = _dialect(connection)
+    present = [(ref_id, body) for ref_id, body in rows if body is not None]
+    if dialect == "postgresql":
+        _delete_rows(connection, kind, [ref_id for ref_id, body in rows if body is None])
+    elif replace:
+        _delete_rows(connection, kind, [ref_id for ref_id, _ in rows])
+    if not present:
+        return
+    params = [{"kind": kind, "ref_id": ref_id, "body": body} for ref_id, body in present]
+    if dialect == "sqlite":
+        for row in params:
+            row["rowid"] = _rowid(kind, row["ref_id"])
+        sql = (
+            f"INSERT INTO {SEARCH_TABLE} (rowid, kind, ref_id, body) "
+            "VALUES (:rowid, :kind, :ref_id, :body)"
+        )
+    elif dialect == "postgresql":
+        sql = (
+            f"INSERT INTO {SEARCH_TABLE} (kind, ref_id, body) VALUES (:kind, :ref_id, :body) "
+            "ON CONFLICT (kind, ref_id) DO UPDATE SET body = EXCLUDED.body"
+        )
+    else:
+        sql = f"INSERT INTO {SEARCH_TABLE} (kind, ref_id, body) VALUES (:kind, :ref_id, :body)"
+    connection.execute(text(sql), params)
+
+
+def _text_changed(obj, attr: str) -> bool:
+    return db.inspect(obj).attrs[attr].history.has_changes()
+
+
+def _kind_rows(objects, kind):
+    return [(obj.id, getattr(obj, SEARCH_KINDS[kind][1])) for obj in objects]
+
+
+@event.listens_for(db.session, "after_flush")
+def _sync_search_index(session, flush_context):  # pylint: disable=unused-argument
+    """Mirror inserts, text updates and deletes of tracked models into the index."""
+    inserted, updated, deleted = {}, {}, {}
+    for obj in session.new:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind:
+            inserted.setdefault(kind, []).append(obj)
+    for obj in session.dirty:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind and _text_changed(obj, SEARCH_KINDS[kind][1]):
+            updated.setdefault(kind, []).append(obj)
+    for obj in session.deleted:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind:
+            deleted.setdefault(kind, []).append(obj.id)
+    if not (inserted or updated or deleted):
+        return
+
+    connection = session.connection()
+    if not _is_indexed(connection):
+        return
+    for kind, objects in inserted.items():
+        _write_rows(connection, kind, _kind_rows(objects, kind), replace=False)
+    for kind, objects in updated.items():
+        _write_rows(connection, kind, _kind_rows(objects, kind))
+    for kind, ref_ids in deleted.items():
+        _delete_rows(connection, kind, ref_ids)
+
+
+def index_objects(session, objects) -> None:
+    """Index rows inserted outside the unit of work (ORM bulk/upsert statements).
+
+    Those statements don't fire flush events, so callers that create
+    tracked rows that way pass the returned objects here instead.
+    """
+    connection = session.connection()
+    if not _is_indexed(connection):
+        return
+    by_kind = {}
+    for obj in objects:
+        kind = _KIND_BY_MODEL.get(type(obj))
+        if kind:
+            by_kind.setdefault(kind, []).append(obj)
+    for kind, objs in by_kind.items():
+        _write_rows(connection, kind, _kind_rows(objs, kind), replace=False)
+
+
+def _reindex_after_bulk(context) -> None:
+    kind = _KIND_BY_MODEL.get(getattr(context.mapper, "class_", None))
+    if not kind:
+        return
+    connection = context.session.connection()
+    if _is_indexed(connection):
+        reindex_kind(connection, kind)
+
+
+event.listen(db.session, "after_bulk_delete", _reindex_after_bulk)
+event.listen(db.session, "after_bulk_update", _reindex_after_bulk)
+
+
+# -----------------------------------------------------------------------
+# Querying
+# -----------------------------------------------------------------------
+
+
+def _terms(query: str) -> list[str]:
+    return _TERM_RE.findall(query.lower())
+
+
+def search(query: str, kinds=None, limit: int = DEFAULT_SEARCH_LIMIT) -> list[dict]:
+    """Return up to ``limit`` ranked matches for ``query``.
+
+    Every whitespace-separated term must match, and the last term also
+    matches as a prefix so results show up while the user is typing.
+    Each result is ``{"type", "id", "text", "score"}`` with higher scores
+    ranking first.
+    """
+    terms = _terms(query or "")
+    if not terms:
+        raise SearchError("Search query must contain at least one word")
+    kinds = list(kinds or SEARCH_KINDS)
+    unknown = [k for k in kinds if k not in SEARCH_KINDS]
+    if unknown:
+        raise SearchError(f"Unknown search type: {', '.join(unknown)}")
+
+    kind_params = {f"kind_{i}": k for i, k in enumerate(kinds)}
+    kind_clause = "kind IN (" + ", ".join(f":{p}" for p in kind_params) + ")"
+    params = {"limit": limit, **kind_params}
+    dialect = db.session.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        # quote every term so FTS5 operators in user input are inert
+        params["match"] = " ".join(f'"{t}"' for t in terms[:-1]) + f' "{terms[-1]}"*'
+        sql = (
+            f"SELECT kind, ref_id, body, -bm25({SEARCH_TABLE}) AS score FROM {SEARCH_TABLE} "
+            f"WHERE {SEARCH_TABLE} MATCH :match AND {kind_clause} "
+            "ORDER BY bm25(search_index) LIMIT :limit"
+        )
+    elif dialect == "postgresql":
+        params["match"] = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+        sql = (
+            "SELECT kind, ref_id, body, ts_rank(document, q) AS score "
+            f"FROM {SEARCH_TABLE}, to_tsquery('simple', :match) AS q "
+            f"WHERE document @@ q AND {kind_clause} ORDER BY score DESC LIMIT :limit"
+        )
+    else:
+        like_clauses = []
+        for i, term in enumerate(terms):
+            params[f"term_{i}"] = f"%{term}%"
+            like_clauses.append(f"lower(body) LIKE :term_{i}")
+        sql = (
+            f"SELECT kind, ref_id, body, 0 AS score FROM {SEARCH_TABLE} "
+            f"WHERE {' AND '.join(like_clauses)} AND {kind_clause} LIMIT :limit"
+        )
+
+    try:
+        rows = db.session.execute(text(sql), params).all()
+    except Exception as exc:  # pragma: no cover - defensive
+        current_app.logger.exception("Search query failed for %r", query)
+        raise SearchError("Search is unavailable") from exc
+    return [
+        {"type": kind, "id": int(ref_id), "text": body, "score": float(score)}
+        for kind, ref_id, body, score in rows
+    ]
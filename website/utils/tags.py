@@ -0,0 +1,93 @@
+"""Set-based resolution of tags (and locations) by name.
+
+Tag and location names are unique ignoring case (see ``models.indexes``),
+so a list of names is resolved with one ``lower(name) IN (...)`` query
+for the rows that already exist and one multi-row ``INSERT ... ON
+CONFLICT DO NOTHING`` for the rest. The upsert makes concurrent creators
+of the same name safe: whoever loses the race simply reads the winner's
+row.
+
+Nothing is committed here; the caller attaches the rows to its item and
+commits once, so new tags and associations land in the same transaction.
+"""
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+from website import db
+from ..models import Location, Tag
+from .search import index_objects
+
+_UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def _unique_names(names):
+    """Strip and de-duplicate ``names`` case-insensitively, keeping order."""
+    seen = set()
+    unique = []
+    for raw in names or []:
+        if not isinstance(raw, str):
+            continue
+        name = raw.strip()
+        key = name.lower()
+        if name and key not in seen:
+            seen.add(key)
+            unique.append(name)
+    return unique
+
+
+def _fetch(keys, model=Tag):
+    return {row.name.lower(): row for row in model.query.filter(func.lower(model.name).in_(keys))}
+
+
+def _insert_missing(names, model=Tag):
+    """Insert ``model`` rows named ``names`` and return the rows this call created."""
+    rows = [{"name": name} for name in names]
+    insert = _UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if insert is None:
+        # no portable upsert; fall back to the unit of work
+        created = [model(**row) for row in rows]
+        db.session.add_all(created)
+        db.session.flush()
+        return created
+    created = db.session.scalars(
+        insert(model).on_conflict_do_nothing().returning(model), rows
+    ).all()
+    index_objects(db.session, created)
+    return created
+
+
+def resolve_names(model, names):
+    """Return ``model`` rows for ``names``, creating any that don't exist.
+
+    ``model`` is a table with a case-insensitively unique ``name``
+    column. Matching ignores case and the result is de-duplicated in the
+    order the names were given. Existing rows keep their stored casing.
+    """
+    unique = _unique_names(names)
+    if not unique:
+        return []
+
+    found = _fetch([name.lower() for name in unique], model=model)
+    missing = [name for name in unique if name.lower() not in found]
+    if missing:
+        created = _insert_missing(missing, model=model)
+        found.update((row.name.lower(), row) for row in created)
+        if len(created) < len(missing):
+            # another transaction created some of them first
+            late = [n.lower() for n in missing if n.lower() not in found]
+            found.update(_fetch(late, model=model))
+    return [found[name.lower()] for name in unique if name.lower() in found]
+
+
+def resolve_tags(names):
+    """Return ``Tag`` rows for ``names``, creating any that don't exist."""
+    return resolve_names(Tag, names)
+
+
+def resolve_locations(names):
+    """Return ``Location`` rows for ``names``, creating any that don't exist."""
+    return resolve_names(Location, names)
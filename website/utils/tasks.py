@@ -5,6 +5,12 @@ These functions are intentionally resilient: they try DB filtering
 first and fall back to in-Python filtering if the ORM does not
 implement the needed comparisons. They log but do not raise when
 sending fails so callers can invoke them from scheduled jobs safely.
+
+Each helper takes an optional :class:`~website.utils.mail.MailSession`;
+a job running several of them passes one session so all their messages
+share a single SMTP connection. They also take an optional
+``recipients`` list, so a job can look up the admin/TA addresses once
+(:func:`task_recipients`) and hand the same snapshot to every helper.
 """
 
 from datetime import date, timedelta
@@ -20,9 +26,21 @@ from ..models import (
     LabEquipment
 )
 from ..constants import UserRole
+from .mail import MailSession, mail_session
+
+
+def task_recipients() -> List[str]:
+    """Return the email addresses of every admin and TA."""
+    try:
+        users = User.query.filter(User.role.in_([UserRole.ADMIN, UserRole.TA])).all()
+    except Exception:  # pragma: no cover - fallback exercised in tests
+        users = [u for u in User.query.all() if u.role in (UserRole.ADMIN, UserRole.TA)]
+    return [u.email for u in users if getattr(u, "email", None)]
 
 
-def notify_consumables_expiring_this_week() -> bool:
+def notify_consumables_expiring_this_week(
+    session: MailSession | None = None, recipients: List[str] | None = None
+) -> bool:
     """Find consumables expiring within the next 7 days and email admins/TAs.
 
     Returns True if an email was sent (or attempted), False if there were
@@ -56,17 +74,8 @@ def notify_consumables_expiring_this_week() -> bool:
             )
         return False
 
-    # Collect admin/TA recipients
-    try:
-        recipients_q = (
-            User.query
-            .filter(User.role.in_([UserRole.ADMIN, UserRole.TA]))
-            .all()
-        )
-    except Exception:  # pragma: no cover - fallback path exercised in tests
-        recipients_q = [u for u in User.query.all() if u.role in (UserRole.ADMIN, UserRole.TA)]
-
-    recipients = [u.email for u in recipients_q if getattr(u, "email", None)]
+    if recipients is None:
+        recipients = task_recipients()
     if not recipients:
         if current_app and current_app.logger:
             current_app.logger.info("No admin/TA recipients for expiration notifications.")
@@ -86,8 +95,8 @@ def notify_consumables_expiring_this_week() -> bool:
     body = "\n".join(lines)
 
     try:
-        msg = EmailMessage(subject=subject, to=recipients, body=body)
-        msg.send()
+        with mail_session(session) as mailer:
+            mailer.send(EmailMessage(subject=subject, to=recipients, body=body))
     except Exception:  # pragma: no cover - error path exercised in tests
         if current_app and current_app.logger:
             current_app.logger.exception("Failed to send weekly expiration email")
@@ -104,7 +113,11 @@ def send_weekly_expiration_notifications() -> bool:
     return notify_consumables_expiring_this_week()
 
 
-def notify_camera_gear_due_returns(within_days: int = 7) -> bool:  # pylint: disable=too-many-branches,too-many-locals
+def notify_camera_gear_due_returns(  # pylint: disable=too-many-branches,too-many-locals
+    within_days: int = 7,
+    session: MailSession | None = None,
+    recipients: List[str] | None = None,
+) -> bool:
     """Notify admins/TAs about camera gear that should be returned within
     `within_days` (inclusive) or that are already overdue.
 
@@ -145,13 +158,8 @@ def notify_camera_gear_due_returns(within_days: int = 7) -> bool:  # pylint: dis
             current_app.logger.info("No camera gear due for return this week.")
         return False
 
-    # recipients: admins and TAs
-    try:
-        recipients_q = User.query.filter(User.role.in_([UserRole.ADMIN, UserRole.TA])).all()
-    except Exception:  # pragma: no cover - fallback exercised in tests
-        recipients_q = [u for u in User.query.all() if u.role in (UserRole.ADMIN, UserRole.TA)]
-
-    recipients = [u.email for u in recipients_q if getattr(u, "email", None)]
+    if recipients is None:
+        recipients = task_recipients()
     if not recipients:
         if current_app and current_app.logger:
             current_app.logger.info("No admin/TA recipients for camera gear return notifications.")
@@ -178,8 +186,8 @@ def notify_camera_gear_due_returns(within_days: int = 7) -> bool:  # pylint: dis
     body = "\n".join(lines)
 
     try:
-        msg = EmailMessage(subject=subject, to=recipients, body=body)
-        msg.send()
+        with mail_session(session) as mailer:
+            mailer.send(EmailMessage(subject=subject, to=recipients, body=body))
     except Exception:  # pragma: no cover - error path exercised in tests
         if current_app and current_app.logger:
             current_app.logger.exception("Failed to send camera gear return email")
@@ -215,7 +223,9 @@ def _parse_service_frequency(freq: str) -> int | None:
         return None
 
 
-def notify_lab_equipment_service_reminders() -> bool:  # pylint: disable=too-many-branches
+def notify_lab_equipment_service_reminders(  # pylint: disable=too-many-branches
+    session: MailSession | None = None, recipients: List[str] | None = None
+) -> bool:
     """Notify admins/TAs about lab equipment due for service based on
     `last_serviced_on` + `service_frequency`.
 
@@ -243,13 +253,8 @@ def notify_lab_equipment_service_reminders() -> bool:  # pylint: disable=too-man
             current_app.logger.info("No lab equipment due for service this week.")
         return False
 
-    # recipients: admins and TAs
-    try:
-        recipients_q = User.query.filter(User.role.in_([UserRole.ADMIN, UserRole.TA])).all()
-    except Exception:  # pragma: no cover - fallback exercised in tests
-        recipients_q = [u for u in User.query.all() if u.role in (UserRole.ADMIN, UserRole.TA)]
-
-    recipients = [u.email for u in recipients_q if getattr(u, "email", None)]
+    if recipients is None:
+        recipients = task_recipients()
     if not recipients:
         if current_app and current_app.logger:
             current_app.logger.info("No admin/TA recipients for lab equipment service notifications.")
@@ -266,8 +271,8 @@ def notify_lab_equipment_service_reminders() -> bool:  # pylint: disable=too-man
 
     body = "\n".join(lines)
     try:
-        msg = EmailMessage(subject=subject, to=recipients, body=body)
-        msg.send()
+        with mail_session(session) as mailer:
+            mailer.send(EmailMessage(subject=subject, to=recipients, body=body))
     except Exception:  # pragma: no cover - error path exercised in tests
         if current_app and current_app.logger:
             current_app.logger.exception("Failed to send lab equipment service email")
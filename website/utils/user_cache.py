@@ -0,0 +1,157 @@
+"""Per-process cache of the users flask-login loads on every request.
+
+``load_user`` runs once per authenticated request, and the role checks
+in ``role_decorators`` depend on it, so pages that otherwise never touch
+the database would still issue a user query. :class:`UserCache` keeps a
+bounded, TTL-limited map of user id to :class:`CachedUser`, a detached
+snapshot of the user's columns that acts like the ORM object for
+``current_user`` purposes (``id``, ``role``, names, ``get_id()``...).
+
+Entries are dropped when a transaction that changed the user commits:
+role changes (``make_admin`` and friends), ``User.save()`` and deletes
+all go through the session hooks below. Each worker process has its own
+cache, so another worker can serve a stale role for up to
+``USER_CACHE_TTL`` seconds.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from flask_login import UserMixin
+from sqlalchemy import event
+
+from website import db
+from ..models import User
+
+USER_CACHE_TTL = "USER_CACHE_TTL"
+DEFAULT_USER_CACHE_TTL = 60
+USER_CACHE_SIZE = 1024
+
+_USER_COLUMNS = ("id", "first_name", "last_name", "email", "profile_picture", "role")
+_CHANGED_KEY = "changed_users"
+_ALL_USERS = "*"
+_EXTENSION = "user_cache"
+
+
+class CachedUser(UserMixin):
+    """Read-only snapshot of a :class:`~website.models.User` row."""
+
+    __slots__ = _USER_COLUMNS
+
+    def __init__(self, **values):
+        for key in _USER_COLUMNS:
+            object.__setattr__(self, key, values[key])
+
+    def __setattr__(self, key, value):
+        raise AttributeError("cached users are read-only; load the User to change it")
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(**{key: getattr(user, key) for key in _USER_COLUMNS})
+
+    def __repr__(self):
+        return f"<User {self.email} Role {self.role}>"
+
+
+class UserCache:
+    """Bounded LRU map of user id to :class:`CachedUser` with a TTL."""
+
+    def __init__(self, ttl=DEFAULT_USER_CACHE_TTL, size=USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Return the cached user, or None when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, user = entry
+            if expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids=None):
+        """Drop ``user_ids``, or every entry when None."""
+        with self._lock:
+            if user_ids is None:
+                self._entries.clear()
+            else:
+                for user_id in user_ids:
+                    self._entries.pop(user_id, None)
+
+
+def init_user_cache(app):
+    """Create the app's :class:`UserCache` (``USER_CACHE_TTL`` seconds, 0 disables)."""
+    ttl = app.config.get(USER_CACHE_TTL, os.getenv(USER_CACHE_TTL))
+    ttl = DEFAULT_USER_CACHE_TTL if ttl in (None, "") else float(ttl)
+    app.extensions[_EXTENSION] = UserCache(ttl)
+
+
+def _get_cache():
+    return current_app.extensions.get(_EXTENSION) if has_app_context() else None
+
+
+def load_cached_user(user_id):
+    """Return the :class:`CachedUser` for ``user_id``, or None if there is none."""
+    cache = _get_cache()
+    user = cache.get(user_id) if cache is not None else None
+    if user is None:
+        row = db.session.get(User, user_id)
+        if row is None:
+            return None
+        user = CachedUser.from_user(row)
+        if cache is not None:
+            cache.put(user)
+    return user
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_users(session, flush_context):  # pylint: disable=unused-argument
+    changed = [
+        obj.id
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if isinstance(obj, User)
+    ]
+    if changed:
+        session.info.setdefault(_CHANGED_KEY, set()).update(changed)
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _collect_user_statements(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) == User.__tablename__:
+        # which rows matched isn't known; forget them all
+        orm_execute_state.session.info.setdefault(_CHANGED_KEY, set()).add(_ALL_USERS)
+
+
+@event.listens_for(db.session, "after_commit")
+def _invalidate_after_commit(session):
+    # only once committed, so no other request can re-cache the old row
+    changed = session.info.pop(_CHANGED_KEY, None)
+    cache = _get_cache()
+    if changed and cache is not None:
+        cache.invalidate(None if _ALL_USERS in changed else changed)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _drop_after_rollback(session, previous_transaction):  # pylint: disable=unused-argument
+    session.info.pop(_CHANGED_KEY, None)
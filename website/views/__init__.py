@@ -13,4 +13,8 @@ from .camera_gear_views import *
 from .lab_equipment_views import *
 from .consumables_views import *
 from .task_views import *
-from .notes_views import *
\ No newline at end of file
+from .notes_views import *
+from .search_views import *
+from .import_views import *
+from .item_views import *
+from .events_views import *
@@ -2,15 +2,26 @@
 Admin Views
 """
 
-from flask import Blueprint, render_template
+from flask import Blueprint, current_app, render_template, request
 
-from ..constants import ADMIN_TEMPLATE, GET, POST, UserRole
+from website import db
+from ..constants import ADMIN_DB_POOL_ROUTE, ADMIN_TEMPLATE, ERROR_BAD_REQUEST, GET, POST, UserRole
 from ..models import User
-from ..utils import require_admin
+from ..utils import (
+    FilterError,
+    conditional_get,
+    parse_fields,
+    projected_query,
+    require_admin,
+    serialize_row,
+)
+from ..utils.engine import DB_PROFILE, pool_stats
 
 
 admin_blueprint = Blueprint("admin", __name__)
 
+_ETAG_SOURCES = (User,)
+
 @admin_blueprint.route("/dashboard")
 @require_admin
 def dashboard():
@@ -19,10 +30,18 @@ def dashboard():
 
 @admin_blueprint.route("/users/all", methods=[GET])
 @require_admin
+@conditional_get(*_ETAG_SOURCES)
 def get_all_users():
-    """Return a list of all users as JSON-serializable dicts."""
-    users = User.query.all()
-    return {"user": [user.to_dict() for user in users]}
+    """Return a list of all users as JSON-serializable dicts.
+
+    ``fields`` selects the keys returned.
+    """
+    try:
+        fields = parse_fields(User, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    serialize = serialize_row(User, fields)
+    return {"user": [serialize(row) for row in projected_query(User, fields)]}
 
 
 
@@ -61,3 +80,14 @@ def make_invalid(user_id: int):
     user.role = UserRole.INVALID
     user.save()
     return user.to_dict()
+
+@admin_blueprint.route(ADMIN_DB_POOL_ROUTE, methods=[GET])
+@require_admin
+def db_pool():
+    """Return this worker's connection pool usage and limits.
+
+    Each worker has its own pool; ``pid`` tells them apart.
+    """
+    stats = pool_stats(db.engine)
+    stats["profile"] = current_app.config.get(DB_PROFILE)
+    return stats
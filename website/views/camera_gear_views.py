@@ -5,11 +5,15 @@
 
 GET     /api/v1/camera_gear/all                → Retrieve all camera gear
 GET     /api/v1/camera_gear/one/<int:gear_id>   → Retrieve a specific camera gear item by ID
+GET     /api/v1/camera_gear/changes?since=<cursor> → Camera gear written/deleted since a cursor
 POST    /api/v1/camera_gear/                   → Create a new camera gear item
 PUT     /api/v1/camera_gear/<int:gear_id>       → Update an existing camera gear item
 PUT     /api/v1/camera_gear/checkout/<int:gear_id> → Check out a camera gear item
 PUT     /api/v1/camera_gear/checkin/<int:gear_id>  → Check in a camera gear item
 DELETE  /api/v1/camera_gear/<int:gear_id>       → Delete a camera gear item by ID
+POST    /api/v1/camera_gear/bulk               → Create many camera gear items
+PATCH   /api/v1/camera_gear/bulk               → Update many camera gear items
+DELETE  /api/v1/camera_gear/bulk               → Delete many camera gear items
 """
 
 from datetime import datetime
@@ -19,9 +23,11 @@ from flask_login.utils import login_required
 
 from ..constants import (
     CAMERA_GEAR_ALL_ROUTE,
+    CAMERA_GEAR_BULK_ROUTE,
     CAMERA_GEAR_CREATE_ROUTE,
     CAMERA_GEAR_DEAFULT_NAME,
     CAMERA_GEAR_DELETE_ROUTE,
+    CAMERA_GEAR_CHANGES_ROUTE,
     CAMERA_GEAR_GET_ONE_ROUTE,
     CAMERA_GEAR_CHECK_OUT_ROUTE,
     CAMERA_GEAR_CHECK_IN_ROUTE,
@@ -29,35 +35,91 @@ from ..constants import (
     CAMERA_GEAR_TAGS_FIELD,
     CAMERA_GEAR_UPDATE_ROUTE,
     DELETE,
+    ERROR_BAD_REQUEST,
     GET,
+    PATCH,
     POST,
     PUT,
 )
-from ..models import CameraGear, Location, Tag
-from ..utils import require_ta, require_approved
+from ..models import CameraGear, Location, Tag, User, camera_gear_tags, eager_query
+from ..utils import (
+    conditional_get,
+    FilterError,
+    bulk_response,
+    changes_response,
+    row_int,
+    row_text,
+    apply_filters,
+    paginated_response,
+    parse_fields,
+    projected_query,
+    parse_sort,
+    serialize_row,
+    require_ta,
+    resolve_tags,
+    require_approved,
+)
 
 from website import db
 
 
 camera_gear_blueprint = Blueprint(CAMERA_GEAR_DEAFULT_NAME, __name__)
 
+_ETAG_SOURCES = (CameraGear, camera_gear_tags, Tag, Location, User)
+
 
 @camera_gear_blueprint.route(CAMERA_GEAR_ALL_ROUTE, methods=[GET])
 @login_required
 @require_approved
+@conditional_get(*_ETAG_SOURCES)
 def get_all_camera_gear():
-    """Return all camera gear items as a list of dicts."""
-    all_gear = CameraGear.query.all()
-    return {CAMERA_GEAR_DEAFULT_NAME: [all_gear_item.to_dict() for all_gear_item in all_gear]}
+    """Return camera gear items as a list of dicts.
+
+    Supports the filters and ``sort`` described in ``utils.filters``,
+    keyset pagination via ``limit``/``after`` and ``fields`` to select
+    the keys returned.
+    """
+    try:
+        fields = parse_fields(CameraGear, request.args)
+        query = apply_filters(projected_query(CameraGear, fields), CameraGear, request.args)
+        sort_column, descending = parse_sort(CameraGear, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    return paginated_response(
+        query,
+        CAMERA_GEAR_DEAFULT_NAME,
+        sort_column,
+        CameraGear.id,
+        descending,
+        serialize=serialize_row(CameraGear, fields),
+    )
+
+
+@camera_gear_blueprint.route(CAMERA_GEAR_CHANGES_ROUTE, methods=[GET])
+@login_required
+@require_approved
+def get_camera_gear_changes():
+    """Return camera gear written or deleted since the ``since`` cursor.
+
+    The response carries the current rows, the ids of deleted rows and
+    the cursor for the next call; see ``utils.changes``. Without
+    ``since`` every row is returned. ``fields`` works as on ``/all``.
+    """
+    return changes_response(CameraGear, CAMERA_GEAR_DEAFULT_NAME)
 
 
 @camera_gear_blueprint.route(CAMERA_GEAR_GET_ONE_ROUTE, methods=[GET])
 @require_ta
 @login_required
+@conditional_get(*_ETAG_SOURCES)
 def get_camera_gear(gear_id):
     """Return a single camera gear item by ID."""
-    gear_item = CameraGear.query.get_or_404(gear_id)
-    return gear_item.to_dict()
+    try:
+        fields = parse_fields(CameraGear, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    gear_item = eager_query(CameraGear, fields).filter_by(id=gear_id).first_or_404()
+    return gear_item.to_dict(fields)
 
 
 @camera_gear_blueprint.route(CAMERA_GEAR_CREATE_ROUTE, methods=[POST])
@@ -75,30 +137,13 @@ def create_camera_gear():
 
     new_gear = CameraGear(
         name=name,
-        # create without tags first to avoid transient duplicate many-to-many inserts
+        tags=resolve_tags(tag_names),
         location_id=location_id,
         last_updated=datetime.now(),
         updated_by=current_user.id,
     )
     db.session.add(new_gear)
     db.session.commit()
-    # ensure Tag rows exist and attach them to the newly-created gear
-    if tag_names:
-        resolved = []
-        # create any missing Tag rows
-        for tag_name in tag_names:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-        # commit created tags (so they have ids)
-        db.session.commit()
-        for tag_name in tag_names:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if tag:
-                resolved.append(tag)
-        new_gear.tags = resolved
-        db.session.commit()
     return new_gear.to_dict()
 
 
@@ -117,14 +162,7 @@ def update_camera_gear(gear_id):
         gear_item.name = name
 
     if tag_names is not None:
-        tags = []
-        for tag_name in tag_names:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-            tags.append(tag)
-        gear_item.tags = tags
+        gear_item.tags = resolve_tags(tag_names)
 
     if location_id is not None:
         if location_id == "":
@@ -191,3 +229,26 @@ def delete_camera_gear(gear_id):
     db.session.delete(gear_item)
     db.session.commit()
     return {"message": "Camera gear item deleted successfully."}
+
+
+def _bulk_row(row, partial):
+    """Column values for one camera gear row of a bulk request."""
+    values = {}
+    if not partial or CAMERA_GEAR_NAME_FIELD in row:
+        values[CAMERA_GEAR_NAME_FIELD] = row_text(row, CAMERA_GEAR_NAME_FIELD)
+    if not partial or "location_id" in row:
+        values["location_id"] = row_int(row, "location_id")
+    if not partial or CAMERA_GEAR_TAGS_FIELD in row:
+        values[CAMERA_GEAR_TAGS_FIELD] = row.get(CAMERA_GEAR_TAGS_FIELD) or []
+    return values
+
+
+@camera_gear_blueprint.route(CAMERA_GEAR_BULK_ROUTE, methods=[POST, PATCH, DELETE])
+@require_ta
+def bulk_camera_gear():
+    """Create (POST), update (PATCH) or delete (DELETE) many camera gear items.
+
+    Takes a JSON array (or ``{"items": [...]}``) and returns one result
+    per row. Deletes take ids or ``{"id": ...}`` objects.
+    """
+    return bulk_response(CameraGear, _bulk_row)
@@ -13,13 +13,17 @@ from website import db
 
 from ..constants import (
     DELETE,
+    ERROR_BAD_REQUEST,
     GET,
+    PATCH,
     POST,
     PUT,
     CONSUMABLES_ALL_ROUTE,
+    CONSUMABLES_BULK_ROUTE,
     CONSUMABLES_CREATE_ROUTE,
     CONSUMABLES_DEFAULT_NAME,
     CONSUMABLES_DELETE_ROUTE,
+    CONSUMABLES_CHANGES_ROUTE,
     CONSUMABLES_GET_ONE_ROUTE,
     CONSUMABLES_UPDATE_ROUTE,
     ITEM_FIELD_NAME,
@@ -28,15 +32,32 @@ from ..constants import (
     ITEM_FIELD_LOCATION_ID,
     ITEM_FIELD_EXPIRES,
 )
-from ..models import Consumable, Location, Tag
+from ..models import Consumable, Location, Tag, User, consumable_tags, eager_query
 from ..utils import (
+    conditional_get,
+    FilterError,
+    RowError,
+    bulk_response,
+    changes_response,
+    row_date,
+    row_int,
+    row_text,
+    apply_filters,
+    paginated_response,
+    parse_fields,
+    projected_query,
+    parse_sort,
+    serialize_row,
     require_approved,
     require_ta,
-    send_low_stock_alert,
+    resolve_tags,
 )
+from ..utils.low_stock import track_low_stock, track_low_stock_all
 
 consumables_blueprint = Blueprint(CONSUMABLES_DEFAULT_NAME, __name__)
 
+_ETAG_SOURCES = (Consumable, consumable_tags, Tag, Location, User)
+
 
 def _parse_expires(expires_str: str):
     """Parse an ISO date string into a date or raise ValueError.
@@ -47,46 +68,55 @@ def _parse_expires(expires_str: str):
     return datetime.fromisoformat(expires_str).date()
 
 
-def _resolve_tags(tag_names):
-    """Resolve or create Tag objects for the given names and return a
-    deduplicated list of Tag instances.
+@consumables_blueprint.route(CONSUMABLES_ALL_ROUTE, methods=[GET])
+@require_approved
+@conditional_get(*_ETAG_SOURCES)
+def get_all_consumables():
+    """Return consumable items as JSON-serializable dicts.
 
-    This centralizes DB lookups and deduplication so both create and
-    update flows are simpler and have fewer branches.
+    Supports the filters and ``sort`` described in ``utils.filters``,
+    keyset pagination via ``limit``/``after`` and ``fields`` to select
+    the keys returned.
     """
-    tags = []
-    for tag_name in tag_names:
-        tag = Tag.query.filter_by(name=tag_name).first()
-        if not tag:
-            tag = Tag(name=tag_name)
-            db.session.add(tag)
-        tags.append(tag)
-
-    # Deduplicate tags by name
-    seen = set()
-    unique = []
-    for t in tags:
-        name = getattr(t, "name", None)
-        if name and name not in seen:
-            seen.add(name)
-            unique.append(t)
-    return unique
+    try:
+        fields = parse_fields(Consumable, request.args)
+        query = apply_filters(projected_query(Consumable, fields), Consumable, request.args)
+        sort_column, descending = parse_sort(Consumable, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    return paginated_response(
+        query,
+        CONSUMABLES_DEFAULT_NAME,
+        sort_column,
+        Consumable.id,
+        descending,
+        serialize=serialize_row(Consumable, fields),
+    )
 
 
-@consumables_blueprint.route(CONSUMABLES_ALL_ROUTE, methods=[GET])
+@consumables_blueprint.route(CONSUMABLES_CHANGES_ROUTE, methods=[GET])
 @require_approved
-def get_all_consumables():
-    """Return all consumable items as JSON-serializable dicts."""
-    all_consumables = Consumable.query.all()
-    return {CONSUMABLES_DEFAULT_NAME: [consumable.to_dict() for consumable in all_consumables]}
+def get_consumables_changes():
+    """Return consumables written or deleted since the ``since`` cursor.
+
+    The response carries the current rows, the ids of deleted rows and
+    the cursor for the next call; see ``utils.changes``. Without
+    ``since`` every row is returned. ``fields`` works as on ``/all``.
+    """
+    return changes_response(Consumable, CONSUMABLES_DEFAULT_NAME)
 
 
 @consumables_blueprint.route(CONSUMABLES_GET_ONE_ROUTE, methods=[GET])
 @require_ta
+@conditional_get(*_ETAG_SOURCES)
 def get_consumable(consumable_id):
     """Return a single consumable item by ID."""
-    consumable = Consumable.query.get_or_404(consumable_id)
-    return consumable.to_dict()
+    try:
+        fields = parse_fields(Consumable, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    consumable = eager_query(Consumable, fields).filter_by(id=consumable_id).first_or_404()
+    return consumable.to_dict(fields)
 
 
 @consumables_blueprint.route(CONSUMABLES_CREATE_ROUTE, methods=[POST])
@@ -95,7 +125,6 @@ def create_consumable():
     """Create a consumable from JSON body and return the created object."""
     data = request.get_json()
     name = data.get(ITEM_FIELD_NAME)
-    quantity = data.get(ITEM_FIELD_QUANTITY, 1)
     tag_names = data.get(ITEM_FIELD_TAGS, [])
     location_id = data.get(ITEM_FIELD_LOCATION_ID)
     expires_str = data.get(ITEM_FIELD_EXPIRES)
@@ -103,6 +132,11 @@ def create_consumable():
     if not name:
         return {"error": "Name is required"}, 400
 
+    try:
+        quantity = row_int(data, ITEM_FIELD_QUANTITY, 1)
+    except RowError as exc:
+        return {"error": str(exc)}, 400
+
     expires = None
     if expires_str:
         try:
@@ -110,7 +144,7 @@ def create_consumable():
         except ValueError:
             return {"error": "Invalid expiration date format"}, 400
 
-    tags = _resolve_tags(tag_names)
+    tags = resolve_tags(tag_names)
 
     location = None
     if location_id:
@@ -118,12 +152,10 @@ def create_consumable():
         if not location:
             return {"error": "Location not found"}, 400
 
-    # Create the consumable first without tags to avoid potential duplicate
-    # many-to-many association inserts when both sides are transient. After
-    # the consumable has a primary key, assign tags and commit again.
     new_consumable = Consumable(
         name=name,
         quantity=quantity,
+        tags=tags,
         location=location,
         expires=expires,
         last_updated=datetime.now(),
@@ -131,16 +163,10 @@ def create_consumable():
     )
 
     db.session.add(new_consumable)
+    # A low item joins the next low-stock digest; no mail is sent here.
+    track_low_stock(new_consumable)
     db.session.commit()
 
-    if tags:
-        new_consumable.tags = tags
-        db.session.commit()
-
-    # After creating, check for low stock and notify admins if configured.
-    # send_low_stock_alert is resilient and will return silently on failures.
-    send_low_stock_alert(new_consumable)
-
     return new_consumable.to_dict()
 
 
@@ -151,11 +177,15 @@ def update_consumable(consumable_id):
     consumable = Consumable.query.get_or_404(consumable_id)
     data = request.get_json()
     name = data.get(ITEM_FIELD_NAME)
-    quantity = data.get(ITEM_FIELD_QUANTITY)
     tag_names = data.get(ITEM_FIELD_TAGS)
     location_id = data.get(ITEM_FIELD_LOCATION_ID)
     expires_str = data.get(ITEM_FIELD_EXPIRES)
 
+    try:
+        quantity = row_int(data, ITEM_FIELD_QUANTITY)
+    except RowError as exc:
+        return {"error": str(exc)}, 400
+
     if name:
         consumable.name = name
 
@@ -172,7 +202,7 @@ def update_consumable(consumable_id):
             consumable.expires = None
 
     if tag_names is not None:
-        consumable.tags = _resolve_tags(tag_names)
+        consumable.tags = resolve_tags(tag_names)
 
     if ITEM_FIELD_LOCATION_ID in data:
         if location_id:
@@ -186,13 +216,10 @@ def update_consumable(consumable_id):
     consumable.last_updated = datetime.now()
     consumable.updated_by = current_user.id
 
+    # Only a drop below the threshold joins the next low-stock digest.
+    track_low_stock(consumable)
     db.session.commit()
 
-    # After updating, check for low stock and notify admins if configured.
-    # Let send_low_stock_alert raise if something unexpected occurs; that
-    # surface an application error rather than silently hiding it.
-    send_low_stock_alert(consumable)
-
     return consumable.to_dict()
 
 
@@ -204,3 +231,31 @@ def delete_consumable(consumable_id):
     db.session.delete(consumable)
     db.session.commit()
     return {"message": "Consumable deleted successfully"}
+
+
+def _bulk_row(row, partial):
+    """Column values for one consumable row of a bulk request."""
+    values = {}
+    if not partial or ITEM_FIELD_NAME in row:
+        values[ITEM_FIELD_NAME] = row_text(row, ITEM_FIELD_NAME)
+    if not partial or ITEM_FIELD_QUANTITY in row:
+        values[ITEM_FIELD_QUANTITY] = row_int(row, ITEM_FIELD_QUANTITY, default=1)
+    if not partial or ITEM_FIELD_LOCATION_ID in row:
+        values[ITEM_FIELD_LOCATION_ID] = row_int(row, ITEM_FIELD_LOCATION_ID)
+    if not partial or ITEM_FIELD_EXPIRES in row:
+        values[ITEM_FIELD_EXPIRES] = row_date(row, ITEM_FIELD_EXPIRES)
+    if not partial or ITEM_FIELD_TAGS in row:
+        values[ITEM_FIELD_TAGS] = row.get(ITEM_FIELD_TAGS) or []
+    return values
+
+
+@consumables_blueprint.route(CONSUMABLES_BULK_ROUTE, methods=[POST, PATCH, DELETE])
+@require_ta
+def bulk_consumables():
+    """Create (POST), update (PATCH) or delete (DELETE) many consumables.
+
+    Takes a JSON array (or ``{"items": [...]}``) and returns one result
+    per row. Rows that drop below the low-stock threshold join the next
+    low-stock digest rather than sending one email per row.
+    """
+    return bulk_response(Consumable, _bulk_row, on_written=track_low_stock_all)
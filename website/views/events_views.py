@@ -0,0 +1,37 @@
+"""
+=====================================================
+ Event Routes (prefixed with "/events")
+=====================================================
+
+GET     /api/v1/events/                  → Server-Sent Events stream of item and note changes
+                                           (resumes after the Last-Event-ID header when sent)
+"""
+
+from flask import Blueprint, Response, request, stream_with_context
+from flask_login.utils import login_required
+
+from website import db
+from ..constants import ERROR_UNAVAILABLE, EVENTS_DEFAULT_NAME, EVENTS_ROUTE, GET
+from ..utils import require_approved
+from ..utils.events import event_stream, get_hub
+
+
+events_blueprint = Blueprint(EVENTS_DEFAULT_NAME, __name__)
+
+
+@events_blueprint.route(EVENTS_ROUTE, methods=[GET])
+@login_required
+@require_approved
+def stream_events():
+    """Stream change events to an ``EventSource`` until the stream times out."""
+    hub = get_hub()
+    if hub is None:
+        return {"error": "Live updates are not available"}, ERROR_UNAVAILABLE
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    # the stream holds no database connection while it waits
+    db.session.close()
+    return Response(
+        stream_with_context(event_stream(hub, last_event_id)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,70 @@
+"""
+=====================================================
+ Import Routes (prefixed with "/import")
+=====================================================
+
+POST    /api/v1/import/                  → Import items from a CSV or JSONL file
+                                           (multipart ``file`` field or the raw request body;
+                                           optional: format=csv|jsonl&type=<kind>&chunk_size=<n>)
+"""
+
+from flask import Blueprint, request
+from flask_login import current_user
+from flask_login.utils import login_required
+
+from ..constants import (
+    ERROR_BAD_REQUEST,
+    IMPORT_CHUNK_SIZE_ARG,
+    IMPORT_DEFAULT_NAME,
+    IMPORT_FILE_FIELD,
+    IMPORT_FORMAT_ARG,
+    IMPORT_ROUTE,
+    IMPORT_TYPE_ARG,
+    POST,
+)
+from ..utils import require_ta
+from ..utils.importer import (
+    DEFAULT_CHUNK_SIZE,
+    InventoryImporter,
+    InventoryImportError,
+    detect_format,
+)
+
+_CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+}
+
+
+import_blueprint = Blueprint(IMPORT_DEFAULT_NAME, __name__)
+
+
+@import_blueprint.route(IMPORT_ROUTE, methods=[POST])
+@login_required
+@require_ta
+def import_items():
+    """Stream an uploaded CSV/JSONL file into the inventory and report the outcome."""
+    upload = request.files.get(IMPORT_FILE_FIELD)
+    declared = request.args.get(IMPORT_FORMAT_ARG)
+    try:
+        if upload is not None:
+            declared = declared or _CONTENT_TYPE_FORMATS.get(upload.mimetype)
+            fmt = detect_format(upload.filename, declared)
+            stream = upload.stream
+        else:
+            fmt = detect_format(declared=declared or _CONTENT_TYPE_FORMATS.get(request.mimetype))
+            stream = request.stream
+        try:
+            chunk_size = int(request.args.get(IMPORT_CHUNK_SIZE_ARG) or DEFAULT_CHUNK_SIZE)
+        except ValueError as exc:
+            raise InventoryImportError(f"'{IMPORT_CHUNK_SIZE_ARG}' must be an integer") from exc
+        importer = InventoryImporter(
+            chunk_size=chunk_size,
+            default_type=request.args.get(IMPORT_TYPE_ARG) or None,
+            user_id=current_user.id,
+        )
+        return importer.run(stream, fmt)
+    except InventoryImportError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
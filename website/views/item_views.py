@@ -0,0 +1,64 @@
+"""
+=========================================
+ Item Routes (prefixed with "/items")
+=========================================
+
+GET     /api/v1/items/all                → Camera gear, consumables and lab equipment in one
+                                           normalized list (optional: type=<kind,...>, the
+                                           item filters, sort=<field>, limit/after)
+"""
+
+from flask import Blueprint, request
+
+from ..constants import ERROR_BAD_REQUEST, GET, ITEM_ALL_ROUTE, ITEM_DEFAULT_NAME
+from ..models import (
+    CameraGear,
+    Consumable,
+    LabEquipment,
+    Location,
+    Tag,
+    camera_gear_tags,
+    consumable_tags,
+    lab_equipment_tags,
+)
+from ..utils import FilterError, conditional_get, paginated_response, require_approved
+from ..utils.items import items_query, items_union, parse_item_sort, serialize_item
+
+
+items_blueprint = Blueprint(ITEM_DEFAULT_NAME, __name__)
+
+_ETAG_SOURCES = (
+    CameraGear,
+    Consumable,
+    LabEquipment,
+    camera_gear_tags,
+    consumable_tags,
+    lab_equipment_tags,
+    Tag,
+    Location,
+)
+
+
+@items_blueprint.route(ITEM_ALL_ROUTE, methods=[GET])
+@require_approved
+@conditional_get(*_ETAG_SOURCES)
+def get_all_items():
+    """Return items of every type from a single ``UNION ALL`` query.
+
+    Supports the filters shared by the per-type list endpoints, ``type``
+    to restrict the kinds returned, ``sort`` and keyset pagination via
+    ``limit``/``after``.
+    """
+    try:
+        items = items_union(request.args)
+        sort_column, descending = parse_item_sort(items, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    return paginated_response(
+        items_query(items),
+        ITEM_DEFAULT_NAME,
+        sort_column,
+        (items.c.type, items.c.id),
+        descending,
+        serialize=serialize_item,
+    )
@@ -5,51 +5,113 @@
 
 GET     /api/v1/lab_equipment/all                → Retrieve all lab equipment
 GET     /api/v1/lab_equipment/one/<int:tag_id>   → Retrieve a specific lab equipment item by ID
+GET     /api/v1/lab_equipment/changes?since=<cursor> → Items written/deleted since a cursor
 POST    /api/v1/lab_equipment/                   → Create a new lab equipment item
 PUT     /api/v1/lab_equipment/<int:tag_id>       → Update an existing lab equipment item
 DELETE  /api/v1/lab_equipment/<int:tag_id>       → Delete a lab equipment item by ID
+POST    /api/v1/lab_equipment/bulk               → Create many lab equipment items
+PATCH   /api/v1/lab_equipment/bulk               → Update many lab equipment items
+DELETE  /api/v1/lab_equipment/bulk               → Delete many lab equipment items
 """
 from datetime import datetime
 from flask import Blueprint, request
 from flask_login import current_user
 from ..constants import (
     DELETE,
+    ERROR_BAD_REQUEST,
     GET,
     LAB_EQUIPMENT_ALL_ROUTE,
+    LAB_EQUIPMENT_BULK_ROUTE,
     LAB_EQUIPMENT_CREATE_ROUTE,
     LAB_EQUIPMENT_DEFAULT_NAME,
     LAB_EQUIPMENT_DELETE_ROUTE,
+    LAB_EQUIPMENT_CHANGES_ROUTE,
     LAB_EQUIPMENT_GET_ONE_ROUTE,
+    LAB_EQUIPMENT_LAST_SERVICED_ON_FIELD,
     LAB_EQUIPMENT_NAME_FIELD,
     LAB_EQUIPMENT_SERVICE_FREQUENCY_FIELD,
     LAB_EQUIPMENT_TAGS_FIELD,
     LAB_EQUIPMENT_UPDATE_ROUTE,
+    PATCH,
     POST,
     PUT,
 )
-from ..models import LabEquipment, Tag
-from ..utils import require_approved, require_ta
+from ..models import LabEquipment, Tag, User, eager_query, lab_equipment_tags
+from ..utils import (
+    conditional_get,
+    FilterError,
+    bulk_response,
+    changes_response,
+    row_date,
+    row_text,
+    apply_filters,
+    paginated_response,
+    parse_fields,
+    projected_query,
+    parse_sort,
+    serialize_row,
+    require_approved,
+    require_ta,
+    resolve_tags,
+)
 
 from website import db
 
 
 lab_equipment_blueprint = Blueprint(LAB_EQUIPMENT_DEFAULT_NAME, __name__)
 
+_ETAG_SOURCES = (LabEquipment, lab_equipment_tags, Tag, User)
+
 
 @lab_equipment_blueprint.route(LAB_EQUIPMENT_ALL_ROUTE, methods=[GET])
 @require_approved
+@conditional_get(*_ETAG_SOURCES)
 def get_all_lab_equipment():
-    """Return all lab equipment items as a list of dicts."""
-    all_equipment = LabEquipment.query.all()
-    return {LAB_EQUIPMENT_DEFAULT_NAME: [equipment_item.to_dict() for equipment_item in all_equipment]}
+    """Return lab equipment items as a list of dicts.
+
+    Supports the filters and ``sort`` described in ``utils.filters``,
+    keyset pagination via ``limit``/``after`` and ``fields`` to select
+    the keys returned.
+    """
+    try:
+        fields = parse_fields(LabEquipment, request.args)
+        query = apply_filters(projected_query(LabEquipment, fields), LabEquipment, request.args)
+        sort_column, descending = parse_sort(LabEquipment, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    return paginated_response(
+        query,
+        LAB_EQUIPMENT_DEFAULT_NAME,
+        sort_column,
+        LabEquipment.id,
+        descending,
+        serialize=serialize_row(LabEquipment, fields),
+    )
+
+
+@lab_equipment_blueprint.route(LAB_EQUIPMENT_CHANGES_ROUTE, methods=[GET])
+@require_approved
+def get_lab_equipment_changes():
+    """Return lab equipment written or deleted since the ``since`` cursor.
+
+    The response carries the current rows, the ids of deleted rows and
+    the cursor for the next call; see ``utils.changes``. Without
+    ``since`` every row is returned. ``fields`` works as on ``/all``.
+    """
+    return changes_response(LabEquipment, LAB_EQUIPMENT_DEFAULT_NAME)
 
 
 @lab_equipment_blueprint.route(LAB_EQUIPMENT_GET_ONE_ROUTE, methods=[GET])
 @require_ta
+@conditional_get(*_ETAG_SOURCES)
 def get_lab_equipment(equipment_id):
     """Return a single lab equipment item by ID."""
-    equipment_item = LabEquipment.query.get_or_404(equipment_id)
-    return equipment_item.to_dict()
+    try:
+        fields = parse_fields(LabEquipment, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    equipment_item = eager_query(LabEquipment, fields).filter_by(id=equipment_id).first_or_404()
+    return equipment_item.to_dict(fields)
 
 
 @lab_equipment_blueprint.route(LAB_EQUIPMENT_CREATE_ROUTE, methods=[POST])
@@ -66,14 +128,7 @@ def create_lab_equipment():
     if not name:
         return {"error": "Name is required"}, 400
 
-    tags = []
-    if tag_names:
-        for tag_name in tag_names:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-            tags.append(tag)
+    tags = resolve_tags(tag_names)
 
     # Parse the date if provided
     serviced_date = None
@@ -114,14 +169,7 @@ def update_lab_equipment(equipment_id):
         target_equipment.name = name
 
     if tag_names is not None:
-        tags = []
-        for tag_name in tag_names:
-            tag = Tag.query.filter_by(name=tag_name).first()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.session.add(tag)
-            tags.append(tag)
-        target_equipment.tags = tags
+        target_equipment.tags = resolve_tags(tag_names)
 
     if service_freq is not None:
         target_equipment.service_frequency = service_freq
@@ -154,3 +202,32 @@ def delete_lab_equipment(equipment_id):
     db.session.delete(target_equipment)
     db.session.commit()
     return {"message": "Lab equipment deleted successfully"}
+
+
+def _bulk_row(row, partial):
+    """Column values for one lab equipment row of a bulk request."""
+    values = {}
+    if not partial or LAB_EQUIPMENT_NAME_FIELD in row:
+        values[LAB_EQUIPMENT_NAME_FIELD] = row_text(row, LAB_EQUIPMENT_NAME_FIELD)
+    if not partial or LAB_EQUIPMENT_SERVICE_FREQUENCY_FIELD in row:
+        values[LAB_EQUIPMENT_SERVICE_FREQUENCY_FIELD] = row_text(
+            row, LAB_EQUIPMENT_SERVICE_FREQUENCY_FIELD, required=False
+        )
+    if not partial or LAB_EQUIPMENT_LAST_SERVICED_ON_FIELD in row:
+        serviced = row_date(row, LAB_EQUIPMENT_LAST_SERVICED_ON_FIELD)
+        values[LAB_EQUIPMENT_LAST_SERVICED_ON_FIELD] = serviced
+        values["last_serviced_by"] = current_user.id if serviced else None
+    if not partial or LAB_EQUIPMENT_TAGS_FIELD in row:
+        values[LAB_EQUIPMENT_TAGS_FIELD] = row.get(LAB_EQUIPMENT_TAGS_FIELD) or []
+    return values
+
+
+@lab_equipment_blueprint.route(LAB_EQUIPMENT_BULK_ROUTE, methods=[POST, PATCH, DELETE])
+@require_ta
+def bulk_lab_equipment():
+    """Create (POST), update (PATCH) or delete (DELETE) many lab equipment items.
+
+    Takes a JSON array (or ``{"items": [...]}``) and returns one result
+    per row. Deletes take ids or ``{"id": ...}`` objects.
+    """
+    return bulk_response(LabEquipment, _bulk_row)
@@ -8,14 +8,23 @@ GET     /api/v1/location/one/<int:location_id> → Retrieve a specific location
 POST    /api/v1/location/                      → Create a new location
 PUT     /api/v1/location/<int:location_id>     → Update an existing location
 DELETE  /api/v1/location/<int:location_id>     → Delete a location by ID
+POST    /api/v1/location/bulk                  → Create many locations
+PATCH   /api/v1/location/bulk                  → Rename many locations
+DELETE  /api/v1/location/bulk                  → Delete many locations
 """
 
 from flask import Blueprint, request
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
 from ..constants import (
     DELETE,
     ERROR_BAD_REQUEST,
+    ERROR_CONFLICT,
     GET,
     LOCATION_ALL_ROUTE,
+    LOCATION_ALREADY_EXISTS_MESSAGE,
+    LOCATION_BULK_ROUTE,
     LOCATION_CREATE_ROUTE,
     LOCATION_DEFAULT_NAME,
     LOCATION_DELETE_ROUTE,
@@ -24,27 +33,57 @@ from ..constants import (
     LOCATION_NAME,
     LOCATION_NAME_NEEDED_MESSAGE,
     MESSAGE_KEY,
+    PATCH,
     POST,
     PUT,
 )
 from ..models import Location
-from ..utils import require_approved, require_ta
+from ..utils import (
+    RowError,
+    bulk_response,
+    conditional_get,
+    paginated_response,
+    require_approved,
+    require_ta,
+    row_text,
+)
 
 from website import db
 
 location_blueprint = Blueprint(LOCATION_DEFAULT_NAME, __name__)
 
+_ETAG_SOURCES = (Location,)
+
+
+def _name_taken(name, exclude_id=None):
+    """Return True if another location already uses ``name`` (case-insensitive)."""
+    query = Location.query.filter(func.lower(Location.name) == name.lower())
+    if exclude_id is not None:
+        query = query.filter(Location.id != exclude_id)
+    return db.session.query(query.exists()).scalar()
+
+
+def _commit_or_conflict():
+    """Commit, turning a unique-name violation into a 409 response."""
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return {MESSAGE_KEY: LOCATION_ALREADY_EXISTS_MESSAGE}, ERROR_CONFLICT
+    return None
+
 
 @location_blueprint.route(LOCATION_ALL_ROUTE, methods=[GET])
 @require_approved
+@conditional_get(*_ETAG_SOURCES)
 def get_locations():
-    """Return all locations as a list of dicts."""
-    locations = Location.query.all()
-    return {LOCATION_DEFAULT_NAME: [loc.to_dict() for loc in locations]}
+    """Return locations as a list of dicts, optionally one keyset page at a time."""
+    return paginated_response(Location.query, LOCATION_DEFAULT_NAME, Location.name, Location.id)
 
 
 @location_blueprint.route(LOCATION_GET_ONE_ROUTE, methods=[GET])
 @require_ta
+@conditional_get(*_ETAG_SOURCES)
 def get_location(location_id):
     """Return a location by ID as a dict."""
     location = Location.query.get_or_404(location_id)
@@ -56,12 +95,19 @@ def get_location(location_id):
 def create_location():
     """Create a new location from the JSON body and return it."""
     data = request.get_json()
-    name = data.get(LOCATION_NAME)
+    try:
+        name = row_text(data, LOCATION_NAME, required=False)
+    except RowError as exc:
+        return {MESSAGE_KEY: str(exc)}, ERROR_BAD_REQUEST
     if not name:
         return {MESSAGE_KEY: LOCATION_NAME_NEEDED_MESSAGE}, ERROR_BAD_REQUEST
+    if _name_taken(name):
+        return {MESSAGE_KEY: LOCATION_ALREADY_EXISTS_MESSAGE}, ERROR_CONFLICT
     new_location = Location(name=name)
     db.session.add(new_location)
-    db.session.commit()
+    conflict = _commit_or_conflict()
+    if conflict:
+        return conflict
     return new_location.to_dict()
 
 
@@ -70,12 +116,19 @@ def create_location():
 def update_location(location_id):
     """Update the name of an existing location and return it."""
     data = request.get_json()
-    name = data.get(LOCATION_NAME)
+    try:
+        name = row_text(data, LOCATION_NAME, required=False)
+    except RowError as exc:
+        return {MESSAGE_KEY: str(exc)}, ERROR_BAD_REQUEST
     if not name:
         return {MESSAGE_KEY: LOCATION_NAME_NEEDED_MESSAGE}, ERROR_BAD_REQUEST
     location = Location.query.get_or_404(location_id)
+    if _name_taken(name, exclude_id=location_id):
+        return {MESSAGE_KEY: LOCATION_ALREADY_EXISTS_MESSAGE}, ERROR_CONFLICT
     location.name = name
-    db.session.commit()
+    conflict = _commit_or_conflict()
+    if conflict:
+        return conflict
     return location.to_dict()
 
 
@@ -87,3 +140,19 @@ def delete_location(location_id):
     db.session.delete(location)
     db.session.commit()
     return {MESSAGE_KEY: LOCATION_DELETE_SUCCESS_MESSAGE}
+
+
+def _bulk_row(row, partial):  # pylint: disable=unused-argument
+    """Column values for one location row of a bulk request."""
+    return {LOCATION_NAME: row_text(row, LOCATION_NAME)}
+
+
+@location_blueprint.route(LOCATION_BULK_ROUTE, methods=[POST, PATCH, DELETE])
+@require_ta
+def bulk_locations():
+    """Create (POST), rename (PATCH) or delete (DELETE) many locations.
+
+    Names that clash (ignoring case) with an existing location or an
+    earlier row are reported as per-row errors.
+    """
+    return bulk_response(Location, _bulk_row, unique_name=True)
@@ -37,51 +37,85 @@ from ..constants import (
     NOTE_DELETE_SUCCESS_MESSAGE,
     ERROR_BAD_REQUEST,
 )
-from ..models import Note, CameraGear, LabEquipment, Consumable
-from ..utils import require_ta, require_approved
+from ..models import Note, CameraGear, LabEquipment, Consumable, User, eager_query
+from ..utils import (
+    conditional_get,
+    FilterError,
+    paginated_response,
+    parse_fields,
+    projected_query,
+    require_ta,
+    require_approved,
+    serialize_row,
+)
 
 from website import db
 
 
 notes_blueprint = Blueprint(NOTES_DEFAULT_NAME, __name__)
 
+_ETAG_SOURCES = (Note, User, CameraGear, LabEquipment, Consumable)
+
 
 @notes_blueprint.route(NOTES_ALL_ROUTE, methods=[GET])
 @login_required
 @require_approved
+@conditional_get(*_ETAG_SOURCES)
 def get_all_notes():
-    """Return all notes as a list of dicts."""
-    all_notes = Note.query.all()
-    return {NOTES_DEFAULT_NAME: [note.to_dict() for note in all_notes]}
+    """Return notes as a list of dicts, optionally one keyset page at a time.
+
+    ``fields`` selects the keys returned.
+    """
+    try:
+        fields = parse_fields(Note, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    return paginated_response(
+        projected_query(Note, fields),
+        NOTES_DEFAULT_NAME,
+        Note.created_at,
+        Note.id,
+        serialize=serialize_row(Note, fields),
+    )
 
 
 @notes_blueprint.route(NOTES_GET_ONE_ROUTE, methods=[GET])
 @require_approved
 @login_required
+@conditional_get(*_ETAG_SOURCES)
 def get_note(note_id):
     """Return a single note by ID."""
-    note = Note.query.get_or_404(note_id)
-    return note.to_dict()
+    try:
+        fields = parse_fields(Note, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    note = eager_query(Note, fields).filter_by(id=note_id).first_or_404()
+    return note.to_dict(fields)
 
 
 @notes_blueprint.route(NOTES_BY_ITEM_ROUTE, methods=[GET])
 @login_required
 @require_approved
+@conditional_get(*_ETAG_SOURCES)
 def get_note_by_item(item_type, item_id):
     """Return the note for a specific item, or None if no note exists."""
     note = None
+    try:
+        fields = parse_fields(Note, request.args)
+    except FilterError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
     
     if item_type == "camera_gear":
-        note = Note.query.filter_by(camera_gear_id=item_id).first()
+        note = eager_query(Note, fields).filter_by(camera_gear_id=item_id).first()
     elif item_type == "lab_equipment":
-        note = Note.query.filter_by(lab_equipment_id=item_id).first()
+        note = eager_query(Note, fields).filter_by(lab_equipment_id=item_id).first()
     elif item_type == "consumable":
-        note = Note.query.filter_by(consumable_id=item_id).first()
+        note = eager_query(Note, fields).filter_by(consumable_id=item_id).first()
     else:
         return {"error": f"Invalid item type: {item_type}"}, ERROR_BAD_REQUEST
     
     if note:
-        return note.to_dict()
+        return note.to_dict(fields)
     return {}
 
 
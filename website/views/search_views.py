@@ -0,0 +1,59 @@
+"""
+=====================================================
+ Search Routes (prefixed with "/search")
+=====================================================
+
+GET     /api/v1/search/?q=<text>         → Ranked matches across items, tags, locations and notes
+                                           (optional: type=camera_gear,note&limit=<n>)
+"""
+
+from flask import Blueprint, request
+from flask_login.utils import login_required
+
+from ..constants import (
+    ERROR_BAD_REQUEST,
+    GET,
+    SEARCH_DEFAULT_NAME,
+    SEARCH_LIMIT_ARG,
+    SEARCH_QUERY_ARG,
+    SEARCH_RESULTS_KEY,
+    SEARCH_ROUTE,
+    SEARCH_TYPE_ARG,
+)
+from ..utils import conditional_get, require_approved
+from ..utils.search import (
+    DEFAULT_SEARCH_LIMIT,
+    MAX_SEARCH_LIMIT,
+    SEARCH_KINDS,
+    SearchError,
+    search,
+)
+
+
+search_blueprint = Blueprint(SEARCH_DEFAULT_NAME, __name__)
+
+_ETAG_SOURCES = tuple(model for model, _, _ in SEARCH_KINDS.values())
+
+
+@search_blueprint.route(SEARCH_ROUTE, methods=[GET])
+@login_required
+@require_approved
+@conditional_get(*_ETAG_SOURCES)
+def search_all():
+    """Return ranked full-text matches for the ``q`` argument."""
+    raw_types = request.args.get(SEARCH_TYPE_ARG, "")
+    kinds = [k.strip() for k in raw_types.split(",") if k.strip()] or None
+    try:
+        limit = int(request.args.get(SEARCH_LIMIT_ARG) or DEFAULT_SEARCH_LIMIT)
+    except ValueError:
+        return {"error": f"'{SEARCH_LIMIT_ARG}' must be an integer"}, ERROR_BAD_REQUEST
+    if limit < 1 or limit > MAX_SEARCH_LIMIT:
+        return {
+            "error": f"'{SEARCH_LIMIT_ARG}' must be between 1 and {MAX_SEARCH_LIMIT}"
+        }, ERROR_BAD_REQUEST
+
+    try:
+        results = search(request.args.get(SEARCH_QUERY_ARG, ""), kinds, limit)
+    except SearchError as exc:
+        return {"error": str(exc)}, ERROR_BAD_REQUEST
+    return {SEARCH_RESULTS_KEY: results}
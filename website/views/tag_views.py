@@ -8,16 +8,24 @@ GET     /api/v1/items/one/<int:item_id>     → Retrieve a specific item by ID
 POST    /api/v1/items/                      → Create a new item
 PUT     /api/v1/items/<int:item_id>         → Update an existing item
 DELETE  /api/v1/items/<int:item_id>         → Delete an item by ID
+POST    /api/v1/tags/bulk                   → Create many tags
+PATCH   /api/v1/tags/bulk                   → Rename many tags
+DELETE  /api/v1/tags/bulk                   → Delete many tags
 """
 
 from flask import Blueprint, request
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
 from ..constants import (
     DELETE,
     GET,
     MESSAGE_KEY,
+    PATCH,
     POST,
     PUT,
     TAG_ALL_ROUTE,
+    TAG_BULK_ROUTE,
     TAG_CREATE_ROUTE,
     TAG_DEFAULT_NAME,
     TAG_DELETE_ROUTE,
@@ -26,26 +34,57 @@ from ..constants import (
     TAG_NAME,
     TAG_NAME_REQUIRED_MESSAGE,
     TAG_UPDATE_ROUTE,
-    ERROR_BAD_REQUEST
+    TAG_ALREADY_EXISTS_MESSAGE,
+    ERROR_BAD_REQUEST,
+    ERROR_CONFLICT,
 )
 from ..models import Tag
-from ..utils import require_ta, require_approved
+from ..utils import (
+    RowError,
+    bulk_response,
+    conditional_get,
+    paginated_response,
+    require_ta,
+    require_approved,
+    row_text,
+)
 
 from website import db
 
 tags_blueprint = Blueprint(TAG_DEFAULT_NAME, __name__)
 
+_ETAG_SOURCES = (Tag,)
+
+
+def _name_taken(name, exclude_id=None):
+    """Return True if another tag already uses ``name`` (case-insensitive)."""
+    query = Tag.query.filter(func.lower(Tag.name) == name.lower())
+    if exclude_id is not None:
+        query = query.filter(Tag.id != exclude_id)
+    return db.session.query(query.exists()).scalar()
+
+
+def _commit_or_conflict():
+    """Commit, turning a unique-name violation into a 409 response."""
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return {MESSAGE_KEY: TAG_ALREADY_EXISTS_MESSAGE}, ERROR_CONFLICT
+    return None
+
 
 @tags_blueprint.route(TAG_ALL_ROUTE, methods=[GET])
 @require_approved
+@conditional_get(*_ETAG_SOURCES)
 def get_tags():
-    """Return all tags as JSON-serializable dicts."""
-    db_tags = Tag.query.all()
-    return {TAG_DEFAULT_NAME: [t.to_dict() for t in db_tags]}
+    """Return tags as JSON-serializable dicts, optionally one keyset page at a time."""
+    return paginated_response(Tag.query, TAG_DEFAULT_NAME, Tag.name, Tag.id)
 
 
 @tags_blueprint.route(TAG_GET_ONE_ROUTE, methods=[GET])
 @require_ta
+@conditional_get(*_ETAG_SOURCES)
 def get_tag(tag_id):
     """Return a single tag by ID as a dict."""
     db_tag = Tag.query.get_or_404(tag_id)
@@ -57,12 +96,19 @@ def get_tag(tag_id):
 def create_tag():
     """Create a new tag from JSON body and return the created tag."""
     data = request.get_json()
-    name = data.get(TAG_NAME)
+    try:
+        name = row_text(data, TAG_NAME, required=False)
+    except RowError as exc:
+        return {MESSAGE_KEY: str(exc)}, ERROR_BAD_REQUEST
     if not name:
         return {MESSAGE_KEY: TAG_NAME_REQUIRED_MESSAGE}, ERROR_BAD_REQUEST
+    if _name_taken(name):
+        return {MESSAGE_KEY: TAG_ALREADY_EXISTS_MESSAGE}, ERROR_CONFLICT
     new_tag = Tag(name=name)
     db.session.add(new_tag)
-    db.session.commit()
+    conflict = _commit_or_conflict()
+    if conflict:
+        return conflict
     return new_tag.to_dict()
 
 
@@ -71,12 +117,19 @@ def create_tag():
 def update_tag(tag_id):
     """Update the tag's name and return the updated tag."""
     data = request.get_json()
-    name = data.get(TAG_NAME)
+    try:
+        name = row_text(data, TAG_NAME, required=False)
+    except RowError as exc:
+        return {MESSAGE_KEY: str(exc)}, ERROR_BAD_REQUEST
     if not name:
         return {MESSAGE_KEY: TAG_NAME_REQUIRED_MESSAGE}, ERROR_BAD_REQUEST
     tag_to_update = Tag.query.get_or_404(tag_id)
+    if _name_taken(name, exclude_id=tag_id):
+        return {MESSAGE_KEY: TAG_ALREADY_EXISTS_MESSAGE}, ERROR_CONFLICT
     tag_to_update.name = name
-    db.session.commit()
+    conflict = _commit_or_conflict()
+    if conflict:
+        return conflict
     return tag_to_update.to_dict()
 
 
@@ -88,3 +141,19 @@ def delete_tag(tag_id):
     db.session.delete(tag_to_delete)
     db.session.commit()
     return {MESSAGE_KEY: TAG_DELETE_SUCCESS_MESSAGE}
+
+
+def _bulk_row(row, partial):  # pylint: disable=unused-argument
+    """Column values for one tag row of a bulk request."""
+    return {TAG_NAME: row_text(row, TAG_NAME)}
+
+
+@tags_blueprint.route(TAG_BULK_ROUTE, methods=[POST, PATCH, DELETE])
+@require_ta
+def bulk_tags():
+    """Create (POST), rename (PATCH) or delete (DELETE) many tags.
+
+    Names that clash (ignoring case) with an existing tag or an earlier
+    row are reported as per-row errors.
+    """
+    return bulk_response(Tag, _bulk_row, unique_name=True)
@@ -4,48 +4,62 @@ These endpoints are intentionally small and secured by a shared
 secret token (WEEKLY_TASK_TOKEN). Keep the token secret and store it
 in GitHub Actions as a repository secret if you trigger the endpoint
 from a workflow.
+
+The work itself runs in the background (see ``utils.jobs``): the
+trigger endpoint answers 202 with a status URL the caller can poll.
 """
 
 import os
 
-from flask import Blueprint, request, abort, current_app
+from flask import Blueprint, request, abort, current_app, url_for
+
+from website import db
+from ..constants import (
+    ERROR_NOT_FOUND,
+    STATUS_ACCEPTED,
+    TASK_TOKEN_HEADER,
+    TASKS_PREFIX,
+    TASKS_RUN_ROUTE,
+    TASKS_WEEKLY_EXPIRATIONS_ROUTE,
+)
+from ..models import JobRun
+from ..utils.jobs import WEEKLY_EXPIRATIONS, enqueue_job
+
+tasks_blueprint = Blueprint("internal_tasks", __name__, url_prefix=TASKS_PREFIX)
 
-# Importing the task helpers at module import time can create a cyclic
-# import with the utils module (which imports models and app context).
-# Import the helpers inside the endpoint function to break that cycle.
 
-tasks_blueprint = Blueprint("internal_tasks", __name__, url_prefix="/internal/tasks")
+def _require_task_token():
+    """Abort with 403 unless the request carries the WEEKLY_TASK_TOKEN."""
+    token = request.headers.get(TASK_TOKEN_HEADER)
+    expected = os.getenv("WEEKLY_TASK_TOKEN")
+    if not expected or not token or token != expected:
+        current_app.logger.warning("Unauthorized attempt to run internal task %s", request.path)
+        abort(403)
 
 
-@tasks_blueprint.route("/weekly-expirations", methods=("POST",))
+@tasks_blueprint.route(TASKS_WEEKLY_EXPIRATIONS_ROUTE, methods=("POST",))
 def weekly_expirations():
-    """Run the weekly expirations notification.
+    """Enqueue the weekly expirations notification job.
 
     Requires header `X-Task-Token` that matches the environment
-    variable `WEEKLY_TASK_TOKEN`.
+    variable `WEEKLY_TASK_TOKEN`. Returns 202 with the run id and the
+    URL of its status endpoint.
     """
-    token = request.headers.get("X-Task-Token")
-    expected = os.getenv("WEEKLY_TASK_TOKEN")
-    if not expected or not token or token != expected:
-        current_app.logger.warning("Unauthorized attempt to run weekly expirations")
-        abort(403)
+    _require_task_token()
+    run = enqueue_job(WEEKLY_EXPIRATIONS)
+    status_url = url_for("internal_tasks.job_run_status", run_id=run.id)
+    return (
+        {"id": run.id, "status": run.status, "status_url": status_url},
+        STATUS_ACCEPTED,
+        {"Location": status_url},
+    )
+
 
-    # Run the helper synchronously inside the request (app) context.
-    try:
-        # Import helpers here to avoid cyclic imports at module import time.
-        from ..utils import (
-            notify_consumables_expiring_this_week,
-            notify_camera_gear_due_returns,
-            notify_lab_equipment_service_reminders,
-        )
-
-        # run all three weekly checks; each helper logs failures individually
-        notify_consumables_expiring_this_week()
-        notify_camera_gear_due_returns()
-        notify_lab_equipment_service_reminders()
-    except Exception:
-        current_app.logger.exception("Error while running weekly expirations task")
-        # return an explicit 500 response so callers and tests can detect it
-        return ("Internal Server Error", 500)
-
-    return ("OK", 200)
+@tasks_blueprint.route(TASKS_RUN_ROUTE, methods=("GET",))
+def job_run_status(run_id):
+    """Return the status, timings and per-step outcomes of a job run."""
+    _require_task_token()
+    run = db.session.get(JobRun, run_id)
+    if run is None:
+        return {"error": "Job run not found"}, ERROR_NOT_FOUND
+    return run.to_dict()